@@ -0,0 +1 @@
+"""Benchmarks for the Game Coordinator Bot."""
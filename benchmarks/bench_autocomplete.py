@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Autocomplete latency benchmark
+
+Replays realistic typing, one keystroke at a time, against the timezone,
+game and mode autocomplete indexes and reports per-keystroke latency
+(including conversion to app_commands.Choice). A naive substring scan over
+every zone name is measured for comparison. Discord gives an autocomplete
+handler 3 seconds to respond; the target here is well under a millisecond.
+
+Run with: python -m benchmarks.bench_autocomplete
+"""
+
+import statistics
+import sys
+import time
+import zoneinfo
+
+from game_coordinator_bot.utils.autocomplete import (
+    MAX_SUGGESTIONS,
+    catalog_indexes,
+    normalize,
+    timezone_index,
+    to_choices,
+)
+
+
+ROUNDS = 20
+# What people actually type into the timezone option, typos included
+TIMEZONE_INPUTS = [
+    "new york", "los angeles", "chicago", "denver", "london", "berlin",
+    "paris", "tokyo", "seoul", "sydney", "america/chicago", "europe/lo",
+    "us/eastern", "est", "pst", "cet", "utc", "gmt", "mumbai", "sf",
+    "sao paulo", "buenos aires", "auckland", "sydeny", "tokio", "berln",
+]
+GAME_INPUTS = ["call of duty", "cod", "overcooked", "over"]
+MODE_INPUTS = [("call_of_duty", "zombies"), ("call_of_duty", "multi"), (None, "end")]
+LATENCY_BUDGET = 0.001  # seconds per keystroke
+
+
+def keystrokes(text: str):
+    """Every prefix of text, as sent while the user types."""
+    return [text[:i] for i in range(len(text) + 1)]
+
+
+def percentile(samples, pct: float) -> float:
+    """Return the pct-th percentile of samples."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def measure(label: str, queries, search) -> float:
+    """Time search(query) for every query; print stats; return p99 seconds."""
+    samples = []
+    for _ in range(ROUNDS):
+        for query in queries:
+            start = time.perf_counter()
+            search(query)
+            samples.append(time.perf_counter() - start)
+    p50 = percentile(samples, 50)
+    p99 = percentile(samples, 99)
+    print(
+        f"{label:<24} {len(samples):6d} keystrokes  "
+        f"p50 {p50 * 1e6:7.1f}µs  p99 {p99 * 1e6:7.1f}µs  max {max(samples) * 1e6:7.1f}µs"
+    )
+    return p99
+
+
+def main() -> int:
+    """Run the benchmark."""
+    start = time.perf_counter()
+    index = timezone_index()
+    print(f"Timezone index: {len(index)} zones built in {(time.perf_counter() - start) * 1000:.1f}ms")
+    
+    # First call imports discord.app_commands; keep that out of the timings
+    to_choices(index.search(""))
+    
+    zone_queries = [query for text in TIMEZONE_INPUTS for query in keystrokes(text)]
+    names = sorted(zoneinfo.available_timezones())
+    
+    def naive(query):
+        # Substring scan over every zone, as a handler without an index would do
+        q = normalize(query)
+        return [name for name in names if q in normalize(name)][:MAX_SUGGESTIONS]
+    
+    naive_p99 = measure("timezones (naive scan)", zone_queries, naive)
+    zone_p99 = measure("timezones (index)", zone_queries, lambda q: to_choices(index.search(q)))
+    
+    indexes = catalog_indexes()
+    game_queries = [query for text in GAME_INPUTS for query in keystrokes(text)]
+    game_p99 = measure("games", game_queries, lambda q: to_choices(indexes.games.search(q)))
+    mode_queries = [(game, query) for game, text in MODE_INPUTS for query in keystrokes(text)]
+    mode_p99 = measure(
+        "modes",
+        mode_queries,
+        lambda pair: to_choices(indexes.modes(pair[0]).search(pair[1]))
+    )
+    
+    print(f"Index p99 is {naive_p99 / zone_p99:.1f}x faster than the naive scan")
+    worst = max(zone_p99, game_p99, mode_p99)
+    if worst > LATENCY_BUDGET:
+        print(f"p99 {worst * 1e6:.0f}µs exceeds the {LATENCY_BUDGET * 1e6:.0f}µs budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Availability overlap benchmark
+
+Builds a SlotMatrix (game_coordinator_bot/availability.py) for guilds of
+growing size over one to twelve weeks, with random weekly windows in a mix
+of timezones, and times building the members' bitmaps and scoring the best
+session slots (what /when does). A small guild is first checked against a
+naive slot-by-slot search through zoneinfo, so the fast path must give the
+same answer.
+
+Run with: python -m benchmarks.bench_availability [--users 10,100,1000,5000] [--weeks 1,4,12]
+"""
+
+import argparse
+import calendar
+import random
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Tuple
+from zoneinfo import ZoneInfo
+
+from game_coordinator_bot.availability import SLOT_SECONDS, SLOTS_PER_WEEK, SlotMatrix
+
+
+USERS = [10, 100, 1000, 5000]
+WEEKS = [1, 4, 12]
+DURATION = 120  # minutes
+REPEAT = 3  # best of
+
+TIMEZONES = [
+    "America/New_York", "America/Los_Angeles", "Europe/London", "Europe/Berlin",
+    "Asia/Tokyo", "Asia/Kolkata", "Australia/Sydney", "UTC",
+]
+# Spans the March and April DST changes in both hemispheres
+START = calendar.timegm((2026, 3, 2, 0, 0, 0))
+
+Window = Tuple[int, int, int]
+
+
+def random_members(rng: random.Random, count: int) -> Dict[int, Tuple[List[Window], str]]:
+    """Evening and weekend windows, one timezone per member."""
+    members = {}
+    for user_id in range(count):
+        windows = []
+        for weekday in rng.sample(range(7), rng.randint(1, 5)):
+            start = rng.randrange(16 * 4, 23 * 4) * 15
+            length = rng.randrange(4, 20) * 15
+            windows.append((weekday, start, (start + length) % (24 * 60)))
+        members[user_id] = (windows, rng.choice(TIMEZONES))
+    return members
+
+
+def build(members: Dict[int, Tuple[List[Window], str]], weeks: int) -> SlotMatrix:
+    matrix = SlotMatrix(START, weeks)
+    for user_id, (windows, timezone) in members.items():
+        matrix.add(user_id, windows, timezone)
+    return matrix
+
+
+def naive_best(members: Dict[int, Tuple[List[Window], str]], weeks: int, duration: int) -> Tuple[int, int]:
+    """Best (start, free members) by converting every slot of every member."""
+    slots = weeks * SLOTS_PER_WEEK
+    length = duration // 15
+    counts = [0] * slots
+    for windows, timezone in members.values():
+        tz = ZoneInfo(timezone)
+        free = []
+        for slot in range(slots):
+            local = datetime.fromtimestamp(START + slot * SLOT_SECONDS, tz)
+            minute = local.hour * 60 + local.minute
+            hit = False
+            for weekday, first, last in windows:
+                last = last if last > first else last + 24 * 60
+                hit |= local.weekday() == weekday and first <= minute < last
+                hit |= (local.weekday() - 1) % 7 == weekday and first <= minute + 24 * 60 < last
+            free.append(hit)
+        for slot in range(slots - length + 1):
+            if all(free[slot:slot + length]):
+                counts[slot] += 1
+    best = max(range(slots), key=lambda slot: (counts[slot], -slot))
+    return START + best * SLOT_SECONDS, counts[best]
+
+
+def best_of(fn, repeat: int = REPEAT) -> Tuple[float, object]:
+    """Fastest of ``repeat`` runs, and the last result."""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - started)
+    return min(times), result
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", default=",".join(map(str, USERS)), help="Comma-separated guild sizes")
+    parser.add_argument("--weeks", default=",".join(map(str, WEEKS)), help="Comma-separated week counts")
+    args = parser.parse_args()
+    user_counts = [int(count) for count in args.users.split(",")]
+    week_counts = [int(count) for count in args.weeks.split(",")]
+    rng = random.Random(1)
+    
+    small = random_members(rng, 40)
+    expected = naive_best(small, 2, DURATION)
+    best = build(small, 2).best_slots(DURATION, top=1)[0]
+    if (best.start, len(best.user_ids)) != expected:
+        print(f"Mismatch with the naive search: {best.start, len(best.user_ids)} != {expected}")
+        return 1
+    naive_time, _ = best_of(lambda: naive_best(small, 2, DURATION), repeat=1)
+    fast_time, _ = best_of(lambda: build(small, 2).best_slots(DURATION, top=1))
+    print(
+        f"40 members over 2 weeks: naive {naive_time * 1000:.0f} ms, "
+        f"bitmaps {fast_time * 1000:.1f} ms (x{naive_time / fast_time:.0f}), same best slot"
+    )
+    print()
+    
+    print(f"{'members':>7} {'weeks':>5} {'build ms':>9} {'score ms':>9} {'total ms':>9} {'best':>5}")
+    for users in user_counts:
+        members = random_members(rng, users)
+        for weeks in week_counts:
+            build_time, matrix = best_of(lambda: build(members, weeks))
+            score_time, suggestions = best_of(lambda: matrix.best_slots(DURATION, top=3))
+            print(
+                f"{users:7d} {weeks:5d} {build_time * 1000:9.1f} {score_time * 1000:9.1f} "
+                f"{(build_time + score_time) * 1000:9.1f} {len(suggestions[0].user_ids):5d}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
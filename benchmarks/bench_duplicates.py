@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Duplicate session lookup benchmark
+
+Indexes growing numbers of upcoming sessions in a DuplicateIndex
+(game_coordinator_bot/duplicates.py) and times the lookup /play makes
+before announcing, adding a session, and expiring sessions as their start
+times pass. The same lookups are answered by scanning every session for
+comparison, and their answers must match.
+
+Run with: python -m benchmarks.bench_duplicates [--sessions 1000,100000,1000000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from typing import List, Optional, Tuple
+
+from game_coordinator_bot.duplicates import DUPLICATE_WINDOW, DuplicateIndex
+from game_coordinator_bot.storage.sessions import Session
+
+
+SESSIONS = [1000, 100000, 1000000]
+GUILDS = 1000
+GAMES = ["call_of_duty", "fortnite", "valorant", "minecraft", "apex"]
+PLATFORMS = ["pc", "playstation", "xbox"]
+QUERIES = 10000
+SCANNED = 20  # queries answered by scanning every session
+HORIZON = 7 * 86400  # sessions start up to a week ahead
+START = 1_800_000_000
+
+Query = Tuple[int, str, Optional[str], str, int]
+
+
+def random_sessions(rng: random.Random, count: int) -> List[Session]:
+    return [
+        Session(
+            guild_id=rng.randrange(GUILDS),
+            channel_id=1,
+            organizer_id=rng.randrange(10 ** 6),
+            game=rng.choice(GAMES),
+            platform=rng.choice(PLATFORMS),
+            timezone="UTC",
+            start_time=START + rng.randrange(1, HORIZON),
+            id=str(i),
+        )
+        for i in range(count)
+    ]
+
+
+def random_queries(rng: random.Random, count: int) -> List[Query]:
+    return [
+        (rng.randrange(GUILDS), rng.choice(GAMES), None, rng.choice(PLATFORMS), START + rng.randrange(1, HORIZON))
+        for _ in range(count)
+    ]
+
+
+def scan_find(sessions: List[Session], query: Query) -> Optional[Session]:
+    """The closest matching session within the window, by checking every session."""
+    guild_id, game, mode, platform, start_time = query
+    matches = [
+        session for session in sessions
+        if (session.guild_id, session.game, session.mode, session.platform) == (guild_id, game, mode, platform)
+        and abs(session.start_time - start_time) <= DUPLICATE_WINDOW
+    ]
+    return min(matches, key=lambda session: abs(session.start_time - start_time), default=None)
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", default=",".join(map(str, SESSIONS)), help="Comma-separated session counts")
+    args = parser.parse_args()
+    rng = random.Random(1)
+    
+    print(f"{'sessions':>9} {'add µs':>7} {'find µs':>8} {'expire µs':>10} {'scan find ms':>13} {'found':>6}")
+    for count in [int(value) for value in args.sessions.split(",")]:
+        sessions = random_sessions(rng, count)
+        queries = random_queries(rng, QUERIES)
+        now = START
+        index = DuplicateIndex(clock=lambda: now)
+        
+        started = time.perf_counter()
+        for session in sessions:
+            index.add(session)
+        add_time = (time.perf_counter() - started) / count
+        
+        started = time.perf_counter()
+        found = sum(index.find(*query) is not None for query in queries)
+        find_time = (time.perf_counter() - started) / QUERIES
+        
+        started = time.perf_counter()
+        for query in queries[:SCANNED]:
+            if index.find(*query) is not scan_find(sessions, query):
+                print(f"Index disagrees with the scan for {query}")
+                return 1
+        scan_time = (time.perf_counter() - started) / SCANNED
+        
+        # A day later a seventh of the sessions have started
+        now = START + 86400
+        started = time.perf_counter()
+        dropped = index.expire()
+        expire_time = (time.perf_counter() - started) / max(dropped, 1)
+        
+        print(
+            f"{count:9d} {add_time * 1e6:7.2f} {find_time * 1e6:8.2f} {expire_time * 1e6:10.2f} "
+            f"{scan_time * 1000:13.2f} {found / QUERIES:6.0%}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
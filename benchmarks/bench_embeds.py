@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Session embed benchmark
+
+Compares building the session embed from scratch on every interaction (the
+previous ``_create_session_embed`` body) with rendering it from the cached
+per-game/mode template. Reports time and allocated bytes per embed.
+
+Run with: python -m benchmarks.bench_embeds
+"""
+
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import discord
+
+from game_coordinator_bot.utils.config import get_game_config
+from game_coordinator_bot.utils.embed_templates import EmbedTemplateCache
+
+
+ITERATIONS = 50000
+
+USER = SimpleNamespace(
+    mention="<@1234567890>",
+    name="player1",
+    display_avatar=SimpleNamespace(url="https://cdn.discordapp.com/avatars/1/a.png"),
+)
+TIMESTAMP = 1700000000
+
+
+def build_from_scratch() -> discord.Embed:
+    """The per-interaction construction used before templates."""
+    game_config = get_game_config("call_of_duty")
+    color = discord.Color(game_config.color) if game_config else discord.Color.blue()
+    embed = discord.Embed(
+        title="🎮 Gaming Session",
+        description=f"{USER.mention} wants to play!",
+        color=color
+    )
+    embed.add_field(name="🎯 Game", value="Call of Duty - Zombies", inline=True)
+    embed.add_field(name="🖥️ Platform", value="PC", inline=True)
+    embed.add_field(name="⏰ Time", value=f"<t:{TIMESTAMP}:F>\n<t:{TIMESTAMP}:R>", inline=False)
+    embed.set_footer(
+        text=f"Organized by {USER.name} • US Eastern (EST/EDT)",
+        icon_url=USER.display_avatar.url
+    )
+    return embed
+
+
+def make_render_from_template():
+    """Bind a template lookup + render the way the cog does it."""
+    cache = EmbedTemplateCache()
+    
+    def render() -> discord.Embed:
+        return cache.get("call_of_duty", "zombies").render(
+            USER, "PC", TIMESTAMP, "US Eastern (EST/EDT)"
+        )
+    return render
+
+
+def measure(label: str, func) -> float:
+    """Report µs and allocated bytes per call; return µs per call."""
+    func()
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        func()
+    per_call = (time.perf_counter() - start) / ITERATIONS * 1e6
+    
+    tracemalloc.start()
+    snapshot_before = tracemalloc.take_snapshot()
+    keep = [func() for _ in range(1000)]
+    snapshot_after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in snapshot_after.compare_to(snapshot_before, "filename"))
+    del keep
+    
+    print(f"{label:<16} {per_call:8.2f} µs/embed {allocated / 1000:8.0f} B/embed")
+    return per_call
+
+
+def main() -> int:
+    """Run the benchmark."""
+    assert build_from_scratch().to_dict() == make_render_from_template()().to_dict()
+    
+    scratch_us = measure("from scratch", build_from_scratch)
+    template_us = measure("from template", make_render_from_template())
+    print(f"Speedup: {scratch_us / template_us:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Gateway memory benchmark
+
+Feeds N synthetic guilds through discord.py's connection state, the same
+way GUILD_CREATE and MESSAGE_CREATE events arrive from the gateway, and
+reports resident memory for each gateway profile. Each profile runs in its
+own interpreter. Payloads only carry what Discord sends for the profile's
+intents: voice members need the voice states intent, and message events
+need the guild messages intent.
+
+Run with: python -m benchmarks.bench_gateway_memory [--guilds N]
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import resource
+import subprocess
+import sys
+
+import discord
+from discord.ext import commands
+
+from game_coordinator_bot.utils.gateway_profile import GATEWAY_PROFILES, gateway_options
+
+
+GUILDS = 2000
+TEXT_CHANNELS = 20
+VOICE_CHANNELS = 5
+ROLES = 15
+EMOJIS = 20
+VOICE_MEMBERS = 5
+MESSAGES_PER_GUILD = 20
+BOT_USER_ID = 1
+TIMESTAMP = "2024-01-01T00:00:00+00:00"
+
+
+def rss_bytes() -> int:
+    """Current resident set size (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def user_payload(user_id: int) -> dict:
+    return {
+        "id": str(user_id),
+        "username": f"user{user_id}",
+        "discriminator": "0",
+        "avatar": None,
+        "global_name": f"User {user_id}",
+    }
+
+
+def member_payload(user_id: int, with_user: bool = True) -> dict:
+    data = {"roles": [], "joined_at": TIMESTAMP, "deaf": False, "mute": False, "flags": 0}
+    if with_user:
+        data["user"] = user_payload(user_id)
+    return data
+
+
+def guild_payload(guild_id: int, intents: discord.Intents) -> dict:
+    """GUILD_CREATE payload as Discord would send it for these intents."""
+    base = guild_id * 1000
+    channels = [
+        {
+            "id": str(base + i),
+            "type": 0,
+            "name": f"channel-{i}",
+            "position": i,
+            "permission_overwrites": [],
+            "guild_id": str(guild_id),
+        }
+        for i in range(TEXT_CHANNELS)
+    ]
+    channels += [
+        {
+            "id": str(base + i),
+            "type": 2,
+            "name": f"voice-{i}",
+            "position": i,
+            "permission_overwrites": [],
+            "guild_id": str(guild_id),
+            "bitrate": 64000,
+            "user_limit": 0,
+        }
+        for i in range(TEXT_CHANNELS, TEXT_CHANNELS + VOICE_CHANNELS)
+    ]
+    roles = [
+        {
+            "id": str(guild_id if i == 0 else base + 100 + i),
+            "name": "@everyone" if i == 0 else f"role-{i}",
+            "permissions": "0",
+            "position": i,
+            "color": 0,
+            "hoist": False,
+            "managed": False,
+            "mentionable": False,
+        }
+        for i in range(ROLES)
+    ]
+    emojis = [
+        {"id": str(base + 200 + i), "name": f"emoji{i}", "roles": [], "require_colons": True, "managed": False, "animated": False, "available": True}
+        for i in range(EMOJIS)
+    ]
+    members = [member_payload(BOT_USER_ID)]
+    voice_states = []
+    if intents.voice_states:
+        for i in range(VOICE_MEMBERS):
+            user_id = base + 300 + i
+            members.append(member_payload(user_id))
+            voice_states.append({
+                "user_id": str(user_id),
+                "channel_id": str(base + TEXT_CHANNELS),
+                "session_id": f"voice{user_id}",
+                "deaf": False,
+                "mute": False,
+                "self_deaf": False,
+                "self_mute": False,
+                "self_video": False,
+                "suppress": False,
+                "request_to_speak_timestamp": None,
+            })
+    return {
+        "id": str(guild_id),
+        "name": f"guild-{guild_id}",
+        "icon": None,
+        "owner_id": str(base + 300),
+        "roles": roles,
+        "channels": channels,
+        "members": members,
+        "voice_states": voice_states,
+        "emojis": emojis,
+        "stickers": [],
+        "features": [],
+        "threads": [],
+        "presences": [],
+        "member_count": 50,
+        "large": False,
+    }
+
+
+def message_payload(guild_id: int, message_id: int, intents: discord.Intents) -> dict:
+    """MESSAGE_CREATE payload; content is empty without the message content intent."""
+    author_id = guild_id * 1000 + 400 + message_id % 10
+    return {
+        "id": str(guild_id * 1000 + 500 + message_id),
+        "channel_id": str(guild_id * 1000 + message_id % TEXT_CHANNELS),
+        "guild_id": str(guild_id),
+        "author": user_payload(author_id),
+        "member": member_payload(author_id, with_user=False),
+        "content": "anyone up for a game tonight?" if intents.message_content else "",
+        "timestamp": TIMESTAMP,
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": [],
+        "pinned": False,
+        "type": 0,
+    }
+
+
+async def measure(profile: str, guilds: int) -> dict:
+    """Load synthetic guilds into a bot built with a profile and report its memory."""
+    bot = commands.Bot(command_prefix="!", **gateway_options(profile))
+    async with bot:
+        state = bot._connection
+        state.user = discord.ClientUser(state=state, data=user_payload(BOT_USER_ID))
+        intents = bot.intents
+        gc.collect()
+        before = rss_bytes()
+        
+        for guild_id in range(10, 10 + guilds):
+            state.parse_guild_create(guild_payload(guild_id, intents))
+            if intents.guild_messages:
+                for message_id in range(MESSAGES_PER_GUILD):
+                    state.parse_message_create(message_payload(guild_id, message_id, intents))
+            # Let dispatched events (e.g. prefix command handling) run
+            await asyncio.sleep(0)
+        
+        gc.collect()
+        after = rss_bytes()
+        return {
+            "profile": profile,
+            "guilds": len(bot.guilds),
+            "members": sum(len(guild.members) for guild in bot.guilds),
+            "messages": len(state._messages or ()),
+            "rss_delta": after - before,
+            "rss": after,
+        }
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Gateway memory benchmark")
+    parser.add_argument("--guilds", type=int, default=GUILDS)
+    parser.add_argument("--profile", choices=GATEWAY_PROFILES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.profile:
+        # Child process: measure one profile
+        print(json.dumps(asyncio.run(measure(args.profile, args.guilds))))
+        return 0
+    
+    results = []
+    for profile in GATEWAY_PROFILES:
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_gateway_memory", "--guilds", str(args.guilds), "--profile", profile],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    
+    print(f"Memory after {args.guilds} synthetic guilds:")
+    for result in results:
+        print(
+            f"  {result['profile']:<9} RSS {result['rss'] / 2**20:7.1f} MiB"
+            f"  (+{result['rss_delta'] / 2**20:6.1f} MiB for guilds)"
+            f"  members cached: {result['members']:6d}  messages cached: {result['messages']:5d}"
+        )
+    standard, lean = results[0], results[1]
+    saved = 1 - lean["rss_delta"] / standard["rss_delta"] if standard["rss_delta"] else 0.0
+    print(f"Lean profile uses {saved:.0%} less memory for guild state")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
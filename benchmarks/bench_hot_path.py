@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Interaction hot path benchmark
+
+Times the code every /play interaction runs: parse_time_input,
+get_game_config, GameCommands._create_session_embed and the whole
+play_command coroutine, driven through a fake discord.Interaction with the
+real dispatcher, session store, preference store and reminder scheduler
+(only the Discord HTTP call is faked). Reports ops/sec, p50/p99 latency and
+the bytes allocated per call (peak traced by tracemalloc).
+
+Results are compared against benchmarks/baselines/hot_path.json, and p99
+latency is checked against fixed budgets, so regressions fail the run
+before a deploy.
+
+Run with: python -m benchmarks.bench_hot_path [--update-baseline]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List
+
+from game_coordinator_bot.cogs.game_commands import GameCommands
+from game_coordinator_bot.dispatcher import OutboundDispatcher
+from game_coordinator_bot.duplicates import DuplicateIndex
+from game_coordinator_bot.metrics import Metrics
+from game_coordinator_bot.scheduler import ReminderScheduler
+from game_coordinator_bot.storage.database import Database
+from game_coordinator_bot.storage.preferences import UserPreferences
+from game_coordinator_bot.storage.sessions import SessionRepository
+from game_coordinator_bot.utils.config import get_game_config
+from game_coordinator_bot.utils.timezone_utils import parse_time_input
+
+
+ITERATIONS = 5000
+ALLOCATION_SAMPLES = 200
+# Fail if p50 or allocations are this much worse than the baseline (machines differ)
+TOLERANCE = 1.5
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "hot_path.json")
+# Hard p99 ceilings in µs, independent of the baseline. Discord needs the
+# interaction answered within 3 seconds; these leave room for the network.
+BUDGETS = {
+    "parse_time_input": 50,
+    "get_game_config": 5,
+    "create_session_embed": 200,
+    "play_command": 5000,
+}
+
+TIMES = ["8pm", "8:30pm", "20:00", "9:15 PM", "21:45"]
+TIMEZONES = ["US/Eastern", "Europe/London", "Asia/Tokyo", "UTC"]
+
+
+class FakeResponse:
+    """Stands in for InteractionResponse; answers without touching the network."""
+    
+    def __init__(self):
+        self.sent = 0
+    
+    def is_done(self) -> bool:
+        return False
+    
+    async def send_message(self, **kwargs) -> Any:
+        self.sent += 1
+        return SimpleNamespace(message_id=self.sent)
+
+
+def fake_interaction(user_id: int, response: FakeResponse) -> SimpleNamespace:
+    """The attributes of discord.Interaction that /play reads."""
+    return SimpleNamespace(
+        id=1,
+        guild_id=100,
+        channel_id=200,
+        user=SimpleNamespace(
+            id=user_id,
+            name=f"player{user_id}",
+            mention=f"<@{user_id}>",
+            display_avatar=SimpleNamespace(url="https://cdn.discordapp.com/avatars/1/a.png"),
+        ),
+        response=response,
+        namespace=SimpleNamespace(),
+        extras={},
+        command=SimpleNamespace(qualified_name="play"),
+    )
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Return the pct-th percentile of samples."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def measure(func: Callable[[], Any], is_async: bool = False) -> Dict[str, float]:
+    """Time func per call, then trace its allocations; return the stats."""
+    async def call():
+        result = func()
+        if is_async:
+            await result
+    
+    for _ in range(100):
+        await call()
+    
+    samples = []
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        t0 = time.perf_counter()
+        await call()
+        samples.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    
+    tracemalloc.start()
+    allocated = []
+    for _ in range(ALLOCATION_SAMPLES):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        await call()
+        allocated.append(tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+    
+    return {
+        "ops_per_sec": round(ITERATIONS / elapsed),
+        "p50_us": round(percentile(samples, 50) * 1e6, 2),
+        "p99_us": round(percentile(samples, 99) * 1e6, 2),
+        "alloc_bytes": round(sorted(allocated)[len(allocated) // 2]),
+    }
+
+
+async def run(path: str) -> Dict[str, Dict[str, float]]:
+    """Benchmark every case against a bot wired like bot.py."""
+    database = Database(path)
+    metrics = Metrics()
+    bot = SimpleNamespace(
+        metrics=metrics,
+        dispatcher=OutboundDispatcher(metrics=metrics),
+        session_store=SessionRepository(database),
+        user_preferences=UserPreferences(database),
+        reminder_scheduler=ReminderScheduler(),
+        duplicate_index=DuplicateIndex(),
+    )
+    bot.dispatcher.start()
+    await bot.session_store.open()
+    await bot.user_preferences.open()
+    cog = GameCommands(bot)
+    try:
+        inputs = itertools.cycle([(t, tz) for t in TIMES for tz in TIMEZONES])
+        game_ids = itertools.cycle(["call_of_duty", "overcooked", "unknown"])
+        # A guild per /play, so none is answered as a duplicate of an earlier one
+        guild_ids = itertools.count(100)
+        response = FakeResponse()
+        interaction = fake_interaction(42, response)
+        game_config = get_game_config("call_of_duty")
+        parsed_time = parse_time_input("8pm", "US/Eastern")
+        
+        def create_embed():
+            return cog._create_session_embed(
+                user=interaction.user,
+                game=game_config.display_name,
+                game_value=game_config.id,
+                parsed_time=parsed_time,
+                timezone_name="US/Eastern",
+                timezone_display="US Eastern (EST/EDT)",
+                platform="PC",
+                mode="Zombies",
+                mode_value="zombies",
+                game_config=game_config,
+            )
+        
+        def play():
+            time_str, timezone_name = next(inputs)
+            interaction.guild_id = next(guild_ids)
+            metrics.mark_received(interaction)
+            return cog.play_command.callback(
+                cog, interaction, game="call_of_duty", time=time_str,
+                timezone=timezone_name, platform=None, mode="zombies",
+            )
+        
+        # The first /play has no remembered platform; pick it once like a user would
+        bot.user_preferences.remember(42, platform="pc")
+        
+        results = {
+            "parse_time_input": await measure(lambda: parse_time_input(*next(inputs))),
+            "get_game_config": await measure(lambda: get_game_config(next(game_ids))),
+            "create_session_embed": await measure(create_embed),
+            "play_command": await measure(play, is_async=True),
+        }
+        assert response.sent > ITERATIONS, "play_command did not answer the interaction"
+        return results
+    finally:
+        cog.cog_unload()
+        await bot.user_preferences.close()
+        await bot.session_store.close()
+        await bot.dispatcher.stop()
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--update-baseline", action="store_true", help="Record these results as the new baseline")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        results = asyncio.run(run(os.path.join(tmp, "bench.db")))
+    
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            baseline = json.load(f)
+    
+    print(f"{'case':<22} {'ops/s':>9} {'p50 µs':>9} {'p99 µs':>9} {'B/call':>8}   vs baseline")
+    failures = []
+    for case, stats in results.items():
+        line = (
+            f"{case:<22} {stats['ops_per_sec']:9,d} {stats['p50_us']:9.1f} "
+            f"{stats['p99_us']:9.1f} {stats['alloc_bytes']:8,d}"
+        )
+        recorded = baseline.get(case)
+        if recorded:
+            time_ratio = stats["p50_us"] / recorded["p50_us"]
+            alloc_ratio = stats["alloc_bytes"] / max(recorded["alloc_bytes"], 1)
+            line += f"   p50 x{time_ratio:.2f}  alloc x{alloc_ratio:.2f}"
+            if time_ratio > TOLERANCE or alloc_ratio > TOLERANCE:
+                failures.append(f"{case} regressed more than x{TOLERANCE}")
+        print(line)
+        if stats["p99_us"] > BUDGETS[case]:
+            failures.append(f"{case} p99 {stats['p99_us']:.0f}µs exceeds the {BUDGETS[case]}µs budget")
+    
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {BASELINE_PATH}")
+        return 0
+    
+    for failure in failures:
+        print(failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+HTTP interactions benchmark
+
+Measures the interactions endpoint (game_coordinator_bot/http_interactions.py):
+first Ed25519 verification and /play handling in-process, then end to end
+against worker processes started on one port (SO_REUSEPORT), driven by a
+local client that signs every request like Discord does. Requests are signed
+before the clock starts, so only the server side is measured.
+
+Run with: python -m benchmarks.bench_interactions [--workers 1,2] [--duration 5]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+import aiohttp
+from nacl.signing import SigningKey
+
+from benchmarks.fake_discord import command_interaction
+from game_coordinator_bot.http_interactions import InteractionsEndpoint
+from game_coordinator_bot.storage.database import Database
+from game_coordinator_bot.storage.sessions import SessionRepository
+
+
+WORKERS = [1, 2]
+DURATION = 5.0  # seconds per worker count
+CONCURRENCY = 64  # requests in flight
+REQUESTS = 5000  # pre-signed requests, reused round robin
+MICRO_ITERATIONS = 2000
+READY_TIMEOUT = 30.0
+
+TIMES = ["8pm", "8:30pm", "20:00", "9:15pm", "21:45"]
+TIMEZONES = ["America/New_York", "Europe/London", "Asia/Tokyo", "UTC"]
+
+Request = Tuple[bytes, Dict[str, str]]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Return the pct-th percentile of samples."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def play_payload(interaction_id: int) -> dict:
+    """A valid /play interaction, varying user, time and timezone."""
+    return command_interaction(interaction_id, 1000 + interaction_id % 1000, "play", {
+        "game": "call_of_duty",
+        "time": TIMES[interaction_id % len(TIMES)],
+        "timezone": TIMEZONES[interaction_id % len(TIMEZONES)],
+        "platform": "pc",
+        "mode": "zombies",
+    })
+
+
+def sign(key: SigningKey, payload: dict) -> Request:
+    """Body and headers of a request signed the way Discord signs it."""
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    timestamp = str(int(time.time()))
+    signature = key.sign(timestamp.encode() + body).signature.hex()
+    return body, {
+        "X-Signature-Ed25519": signature,
+        "X-Signature-Timestamp": timestamp,
+        "Content-Type": "application/json",
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def micro(key: SigningKey, tmp: str) -> None:
+    """Per-request cost of verification and of /play handling, without HTTP."""
+    database = Database(os.path.join(tmp, "micro.db"))
+    store = SessionRepository(database)
+    await store.open()
+    endpoint = InteractionsEndpoint(key.verify_key.encode().hex(), session_store=store)
+    try:
+        requests = [sign(key, play_payload(i)) for i in range(MICRO_ITERATIONS)]
+        started = time.perf_counter()
+        for body, headers in requests:
+            assert endpoint.verify(headers["X-Signature-Ed25519"], headers["X-Signature-Timestamp"], body)
+        verify = (time.perf_counter() - started) / MICRO_ITERATIONS
+        
+        payloads = [json.loads(body) for body, _ in requests]
+        started = time.perf_counter()
+        for payload in payloads:
+            reply = await endpoint.handle(payload)
+            assert reply["type"] == 4 and "flags" not in reply["data"], reply
+        handle = (time.perf_counter() - started) / MICRO_ITERATIONS
+    finally:
+        await endpoint.stop()
+        await store.close()
+    
+    print(f"{'in-process':<24} {'µs/request':>10} {'requests/s':>11}")
+    for label, seconds in (("verify signature", verify), ("handle /play", handle)):
+        print(f"{label:<24} {seconds * 1e6:10.1f} {1 / seconds:11,.0f}")
+
+
+def start_workers(count: int, port: int, public_key: str, tmp: str) -> List[subprocess.Popen]:
+    """Start ``count`` endpoint workers sharing one port and one database."""
+    env = dict(
+        os.environ,
+        DISCORD_PUBLIC_KEY=public_key,
+        DATABASE_PATH=os.path.join(tmp, "load.db"),
+        LOG_LEVEL="WARNING",
+    )
+    env.pop("METRICS_PORT", None)
+    log = open(os.path.join(tmp, "workers.log"), "a")
+    return [
+        subprocess.Popen(
+            [sys.executable, "-m", "game_coordinator_bot.http_interactions", "--port", str(port)],
+            env=env,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+        for _ in range(count)
+    ]
+
+
+async def wait_ready(client: aiohttp.ClientSession, url: str, ping: Request, workers: int) -> bool:
+    """Wait until the port answers; give every worker time to bind it too."""
+    deadline = time.perf_counter() + READY_TIMEOUT
+    while time.perf_counter() < deadline:
+        try:
+            async with client.post(url, data=ping[0], headers=ping[1]) as response:
+                if response.status == 200:
+                    await asyncio.sleep(0.5 * workers)
+                    return True
+        except aiohttp.ClientConnectionError:
+            pass
+        await asyncio.sleep(0.1)
+    return False
+
+
+async def flood(client: aiohttp.ClientSession, url: str, requests: List[Request], duration: float) -> Dict[str, float]:
+    """Keep CONCURRENCY signed /play requests in flight for ``duration`` seconds."""
+    latencies: List[float] = []
+    errors = 0
+    cycle = itertools.cycle(requests)
+    deadline = time.perf_counter() + duration
+    
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            body, headers = next(cycle)
+            started = time.perf_counter()
+            async with client.post(url, data=body, headers=headers) as response:
+                reply = await response.json(content_type=None) if response.status == 200 else None
+            latencies.append(time.perf_counter() - started)
+            if reply is None or reply.get("type") != 4 or "flags" in reply["data"]:
+                errors += 1
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+    elapsed = time.perf_counter() - started
+    return {
+        "rate": len(latencies) / elapsed,
+        "p50": percentile(latencies, 50) * 1000,
+        "p99": percentile(latencies, 99) * 1000,
+        "errors": errors,
+    }
+
+
+async def run(worker_counts: List[int], duration: float, tmp: str) -> int:
+    key = SigningKey.generate()
+    await micro(key, tmp)
+    
+    requests = [sign(key, play_payload(i)) for i in range(REQUESTS)]
+    ping = sign(key, {"type": 1})
+    print()
+    print(f"{'workers':>7} {'requests/s':>11} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    connector = aiohttp.TCPConnector(limit=CONCURRENCY)
+    async with aiohttp.ClientSession(connector=connector) as client:
+        for count in worker_counts:
+            port = free_port()
+            url = f"http://127.0.0.1:{port}/interactions"
+            workers = start_workers(count, port, key.verify_key.encode().hex(), tmp)
+            try:
+                if not await wait_ready(client, url, ping, count):
+                    with open(os.path.join(tmp, "workers.log")) as f:
+                        print("Workers did not start. Last log lines:\n" + "".join(f.readlines()[-20:]))
+                    return 1
+                stats = await flood(client, url, requests, duration)
+            finally:
+                for worker in workers:
+                    worker.send_signal(signal.SIGINT)
+                for worker in workers:
+                    try:
+                        worker.wait(timeout=10)
+                    except subprocess.TimeoutExpired:
+                        worker.kill()
+            print(f"{count:7d} {stats['rate']:11,.0f} {stats['p50']:8.1f} {stats['p99']:8.1f} {stats['errors']:7d}")
+            if stats["errors"]:
+                print(f"{stats['errors']} requests failed or were answered with an error")
+                return 1
+    return 0
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", default=",".join(map(str, WORKERS)), help="Comma-separated worker counts")
+    parser.add_argument("--duration", type=float, default=DURATION, help="Seconds per worker count")
+    args = parser.parse_args()
+    worker_counts = [int(count) for count in args.workers.split(",")]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        return asyncio.run(run(worker_counts, args.duration, tmp))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+End-to-end load benchmark
+
+Starts the local Discord stand-in (benchmarks/fake_discord.py), runs the
+real bot against it in a separate process and floods it with /play
+interactions at increasing rates. For each rate it reports the achieved
+throughput, ack latency (INTERACTION_CREATE sent to callback received) and
+the bot process's CPU use; a single event loop pinned near 100% CPU with
+growing latency is saturated. Everything runs offline.
+
+Every /play goes to a guild of its own. Within a guild, a second /play of
+the same game at about the same time is answered with the earlier session
+instead of a new one, so reusing guilds would measure that shortcut.
+
+Run with: python -m benchmarks.bench_load [--rates 250,500,1000,2000] [--duration 5]
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+from benchmarks.fake_discord import GUILD_ID, FakeDiscord
+
+
+RATES = [250, 500, 1000, 2000]
+DURATION = 5.0  # seconds per rate
+USERS = 1000
+WARMUP_RATE = 200
+WARMUP_DURATION = 1.0
+TICK = 0.01  # seconds between bursts
+DRAIN_TIMEOUT = 10.0
+READY_TIMEOUT = 30.0
+# Discord fails an interaction that is not acknowledged within 3 seconds
+ACK_DEADLINE = 3.0
+
+TIMES = ["8pm", "8:30pm", "20:00", "9:15pm", "21:45"]
+TIMEZONES = ["America/New_York", "Europe/London", "Asia/Tokyo", "UTC"]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Return the pct-th percentile of samples."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def cpu_seconds(pid: int) -> Optional[float]:
+    """User + system CPU time of a process, where /proc is available."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def start_bot(server: FakeDiscord, tmp: str) -> subprocess.Popen:
+    """Run the bot against the stand-in, with state in a scratch directory."""
+    env = dict(
+        os.environ,
+        DISCORD_BOT_TOKEN="fake-token",
+        DISCORD_GUILD_ID="",
+        DISCORD_API_URL=server.api_url,
+        DISCORD_GATEWAY_URL=server.gateway_url,
+        DATABASE_PATH=os.path.join(tmp, "load.db"),
+        COMMAND_SYNC_STATE_PATH=os.path.join(tmp, "command_sync.json"),
+        GATEWAY_PROFILE="lean",
+        METRICS_PORT="",
+    )
+    env.pop("CLUSTER_IPC_ADDRESS", None)
+    env.pop("SHARD_IDS", None)
+    log = open(os.path.join(tmp, "bot.log"), "w")
+    return subprocess.Popen(
+        [sys.executable, "-m", "game_coordinator_bot.bot"],
+        env=env,
+        stdout=log,
+        stderr=subprocess.STDOUT,
+    )
+
+
+async def flood(server: FakeDiscord, rate: int, duration: float, users, guilds) -> int:
+    """Send /play interactions at ``rate`` per second for ``duration`` seconds."""
+    inputs = itertools.cycle([(t, tz) for t in TIMES for tz in TIMEZONES])
+    sent = 0
+    started = time.perf_counter()
+    while True:
+        elapsed = time.perf_counter() - started
+        if elapsed >= duration:
+            return sent
+        due = int(rate * elapsed) - sent
+        if due > 0:
+            batch = []
+            for _ in range(due):
+                time_str, timezone = next(inputs)
+                batch.append(server.play_interaction(
+                    next(users), next(guilds), game="call_of_duty", time=time_str,
+                    timezone=timezone, platform="pc", mode="zombies",
+                ))
+            await server.send_interactions(batch)
+            sent += due
+        await asyncio.sleep(TICK)
+
+
+async def drain(server: FakeDiscord) -> None:
+    """Wait until every interaction has been acknowledged (or give up)."""
+    deadline = time.perf_counter() + DRAIN_TIMEOUT
+    while server.pending and time.perf_counter() < deadline:
+        await asyncio.sleep(0.05)
+
+
+async def run(rates: List[int], duration: float, tmp: str) -> int:
+    # One guild per interaction sent
+    server = FakeDiscord(guilds=int(WARMUP_RATE * WARMUP_DURATION + sum(rates) * duration))
+    await server.start()
+    bot = start_bot(server, tmp)
+    try:
+        try:
+            await asyncio.wait_for(server.synced.wait(), READY_TIMEOUT)
+        except asyncio.TimeoutError:
+            with open(os.path.join(tmp, "bot.log")) as f:
+                print("Bot did not become ready. Last log lines:\n" + "".join(f.readlines()[-20:]))
+            return 1
+        
+        users = itertools.cycle(range(1000, 1000 + USERS))
+        guilds = itertools.count(GUILD_ID)
+        # Warm up caches and the database before measuring
+        await flood(server, WARMUP_RATE, WARMUP_DURATION, users, guilds)
+        await drain(server)
+        server.ack_latencies.clear()
+        server.errors = 0
+        
+        print(f"{'offered/s':>9} {'acked/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'late':>6} {'lost':>6} {'CPU %':>6}")
+        saturated_at = None
+        for rate in rates:
+            cpu_before = cpu_seconds(bot.pid)
+            started = time.perf_counter()
+            sent = await flood(server, rate, duration, users, guilds)
+            await drain(server)
+            elapsed = time.perf_counter() - started
+            cpu_after = cpu_seconds(bot.pid)
+            
+            latencies = server.ack_latencies
+            server.ack_latencies = []
+            lost = len(server.pending)
+            server.pending.clear()
+            late = sum(1 for latency in latencies if latency > ACK_DEADLINE)
+            cpu = f"{(cpu_after - cpu_before) / elapsed * 100:6.0f}" if cpu_before is not None else f"{'-':>6}"
+            if not latencies:
+                print(f"{rate:9d} {0:9.0f} {'-':>8} {'-':>8} {'-':>8} {late:6d} {lost:6d} {cpu}")
+                saturated_at = saturated_at or rate
+                continue
+            print(
+                f"{rate:9d} {len(latencies) / elapsed:9.0f} "
+                f"{percentile(latencies, 50) * 1000:8.1f} {percentile(latencies, 99) * 1000:8.1f} "
+                f"{max(latencies) * 1000:8.1f} {late:6d} {lost:6d} {cpu}"
+            )
+            if late or lost or len(latencies) < sent:
+                saturated_at = saturated_at or rate
+        
+        if server.errors:
+            print(f"{server.errors} interactions were rejected by the bot (ephemeral error replies)")
+        if server.unhandled:
+            print(f"Unhandled API routes: {dict(server.unhandled)}")
+        if saturated_at:
+            print(f"Saturated at {saturated_at} interactions/s")
+        else:
+            print(f"No saturation up to {rates[-1]} interactions/s")
+        return 0
+    finally:
+        bot.send_signal(signal.SIGINT)
+        try:
+            bot.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            bot.kill()
+        await server.stop()
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rates", default=",".join(map(str, RATES)), help="Comma-separated interactions per second")
+    parser.add_argument("--duration", type=float, default=DURATION, help="Seconds per rate")
+    args = parser.parse_args()
+    rates = [int(rate) for rate in args.rates.split(",")]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        return asyncio.run(run(rates, args.duration, tmp))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
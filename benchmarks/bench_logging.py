@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Logging loop-lag benchmark
+
+Simulates bursts of /play interactions that each log a session line, while
+a probe task measures event loop lag (how late a 1ms sleep wakes up). The
+log sink is a stream whose writes take WRITE_DELAY, standing in for a slow
+stderr pipe or a busy journald. The direct StreamHandler that
+logging.basicConfig installs (writes on the event loop) is compared with
+the queue pipeline from utils/log_pipeline.py (writes on a background
+thread), in both text and JSON formats.
+
+Run with: python -m benchmarks.bench_logging
+"""
+
+import asyncio
+import io
+import logging
+import sys
+import time
+from typing import Callable, Dict, List
+
+from game_coordinator_bot.utils.log_pipeline import TEXT_FORMAT, configure_logging
+
+
+BURSTS = 10
+BURST_SIZE = 200  # interactions arriving together
+BURST_INTERVAL = 0.05  # seconds between bursts
+WRITE_DELAY = 0.0005  # seconds per write to the sink
+PROBE_INTERVAL = 0.001
+
+logger = logging.getLogger('game_coordinator.commands')
+
+
+class SlowStream(io.TextIOBase):
+    """Text sink whose writes block for WRITE_DELAY."""
+    
+    def __init__(self):
+        self.lines = 0
+    
+    def write(self, text: str) -> int:
+        time.sleep(WRITE_DELAY)
+        self.lines += text.count("\n")
+        return len(text)
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Return the pct-th percentile of samples."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def interaction(user_id: int) -> None:
+    """The logging a /play interaction does, around a yield to the loop."""
+    await asyncio.sleep(0)
+    logger.info(
+        "Gaming session created by %s: %s on %s at %s %s",
+        f"player{user_id}", "Call of Duty", "PC", "8pm", "US Eastern (EST/EDT)",
+        extra={"session_id": f"s{user_id}", "guild_id": 100, "game": "call_of_duty"}
+    )
+
+
+async def run_bursts() -> Dict[str, float]:
+    """Run the bursts with the lag probe alongside; return lag stats in ms."""
+    lags: List[float] = []
+    running = True
+    
+    async def probe():
+        while running:
+            started = time.perf_counter()
+            await asyncio.sleep(PROBE_INTERVAL)
+            lags.append(time.perf_counter() - started - PROBE_INTERVAL)
+    
+    probe_task = asyncio.create_task(probe())
+    started = time.perf_counter()
+    for burst in range(BURSTS):
+        await asyncio.gather(*(interaction(burst * BURST_SIZE + i) for i in range(BURST_SIZE)))
+        await asyncio.sleep(BURST_INTERVAL)
+    elapsed = time.perf_counter() - started
+    running = False
+    await probe_task
+    return {
+        "p50": percentile(lags, 50) * 1000,
+        "p99": percentile(lags, 99) * 1000,
+        "max": max(lags) * 1000,
+        "elapsed": elapsed * 1000,
+    }
+
+
+def direct(stream: SlowStream) -> Callable[[], None]:
+    """What logging.basicConfig sets up: a StreamHandler on the root logger."""
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+    return lambda: root.removeHandler(handler)
+
+
+def queued(log_format: str) -> Callable[[SlowStream], Callable[[], None]]:
+    def setup(stream: SlowStream) -> Callable[[], None]:
+        listener = configure_logging(logging.INFO, log_format, stream)
+        return listener.stop
+    return setup
+
+
+def main() -> int:
+    """Run the benchmark."""
+    setups = {
+        "direct (basicConfig)": direct,
+        "queue, text": queued("text"),
+        "queue, json": queued("json"),
+    }
+    records = BURSTS * BURST_SIZE
+    print(f"{records} log records in bursts of {BURST_SIZE}; sink write takes {WRITE_DELAY * 1000:.1f}ms")
+    print(f"{'pipeline':<22} {'lag p50':>9} {'lag p99':>9} {'lag max':>9} {'bursts':>9} {'written':>8}")
+    results = {}
+    for label, setup in setups.items():
+        stream = SlowStream()
+        teardown = setup(stream)
+        stats = asyncio.run(run_bursts())
+        # Stopping the listener drains the queue
+        teardown()
+        results[label] = stats
+        print(
+            f"{label:<22} {stats['p50']:7.2f}ms {stats['p99']:7.2f}ms {stats['max']:7.2f}ms "
+            f"{stats['elapsed']:7.0f}ms {stream.lines:8d}"
+        )
+        if stream.lines != records:
+            print(f"Expected {records} lines, got {stream.lines}")
+            return 1
+    
+    direct_p99 = results["direct (basicConfig)"]["p99"]
+    queue_p99 = results["queue, json"]["p99"]
+    print(f"Queue pipeline cuts p99 loop lag from {direct_p99:.1f}ms to {queue_p99:.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Recurring session benchmark
+
+Indexes growing numbers of random weekly rules in an OccurrenceIndex
+(game_coordinator_bot/recurrence.py) and times the queries the bot makes:
+the next occurrence overall, a guild's next ten sessions for /sessions
+upcoming, and advancing past occurrences as time moves on. The same
+queries are timed as a scan over every rule for comparison, and their
+answers must match.
+
+Run with: python -m benchmarks.bench_recurrence [--rules 1000,10000,100000]
+"""
+
+import argparse
+import calendar
+import itertools
+import random
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from game_coordinator_bot.recurrence import OccurrenceIndex, RecurrenceRule
+
+
+RULES = [1000, 10000, 100000]
+GUILDS = 100
+QUERIES = 200
+SCANNED = 3  # queries answered by scanning every rule
+LIMIT = 10
+
+TIMEZONES = [
+    "America/New_York", "America/Los_Angeles", "Europe/London", "Europe/Berlin",
+    "Asia/Tokyo", "Asia/Kolkata", "Australia/Sydney", "UTC",
+]
+START = calendar.timegm((2026, 10, 1, 0, 0, 0))
+
+
+def random_rules(rng: random.Random, count: int) -> Dict[str, Tuple[RecurrenceRule, int]]:
+    """Rules with one to three weekdays, spread over GUILDS guilds."""
+    return {
+        str(i): (
+            RecurrenceRule(
+                weekdays=sum(1 << day for day in rng.sample(range(7), rng.randint(1, 3))),
+                minute=rng.randrange(16 * 4, 24 * 4) * 15,
+                timezone=rng.choice(TIMEZONES),
+                interval=rng.choice((1, 1, 2)),
+                anchor=START - rng.randrange(30 * 86400),
+            ),
+            rng.randrange(GUILDS),
+        )
+        for i in range(count)
+    }
+
+
+def scan_upcoming(rules: Dict[str, Tuple[RecurrenceRule, int]], guild: int, now: int) -> List[int]:
+    """A guild's next LIMIT occurrences by expanding every rule."""
+    starts = [
+        start for rule, rule_guild in rules.values() if rule_guild == guild
+        for start in itertools.islice(rule.occurrences(now), LIMIT)
+    ]
+    return sorted(starts)[:LIMIT]
+
+
+def scan_next(rules: Dict[str, Tuple[RecurrenceRule, int]], now: int) -> int:
+    return min(rule.next_occurrence(now) for rule, _ in rules.values())
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rules", default=",".join(map(str, RULES)), help="Comma-separated rule counts")
+    args = parser.parse_args()
+    rng = random.Random(1)
+    
+    print(f"{'rules':>7} {'index s':>8} {'next µs':>8} {'upcoming µs':>12} {'advance µs':>11} {'scan next ms':>13} {'scan upcoming ms':>17}")
+    for count in [int(value) for value in args.rules.split(",")]:
+        rules = random_rules(rng, count)
+        now = START
+        index = OccurrenceIndex(clock=lambda: now)
+        
+        started = time.perf_counter()
+        for key, (rule, guild) in rules.items():
+            index.add(key, rule, guild, groups=(guild,))
+        build = time.perf_counter() - started
+        
+        guilds = [rng.randrange(GUILDS) for _ in range(QUERIES)]
+        started = time.perf_counter()
+        for _ in range(QUERIES):
+            index.next()
+        next_time = (time.perf_counter() - started) / QUERIES
+        started = time.perf_counter()
+        for guild in guilds:
+            index.upcoming(guild, limit=LIMIT)
+        upcoming_time = (time.perf_counter() - started) / QUERIES
+        
+        # A week later every rule has passed at least one occurrence
+        now = START + 7 * 86400
+        started = time.perf_counter()
+        index.next()
+        for guild in range(GUILDS):
+            index.next(guild)
+        advance_time = (time.perf_counter() - started) / count
+        
+        started = time.perf_counter()
+        for guild in guilds[:SCANNED]:
+            expected = scan_upcoming(rules, guild, now)
+            if [occurrence.start for occurrence in index.upcoming(guild, limit=LIMIT)] != expected:
+                print(f"Index disagrees with the scan for guild {guild}")
+                return 1
+        scan_upcoming_time = (time.perf_counter() - started) / SCANNED
+        started = time.perf_counter()
+        if index.next().start != scan_next(rules, now):
+            print("Index disagrees with the scan for the next occurrence")
+            return 1
+        scan_next_time = time.perf_counter() - started
+        
+        print(
+            f"{count:7d} {build:8.2f} {next_time * 1e6:8.1f} {upcoming_time * 1e6:12.1f} "
+            f"{advance_time * 1e6:11.1f} {scan_next_time * 1000:13.1f} {scan_upcoming_time * 1000:17.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
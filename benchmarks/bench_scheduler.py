@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Reminder scheduler benchmark
+
+Loads 100k pending reminders into one ReminderScheduler, measures insert and
+cancel cost and memory, then lets the single scheduler task fire a window of
+reminders and reports how late they fired.
+
+Run with: python -m benchmarks.bench_scheduler
+"""
+
+import asyncio
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from game_coordinator_bot.scheduler import ReminderScheduler
+
+
+PENDING = 100000
+CANCELLED = 10000
+FIRE_WINDOW = 2.0  # seconds over which the fired reminders are spread
+
+
+def percentile(samples, pct: float) -> float:
+    """Return the pct-th percentile of samples."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run() -> int:
+    rng = random.Random(1)
+    scheduler = ReminderScheduler()
+    now = time.time()
+    
+    # Spread reminders over the next week
+    session_ids = [f"s{i}" for i in range(PENDING)]
+    fire_times = [now + 60 + rng.random() * 7 * 86400 for _ in range(PENDING)]
+    
+    start = time.perf_counter()
+    reminders = [
+        scheduler.schedule(session_id, fire_at, "start")
+        for session_id, fire_at in zip(session_ids, fire_times)
+    ]
+    insert_elapsed = time.perf_counter() - start
+    
+    # Memory held by the scheduler itself, measured on a second instance
+    tracemalloc.start()
+    measured = ReminderScheduler()
+    for session_id, fire_at in zip(session_ids, fire_times):
+        measured.schedule(session_id, fire_at, "start")
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del measured
+    
+    print(
+        f"Inserted {PENDING:,} reminders: {insert_elapsed / PENDING * 1e6:.2f} µs each, "
+        f"{current / 1e6:.1f} MB ({current / PENDING:.0f} B/reminder)"
+    )
+    
+    start = time.perf_counter()
+    for reminder in rng.sample(reminders, CANCELLED):
+        scheduler.cancel(reminder)
+    cancel_elapsed = time.perf_counter() - start
+    print(f"Cancelled {CANCELLED:,} reminders: {cancel_elapsed / CANCELLED * 1e6:.2f} µs each")
+    
+    burst = 5000
+    base = time.time() + 0.2
+    for i in range(burst):
+        scheduler.schedule(f"burst{i}", base + rng.random() * FIRE_WINDOW, "start")
+    
+    lateness = []
+    batches = []
+    
+    async def callback(batch):
+        fired_at = time.time()
+        batches.append(len(batch))
+        lateness.extend(fired_at - reminder.fire_at for reminder in batch)
+    
+    scheduler.start(callback)
+    await asyncio.sleep(FIRE_WINDOW + 0.5)
+    await scheduler.stop()
+    
+    print(
+        f"Fired {len(lateness):,}/{burst:,} burst reminders in {len(batches)} batches "
+        f"(max {max(batches)} per batch) with {len(scheduler):,} still pending"
+    )
+    print(
+        f"Lateness: p50 {percentile(lateness, 50) * 1000:.1f} ms   "
+        f"p99 {percentile(lateness, 99) * 1000:.1f} ms   "
+        f"mean {statistics.mean(lateness) * 1000:.1f} ms"
+    )
+    return 0 if len(lateness) == burst else 1
+
+
+def main() -> int:
+    """Run the benchmark."""
+    return asyncio.run(run())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Session store benchmark
+
+Fills a SQLite session store with tens of thousands of sessions spread over
+many guilds, then measures ``/sessions upcoming`` query latency, both for
+the raw indexed query and end to end through the worker thread.
+
+Run with: python -m benchmarks.bench_session_store
+"""
+
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from game_coordinator_bot.storage.database import Database
+from game_coordinator_bot.storage.sessions import Session, SessionRepository
+
+
+SESSIONS = 50000
+GUILDS = 50
+QUERIES = 2000
+GAMES = ("call_of_duty", "overcooked")
+
+
+def percentile(samples, pct: float) -> float:
+    """Return the pct-th percentile of samples."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def report(label: str, samples) -> None:
+    """Print p50/p99 latency in microseconds."""
+    print(
+        f"{label:<28} p50 {percentile(samples, 50) * 1e6:8.1f} µs"
+        f"   p99 {percentile(samples, 99) * 1e6:8.1f} µs"
+    )
+
+
+async def run(path: str) -> int:
+    store = SessionRepository(Database(path), batch_size=500)
+    await store.open()
+    now = int(time.time())
+    rng = random.Random(1)
+    
+    start = time.perf_counter()
+    for _ in range(SESSIONS):
+        await store.add(Session(
+            guild_id=rng.randrange(GUILDS),
+            channel_id=1,
+            organizer_id=rng.randrange(10000),
+            game=rng.choice(GAMES),
+            platform="pc",
+            timezone="UTC",
+            start_time=now + rng.randrange(-30 * 86400, 30 * 86400),
+        ))
+    await store.flush()
+    elapsed = time.perf_counter() - start
+    print(f"Inserted {SESSIONS} sessions in {elapsed:.2f}s ({SESSIONS / elapsed:,.0f}/s)")
+    
+    end_to_end = []
+    by_game = []
+    for _ in range(QUERIES):
+        guild_id = rng.randrange(GUILDS)
+        t0 = time.perf_counter()
+        await store.upcoming(guild_id, now=now)
+        t1 = time.perf_counter()
+        await store.upcoming(guild_id, game=rng.choice(GAMES), now=now)
+        t2 = time.perf_counter()
+        end_to_end.append(t1 - t0)
+        by_game.append(t2 - t1)
+    
+    raw = await store.database.run(_time_raw_queries, now, rng)
+    
+    report("upcoming (raw query)", raw)
+    report("upcoming (via worker thread)", end_to_end)
+    report("upcoming by game", by_game)
+    
+    await store.close()
+    return 0 if percentile(raw, 50) < 0.001 else 1
+
+
+def _time_raw_queries(connection, now, rng):
+    samples = []
+    for _ in range(QUERIES):
+        guild_id = rng.randrange(GUILDS)
+        t0 = time.perf_counter()
+        connection.execute(
+            "SELECT * FROM sessions INDEXED BY idx_sessions_guild_start "
+            "WHERE guild_id IS ? AND start_time >= ? AND status = ? "
+            "ORDER BY start_time LIMIT 10",
+            (guild_id, now, "scheduled"),
+        ).fetchall()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def main() -> int:
+    """Run the benchmark."""
+    with tempfile.TemporaryDirectory() as directory:
+        return asyncio.run(run(os.path.join(directory, "bench.db")))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
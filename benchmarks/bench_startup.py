@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark
+
+Starts fresh interpreters that import the bot and load its extensions (no
+Discord login), and reports the median time per startup phase. Results are
+compared against the recorded baseline in benchmarks/baselines/startup.json
+so that import-time regressions fail the run.
+
+Run with: python -m benchmarks.bench_startup [--update-baseline]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RUNS = 7
+# Fail if a phase is this much slower than the baseline (machines differ)
+TOLERANCE = 1.5
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "startup.json")
+
+# Runs in a child process so every measurement is a cold import
+CHILD = """
+import asyncio, json, time
+from game_coordinator_bot import bot
+from game_coordinator_bot.utils.timezone_utils import preload_transition_tables
+
+async def run():
+    # Open every repository, as bot.main() does, so the cogs find their tables
+    await bot.bot.session_store.open()
+    await bot.bot.user_preferences.open()
+    await bot.bot.availability.open()
+    await bot.bot.recurring_sessions.open()
+    try:
+        with bot.startup.phase('extensions'):
+            await bot.load_extensions()
+    finally:
+        await bot.bot.user_preferences.close()
+        await bot.bot.session_store.close()
+        await bot.bot.reminder_scheduler.stop()
+
+asyncio.run(run())
+started = time.perf_counter()
+preload_transition_tables()
+bot.startup.durations['preload'] = time.perf_counter() - started
+print(json.dumps(bot.startup.report()))
+"""
+
+
+def measure_once(tmp: str) -> dict:
+    """Run one cold start and return its phase timings in ms."""
+    env = dict(
+        os.environ,
+        DATABASE_PATH=os.path.join(tmp, "bench.db"),
+        DISCORD_GUILD_ID="",
+    )
+    env.pop("CLUSTER_IPC_ADDRESS", None)
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--update-baseline", action="store_true", help="Record these timings as the new baseline")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        runs = [measure_once(tmp) for _ in range(RUNS)]
+    medians = {
+        phase: round(statistics.median(run[phase] for run in runs), 1)
+        for phase in runs[0]
+    }
+    
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            baseline = json.load(f)
+    
+    print(f"Cold start, median of {RUNS} runs (no Discord login):")
+    regressions = []
+    for phase, ms in medians.items():
+        recorded = baseline.get(phase)
+        if recorded:
+            ratio = ms / recorded
+            print(f"  {phase:<11} {ms:8.1f} ms   baseline {recorded:8.1f} ms   x{ratio:.2f}")
+            if ratio > TOLERANCE:
+                regressions.append(phase)
+        else:
+            print(f"  {phase:<11} {ms:8.1f} ms")
+    
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(medians, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {BASELINE_PATH}")
+        return 0
+    
+    if regressions:
+        print(f"Regressed more than x{TOLERANCE}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
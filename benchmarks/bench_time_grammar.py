@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Session time parsing benchmark
+
+Compares the tokenizer and grammar behind parse_time_input
+(game_coordinator_bot/utils/time_grammar.py) against the two regexes it
+replaced, with the result cache out of the way so both read every input from
+scratch. Both must give the same datetime for every input the regexes
+accepted. Also times the cached parse_time_input on the wider set of inputs
+the grammar accepts ("tomorrow 9", "fri 8pm", "in 2h", "noon"), and the
+grammar on inputs of growing length to show the cost stays linear.
+
+Run with: python -m benchmarks.bench_time_grammar
+"""
+
+import re
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, List, Optional, Tuple
+
+from game_coordinator_bot.utils.time_grammar import parse_time_spec
+from game_coordinator_bot.utils.timezone_utils import (
+    TimeParser,
+    TransitionTable,
+    get_transition_table,
+    parse_time_input,
+)
+
+
+ITERATIONS = 50000
+REPEAT = 3  # best of
+TIMEZONES = ["US/Eastern", "Europe/London", "Asia/Tokyo", "UTC"]
+# Inputs the previous parser accepted, and some it rejected
+PREVIOUS_INPUTS = [
+    "8pm", "8:30pm", "20:00", "9:15 pm", "21:45", "12am", "12:05pm", "7am", "00:30", "11:59pm",
+    "25:00", "8:75pm", "tomorrow", "nope",
+]
+NEW_INPUTS = [
+    "tomorrow 9", "fri 8pm", "in 2h", "noon", "sat at 8:30 pm", "in 1 hour 30 min",
+    "tonight 10", "8pm tomorrow", "midnight", "on sunday 14:00",
+]
+LENGTHS = [10, 100, 1000]
+
+_EPOCH = datetime(1970, 1, 1)
+TIME_12H_PATTERN = re.compile(r'^(\d{1,2})(?::(\d{2}))?\s*(am|pm)$')
+TIME_24H_PATTERN = re.compile(r'^(\d{1,2}):(\d{2})$')
+
+
+def previous_parse(time_lower: str, table: TransitionTable, today: date, now: float) -> Optional[datetime]:
+    """The regex parser the grammar replaced, without its cache."""
+    match = TIME_12H_PATTERN.match(time_lower)
+    if match:
+        hour = int(match.group(1))
+        minute = int(match.group(2)) if match.group(2) else 0
+        if match.group(3) == 'pm' and hour < 12:
+            hour += 12
+        elif match.group(3) == 'am' and hour == 12:
+            hour = 0
+    else:
+        match = TIME_24H_PATTERN.match(time_lower)
+        if not match:
+            return None
+        hour, minute = int(match.group(1)), int(match.group(2))
+        if hour > 23 or minute > 59:
+            return None
+    try:
+        local = datetime(today.year, today.month, today.day, hour, minute)
+    except ValueError:
+        return None
+    utc_ts = table.to_utc((local - _EPOCH) // timedelta(seconds=1))
+    if utc_ts < now:
+        utc_ts = table.to_utc((local + timedelta(days=1) - _EPOCH) // timedelta(seconds=1))
+    return datetime.fromtimestamp(utc_ts, table.zone)
+
+
+def grammar_parse(time_lower: str, table: TransitionTable, today: date, now: float) -> Optional[datetime]:
+    """The grammar, bypassing both the spec and result caches."""
+    spec = parse_time_spec.__wrapped__(time_lower)
+    if spec is None:
+        return None
+    if spec.delay is not None:
+        return datetime.fromtimestamp(int(now) + spec.delay, table.zone)
+    return TimeParser._compute(spec, table, today, now)
+
+
+def throughput(parse: Callable[[str], object], inputs: List[str], iterations: int = ITERATIONS) -> float:
+    """Parses per second over ``inputs`` in turn, best of ``REPEAT`` runs."""
+    best = float("inf")
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        for i in range(iterations):
+            parse(inputs[i % len(inputs)])
+        best = min(best, time.perf_counter() - started)
+    return iterations / best
+
+
+def contexts() -> List[Tuple[str, TransitionTable, date, float]]:
+    now = time.time()
+    result = []
+    for name in TIMEZONES:
+        table = get_transition_table(name, now)
+        result.append((name, table, table.to_local(now).date(), now))
+    return result
+
+
+def main() -> int:
+    """Run the benchmark."""
+    mismatches = 0
+    for name, table, today, now in contexts():
+        for text in PREVIOUS_INPUTS:
+            expected = previous_parse(text, table, today, now)
+            actual = grammar_parse(text, table, today, now)
+            if expected != actual:
+                mismatches += 1
+                print(f"  mismatch {text!r} in {name}: regex={expected} grammar={actual}")
+    print(f"Checked {len(PREVIOUS_INPUTS)} inputs in {len(TIMEZONES)} zones: {mismatches} mismatches")
+    print()
+    
+    name, table, today, now = contexts()[0]
+    print(f"{'parser':<34} {'parses/s':>10} {'µs/parse':>9}")
+    rows = [
+        ("regexes, uncached", lambda text: previous_parse(text, table, today, now), PREVIOUS_INPUTS),
+        ("grammar, uncached", lambda text: grammar_parse(text, table, today, now), PREVIOUS_INPUTS),
+        ("grammar, uncached, new inputs", lambda text: grammar_parse(text, table, today, now), NEW_INPUTS),
+        ("parse_time_input, all inputs", lambda text: parse_time_input(text, name), PREVIOUS_INPUTS + NEW_INPUTS),
+    ]
+    for label, parse, inputs in rows:
+        rate = throughput(parse, inputs)
+        print(f"{label:<34} {rate:10.0f} {1e6 / rate:9.2f}")
+    print()
+    
+    print(f"{'chars':>6} {'grammar µs':>11} {'µs/char':>8}")
+    for length in LENGTHS:
+        text = ("fri 8:30pm " * length)[:length]
+        rate = throughput(lambda value: grammar_parse(value, table, today, now), [text], ITERATIONS // 10)
+        print(f"{length:6d} {1e6 / rate:11.2f} {1e6 / rate / length:8.3f}")
+    
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Timezone conversion benchmark
+
+Compares local→UTC conversion through the precomputed transition tables in
+``timezone_utils`` against the previous per-call ``pytz.timezone().localize()``
+path, and checks both agree on every wall-clock time around DST boundaries.
+
+Run with: python -m benchmarks.bench_timezones
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+import pytz
+
+from game_coordinator_bot.utils.timezone_utils import (
+    COMMON_TIMEZONES,
+    get_transition_table,
+    preload_transition_tables,
+)
+
+
+YEARS = (2024, 2025, 2026)
+ITERATIONS = 20000
+
+
+def _wall_times(year: int) -> List[datetime]:
+    """Every half hour of the year on the days near the usual DST switches."""
+    days = []
+    for month in (3, 4, 9, 10, 11):
+        for day in range(1, 32):
+            try:
+                days.append(datetime(year, month, day))
+            except ValueError:
+                continue
+    return [day + timedelta(minutes=30 * step) for day in days for step in range(48)]
+
+
+def pytz_localize(tz_name: str, naive: datetime) -> int:
+    """The pre-table conversion path."""
+    return int(pytz.timezone(tz_name).localize(naive).timestamp())
+
+
+def table_localize(tz_name: str, naive: datetime) -> int:
+    """The transition table conversion path."""
+    return int(get_transition_table(tz_name, datetime(naive.year, 6, 1).timestamp()).localize(naive).timestamp())
+
+
+def check_identical() -> int:
+    """Compare both paths; return the number of mismatches."""
+    mismatches = 0
+    checked = 0
+    for year in YEARS:
+        wall_times = _wall_times(year)
+        for tz_name in COMMON_TIMEZONES:
+            for naive in wall_times:
+                expected = pytz_localize(tz_name, naive)
+                actual = table_localize(tz_name, naive)
+                checked += 1
+                if expected != actual:
+                    mismatches += 1
+                    print(f"  mismatch {tz_name} {naive}: pytz={expected} table={actual}")
+    print(f"Checked {checked} wall times across {len(COMMON_TIMEZONES)} zones: {mismatches} mismatches")
+    return mismatches
+
+
+def time_path(label: str, func, samples: List[datetime]) -> float:
+    """Time ``func`` over every zone and sample; return µs per conversion."""
+    zones = list(COMMON_TIMEZONES)
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        func(zones[i % len(zones)], samples[i % len(samples)])
+    elapsed = time.perf_counter() - start
+    per_call = elapsed / ITERATIONS * 1e6
+    print(f"{label:<22} {per_call:8.2f} µs/conversion")
+    return per_call
+
+
+def main() -> int:
+    """Run the benchmark."""
+    start = time.perf_counter()
+    loaded = preload_transition_tables()
+    print(f"Preloaded {loaded} transition tables in {(time.perf_counter() - start) * 1000:.1f} ms")
+    
+    samples = _wall_times(datetime.now().year)
+    pytz_us = time_path("pytz localize", pytz_localize, samples)
+    table_us = time_path("transition table", lambda name, naive: get_transition_table(name).localize(naive), samples)
+    print(f"Speedup: {pytz_us / table_us:.1f}x")
+    
+    return 1 if check_identical() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
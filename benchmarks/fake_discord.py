@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for Discord
+
+Speaks just enough of the gateway websocket protocol (HELLO, IDENTIFY,
+heartbeats, READY, GUILD_CREATE, INTERACTION_CREATE) and of the REST API
+(login, application info, command sync and the interaction callback) for
+the bot to run entirely offline. Point the bot at it with:
+
+    DISCORD_API_URL=http://127.0.0.1:8090/api/v10
+    DISCORD_GATEWAY_URL=ws://127.0.0.1:8090/gateway
+
+Interactions are injected with ``FakeDiscord.send_interactions``; every
+callback the bot posts back is timed against the moment its
+INTERACTION_CREATE was written to the socket (the ack latency). Requests to
+routes that are not implemented get a 404 and are counted in ``unhandled``.
+
+Run standalone with: python -m benchmarks.fake_discord [--port 8090]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import sys
+import time
+import zlib
+from collections import Counter
+from typing import Dict, List, Optional
+
+from aiohttp import WSMsgType, web
+
+logger = logging.getLogger('game_coordinator.fake_discord')
+
+API_PREFIX = "/api/v10"
+HEARTBEAT_INTERVAL = 41250  # ms, what Discord sends
+BOT_USER_ID = 1
+APPLICATION_ID = 2
+GUILD_ID = 100
+CHANNEL_ID = 200
+TIMESTAMP = "2024-01-01T00:00:00+00:00"
+
+# Gateway opcodes
+DISPATCH = 0
+HEARTBEAT = 1
+IDENTIFY = 2
+RESUME = 6
+INVALID_SESSION = 9
+HELLO = 10
+HEARTBEAT_ACK = 11
+
+# Interaction and option types
+APPLICATION_COMMAND = 2
+STRING_OPTION = 3
+EPHEMERAL = 1 << 6
+
+
+def user_payload(user_id: int, bot: bool = False) -> dict:
+    return {
+        "id": str(user_id),
+        "username": f"user{user_id}",
+        "discriminator": "0",
+        "avatar": None,
+        "global_name": None,
+        "bot": bot,
+    }
+
+
+def guild_payload(guild_id: int) -> dict:
+    """A small GUILD_CREATE payload with one text channel."""
+    return {
+        "id": str(guild_id),
+        "name": f"guild-{guild_id}",
+        "icon": None,
+        "owner_id": str(BOT_USER_ID),
+        "roles": [{
+            "id": str(guild_id),
+            "name": "@everyone",
+            "permissions": "0",
+            "position": 0,
+            "color": 0,
+            "hoist": False,
+            "managed": False,
+            "mentionable": False,
+        }],
+        "channels": [{
+            "id": str(CHANNEL_ID),
+            "type": 0,
+            "name": "general",
+            "position": 0,
+            "permission_overwrites": [],
+            "guild_id": str(guild_id),
+        }],
+        "members": [],
+        "voice_states": [],
+        "emojis": [],
+        "stickers": [],
+        "features": [],
+        "member_count": 1,
+        "large": False,
+        "unavailable": False,
+        "joined_at": TIMESTAMP,
+        "premium_tier": 0,
+        "verification_level": 0,
+        "default_message_notifications": 0,
+        "explicit_content_filter": 0,
+        "mfa_level": 0,
+        "nsfw_level": 0,
+        "system_channel_flags": 0,
+        "preferred_locale": "en-US",
+    }
+
+
+def command_interaction(
+    interaction_id: int, user_id: int, name: str, options: Dict[str, str], guild_id: int = GUILD_ID
+) -> dict:
+    """INTERACTION_CREATE payload for a slash command with string options."""
+    return {
+        "id": str(interaction_id),
+        "application_id": str(APPLICATION_ID),
+        "type": APPLICATION_COMMAND,
+        "token": f"token{interaction_id}",
+        "version": 1,
+        "guild_id": str(guild_id),
+        "channel_id": str(CHANNEL_ID),
+        "channel": {"id": str(CHANNEL_ID), "type": 0, "guild_id": str(guild_id), "name": "general", "position": 0, "permission_overwrites": []},
+        "member": {
+            "user": user_payload(user_id),
+            "roles": [],
+            "joined_at": TIMESTAMP,
+            "deaf": False,
+            "mute": False,
+            "flags": 0,
+            "permissions": "2199023255551",
+        },
+        "app_permissions": "2199023255551",
+        "locale": "en-US",
+        "guild_locale": "en-US",
+        "entitlements": [],
+        "authorizing_integration_owners": {"0": str(guild_id)},
+        "context": 0,
+        "attachment_size_limit": 8388608,
+        "data": {
+            "id": "3",
+            "name": name,
+            "type": 1,
+            "options": [
+                {"name": option, "type": STRING_OPTION, "value": value}
+                for option, value in options.items()
+            ],
+        },
+    }
+
+
+def json_response(data: object, status: int = 200) -> web.Response:
+    # discord.py only decodes bodies whose content type is exactly application/json
+    return web.Response(body=json.dumps(data).encode(), status=status, content_type="application/json")
+
+
+class FakeDiscord:
+    """Fake gateway and REST API served by one aiohttp application."""
+    
+    def __init__(self, guilds: int = 1):
+        self.guilds = guilds
+        self.app = web.Application()
+        self.app.add_routes([
+            web.get("/gateway", self._gateway),
+            web.get(API_PREFIX + "/users/@me", self._current_user),
+            web.get(API_PREFIX + "/oauth2/applications/@me", self._application),
+            web.get(API_PREFIX + "/gateway/bot", self._gateway_bot),
+            web.put(API_PREFIX + "/applications/{application_id}/commands", self._sync_commands),
+            web.put(API_PREFIX + "/applications/{application_id}/guilds/{guild_id}/commands", self._sync_commands),
+            web.post(API_PREFIX + "/interactions/{interaction_id}/{token}/callback", self._callback),
+            web.route("*", "/{tail:.*}", self._unhandled),
+        ])
+        self._runner: Optional[web.AppRunner] = None
+        self._socket: Optional[web.WebSocketResponse] = None
+        self._compressor = None
+        self._sequence = 0
+        self._ids = itertools.count(10 ** 15)
+        self._messages = itertools.count(10 ** 16)
+        self.port: Optional[int] = None
+        self.ready = asyncio.Event()
+        self.synced = asyncio.Event()
+        # Interaction ID -> time its INTERACTION_CREATE was sent
+        self.pending: Dict[int, float] = {}
+        self.ack_latencies: List[float] = []
+        self.errors = 0  # Ephemeral replies, i.e. the command rejected its input
+        self.unhandled: Counter = Counter()
+    
+    @property
+    def api_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}{API_PREFIX}"
+    
+    @property
+    def gateway_url(self) -> str:
+        return f"ws://127.0.0.1:{self.port}/gateway"
+    
+    async def start(self, port: int = 0) -> None:
+        """Listen on 127.0.0.1 (port 0 picks a free port)."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+    
+    async def stop(self) -> None:
+        if self._socket is not None:
+            await self._socket.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+    
+    async def send_interactions(self, payloads: List[dict]) -> None:
+        """Write INTERACTION_CREATE events to the connected bot."""
+        if self._socket is None:
+            raise RuntimeError("No bot is connected")
+        now = time.perf_counter()
+        for payload in payloads:
+            self.pending[int(payload["id"])] = now
+            await self._dispatch("INTERACTION_CREATE", payload)
+    
+    def play_interaction(self, user_id: int, guild_id: int = GUILD_ID, **options: str) -> dict:
+        """A /play interaction from user_id in guild_id with the given options."""
+        return command_interaction(next(self._ids), user_id, "play", options, guild_id)
+    
+    async def _send(self, payload: dict) -> None:
+        data = json.dumps(payload, separators=(",", ":")).encode()
+        if self._compressor is not None:
+            await self._socket.send_bytes(self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH))
+        else:
+            await self._socket.send_str(data.decode())
+    
+    async def _dispatch(self, event: str, data: dict) -> None:
+        self._sequence += 1
+        await self._send({"op": DISPATCH, "t": event, "s": self._sequence, "d": data})
+    
+    async def _gateway(self, request: web.Request) -> web.WebSocketResponse:
+        socket = web.WebSocketResponse(max_msg_size=0)
+        await socket.prepare(request)
+        self._socket = socket
+        self._sequence = 0
+        self._compressor = zlib.compressobj() if request.query.get("compress") == "zlib-stream" else None
+        await self._send({"op": HELLO, "d": {"heartbeat_interval": HEARTBEAT_INTERVAL}})
+        
+        async for message in socket:
+            if message.type != WSMsgType.TEXT:
+                break
+            payload = json.loads(message.data)
+            op = payload["op"]
+            if op == HEARTBEAT:
+                await self._send({"op": HEARTBEAT_ACK})
+            elif op == IDENTIFY:
+                await self._identify()
+            elif op == RESUME:
+                # Sessions are not kept; make the bot identify again
+                await self._send({"op": INVALID_SESSION, "d": False})
+        
+        self._socket = None
+        self.ready.clear()
+        return socket
+    
+    async def _identify(self) -> None:
+        guild_ids = [GUILD_ID + i for i in range(self.guilds)]
+        await self._dispatch("READY", {
+            "v": 10,
+            "user": user_payload(BOT_USER_ID, bot=True),
+            "guilds": [{"id": str(guild_id), "unavailable": True} for guild_id in guild_ids],
+            "session_id": "fake-session",
+            "resume_gateway_url": self.gateway_url,
+            "shard": [0, 1],
+            "application": {"id": str(APPLICATION_ID), "flags": 0},
+        })
+        for guild_id in guild_ids:
+            await self._dispatch("GUILD_CREATE", guild_payload(guild_id))
+        self.ready.set()
+    
+    async def _current_user(self, request: web.Request) -> web.Response:
+        return json_response(user_payload(BOT_USER_ID, bot=True))
+    
+    async def _application(self, request: web.Request) -> web.Response:
+        return json_response({
+            "id": str(APPLICATION_ID),
+            "name": "Game Coordinator",
+            "description": "",
+            "icon": None,
+            "bot_public": False,
+            "bot_require_code_grant": False,
+            "owner": user_payload(BOT_USER_ID + 10),
+            "verify_key": "0" * 64,
+            "flags": 0,
+        })
+    
+    async def _gateway_bot(self, request: web.Request) -> web.Response:
+        return json_response({
+            "url": self.gateway_url,
+            "shards": 1,
+            "session_start_limit": {"total": 1000, "remaining": 1000, "reset_after": 0, "max_concurrency": 1},
+        })
+    
+    async def _sync_commands(self, request: web.Request) -> web.Response:
+        commands = await request.json()
+        for command_id, command in enumerate(commands, start=3):
+            command.update(id=str(command_id), application_id=str(APPLICATION_ID), version="1")
+            if "guild_id" in request.match_info:
+                command["guild_id"] = request.match_info["guild_id"]
+        self.synced.set()
+        return json_response(commands)
+    
+    async def _callback(self, request: web.Request) -> web.Response:
+        interaction_id = int(request.match_info["interaction_id"])
+        sent_at = self.pending.pop(interaction_id, None)
+        if sent_at is not None:
+            self.ack_latencies.append(time.perf_counter() - sent_at)
+        body = await request.json()
+        data = body.get("data") or {}
+        ephemeral = bool(data.get("flags", 0) & EPHEMERAL)
+        if ephemeral:
+            self.errors += 1
+        
+        message_id = next(self._messages)
+        return json_response({
+            "interaction": {
+                "id": str(interaction_id),
+                "type": APPLICATION_COMMAND,
+                "response_message_id": str(message_id),
+                "response_message_loading": False,
+                "response_message_ephemeral": ephemeral,
+            },
+        })
+    
+    async def _unhandled(self, request: web.Request) -> web.Response:
+        route = f"{request.method} {request.path}"
+        if not self.unhandled[route]:
+            logger.warning(f"Unhandled route {route}")
+        self.unhandled[route] += 1
+        return json_response({"message": "Unknown route", "code": 0}, status=404)
+
+
+async def serve(port: int, guilds: int) -> None:
+    server = FakeDiscord(guilds)
+    await server.start(port)
+    print(f"DISCORD_API_URL={server.api_url}")
+    print(f"DISCORD_GATEWAY_URL={server.gateway_url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main() -> int:
+    """Run the stand-in until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=8090, help="Port to listen on")
+    parser.add_argument("--guilds", type=int, default=1, help="Guilds the bot is in")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.port, args.guilds))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
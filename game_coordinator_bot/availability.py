@@ -0,0 +1,263 @@
+"""
+Availability overlap engine for the Game Coordinator Bot.
+
+Members register weekly windows in their own timezone. Over a stretch of
+whole UTC weeks every member becomes one bitmap with a bit per 15-minute
+slot (a Python int), so DST is applied once per week rather than per slot,
+and "free for the whole session" is a few shifts and ANDs per member.
+
+The members' bitmaps are then summed bit-parallel into a handful of counter
+bitmaps (bit ``s`` of counter ``i`` is bit ``i`` of the number of members
+free at slot ``s``), and the best slot is found by walking the counters from
+the most significant down. Scoring a thousand members over a week costs a
+few thousand big-integer operations instead of a loop over every member and
+every slot, and needs no extra dependencies.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from game_coordinator_bot.utils.timezone_utils import TransitionTable, get_transition_table
+
+
+SLOT_MINUTES = 15
+SLOT_SECONDS = SLOT_MINUTES * 60
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+SLOTS_PER_WEEK = 7 * SLOTS_PER_DAY
+
+_DAY_SECONDS = 86400
+_WEEK_SECONDS = 7 * _DAY_SECONDS
+# The epoch was a Thursday; weeks start on Monday 00:00
+_FIRST_MONDAY = 4 * _DAY_SECONDS
+
+WEEKDAY_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+# (weekday, start minute, end minute) in local time
+Window = Tuple[int, int, int]
+
+
+@dataclass(frozen=True)
+class SlotSuggestion:
+    """A start time and the members free for the whole session."""
+    start: int  # Unix timestamp
+    end: int
+    user_ids: Tuple[int, ...]
+
+
+def format_minute(minute: int) -> str:
+    """Format minutes after midnight as "7:30pm"."""
+    hour, minute = divmod(minute % (24 * 60), 60)
+    suffix = "am" if hour < 12 else "pm"
+    hour = hour % 12 or 12
+    return f"{hour}:{minute:02d}{suffix}" if minute else f"{hour}{suffix}"
+
+
+def week_start(utc_ts: float) -> int:
+    """Monday 00:00 UTC of the week containing a timestamp."""
+    ts = int(utc_ts)
+    return ts - (ts - _FIRST_MONDAY) % _WEEK_SECONDS
+
+
+def _slot_span(start_minute: int, end_minute: int) -> Tuple[int, int]:
+    """First and one-past-last slot of a window, relative to its local midnight."""
+    if end_minute <= start_minute:
+        end_minute += 24 * 60
+    return start_minute // SLOT_MINUTES, -(-end_minute // SLOT_MINUTES)
+
+
+@lru_cache(maxsize=4096)
+def local_week_mask(windows: Tuple[Window, ...]) -> int:
+    """
+    Bitmap of windows over one local week, bit 0 being Monday 00:00 wall time.
+    
+    Windows past Sunday midnight spill over the week's end; the caller
+    shifts each week into place, so the spill lands on the next Monday.
+    """
+    mask = 0
+    for weekday, start_minute, end_minute in windows:
+        first, last = _slot_span(start_minute, end_minute)
+        first += weekday * SLOTS_PER_DAY
+        last += weekday * SLOTS_PER_DAY
+        mask |= ((1 << (last - first)) - 1) << first
+    return mask
+
+
+def user_bitmap(windows: Sequence[Window], timezone: str, start: int, weeks: int) -> int:
+    """
+    Bitmap of a member's windows over ``weeks`` weeks of UTC slots.
+    
+    Args:
+        windows: (weekday, start minute, end minute) in local time
+        timezone: IANA timezone the windows are in
+        start: Monday 00:00 UTC the bitmap starts at (see ``week_start``)
+        weeks: Number of weeks covered
+    
+    Returns:
+        Bitmap with bit ``s`` set when the member is free in slot ``s``
+    
+    Raises:
+        ValueError: If the timezone is unknown
+    """
+    table = get_transition_table(timezone, start)
+    if table is None:
+        raise ValueError(f"Unknown timezone {timezone!r}")
+    windows = tuple(sorted(windows))
+    mask = local_week_mask(windows)
+    bitmap = 0
+    # Local weeks that can reach into the range, whatever the zone's offset
+    first_week = start - _WEEK_SECONDS
+    for week in range(weeks + 2):
+        local_start = first_week + week * _WEEK_SECONDS
+        local_end = local_start + _WEEK_SECONDS + _DAY_SECONDS
+        utc_start = table.to_utc(local_start)
+        offset = local_start - utc_start
+        if local_end - table.to_utc(local_end) == offset:
+            # Offset changes are at least a week apart, so none falls in between
+            shift = (utc_start - start) // SLOT_SECONDS
+            bitmap |= mask << shift if shift >= 0 else mask >> -shift
+        else:
+            bitmap |= _exact_week(windows, table, local_start, start)
+    return bitmap & ((1 << (weeks * SLOTS_PER_WEEK)) - 1)
+
+
+def _exact_week(windows: Sequence[Window], table: TransitionTable, local_week: int, start: int) -> int:
+    """Bitmap of one local week that contains a DST change, window by window."""
+    bitmap = 0
+    for weekday, start_minute, end_minute in windows:
+        first, last = _slot_span(start_minute, end_minute)
+        day = local_week + weekday * _DAY_SECONDS
+        first = (table.to_utc(day + first * SLOT_SECONDS) - start) // SLOT_SECONDS
+        last = -(-(table.to_utc(day + last * SLOT_SECONDS) - start) // SLOT_SECONDS)
+        if last <= 0:
+            continue
+        first = max(first, 0)
+        bitmap |= ((1 << (last - first)) - 1) << first
+    return bitmap
+
+
+def run_starts(bitmap: int, length: int) -> int:
+    """Bits ``s`` of ``bitmap`` followed by at least ``length`` set bits (``s`` included)."""
+    run, covered = bitmap, 1
+    while covered < length:
+        step = min(covered, length - covered)
+        run &= run >> step
+        covered += step
+    return run
+
+
+def count_bits(bitmaps: Iterable[int]) -> List[int]:
+    """
+    Add bitmaps bit-parallel.
+    
+    Returns:
+        Counters, least significant first: bit ``s`` of ``counters[i]`` is
+        bit ``i`` of the number of bitmaps with bit ``s`` set
+    """
+    counters: List[int] = []
+    for carry in bitmaps:
+        level = 0
+        while carry:
+            if level == len(counters):
+                counters.append(carry)
+                break
+            counters[level], carry = counters[level] ^ carry, counters[level] & carry
+            level += 1
+    return counters
+
+
+class SlotMatrix:
+    """Members' availability over consecutive weeks of 15-minute UTC slots."""
+    
+    def __init__(self, start_ts: float, weeks: int = 1):
+        """
+        Args:
+            start_ts: Any time in the first week covered
+            weeks: Number of weeks covered
+        """
+        self.start = week_start(start_ts)
+        self.weeks = weeks
+        self.slots = weeks * SLOTS_PER_WEEK
+        self._index: Dict[int, int] = {}
+        self.user_ids: List[int] = []
+        self.bitmaps: List[int] = []
+    
+    def __len__(self) -> int:
+        return len(self.user_ids)
+    
+    def add(self, user_id: int, windows: Sequence[Window], timezone: str) -> None:
+        """
+        Add a member's windows in one timezone; windows in other timezones can be added too.
+        
+        Raises:
+            ValueError: If the timezone is unknown
+        """
+        bitmap = user_bitmap(windows, timezone, self.start, self.weeks)
+        index = self._index.get(user_id)
+        if index is None:
+            self._index[user_id] = len(self.user_ids)
+            self.user_ids.append(user_id)
+            self.bitmaps.append(bitmap)
+        else:
+            self.bitmaps[index] |= bitmap
+    
+    def slot_time(self, slot: int) -> int:
+        """Unix timestamp at which a slot starts."""
+        return self.start + slot * SLOT_SECONDS
+    
+    def best_slots(
+        self,
+        duration_minutes: int,
+        top: int = 3,
+        not_before: Optional[float] = None,
+        not_after: Optional[float] = None,
+        min_users: int = 1
+    ) -> List[SlotSuggestion]:
+        """
+        Start times at which the most members are free for the whole session.
+        
+        Suggestions do not overlap; ties go to the earliest start.
+        
+        Args:
+            duration_minutes: Session length
+            top: Maximum number of suggestions
+            not_before: Earliest start (Unix timestamp)
+            not_after: Latest start (Unix timestamp)
+            min_users: Fewest free members worth suggesting
+        
+        Returns:
+            Suggestions, best first
+        """
+        length = max(1, -(-duration_minutes // SLOT_MINUTES))
+        runs = [run_starts(bitmap, length) for bitmap in self.bitmaps]
+        counters = count_bits(runs)
+        
+        alive = (1 << self.slots) - 1
+        if not_before is not None:
+            first = max(0, -(-(int(not_before) - self.start) // SLOT_SECONDS))
+            alive &= ~((1 << first) - 1)
+        if not_after is not None:
+            last = (int(not_after) - self.start) // SLOT_SECONDS
+            alive &= (1 << max(0, last + 1)) - 1
+        
+        suggestions: List[SlotSuggestion] = []
+        while alive and len(suggestions) < top:
+            # Narrow to the slots with the highest count, one counter bit at a time
+            best, count = alive, 0
+            for level in range(len(counters) - 1, -1, -1):
+                hit = best & counters[level]
+                if hit:
+                    best = hit
+                    count |= 1 << level
+            if count < max(min_users, 1):
+                break
+            
+            slot = (best & -best).bit_length() - 1
+            user_ids = tuple(user_id for user_id, run in zip(self.user_ids, runs) if run >> slot & 1)
+            start = self.slot_time(slot)
+            suggestions.append(SlotSuggestion(start, start + duration_minutes * 60, user_ids))
+            
+            # Later suggestions must not overlap this one
+            low = max(0, slot - length + 1)
+            alive &= ~(((1 << (slot + length - low)) - 1) << low)
+        return suggestions
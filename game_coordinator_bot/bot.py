@@ -5,49 +5,182 @@ A Discord bot for coordinating gaming sessions with friends.
 Supports slash commands for selecting games, times, platforms, and modes.
 """
 
+import argparse
+import asyncio
 import os
 import logging
+
+from game_coordinator_bot.utils.startup_profiler import StartupProfiler
+
+# Started before the heavy imports so the report covers them
+startup = StartupProfiler()
+startup.begin('import')
+
 from dotenv import load_dotenv
 import discord
 from discord.ext import commands
 
+from game_coordinator_bot.dispatcher import OutboundDispatcher
+from game_coordinator_bot.duplicates import DuplicateIndex
+from game_coordinator_bot.metrics import InstrumentedCommandTree, Metrics, MetricsServer
+from game_coordinator_bot.recurrence import OccurrenceIndex
+from game_coordinator_bot.scheduler import ReminderScheduler
+from game_coordinator_bot.storage.availability import AvailabilityRepository
+from game_coordinator_bot.storage.database import Database
+from game_coordinator_bot.storage.preferences import UserPreferences
+from game_coordinator_bot.storage.recurring import RecurringSessionRepository
+from game_coordinator_bot.storage.sessions import SessionRepository
+from game_coordinator_bot.utils.autocomplete import timezone_index
+from game_coordinator_bot.utils.catalog_watcher import CatalogWatcher
+from game_coordinator_bot.utils.command_sync import CommandSyncState, sync_if_changed
+from game_coordinator_bot.utils.config import (
+    DEFAULT_CATALOG_PATH,
+    add_config_listener,
+    load_catalog,
+    set_catalog,
+)
+from game_coordinator_bot.utils.gateway_profile import gateway_options, use_endpoints
+from game_coordinator_bot.utils.log_pipeline import configure_logging
+from game_coordinator_bot.utils.timezone_utils import preload_transition_tables
+from game_coordinator_bot.watchdog import LoopWatchdog
+
+startup.end('import')
+
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# Log through a background writer thread; LOG_FORMAT=text for the classic format
+configure_logging(
+    level=logging.getLevelName(os.getenv('LOG_LEVEL', 'INFO').upper()),
+    log_format=os.getenv('LOG_FORMAT', 'json').lower(),
 )
 logger = logging.getLogger('game_coordinator')
 
 # Bot configuration
 TOKEN = os.getenv('DISCORD_BOT_TOKEN')
 GUILD_ID = os.getenv('DISCORD_GUILD_ID')
+DATABASE_PATH = os.getenv('DATABASE_PATH', 'data/game_coordinator.db')
+COMMAND_SYNC_STATE_PATH = os.getenv('COMMAND_SYNC_STATE_PATH', 'data/command_sync.json')
+PRELOAD_ALL_TIMEZONES = os.getenv('PRELOAD_ALL_TIMEZONES', '').lower() in ('1', 'true', 'yes')
+GATEWAY_PROFILE = os.getenv('GATEWAY_PROFILE', 'standard').lower()
+GAME_CATALOG_PATH = os.getenv('GAME_CATALOG_PATH') or DEFAULT_CATALOG_PATH
+# Local stand-in for Discord (load testing only; see benchmarks/fake_discord.py)
+DISCORD_API_URL = os.getenv('DISCORD_API_URL')
+DISCORD_GATEWAY_URL = os.getenv('DISCORD_GATEWAY_URL')
+# Seconds a command handler has to answer before its interaction is deferred
+INTERACTION_DEFER_BUDGET = float(os.getenv('INTERACTION_DEFER_BUDGET', '2.0'))
+# Prometheus endpoint; empty METRICS_PORT disables it (cluster workers add their ID)
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+METRICS_PORT = os.getenv('METRICS_PORT', '9108')
+
+# Cluster mode: set by game_coordinator_bot.cluster for each worker process
+CLUSTER_ID = int(os.getenv('CLUSTER_ID', '0'))
+SHARD_IDS = os.getenv('SHARD_IDS')
+SHARD_COUNT = os.getenv('SHARD_COUNT')
 
-# Initialize bot with intents
-intents = discord.Intents.default()
-intents.message_content = True
-intents.guilds = True
+use_endpoints(DISCORD_API_URL, DISCORD_GATEWAY_URL)
 
-bot = commands.Bot(command_prefix='!', intents=intents)
+# Initialize bot with the intents and caches of the gateway profile
+client_options = gateway_options(GATEWAY_PROFILE)
+metrics = Metrics()
+dispatcher = OutboundDispatcher(metrics=metrics, defer_budget=INTERACTION_DEFER_BUDGET)
+# The dispatcher's buckets follow the rate limit headers of every response
+client_options['http_trace'] = dispatcher.trace_config()
+
+if SHARD_IDS and SHARD_COUNT:
+    bot = commands.AutoShardedBot(
+        command_prefix='!',
+        shard_ids=[int(shard_id) for shard_id in SHARD_IDS.split(',')],
+        shard_count=int(SHARD_COUNT),
+        tree_cls=InstrumentedCommandTree,
+        **client_options,
+    )
+else:
+    bot = commands.Bot(command_prefix='!', tree_cls=InstrumentedCommandTree, **client_options)
+bot.cluster = None
+if os.getenv('CLUSTER_IPC_ADDRESS'):
+    # Only cluster workers need the IPC client (and multiprocessing)
+    from game_coordinator_bot.cluster import ClusterClient
+    bot.cluster = ClusterClient.from_env()
+database = Database(DATABASE_PATH)
+bot.session_store = SessionRepository(database)
+bot.user_preferences = UserPreferences(database)
+bot.availability = AvailabilityRepository(database)
+bot.recurring_sessions = RecurringSessionRepository(database)
+bot.recurring_index = OccurrenceIndex()
+bot.reminder_scheduler = ReminderScheduler()
+bot.duplicate_index = DuplicateIndex()
+bot.metrics = metrics
+bot.dispatcher = dispatcher
+bot.loop_watchdog = LoopWatchdog()
+
+# Read only when /metrics is scraped
+bot.metrics.add_gauge('gateway_latency_seconds', 'Gateway heartbeat latency.', lambda: bot.latency)
+bot.metrics.add_gauge('guilds', 'Guilds served by this process.', lambda: len(bot.guilds))
+bot.metrics.add_gauge(
+    'dispatcher_queue_depth',
+    'Outbound requests waiting, by priority.',
+    lambda: bot.dispatcher.metrics()['depth'],
+    label='priority',
+)
+bot.metrics.add_gauge('dispatcher_in_flight', 'Outbound requests being sent.', lambda: bot.dispatcher.metrics()['in_flight'])
+bot.metrics.add_gauge('reminders_scheduled', 'Reminders waiting to fire.', lambda: len(bot.reminder_scheduler))
+bot.metrics.add_gauge('recurring_sessions', 'Recurring sessions with upcoming occurrences.', lambda: len(bot.recurring_index))
+bot.metrics.add_gauge('duplicate_index_sessions', 'Upcoming sessions checked for duplicates by /play.', lambda: len(bot.duplicate_index))
+bot.metrics.add_gauge('event_loop_lag_seconds', 'Most recent event loop lag.', lambda: bot.loop_watchdog.lag)
+bot.metrics.add_gauge('event_loop_stalls', 'Times the event loop was blocked past the stall threshold.', lambda: bot.loop_watchdog.stalls)
+
+# Set from --force-sync; cleared after the first sync of this process
+force_sync = False
+commands_synced = False
 
 
 @bot.event
 async def on_ready():
     """Event handler for when the bot is ready."""
+    startup.end('ready')
+    startup.log_report()
+    bot.metrics.count_event('ready')
+    
     logger.info(f'{bot.user} has connected to Discord!')
     logger.info(f'Bot is in {len(bot.guilds)} guilds')
     
-    # Sync slash commands
+    if bot.cluster is not None:
+        try:
+            counts = await bot.cluster.query('guild_count')
+            logger.info(f'Cluster {CLUSTER_ID} (shards {SHARD_IDS}): {sum(counts)} guilds across {len(counts)} workers')
+        except (asyncio.TimeoutError, ConnectionError) as e:
+            logger.warning(f'Failed to query cluster guild count: {e}')
+        
+        # Commands are global, so only one worker needs to sync them
+        if CLUSTER_ID != 0:
+            return
+    
+    # Sync slash commands once per process, and only if they changed
+    if not commands_synced:
+        await sync_commands()
+
+
+async def sync_commands():
+    """Sync slash commands with Discord if they changed since the last sync."""
+    global commands_synced, force_sync
     try:
-        if GUILD_ID:
-            guild = discord.Object(id=int(GUILD_ID))
-            await bot.tree.sync(guild=guild)
-            logger.info(f'Synced commands to guild {GUILD_ID}')
+        guild = discord.Object(id=int(GUILD_ID)) if GUILD_ID else None
+        scope = f'{bot.application_id}:{GUILD_ID or "global"}'
+        synced = await sync_if_changed(
+            bot.tree,
+            CommandSyncState(COMMAND_SYNC_STATE_PATH),
+            scope,
+            guild=guild,
+            force=force_sync,
+        )
+        commands_synced = True
+        force_sync = False
+        target = f'guild {GUILD_ID}' if GUILD_ID else 'global scope'
+        if synced:
+            logger.info(f'Synced commands to {target}')
         else:
-            await bot.tree.sync()
-            logger.info('Synced commands globally')
+            logger.info(f'Commands unchanged for {target}; skipped sync')
     except Exception as e:
         logger.error(f'Failed to sync commands: {e}')
 
@@ -56,6 +189,14 @@ async def load_extensions():
     """Load all cogs/extensions."""
     await bot.load_extension('game_coordinator_bot.cogs.game_commands')
     logger.info('Loaded game_commands cog')
+    await bot.load_extension('game_coordinator_bot.cogs.session_commands')
+    logger.info('Loaded session_commands cog')
+    await bot.load_extension('game_coordinator_bot.cogs.reminders')
+    logger.info('Loaded reminders cog')
+    await bot.load_extension('game_coordinator_bot.cogs.rsvp')
+    logger.info('Loaded rsvp cog')
+    await bot.load_extension('game_coordinator_bot.cogs.availability_commands')
+    logger.info('Loaded availability_commands cog')
     
     # If guild-specific, copy commands to that guild
     if GUILD_ID:
@@ -64,17 +205,90 @@ async def load_extensions():
         logger.info(f'Copied commands to guild {GUILD_ID}')
 
 
-async def main():
-    """Main function to run the bot."""
+def on_catalog_change():
+    """Count catalog reloads; autocomplete reads the new catalog, so nothing needs re-syncing."""
+    bot.metrics.count_event('catalog_reload')
+
+
+async def guild_count() -> int:
+    """Number of guilds served by this process (cluster query handler)."""
+    return len(bot.guilds)
+
+
+async def preload_timezones():
+    """Build timezone transition tables and the autocomplete index in a worker thread."""
+    loaded = await asyncio.to_thread(preload_transition_tables, all_zones=PRELOAD_ALL_TIMEZONES)
+    logger.info(f'Preloaded {loaded} timezone transition tables')
+    index = await asyncio.to_thread(timezone_index)
+    logger.info(f'Built timezone autocomplete index ({len(index)} zones)')
+
+
+async def main(force: bool = False):
+    """
+    Main function to run the bot.
+    
+    Args:
+        force: Sync the command tree even if it has not changed
+    """
+    global force_sync
+    force_sync = force
+    
     if not TOKEN:
         logger.error('DISCORD_BOT_TOKEN not found in environment variables')
         return
     
+    # Tables are built on demand anyway, so preload alongside login instead of before it
+    preload = asyncio.create_task(preload_timezones())
+    
+    if GAME_CATALOG_PATH != DEFAULT_CATALOG_PATH:
+        set_catalog(load_catalog(GAME_CATALOG_PATH))
+        logger.info(f'Loaded game catalog from {GAME_CATALOG_PATH}')
+    catalog_watcher = CatalogWatcher(GAME_CATALOG_PATH)
+    metrics_server = None
+    if METRICS_PORT:
+        metrics_server = MetricsServer(bot.metrics, METRICS_HOST, int(METRICS_PORT) + CLUSTER_ID)
+    
     async with bot:
-        await load_extensions()
-        await bot.start(TOKEN)
+        if bot.cluster is not None:
+            bot.cluster.register('guild_count', guild_count)
+            await bot.cluster.connect()
+        bot.loop_watchdog.start()
+        bot.dispatcher.start()
+        await bot.session_store.open()
+        await bot.user_preferences.open()
+        await bot.availability.open()
+        await bot.recurring_sessions.open()
+        try:
+            if metrics_server is not None:
+                await metrics_server.start()
+            with startup.phase('extensions'):
+                await load_extensions()
+            add_config_listener(on_catalog_change)
+            catalog_watcher.start()
+            with startup.phase('login'):
+                await bot.login(TOKEN)
+            startup.begin('ready')
+            await bot.connect()
+        finally:
+            preload.cancel()
+            await catalog_watcher.stop()
+            if metrics_server is not None:
+                await metrics_server.stop()
+            # See Database for the order
+            await bot.user_preferences.close()
+            await bot.session_store.close()
+            await bot.dispatcher.stop()
+            await bot.loop_watchdog.stop()
+            if bot.cluster is not None:
+                await bot.cluster.close()
 
 
 if __name__ == '__main__':
-    import asyncio
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description='Run the Game Coordinator Bot')
+    parser.add_argument(
+        '--force-sync',
+        action='store_true',
+        help='Sync slash commands with Discord even if they have not changed'
+    )
+    args = parser.parse_args()
+    asyncio.run(main(force=args.force_sync))
@@ -0,0 +1,397 @@
+"""
+Cluster mode for the Game Coordinator Bot.
+
+Opt-in launcher that spreads the bot's gateway shards across several worker
+processes so one deployment can use every core of the host. The supervisor
+assigns each worker a contiguous shard range, restarts workers that crash,
+and relays cross-shard queries (such as total guild count) between workers
+over a local IPC socket.
+
+Run with: python -m game_coordinator_bot.cluster
+"""
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import secrets
+import signal
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import aiohttp
+from dotenv import load_dotenv
+
+from game_coordinator_bot.utils.log_pipeline import configure_logging
+from game_coordinator_bot.watchdog import LoopWatchdog
+
+logger = logging.getLogger('game_coordinator.cluster')
+
+
+# Environment used to hand a worker its shard assignment
+ENV_CLUSTER_ID = 'CLUSTER_ID'
+ENV_SHARD_IDS = 'SHARD_IDS'
+ENV_SHARD_COUNT = 'SHARD_COUNT'
+ENV_IPC_ADDRESS = 'CLUSTER_IPC_ADDRESS'
+ENV_IPC_SECRET = 'CLUSTER_IPC_SECRET'
+
+# Restart backoff for crashing workers
+RESTART_DELAY = 5.0
+MAX_RESTART_DELAY = 60.0
+# A worker that stays up this long resets its backoff
+STABLE_UPTIME = 300.0
+
+# How long a cross-shard query waits for every worker to answer
+QUERY_TIMEOUT = 5.0
+
+GATEWAY_BOT_URL = 'https://discord.com/api/v10/gateway/bot'
+
+
+def shard_ranges(shard_count: int, workers: int) -> List[List[int]]:
+    """
+    Split shards into contiguous ranges, one per worker.
+    
+    Args:
+        shard_count: Total number of shards
+        workers: Number of worker processes
+    
+    Returns:
+        List of shard ID lists; workers beyond the shard count are dropped
+    """
+    workers = max(1, min(workers, shard_count))
+    base, extra = divmod(shard_count, workers)
+    ranges, start = [], 0
+    for worker in range(workers):
+        size = base + (1 if worker < extra else 0)
+        ranges.append(list(range(start, start + size)))
+        start += size
+    return ranges
+
+
+def shard_for_guild(guild_id: int, shard_count: int) -> int:
+    """Shard that receives events for a guild (Discord's sharding formula)."""
+    return (guild_id >> 22) % shard_count
+
+
+def owns_guild(bot, guild_id: Optional[int]) -> bool:
+    """
+    Whether this process's shards serve a guild.
+    
+    Always True outside cluster mode.
+    
+    Args:
+        bot: The running bot
+        guild_id: Guild ID, or None for DMs
+    
+    Returns:
+        True if events for the guild arrive in this process
+    """
+    shard_ids = getattr(bot, 'shard_ids', None)
+    shard_count = getattr(bot, 'shard_count', None)
+    if not shard_ids or not shard_count:
+        return True
+    if guild_id is None:
+        return 0 in shard_ids
+    return shard_for_guild(guild_id, shard_count) in shard_ids
+
+
+async def fetch_recommended_shards(token: str) -> int:
+    """
+    Ask Discord how many shards the bot should run.
+    
+    Args:
+        token: Bot token
+    
+    Returns:
+        Recommended shard count
+    """
+    async with aiohttp.ClientSession() as session:
+        async with session.get(GATEWAY_BOT_URL, headers={'Authorization': f'Bot {token}'}) as response:
+            response.raise_for_status()
+            data = await response.json()
+    return int(data['shards'])
+
+
+async def _send(writer: asyncio.StreamWriter, message: Dict[str, Any]) -> None:
+    writer.write(json.dumps(message).encode() + b'\n')
+    await writer.drain()
+
+
+class ClusterHub:
+    """Supervisor side of the IPC channel; fans queries out to every worker."""
+    
+    def __init__(self, secret: str):
+        self.secret = secret
+        self.address: Optional[str] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._workers: Dict[int, asyncio.StreamWriter] = {}
+        self._pending: Dict[str, Dict[str, Any]] = {}
+    
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """Listen for workers; returns the "host:port" address to hand them."""
+        self._server = await asyncio.start_server(self._handle, host, port)
+        sock_host, sock_port = self._server.sockets[0].getsockname()[:2]
+        self.address = f'{sock_host}:{sock_port}'
+        return self.address
+    
+    async def stop(self) -> None:
+        """Stop listening and drop worker connections."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for writer in self._workers.values():
+            writer.close()
+        self._workers.clear()
+    
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        cluster_id: Optional[int] = None
+        try:
+            hello = json.loads(await reader.readline() or b'{}')
+            if hello.get('op') != 'hello' or not secrets.compare_digest(str(hello.get('secret')), self.secret):
+                return
+            cluster_id = int(hello['cluster_id'])
+            self._workers[cluster_id] = writer
+            
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                message = json.loads(line)
+                if message['op'] == 'query':
+                    asyncio.create_task(self._broadcast(writer, message))
+                elif message['op'] == 'result':
+                    pending = self._pending.get(message['id'])
+                    if pending is not None:
+                        pending['values'][message['cluster_id']] = message['value']
+                        if len(pending['values']) >= pending['expected']:
+                            pending['done'].set()
+        except (ConnectionError, json.JSONDecodeError, KeyError, ValueError) as e:
+            logger.warning(f'IPC connection from cluster {cluster_id} failed: {e}')
+        finally:
+            if cluster_id is not None and self._workers.get(cluster_id) is writer:
+                del self._workers[cluster_id]
+            writer.close()
+    
+    async def _broadcast(self, requester: asyncio.StreamWriter, message: Dict[str, Any]) -> None:
+        query_id = message['id']
+        workers = dict(self._workers)
+        pending = {'values': {}, 'expected': len(workers), 'done': asyncio.Event()}
+        self._pending[query_id] = pending
+        try:
+            for writer in workers.values():
+                await _send(writer, {'op': 'collect', 'id': query_id, 'name': message['name']})
+            try:
+                await asyncio.wait_for(pending['done'].wait(), QUERY_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning(f"Query {message['name']} timed out with {len(pending['values'])}/{len(workers)} answers")
+            await _send(requester, {
+                'op': 'reply',
+                'id': query_id,
+                'values': [pending['values'][cluster_id] for cluster_id in sorted(pending['values'])],
+            })
+        except ConnectionError:
+            pass
+        finally:
+            del self._pending[query_id]
+
+
+class ClusterClient:
+    """Worker side of the IPC channel."""
+    
+    def __init__(self, cluster_id: int, address: str, secret: str):
+        self.cluster_id = cluster_id
+        self.address = address
+        self.secret = secret
+        self._handlers: Dict[str, Callable[[], Awaitable[Any]]] = {}
+        self._replies: Dict[str, 'asyncio.Future[List[Any]]'] = {}
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    @classmethod
+    def from_env(cls) -> Optional['ClusterClient']:
+        """Build a client from the supervisor's environment, or None outside cluster mode."""
+        address = os.getenv(ENV_IPC_ADDRESS)
+        if not address:
+            return None
+        return cls(int(os.getenv(ENV_CLUSTER_ID, '0')), address, os.getenv(ENV_IPC_SECRET, ''))
+    
+    def register(self, name: str, handler: Callable[[], Awaitable[Any]]) -> None:
+        """
+        Answer a cross-shard query with a local value.
+        
+        Args:
+            name: Query name (e.g., "guild_count")
+            handler: Coroutine function returning this worker's JSON-serializable value
+        """
+        self._handlers[name] = handler
+    
+    async def connect(self) -> None:
+        """Connect to the supervisor and start serving queries."""
+        host, port = self.address.rsplit(':', 1)
+        reader, self._writer = await asyncio.open_connection(host, int(port))
+        await _send(self._writer, {'op': 'hello', 'cluster_id': self.cluster_id, 'secret': self.secret})
+        self._task = asyncio.create_task(self._listen(reader))
+    
+    async def close(self) -> None:
+        """Disconnect from the supervisor."""
+        if self._task is not None:
+            self._task.cancel()
+        if self._writer is not None:
+            self._writer.close()
+    
+    async def query(self, name: str) -> List[Any]:
+        """
+        Collect a value from every worker in the cluster.
+        
+        Args:
+            name: Query name registered on the workers
+        
+        Returns:
+            One value per worker that answered, ordered by cluster ID
+        """
+        query_id = f'{self.cluster_id}-{secrets.token_hex(4)}'
+        future = asyncio.get_running_loop().create_future()
+        self._replies[query_id] = future
+        try:
+            await _send(self._writer, {'op': 'query', 'id': query_id, 'name': name})
+            return await asyncio.wait_for(future, QUERY_TIMEOUT * 2)
+        finally:
+            self._replies.pop(query_id, None)
+    
+    async def _listen(self, reader: asyncio.StreamReader) -> None:
+        while True:
+            line = await reader.readline()
+            if not line:
+                logger.warning('Lost IPC connection to the cluster supervisor')
+                return
+            message = json.loads(line)
+            if message['op'] == 'collect':
+                asyncio.create_task(self._answer(message))
+            elif message['op'] == 'reply':
+                future = self._replies.get(message['id'])
+                if future is not None and not future.done():
+                    future.set_result(message['values'])
+    
+    async def _answer(self, message: Dict[str, Any]) -> None:
+        handler = self._handlers.get(message['name'])
+        value = await handler() if handler is not None else None
+        await _send(self._writer, {
+            'op': 'result',
+            'id': message['id'],
+            'cluster_id': self.cluster_id,
+            'value': value,
+        })
+
+
+def _run_worker(cluster_id: int, shard_ids: List[int], shard_count: int, address: str, secret: str) -> None:
+    """Process entry point: run the bot for one shard range."""
+    os.environ[ENV_CLUSTER_ID] = str(cluster_id)
+    os.environ[ENV_SHARD_IDS] = ','.join(str(shard_id) for shard_id in shard_ids)
+    os.environ[ENV_SHARD_COUNT] = str(shard_count)
+    os.environ[ENV_IPC_ADDRESS] = address
+    os.environ[ENV_IPC_SECRET] = secret
+    # Only the supervisor talks to systemd; it restarts workers that exit
+    os.environ.pop('NOTIFY_SOCKET', None)
+    
+    # Imported here so the bot is configured from the variables above
+    from game_coordinator_bot import bot
+    asyncio.run(bot.main())
+
+
+class Supervisor:
+    """Starts one worker process per shard range and restarts crashed ones."""
+    
+    def __init__(self, shard_count: int, workers: int):
+        self.ranges = shard_ranges(shard_count, workers)
+        self.shard_count = shard_count
+        self.hub = ClusterHub(secrets.token_hex(16))
+        self._context = multiprocessing.get_context('spawn')
+        self._processes: Dict[int, multiprocessing.process.BaseProcess] = {}
+        self._started_at: Dict[int, float] = {}
+        self._delays: Dict[int, float] = {}
+        self._stopping = asyncio.Event()
+    
+    def _spawn(self, cluster_id: int) -> None:
+        process = self._context.Process(
+            target=_run_worker,
+            args=(cluster_id, self.ranges[cluster_id], self.shard_count, self.hub.address, self.hub.secret),
+            name=f'cluster-{cluster_id}',
+        )
+        process.start()
+        self._processes[cluster_id] = process
+        self._started_at[cluster_id] = time.monotonic()
+        logger.info(f'Started cluster {cluster_id} (pid {process.pid}) with shards {self.ranges[cluster_id]}')
+    
+    async def run(self) -> None:
+        """Run until SIGINT/SIGTERM, keeping every worker alive."""
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self._stopping.set)
+        
+        await self.hub.start()
+        for cluster_id in range(len(self.ranges)):
+            self._spawn(cluster_id)
+        
+        restarts: Dict[int, asyncio.TimerHandle] = {}
+        while not self._stopping.is_set():
+            for cluster_id, process in self._processes.items():
+                if process.is_alive() or cluster_id in restarts:
+                    continue
+                uptime = time.monotonic() - self._started_at[cluster_id]
+                delay = RESTART_DELAY if uptime >= STABLE_UPTIME else min(
+                    self._delays.get(cluster_id, RESTART_DELAY / 2) * 2, MAX_RESTART_DELAY
+                )
+                self._delays[cluster_id] = delay
+                logger.error(f'Cluster {cluster_id} exited with code {process.exitcode}; restarting in {delay:.0f}s')
+                restarts[cluster_id] = loop.call_later(delay, self._restart, cluster_id, restarts)
+            try:
+                await asyncio.wait_for(self._stopping.wait(), 1.0)
+            except asyncio.TimeoutError:
+                pass
+        
+        for handle in restarts.values():
+            handle.cancel()
+        await self.shutdown()
+    
+    def _restart(self, cluster_id: int, restarts: Dict[int, asyncio.TimerHandle]) -> None:
+        restarts.pop(cluster_id, None)
+        if not self._stopping.is_set():
+            self._spawn(cluster_id)
+    
+    async def shutdown(self) -> None:
+        """Terminate every worker and close the IPC hub."""
+        for process in self._processes.values():
+            if process.is_alive():
+                process.terminate()
+        for process in self._processes.values():
+            await asyncio.to_thread(process.join, 10)
+        await self.hub.stop()
+        logger.info('Cluster stopped')
+
+
+async def main() -> None:
+    """Launch the cluster from environment configuration."""
+    load_dotenv()
+    configure_logging(
+        level=logging.getLevelName(os.getenv('LOG_LEVEL', 'INFO').upper()),
+        log_format=os.getenv('LOG_FORMAT', 'json').lower(),
+    )
+    
+    token = os.getenv('DISCORD_BOT_TOKEN')
+    if not token:
+        logger.error('DISCORD_BOT_TOKEN not found in environment variables')
+        return
+    
+    workers = int(os.getenv('CLUSTER_WORKERS') or os.cpu_count() or 1)
+    shard_count = int(os.getenv(ENV_SHARD_COUNT) or await fetch_recommended_shards(token))
+    logger.info(f'Running {shard_count} shards across {min(workers, shard_count)} workers')
+    watchdog = LoopWatchdog()
+    watchdog.start()
+    try:
+        await Supervisor(shard_count, workers).run()
+    finally:
+        await watchdog.stop()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
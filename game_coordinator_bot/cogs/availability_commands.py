@@ -0,0 +1,320 @@
+"""
+Availability Commands Cog
+
+Contains slash commands for registering weekly availability and for finding
+the times most members can play.
+"""
+
+import logging
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from game_coordinator_bot.availability import (
+    SLOT_MINUTES,
+    WEEKDAY_NAMES,
+    SlotMatrix,
+    format_minute,
+)
+from game_coordinator_bot.dispatcher import OutboundDispatcher, auto_defer
+from game_coordinator_bot.storage.availability import AvailabilityRepository, AvailabilityWindow
+from game_coordinator_bot.utils.autocomplete import (
+    catalog_indexes,
+    resolve_timezone,
+    timezone_display_name,
+    timezone_index,
+    to_choices,
+)
+from game_coordinator_bot.utils.config import get_game_config
+from game_coordinator_bot.utils.time_grammar import parse_weekdays
+from game_coordinator_bot.utils.timezone_utils import parse_wall_time
+
+logger = logging.getLogger('game_coordinator.commands')
+
+
+# Windows a member can register per server
+MAX_WINDOWS = 50
+# Members mentioned per suggestion before "and N more"
+MAX_MENTIONS = 10
+WEEK_SECONDS = 7 * 86400
+
+
+class AvailabilityCommands(commands.Cog):
+    """Cog for weekly availability and session time suggestions."""
+    
+    availability = app_commands.Group(
+        name="availability",
+        description="Tell the server when you are usually free to play",
+        guild_only=True
+    )
+    
+    def __init__(
+        self,
+        bot: commands.Bot,
+        store: AvailabilityRepository,
+        dispatcher: OutboundDispatcher
+    ):
+        self.bot = bot
+        self.store = store
+        self.dispatcher = dispatcher
+        self.preferences = getattr(bot, "user_preferences", None)
+    
+    @availability.command(name="add", description="Add a weekly time you are usually free to play")
+    @app_commands.describe(
+        days="Days, e.g. 'mon-fri', 'sat, sun', 'weekends' or 'daily'",
+        start="From, e.g. '7pm' or '19:00'",
+        end="Until, e.g. '11pm' or '1am'",
+        timezone="Your timezone (defaults to the one you used last)",
+        game="Only for this game (optional)"
+    )
+    @auto_defer(ephemeral=True)
+    async def add_command(
+        self,
+        interaction: discord.Interaction,
+        days: str,
+        start: str,
+        end: str,
+        timezone: Optional[str] = None,
+        game: Optional[str] = None
+    ):
+        """
+        Register weekly availability windows.
+        
+        Args:
+            interaction: Discord interaction object
+            days: Days, day ranges or groups
+            start: Local start time
+            end: Local end time; at or before the start it runs past midnight
+            timezone: IANA timezone name or alias (optional)
+            game: Game ID or name (optional)
+        """
+        weekdays = parse_weekdays(days)
+        if weekdays is None:
+            await self._reply(
+                interaction,
+                f"❌ Could not parse days '{days}'. Use formats like 'mon-fri', 'sat, sun' or 'weekends'."
+            )
+            return
+        
+        bounds = [parse_wall_time(value) for value in (start, end)]
+        if None in bounds:
+            await self._reply(
+                interaction,
+                f"❌ Could not parse '{start}' to '{end}'. Please use formats like '8pm', '8:30pm', or '20:00'."
+            )
+            return
+        # Round out to whole slots
+        start_minute = bounds[0][0] * 60 + bounds[0][1]
+        start_minute -= start_minute % SLOT_MINUTES
+        end_minute = bounds[1][0] * 60 + bounds[1][1]
+        end_minute = -(-end_minute // SLOT_MINUTES) * SLOT_MINUTES % (24 * 60)
+        
+        game_id = None
+        if game is not None:
+            match = catalog_indexes().games.lookup(game)
+            if match is None:
+                await self._reply(interaction, f"❌ Unknown game '{game}'. Pick one from the suggestions.")
+                return
+            game_id = match.value
+        
+        if timezone is not None:
+            timezone_name = resolve_timezone(timezone)
+            if timezone_name is None:
+                await self._reply(
+                    interaction,
+                    f"❌ Unknown timezone '{timezone}'. Start typing a city or region and pick a suggestion."
+                )
+                return
+        else:
+            timezone_name = None
+            if self.preferences is not None:
+                timezone_name = (await self.preferences.get(interaction.user.id)).timezone
+            if timezone_name is None:
+                await self._reply(interaction, "❌ Please pick a timezone. It will be remembered for next time.")
+                return
+        
+        existing = await self.store.for_user(interaction.guild_id, interaction.user.id)
+        if len(existing) + len(weekdays) > MAX_WINDOWS:
+            await self._reply(
+                interaction,
+                f"❌ You can register up to {MAX_WINDOWS} windows. "
+                "Clear them with /availability clear and add them again."
+            )
+            return
+        
+        windows = [
+            AvailabilityWindow(interaction.user.id, weekday, start_minute, end_minute, timezone_name, game_id)
+            for weekday in weekdays
+        ]
+        await self.store.add(interaction.guild_id, windows)
+        if self.preferences is not None:
+            self.preferences.remember(interaction.user.id, timezone=timezone_name)
+        
+        day_names = ", ".join(WEEKDAY_NAMES[weekday] for weekday in weekdays)
+        game_config = get_game_config(game_id) if game_id else None
+        for_game = f" for {game_config.display_name}" if game_config else ""
+        await self._reply(
+            interaction,
+            f"✅ Free {day_names}, {format_minute(start_minute)}-{format_minute(end_minute)} "
+            f"{timezone_display_name(timezone_name)}{for_game}."
+        )
+        logger.info(
+            "Availability added by %s: %s windows", interaction.user.name, len(windows),
+            extra={"guild_id": interaction.guild_id, "game": game_id}
+        )
+    
+    @availability.command(name="show", description="Show the times you registered")
+    @auto_defer(ephemeral=True)
+    async def show_command(self, interaction: discord.Interaction):
+        """
+        List the member's availability windows in this server.
+        
+        Args:
+            interaction: Discord interaction object
+        """
+        windows = await self.store.for_user(interaction.guild_id, interaction.user.id)
+        if not windows:
+            await self._reply(interaction, "You have not registered any times. Add some with /availability add!")
+            return
+        
+        lines = []
+        for window in windows:
+            game_config = get_game_config(window.game) if window.game else None
+            for_game = f" ({game_config.display_name if game_config else window.game})" if window.game else ""
+            lines.append(
+                f"**{WEEKDAY_NAMES[window.weekday]}** {format_minute(window.start_minute)}-"
+                f"{format_minute(window.end_minute)} {timezone_display_name(window.timezone)}{for_game}"
+            )
+        embed = discord.Embed(
+            title="🗓️ Your Availability",
+            description="\n".join(lines),
+            color=discord.Color.blue()
+        )
+        await self.dispatcher.respond(interaction, embed=embed, ephemeral=True)
+    
+    @availability.command(name="clear", description="Remove all the times you registered")
+    @auto_defer(ephemeral=True)
+    async def clear_command(self, interaction: discord.Interaction):
+        """
+        Remove the member's availability windows in this server.
+        
+        Args:
+            interaction: Discord interaction object
+        """
+        removed = await self.store.clear(interaction.guild_id, interaction.user.id)
+        await self._reply(interaction, f"🗑️ Removed {removed} window{'s' if removed != 1 else ''}.")
+    
+    @app_commands.command(name="when", description="Find the times most members are free to play a game")
+    @app_commands.describe(
+        game="Game to play",
+        duration="Session length in minutes",
+        weeks="How many weeks ahead to look"
+    )
+    @app_commands.guild_only()
+    @auto_defer()
+    async def when_command(
+        self,
+        interaction: discord.Interaction,
+        game: str,
+        duration: app_commands.Range[int, 15, 480] = 120,
+        weeks: app_commands.Range[int, 1, 4] = 1
+    ):
+        """
+        Suggest the session times with the most members free throughout.
+        
+        Args:
+            interaction: Discord interaction object
+            game: Game ID or name
+            duration: Session length in minutes
+            weeks: Weeks ahead to search
+        """
+        indexes = catalog_indexes()
+        match = indexes.games.lookup(game)
+        if match is None:
+            await self._reply(interaction, f"❌ Unknown game '{game}'. Pick one from the suggestions.")
+            return
+        game_config = indexes.catalog.games[match.value]
+        
+        windows = await self.store.for_guild(interaction.guild_id, game=game_config.id)
+        by_member: Dict[Tuple[int, str], List[Tuple[int, int, int]]] = defaultdict(list)
+        for window in windows:
+            by_member[window.user_id, window.timezone].append(
+                (window.weekday, window.start_minute, window.end_minute)
+            )
+        
+        now = time.time()
+        # One extra week: the search window starts part way through the first
+        matrix = SlotMatrix(now, weeks + 1)
+        for (user_id, timezone_name), member_windows in by_member.items():
+            try:
+                matrix.add(user_id, member_windows, timezone_name)
+            except ValueError:
+                logger.warning("Skipping availability in unknown timezone %s", timezone_name)
+        
+        suggestions = matrix.best_slots(
+            duration,
+            top=3,
+            not_before=now,
+            not_after=now + weeks * WEEK_SECONDS
+        )
+        if not suggestions:
+            await self._reply(
+                interaction,
+                f"Nobody has registered times for {game_config.display_name} yet. "
+                "Add yours with /availability add!"
+            )
+            return
+        
+        lines = []
+        for suggestion in suggestions:
+            mentions = " ".join(f"<@{user_id}>" for user_id in suggestion.user_ids[:MAX_MENTIONS])
+            more = len(suggestion.user_ids) - MAX_MENTIONS
+            if more > 0:
+                mentions += f" and {more} more"
+            lines.append(
+                f"<t:{suggestion.start}:F> (<t:{suggestion.start}:R>): "
+                f"**{len(suggestion.user_ids)} of {len(matrix)}** free\n{mentions}"
+            )
+        embed = discord.Embed(
+            title=f"🕒 Best times for {game_config.display_name}",
+            description="\n\n".join(lines),
+            color=discord.Color.blue()
+        )
+        embed.set_footer(text=f"{duration} minute session. Start one with /play.")
+        await self.dispatcher.respond(
+            interaction,
+            embed=embed,
+            allowed_mentions=discord.AllowedMentions.none()
+        )
+    
+    @add_command.autocomplete("game")
+    @when_command.autocomplete("game")
+    async def game_autocomplete(
+        self,
+        interaction: discord.Interaction,
+        current: str
+    ) -> List[app_commands.Choice[str]]:
+        """Suggest games from the catalog as the user types."""
+        return to_choices(catalog_indexes().games.search(current))
+    
+    @add_command.autocomplete("timezone")
+    async def timezone_autocomplete(
+        self,
+        interaction: discord.Interaction,
+        current: str
+    ) -> List[app_commands.Choice[str]]:
+        """Suggest IANA timezones by name, city, alias or abbreviation."""
+        return to_choices(timezone_index().search(current))
+    
+    async def _reply(self, interaction: discord.Interaction, content: str):
+        """Answer privately with a short message."""
+        await self.dispatcher.respond(interaction, content=content, ephemeral=True)
+
+
+async def setup(bot: commands.Bot):
+    """Setup function to add the cog to the bot."""
+    await bot.add_cog(AvailabilityCommands(bot, bot.availability, bot.dispatcher))
+    logger.info("AvailabilityCommands cog loaded")
@@ -4,27 +4,96 @@ Game Commands Cog
 Contains slash commands for coordinating gaming sessions.
 """
 
+import functools
 import logging
-from typing import Optional
+from datetime import datetime
+from typing import Awaitable, Callable, List, Optional, Tuple, Union
 import discord
 from discord import app_commands
 from discord.ext import commands
 
-from game_coordinator_bot.utils.config import get_game_config
+from game_coordinator_bot.utils.config import (
+    GameConfig,
+    get_game_config,
+    add_config_listener,
+    remove_config_listener,
+)
+from game_coordinator_bot.cluster import owns_guild
+from game_coordinator_bot.cogs.rsvp import build_rsvp_view
+from game_coordinator_bot.dispatcher import auto_defer
+from game_coordinator_bot.recurrence import RecurrenceRule, parse_recurrence
+from game_coordinator_bot.storage.recurring import RecurringSession
+from game_coordinator_bot.storage.sessions import Session
+from game_coordinator_bot.utils.autocomplete import (
+    catalog_indexes,
+    resolve_timezone,
+    timezone_display_name,
+    timezone_index,
+    to_choices,
+)
+from game_coordinator_bot.utils.embed_templates import (
+    DEFAULT_COLOR,
+    EmbedTemplate,
+    EmbedTemplateCache,
+)
 from game_coordinator_bot.utils.timezone_utils import (
-    get_timezone_choices,
     parse_time_input,
+    get_timezone,
     get_unix_timestamp,
 )
 
 logger = logging.getLogger('game_coordinator.commands')
 
 
+# Seconds the "Post anyway" button stays usable
+OFFER_TIMEOUT = 300
+
+
+class DuplicateOfferView(discord.ui.View):
+    """Link to a matching session, and a button to post a new one anyway."""
+    
+    def __init__(self, jump_url: Optional[str], post: Callable[[discord.Interaction], Awaitable[None]]):
+        super().__init__(timeout=OFFER_TIMEOUT)
+        self.post = post
+        if jump_url is not None:
+            self.add_item(discord.ui.Button(label="Go to session", style=discord.ButtonStyle.link, url=jump_url))
+    
+    @discord.ui.button(label="Post anyway", style=discord.ButtonStyle.secondary)
+    async def post_anyway(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """Announce the new session after all, once."""
+        self.stop()
+        await self.post(interaction)
+
+
 class GameCommands(commands.Cog):
     """Cog for game coordination commands."""
     
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self.dispatcher = bot.dispatcher
+        self.preferences = getattr(bot, "user_preferences", None)
+        self.metrics = getattr(bot, "metrics", None)
+        self.embed_templates = EmbedTemplateCache()
+        add_config_listener(self.embed_templates.invalidate)
+    
+    async def cog_load(self):
+        """Index the stored upcoming sessions so /play can spot duplicates."""
+        duplicates = getattr(self.bot, "duplicate_index", None)
+        session_store = getattr(self.bot, "session_store", None)
+        if duplicates is None or session_store is None:
+            return
+        # In cluster mode each worker only answers /play for the guilds its shards serve
+        pending = [
+            session for session in await session_store.pending()
+            if owns_guild(self.bot, session.guild_id)
+        ]
+        for session in pending:
+            duplicates.add(session)
+        logger.info(f'Indexed {len(pending)} upcoming sessions for duplicate detection')
+    
+    def cog_unload(self):
+        """Stop tracking config changes once the cog is removed."""
+        remove_config_listener(self.embed_templates.invalidate)
     
     @app_commands.command(
         name="play",
@@ -32,94 +101,370 @@ class GameCommands(commands.Cog):
     )
     @app_commands.describe(
         game="Choose the game you want to play",
-        time="What time? (e.g., '8pm', '8:30pm', '20:00')",
-        timezone="Your timezone",
-        platform="What platform will you play on?",
-        mode="Game mode (Call of Duty only)"
+        time="What time? (e.g., '8pm', 'tomorrow 9', 'fri 8:30pm', 'in 2h', or 'every fri 9pm' to repeat weekly)",
+        timezone="Your timezone (type a city, region or abbreviation; remembered for next time)",
+        platform="What platform will you play on? (remembered for next time)",
+        mode="Game mode (for games that have modes)"
     )
-    @app_commands.choices(game=[
-        app_commands.Choice(name="Call of Duty", value="call_of_duty"),
-        app_commands.Choice(name="Overcooked", value="overcooked"),
-    ])
-    @app_commands.choices(timezone=get_timezone_choices())
-    @app_commands.choices(platform=[
-        app_commands.Choice(name="PC", value="pc"),
-        app_commands.Choice(name="PlayStation", value="playstation"),
-        app_commands.Choice(name="Xbox", value="xbox"),
-        app_commands.Choice(name="Nintendo Switch", value="switch"),
-        app_commands.Choice(name="Cross-platform", value="crossplatform"),
-    ])
-    @app_commands.choices(mode=[
-        app_commands.Choice(name="Zombies", value="zombies"),
-        app_commands.Choice(name="Multiplayer", value="multiplayer"),
-        app_commands.Choice(name="Endgame", value="endgame"),
-    ])
+    @auto_defer()
     async def play_command(
         self,
         interaction: discord.Interaction,
-        game: app_commands.Choice[str],
+        game: str,
         time: str,
-        timezone: app_commands.Choice[str],
-        platform: app_commands.Choice[str],
-        mode: Optional[app_commands.Choice[str]] = None
+        timezone: Optional[str] = None,
+        platform: Optional[str] = None,
+        mode: Optional[str] = None
     ):
         """
         Slash command to coordinate a gaming session.
         
         Args:
             interaction: Discord interaction object
-            game: Selected game
+            game: Game ID (or name) picked from autocomplete
             time: When to play (time string)
-            timezone: User's timezone
-            platform: Gaming platform
-            mode: Game mode (optional, required for Call of Duty)
+            timezone: IANA timezone (or city/alias) picked from autocomplete
+                (optional, defaults to the user's last one)
+            platform: Platform ID (or name) picked from autocomplete
+                (optional, defaults to the user's last one)
+            mode: Game mode ID (optional, required for games with modes)
         """
-        # Get game configuration
-        game_config = get_game_config(game.value)
-        
-        # Validate Call of Duty requires a mode
-        if game_config and game_config.supports_modes and mode is None:
-            await interaction.response.send_message(
-                f"❌ Please select a mode for {game_config.display_name}.",
-                ephemeral=True
+        # Use one catalog for the whole interaction, even if it reloads meanwhile
+        indexes = catalog_indexes()
+        game_match = indexes.games.lookup(game)
+        game_config = indexes.catalog.games[game_match.value] if game_match else None
+        
+        if game_config is None:
+            await self._reject(
+                interaction,
+                "unknown_game",
+                f"❌ Unknown game '{game}'. Pick one from the suggestions."
             )
             return
         
-        # Parse the time with timezone
-        parsed_time = parse_time_input(time, timezone.value)
+        # Validate games with modes get one of their own modes
+        game_mode = None
+        if mode is not None:
+            mode_match = indexes.modes(game_config.id).lookup(mode)
+            game_mode = game_config.get_mode_by_id(mode_match.value) if mode_match else None
+            if game_mode is None:
+                await self._reject(
+                    interaction,
+                    "invalid_mode",
+                    f"❌ '{mode}' is not a mode of {game_config.display_name}."
+                )
+                return
+        elif game_config.supports_modes:
+            await self._reject(
+                interaction,
+                "missing_mode",
+                f"❌ Please select a mode for {game_config.display_name}."
+            )
+            return
+        
+        # Fall back to what the user picked last time
+        preferences = None
+        if (timezone is None or platform is None) and self.preferences is not None:
+            preferences = await self.preferences.get(interaction.user.id)
+        
+        if timezone is not None:
+            timezone_name = resolve_timezone(timezone)
+            if timezone_name is None:
+                await self._reject(
+                    interaction,
+                    "unknown_timezone",
+                    f"❌ Unknown timezone '{timezone}'. Start typing a city or region and pick a suggestion."
+                )
+                return
+        else:
+            timezone_name = preferences.timezone if preferences else None
+            if timezone_name is None:
+                await self._reject(
+                    interaction,
+                    "missing_timezone",
+                    "❌ Please pick a timezone. It will be remembered for next time."
+                )
+                return
+        
+        if platform is not None:
+            platform_match = indexes.platforms.lookup(platform)
+            if platform_match is None:
+                await self._reject(
+                    interaction,
+                    "unknown_platform",
+                    f"❌ Unknown platform '{platform}'. Pick one from the suggestions."
+                )
+                return
+            platform_id, platform_name = platform_match.value, platform_match.name
+        else:
+            platform_id = preferences.platform if preferences else None
+            platform_name = indexes.catalog.platforms.get(platform_id) if platform_id else None
+            if platform_name is None:
+                await self._reject(
+                    interaction,
+                    "missing_platform",
+                    "❌ Please pick a platform. It will be remembered for next time."
+                )
+                return
+        timezone_display = timezone_display_name(timezone_name)
+        
+        # Parse the time with timezone; "every fri 9pm" starts a recurring session
+        recurrence = parse_recurrence(time, timezone_name)
+        if recurrence is not None:
+            if getattr(self.bot, "recurring_sessions", None) is None:
+                await self._reject(
+                    interaction,
+                    "recurring_unavailable",
+                    "❌ Recurring sessions are not available here. Please pick a single time."
+                )
+                return
+            first = recurrence.next_occurrence(recurrence.anchor)
+            parsed_time = datetime.fromtimestamp(first, get_timezone(timezone_name))
+        else:
+            parsed_time = parse_time_input(time, timezone_name)
         
         if not parsed_time:
-            await interaction.response.send_message(
-                f"❌ Could not parse time '{time}'. Please use formats like '8pm', '8:30pm', or '20:00'.",
-                ephemeral=True
+            await self._reject(
+                interaction,
+                "unparsable_time",
+                f"❌ Could not parse time '{time}'. Please use formats like '8pm', 'tomorrow 20:00', 'fri 8:30pm' "
+                "or 'in 2h', or 'every fri 9pm' for a weekly session."
             )
             return
         
         # Create embed for the gaming session announcement
         embed = self._create_session_embed(
             user=interaction.user,
-            game=game.name,
-            game_value=game.value,
+            game=game_config.display_name,
+            game_value=game_config.id,
             parsed_time=parsed_time,
-            timezone_name=timezone.value,
-            timezone_display=timezone.name,
-            platform=platform.name,
-            mode=mode.name if mode else None
+            timezone_name=timezone_name,
+            timezone_display=timezone_display,
+            platform=platform_name,
+            mode=game_mode.name if game_mode else None,
+            mode_value=game_mode.id if game_mode else None,
+            game_config=game_config
         )
         
-        # Send the announcement with @everyone ping
-        await interaction.response.send_message(
-            content="@everyone",
-            embed=embed,
-            allowed_mentions=discord.AllowedMentions(everyone=True)
+        start_time = get_unix_timestamp(parsed_time)
+        if recurrence is not None:
+            embed.add_field(name="🔁 Repeats", value=recurrence.describe(), inline=False)
+            session = RecurringSession(
+                guild_id=interaction.guild_id,
+                channel_id=interaction.channel_id,
+                organizer_id=interaction.user.id,
+                game=game_config.id,
+                mode=game_mode.id if game_mode else None,
+                platform=platform_id,
+                timezone=timezone_name,
+                weekdays=recurrence.weekdays,
+                minute=recurrence.minute,
+                interval_weeks=recurrence.interval,
+                anchor=recurrence.anchor,
+            )
+        else:
+            session = Session(
+                guild_id=interaction.guild_id,
+                channel_id=interaction.channel_id,
+                organizer_id=interaction.user.id,
+                game=game_config.id,
+                mode=game_mode.id if game_mode else None,
+                platform=platform_id,
+                timezone=timezone_name,
+                start_time=start_time,
+            )
+        
+        if self.preferences is not None:
+            self.preferences.remember(
+                interaction.user.id,
+                timezone=timezone_name,
+                platform=platform_id,
+                favorite_game=game_config.id
+            )
+        
+        summary = (interaction.user.name, game_config.display_name, platform_name, time, timezone_display)
+        
+        # Point to a session of the same game at about the same time instead of pinging everyone again
+        duplicates = getattr(self.bot, "duplicate_index", None)
+        if recurrence is None and duplicates is not None:
+            duplicate = duplicates.find(session.guild_id, session.game, session.mode, session.platform, start_time)
+            if duplicate is not None:
+                # Only built here, so the common path allocates no callable for "Post anyway"
+                post = functools.partial(
+                    self._announce, session=session, embed=embed, start_time=start_time,
+                    recurrence=recurrence, summary=summary
+                )
+                await self._offer_duplicate(interaction, duplicate, game_config.display_name, post)
+                return
+        await self._announce(interaction, session, embed, start_time, recurrence, summary)
+    
+    async def _announce(
+        self,
+        interaction: discord.Interaction,
+        session: Union[Session, RecurringSession],
+        embed: discord.Embed,
+        start_time: int,
+        recurrence: Optional[RecurrenceRule],
+        summary: Tuple[str, str, str, str, str]
+    ):
+        """
+        Post a session announcement and record the session.
+        
+        Args:
+            interaction: Interaction to answer (the /play command, or "Post anyway")
+            session: Session or recurring session to record
+            embed: Announcement embed
+            start_time: Unix timestamp of the session, or of a recurring session's first occurrence
+            recurrence: Recurrence rule of a recurring session
+            summary: Organizer, game, platform, time and timezone as the user gave them, for the log
+        """
+        # Index the session before the first await, so a /play for the same game and
+        # time arriving while this one is being posted is offered it as a duplicate
+        duplicates = getattr(self.bot, "duplicate_index", None) if recurrence is None else None
+        if duplicates is not None:
+            duplicates.add(session)
+        session_store = getattr(self.bot, "recurring_sessions" if recurrence else "session_store", None)
+        try:
+            # Send the announcement with @everyone ping and RSVP buttons
+            response = await self.dispatcher.respond(
+                interaction,
+                content="@everyone",
+                embed=embed,
+                view=build_rsvp_view(session.id),
+                allowed_mentions=discord.AllowedMentions(everyone=True)
+            )
+            # A follow-up (after a deferral) returns the message itself
+            session.message_id = response.message_id if hasattr(response, "message_id") else response.id
+            
+            # Record the session so it can be listed, cancelled and recovered
+            if session_store is not None:
+                await session_store.add(session)
+        except BaseException:
+            # Not posted or not recorded (or cancelled): release the reservation
+            if duplicates is not None:
+                duplicates.remove(session.id)
+            raise
+        
+        if session_store is not None:
+            recurring_index = getattr(self.bot, "recurring_index", None)
+            if recurrence is not None and recurring_index is not None:
+                recurring_index.add(session.id, recurrence, session, session.groups())
+            
+            # For a recurring session this is the first occurrence; the reminders cog schedules the next
+            reminder_scheduler = getattr(self.bot, "reminder_scheduler", None)
+            if reminder_scheduler is not None:
+                reminder_scheduler.schedule_session(session.id, start_time)
+        
+        # Formatted on the log writer thread, not here
+        logger.info(
+            "Gaming session created by %s: %s on %s at %s %s", *summary,
+            extra={
+                "session_id": session.id,
+                "guild_id": session.guild_id,
+                "game": session.game,
+                "mode": session.mode,
+                "platform": session.platform,
+                "start_time": start_time,
+                "recurrence": recurrence.describe() if recurrence else None,
+            }
         )
+    
+    async def _offer_duplicate(
+        self,
+        interaction: discord.Interaction,
+        duplicate: Session,
+        game_name: str,
+        post: Callable[[discord.Interaction], Awaitable[None]]
+    ):
+        """
+        Offer to join a matching session instead of announcing a new one.
         
+        Args:
+            interaction: Discord interaction object
+            duplicate: Upcoming session of the same game at about the same time
+            game_name: Display name of the game
+            post: Posts the new announcement after all, from a button click
+        """
+        if self.metrics is not None:
+            self.metrics.count_error("play", "duplicate")
+        jump_url = None
+        if duplicate.message_id is not None:
+            jump_url = f"https://discord.com/channels/{duplicate.guild_id}/{duplicate.channel_id}/{duplicate.message_id}"
+        await self.dispatcher.respond(
+            interaction,
+            content=(
+                f"🎮 <@{duplicate.organizer_id}> already posted **{game_name}** for "
+                f"<t:{duplicate.start_time}:t> (<t:{duplicate.start_time}:R>). "
+                "Join that session instead of pinging everyone again?"
+            ),
+            view=DuplicateOfferView(jump_url, post),
+            allowed_mentions=discord.AllowedMentions.none(),
+            ephemeral=True
+        )
         logger.info(
-            f"Gaming session created by {interaction.user.name}: "
-            f"{game.name} on {platform.name} at {time} {timezone.name}"
-            + (f" ({mode.name})" if mode else "")
+            "Duplicate session offered to %s", interaction.user.name,
+            extra={"session_id": duplicate.id, "guild_id": duplicate.guild_id, "game": duplicate.game}
         )
     
+    async def _reject(self, interaction: discord.Interaction, reason: str, content: str):
+        """
+        Tell the user why /play was refused, and count it.
+        
+        Args:
+            interaction: Discord interaction object
+            reason: Short, fixed reason for the error metrics (e.g. "missing_mode")
+            content: Message shown to the user
+        """
+        if self.metrics is not None:
+            self.metrics.count_error("play", reason)
+        await self.dispatcher.respond(interaction, content=content, ephemeral=True)
+    
+    @play_command.autocomplete("game")
+    async def game_autocomplete(
+        self,
+        interaction: discord.Interaction,
+        current: str
+    ) -> List[app_commands.Choice[str]]:
+        """Suggest games from the catalog, the user's last game first."""
+        suggestions = catalog_indexes().games.search(current)
+        if not current and self.preferences is not None:
+            favorite = (await self.preferences.get(interaction.user.id)).favorite_game
+            suggestions.sort(key=lambda suggestion: suggestion.value != favorite)
+        return to_choices(suggestions)
+    
+    @play_command.autocomplete("mode")
+    async def mode_autocomplete(
+        self,
+        interaction: discord.Interaction,
+        current: str
+    ) -> List[app_commands.Choice[str]]:
+        """Suggest modes of the game already chosen, or of every game."""
+        indexes = catalog_indexes()
+        game = indexes.games.lookup(interaction.namespace.game or "")
+        return to_choices(indexes.modes(game.value if game else None).search(current))
+    
+    @play_command.autocomplete("platform")
+    async def platform_autocomplete(
+        self,
+        interaction: discord.Interaction,
+        current: str
+    ) -> List[app_commands.Choice[str]]:
+        """Suggest platforms from the catalog, the user's last platform first."""
+        suggestions = catalog_indexes().platforms.search(current)
+        if not current and self.preferences is not None:
+            last = (await self.preferences.get(interaction.user.id)).platform
+            suggestions.sort(key=lambda suggestion: suggestion.value != last)
+        return to_choices(suggestions)
+    
+    @play_command.autocomplete("timezone")
+    async def timezone_autocomplete(
+        self,
+        interaction: discord.Interaction,
+        current: str
+    ) -> List[app_commands.Choice[str]]:
+        """Suggest IANA timezones by name, city, alias or abbreviation."""
+        return to_choices(timezone_index().search(current))
+    
     def _create_session_embed(
         self,
         user: discord.User,
@@ -129,7 +474,9 @@ class GameCommands(commands.Cog):
         timezone_name: str,
         timezone_display: str,
         platform: str,
-        mode: Optional[str] = None
+        mode: Optional[str] = None,
+        mode_value: Optional[str] = None,
+        game_config: Optional[GameConfig] = None
     ) -> discord.Embed:
         """
         Create a formatted embed for a gaming session announcement.
@@ -143,47 +490,26 @@ class GameCommands(commands.Cog):
             timezone_display: Timezone display name
             platform: Gaming platform
             mode: Game mode (optional)
+            mode_value: Game mode value/ID (optional)
+            game_config: Game configuration, if already looked up
         
         Returns:
             discord.Embed: Formatted embed
         """
-        # Get game configuration for color
-        game_config = get_game_config(game_value)
-        color = discord.Color(game_config.color) if game_config else discord.Color.blue()
-        
-        # Create embed
-        embed = discord.Embed(
-            title="🎮 Gaming Session",
-            description=f"{user.mention} wants to play!",
-            color=color
-        )
-        
-        # Add game field
-        game_display = game
-        if mode:
-            game_display = f"{game} - {mode}"
-        embed.add_field(name="🎯 Game", value=game_display, inline=True)
-        
-        # Add platform field
-        embed.add_field(name="🖥️ Platform", value=platform, inline=True)
+        template = self.embed_templates.get(game_value, mode_value)
+        if template is None:
+            # Unconfigured game or mode: build a one-off template
+            if game_config is None:
+                game_config = get_game_config(game_value)
+            color = discord.Color(game_config.color) if game_config else DEFAULT_COLOR
+            template = EmbedTemplate(color, f"{game} - {mode}" if mode else game)
         
-        # Add time field with Discord timestamp (auto-converts to user's timezone)
-        timestamp = get_unix_timestamp(parsed_time)
-        if timestamp:
-            # Discord timestamp formatting: <t:timestamp:F> shows full date/time in user's local timezone
-            time_display = f"<t:{timestamp}:F>\n<t:{timestamp}:R>"
-        else:
-            time_display = "Time not specified"
-        
-        embed.add_field(name="⏰ Time", value=time_display, inline=False)
-        
-        # Add footer with user avatar
-        embed.set_footer(
-            text=f"Organized by {user.name} • {timezone_display}",
-            icon_url=user.display_avatar.url
+        return template.render(
+            user=user,
+            platform=platform,
+            timestamp=get_unix_timestamp(parsed_time),
+            timezone_display=timezone_display
         )
-        
-        return embed
 
 
 async def setup(bot: commands.Bot):
@@ -0,0 +1,131 @@
+"""
+Reminders Cog
+
+Sends reminder messages for scheduled sessions shortly before and when
+they start. Recurring sessions only ever have their next occurrence
+scheduled; once it starts, the one after it is scheduled.
+"""
+
+import logging
+import sqlite3
+from typing import List, Optional
+import discord
+from discord.ext import commands
+
+from game_coordinator_bot.cluster import owns_guild
+from game_coordinator_bot.dispatcher import OutboundDispatcher
+from game_coordinator_bot.recurrence import OccurrenceIndex
+from game_coordinator_bot.scheduler import REMINDER_OFFSETS, Reminder, ReminderScheduler
+from game_coordinator_bot.storage.recurring import RecurringSessionRepository
+from game_coordinator_bot.storage.sessions import SCHEDULED, SessionRepository
+from game_coordinator_bot.utils.config import get_game_config
+
+logger = logging.getLogger('game_coordinator.reminders')
+
+
+# Seconds before the start at which each kind of reminder fires
+_OFFSETS = {kind: offset for offset, kind in REMINDER_OFFSETS}
+# The last reminder of an occurrence
+_LAST_KIND = min(REMINDER_OFFSETS)[1]
+
+
+class Reminders(commands.Cog):
+    """Cog that delivers session reminders from the shared scheduler."""
+    
+    def __init__(
+        self,
+        bot: commands.Bot,
+        store: SessionRepository,
+        scheduler: ReminderScheduler,
+        dispatcher: OutboundDispatcher,
+        recurring: Optional[RecurringSessionRepository] = None,
+        index: Optional[OccurrenceIndex] = None
+    ):
+        self.bot = bot
+        self.store = store
+        self.scheduler = scheduler
+        self.dispatcher = dispatcher
+        self.recurring = recurring
+        self.index = index
+    
+    async def cog_load(self):
+        """Reschedule stored sessions and start the scheduler."""
+        # In cluster mode each worker only reminds the guilds its shards serve
+        pending = [
+            session for session in await self.store.pending()
+            if owns_guild(self.bot, session.guild_id)
+        ]
+        for session in pending:
+            self.scheduler.schedule_session(session.id, session.start_time)
+        logger.info(f'Restored reminders for {len(pending)} sessions')
+        
+        if self.recurring is not None and self.index is not None:
+            await self._restore_recurring()
+        self.scheduler.start(self.send_reminders)
+    
+    async def _restore_recurring(self):
+        """Index stored recurring sessions and schedule their next occurrence."""
+        # One-off reminders must still start if the recurring table is unavailable
+        try:
+            active = await self.recurring.active()
+        except (sqlite3.Error, RuntimeError) as e:
+            logger.warning(f'Could not restore recurring sessions: {e}')
+            return
+        series = [session for session in active if owns_guild(self.bot, session.guild_id)]
+        for session in series:
+            start_time = self.index.add(session.id, session.rule, session, session.groups())
+            self.scheduler.schedule_session(session.id, start_time)
+        logger.info(f'Restored {len(series)} recurring sessions')
+    
+    async def cog_unload(self):
+        """Stop the scheduler."""
+        await self.scheduler.stop()
+    
+    async def send_reminders(self, reminders: List[Reminder]):
+        """
+        Deliver a batch of due reminders.
+        
+        Args:
+            reminders: Reminders that are due
+        """
+        for reminder in reminders:
+            session = self.index.get(reminder.session_id) if self.index is not None else None
+            if session is not None:
+                start_time = int(reminder.fire_at) + _OFFSETS[reminder.kind]
+                if reminder.kind == _LAST_KIND:
+                    self.scheduler.schedule_session(session.id, session.rule.next_occurrence(start_time + 1))
+            else:
+                session = await self.store.get(reminder.session_id)
+                if session is None or session.status != SCHEDULED:
+                    continue
+                start_time = session.start_time
+            
+            channel = self.bot.get_channel(session.channel_id)
+            if channel is None:
+                continue
+            
+            game_config = get_game_config(session.game)
+            game_display = game_config.display_name if game_config else session.game
+            
+            if reminder.kind == "start":
+                content = f"🎮 <@{session.organizer_id}>'s **{game_display}** session is starting now!"
+            else:
+                content = f"⏰ <@{session.organizer_id}>'s **{game_display}** session starts <t:{start_time}:R>."
+            
+            try:
+                await self.dispatcher.send(channel, content=content)
+            except discord.HTTPException as e:
+                logger.warning('Failed to send reminder for session %s: %s', session.id, e)
+
+
+async def setup(bot: commands.Bot):
+    """Setup function to add the cog to the bot."""
+    await bot.add_cog(Reminders(
+        bot,
+        bot.session_store,
+        bot.reminder_scheduler,
+        bot.dispatcher,
+        recurring=bot.recurring_sessions,
+        index=bot.recurring_index
+    ))
+    logger.info("Reminders cog loaded")
@@ -0,0 +1,165 @@
+"""
+RSVP Cog
+
+Join/Maybe/Leave buttons on session announcements with a live participant
+list in the embed.
+"""
+
+import copy
+import logging
+from collections import OrderedDict
+from typing import Dict
+import discord
+from discord.ext import commands
+
+from game_coordinator_bot.dispatcher import OutboundDispatcher
+from game_coordinator_bot.storage.sessions import SessionRepository
+from game_coordinator_bot.utils.edit_coalescer import EditCoalescer
+
+logger = logging.getLogger('game_coordinator.rsvp')
+
+
+RSVP_GOING = "going"
+RSVP_MAYBE = "maybe"
+
+# action -> (label, style, resulting status)
+RSVP_ACTIONS = {
+    "join": ("Join", discord.ButtonStyle.success, RSVP_GOING),
+    "maybe": ("Maybe", discord.ButtonStyle.secondary, RSVP_MAYBE),
+    "leave": ("Leave", discord.ButtonStyle.danger, None),
+}
+
+GOING_FIELD = "✅ Going"
+MAYBE_FIELD = "🤔 Maybe"
+
+# Sessions whose RSVPs are kept in memory; the rest are read back from the store
+CACHE_SIZE = 1000
+
+
+class RsvpButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r'rsvp:(?P<action>join|maybe|leave):(?P<session_id>[0-9a-f]+)'
+):
+    """RSVP button whose custom ID carries the action and session ID."""
+    
+    def __init__(self, action: str, session_id: str):
+        label, style, _ = RSVP_ACTIONS[action]
+        super().__init__(discord.ui.Button(
+            label=label,
+            style=style,
+            custom_id=f"rsvp:{action}:{session_id}",
+        ))
+        self.action = action
+        self.session_id = session_id
+    
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match["action"], match["session_id"])
+    
+    async def callback(self, interaction: discord.Interaction):
+        cog = interaction.client.get_cog("Rsvp")
+        if cog is None:
+            await interaction.response.send_message("❌ RSVPs are unavailable right now.", ephemeral=True)
+            return
+        await cog.handle_rsvp(interaction, self.session_id, self.action)
+
+
+def build_rsvp_view(session_id: str) -> discord.ui.View:
+    """
+    Build the Join/Maybe/Leave buttons for a session announcement.
+    
+    Args:
+        session_id: Session identifier
+    
+    Returns:
+        discord.ui.View: Persistent view with the RSVP buttons
+    """
+    view = discord.ui.View(timeout=None)
+    for action in RSVP_ACTIONS:
+        view.add_item(RsvpButton(action, session_id))
+    return view
+
+
+def apply_rsvps(embed: discord.Embed, rsvps: Dict[int, str]) -> discord.Embed:
+    """
+    Copy a session embed with its participant fields updated.
+    
+    Args:
+        embed: Current session embed
+        rsvps: Mapping of user ID to RSVP status
+    
+    Returns:
+        discord.Embed: New embed with Going/Maybe fields
+    """
+    # Embed.copy() shares the field list, so copy the dict form instead
+    updated = discord.Embed.from_dict(copy.deepcopy(embed.to_dict()))
+    for index in reversed(range(len(updated.fields))):
+        if updated.fields[index].name.startswith((GOING_FIELD, MAYBE_FIELD)):
+            updated.remove_field(index)
+    
+    going = [f"<@{user_id}>" for user_id, status in rsvps.items() if status == RSVP_GOING]
+    maybe = [f"<@{user_id}>" for user_id, status in rsvps.items() if status == RSVP_MAYBE]
+    if going:
+        updated.add_field(name=f"{GOING_FIELD} ({len(going)})", value=", ".join(going), inline=False)
+    if maybe:
+        updated.add_field(name=f"{MAYBE_FIELD} ({len(maybe)})", value=", ".join(maybe), inline=False)
+    return updated
+
+
+class Rsvp(commands.Cog):
+    """Cog handling RSVP button clicks on session announcements."""
+    
+    def __init__(
+        self,
+        bot: commands.Bot,
+        store: SessionRepository,
+        dispatcher: OutboundDispatcher,
+        cache_size: int = CACHE_SIZE
+    ):
+        self.bot = bot
+        self.store = store
+        self.coalescer = EditCoalescer(dispatcher)
+        self.cache_size = cache_size
+        # RSVPs of the sessions clicked most recently, least recent first
+        self.rsvps: "OrderedDict[str, Dict[int, str]]" = OrderedDict()
+    
+    async def cog_load(self):
+        """Route RSVP button clicks, including on messages from before a restart."""
+        self.bot.add_dynamic_items(RsvpButton)
+    
+    async def cog_unload(self):
+        """Stop routing RSVP button clicks."""
+        self.bot.remove_dynamic_items(RsvpButton)
+    
+    async def handle_rsvp(self, interaction: discord.Interaction, session_id: str, action: str):
+        """
+        Apply an RSVP click and update the announcement.
+        
+        Args:
+            interaction: Button interaction
+            session_id: Session identifier
+            action: "join", "maybe" or "leave"
+        """
+        rsvps = self.rsvps.get(session_id)
+        if rsvps is None:
+            loaded = await self.store.get_rsvps(session_id)
+            rsvps = self.rsvps.setdefault(session_id, loaded)
+        self.rsvps.move_to_end(session_id)
+        while len(self.rsvps) > self.cache_size:
+            self.rsvps.popitem(last=False)
+        
+        user_id = interaction.user.id
+        status = RSVP_ACTIONS[action][2]
+        rsvps.pop(user_id, None)
+        if status is not None:
+            rsvps[user_id] = status
+        
+        base = interaction.message.embeds[0] if interaction.message and interaction.message.embeds else discord.Embed()
+        await self.coalescer.submit(session_id, interaction, lambda: apply_rsvps(base, rsvps))
+        await self.store.set_rsvp(session_id, user_id, status)
+
+
+async def setup(bot: commands.Bot):
+    """Setup function to add the cog to the bot."""
+    await bot.add_cog(Rsvp(bot, bot.session_store, bot.dispatcher))
+    logger.info("Rsvp cog loaded")
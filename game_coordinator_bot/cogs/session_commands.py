@@ -0,0 +1,188 @@
+"""
+Session Commands Cog
+
+Contains slash commands for listing and cancelling scheduled sessions,
+one-off and recurring.
+"""
+
+import logging
+from typing import List, Optional
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from game_coordinator_bot.dispatcher import OutboundDispatcher, auto_defer
+from game_coordinator_bot.scheduler import ReminderScheduler
+from game_coordinator_bot.storage.recurring import RecurringSession
+from game_coordinator_bot.storage.sessions import SessionRepository
+from game_coordinator_bot.utils.autocomplete import catalog_indexes, to_choices
+from game_coordinator_bot.utils.config import get_game_config, get_platform_name
+
+logger = logging.getLogger('game_coordinator.commands')
+
+
+# Sessions listed by /sessions upcoming
+UPCOMING_LIMIT = 10
+
+
+class SessionCommands(commands.Cog):
+    """Cog for managing scheduled gaming sessions."""
+    
+    sessions = app_commands.Group(
+        name="sessions",
+        description="View and manage scheduled gaming sessions"
+    )
+    
+    def __init__(
+        self,
+        bot: commands.Bot,
+        store: SessionRepository,
+        scheduler: ReminderScheduler,
+        dispatcher: OutboundDispatcher
+    ):
+        self.bot = bot
+        self.store = store
+        self.scheduler = scheduler
+        self.dispatcher = dispatcher
+        self.recurring = getattr(bot, "recurring_sessions", None)
+        self.recurring_index = getattr(bot, "recurring_index", None)
+        self.duplicate_index = getattr(bot, "duplicate_index", None)
+    
+    @sessions.command(name="upcoming", description="List upcoming gaming sessions")
+    @app_commands.describe(game="Only show sessions for this game")
+    @auto_defer(ephemeral=True)
+    async def upcoming_command(
+        self,
+        interaction: discord.Interaction,
+        game: Optional[str] = None
+    ):
+        """
+        List the next scheduled sessions in this server.
+        
+        Args:
+            interaction: Discord interaction object
+            game: Only list sessions for this game ID or name (optional)
+        """
+        game_id = None
+        if game is not None:
+            match = catalog_indexes().games.lookup(game)
+            if match is None:
+                await self.dispatcher.respond(
+                    interaction,
+                    content=f"❌ Unknown game '{game}'.",
+                    ephemeral=True
+                )
+                return
+            game_id = match.value
+        
+        upcoming = [
+            (session.start_time, session)
+            for session in await self.store.upcoming(interaction.guild_id, game=game_id, limit=UPCOMING_LIMIT)
+        ]
+        if self.recurring_index is not None:
+            group = interaction.guild_id if game_id is None else (interaction.guild_id, game_id)
+            upcoming += [
+                (occurrence.start, occurrence.value)
+                for occurrence in self.recurring_index.upcoming(group, limit=UPCOMING_LIMIT, distinct=True)
+            ]
+            upcoming.sort(key=lambda entry: entry[0])
+            del upcoming[UPCOMING_LIMIT:]
+        
+        if not upcoming:
+            await self.dispatcher.respond(
+                interaction,
+                content="No upcoming sessions. Start one with /play!",
+                ephemeral=True
+            )
+            return
+        
+        lines = []
+        for start_time, session in upcoming:
+            game_config = get_game_config(session.game)
+            game_display = game_config.display_name if game_config else session.game
+            mode = game_config.get_mode_by_id(session.mode) if game_config and session.mode else None
+            if mode:
+                game_display = f"{game_display} - {mode.name}"
+            line = (
+                f"`{session.id}` **{game_display}** on {get_platform_name(session.platform)} "
+                f"<t:{start_time}:F> by <@{session.organizer_id}>"
+            )
+            if isinstance(session, RecurringSession):
+                line += f" (🔁 {session.rule.describe()})"
+            lines.append(line)
+        
+        embed = discord.Embed(
+            title="📅 Upcoming Sessions",
+            description="\n".join(lines),
+            color=discord.Color.blue()
+        )
+        await self.dispatcher.respond(interaction, embed=embed, ephemeral=True)
+    
+    @upcoming_command.autocomplete("game")
+    async def game_autocomplete(
+        self,
+        interaction: discord.Interaction,
+        current: str
+    ) -> List[app_commands.Choice[str]]:
+        """Suggest games from the catalog as the user types."""
+        return to_choices(catalog_indexes().games.search(current))
+    
+    @sessions.command(name="cancel", description="Cancel a session you organized")
+    @app_commands.describe(session_id="Session ID from /sessions upcoming")
+    @auto_defer()
+    async def cancel_command(self, interaction: discord.Interaction, session_id: str):
+        """
+        Cancel a scheduled session, or every future occurrence of a recurring one.
+        
+        Only the organizer can cancel their session.
+        
+        Args:
+            interaction: Discord interaction object
+            session_id: Session identifier
+        """
+        session = await self.store.get(session_id.strip())
+        store = self.store
+        if session is None and self.recurring is not None:
+            session = await self.recurring.get(session_id.strip())
+            store = self.recurring
+        
+        if session is None or session.guild_id != interaction.guild_id:
+            await self.dispatcher.respond(
+                interaction,
+                content=f"❌ No session found with ID '{session_id}'.",
+                ephemeral=True
+            )
+            return
+        
+        if session.organizer_id != interaction.user.id:
+            await self.dispatcher.respond(
+                interaction,
+                content="❌ Only the organizer can cancel this session.",
+                ephemeral=True
+            )
+            return
+        
+        if not await store.cancel(session.id, interaction.guild_id):
+            await self.dispatcher.respond(
+                interaction,
+                content=f"❌ Session '{session.id}' is already cancelled.",
+                ephemeral=True
+            )
+            return
+        
+        self.scheduler.cancel_session(session.id)
+        if self.recurring_index is not None:
+            self.recurring_index.remove(session.id)
+        if self.duplicate_index is not None:
+            self.duplicate_index.remove(session.id)
+        await self.dispatcher.respond(interaction, content=f"🗑️ Session `{session.id}` cancelled.")
+        logger.info(
+            "Session %s cancelled by %s", session.id, interaction.user.name,
+            extra={"session_id": session.id, "guild_id": session.guild_id}
+        )
+
+
+async def setup(bot: commands.Bot):
+    """Setup function to add the cog to the bot."""
+    await bot.add_cog(SessionCommands(bot, bot.session_store, bot.reminder_scheduler, bot.dispatcher))
+    logger.info("SessionCommands cog loaded")
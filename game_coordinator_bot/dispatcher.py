@@ -0,0 +1,598 @@
+"""
+Outbound message dispatcher for the Game Coordinator Bot.
+
+Every message the bot sends goes through one ``OutboundDispatcher``. Requests
+are queued per route and released only while the route's rate limit bucket
+has capacity, so reminders, RSVP edits and DMs queue up locally instead of
+cascading into 429s. Buckets follow Discord's ``X-RateLimit-*`` headers,
+read from every HTTP response through an aiohttp trace hook (discord.py only
+hands back messages), and interaction acknowledgements travel in their own
+priority lane ahead of background notifications.
+
+Slash commands decorated with ``auto_defer`` are deferred when their handler
+has not answered within a budget; their replies then go out as follow-ups.
+"""
+
+import asyncio
+import contextvars
+import functools
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Deque, Dict, List, Mapping, Optional, Tuple
+import aiohttp
+import discord
+
+if TYPE_CHECKING:
+    from game_coordinator_bot.metrics import Metrics
+
+logger = logging.getLogger('game_coordinator.dispatcher')
+
+
+class Priority(IntEnum):
+    """Dispatch priority; lower values are sent first."""
+    INTERACTION = 0  # Interaction responses racing the 3-second deadline
+    USER = 1  # Updates a user is waiting to see, e.g. RSVP edits
+    BACKGROUND = 2  # Reminders, DMs and other notifications
+
+
+# Discord's global limit applies to everything except interaction callbacks
+GLOBAL_LIMIT = 50
+GLOBAL_PER = 1.0
+
+# Message routes are limited per channel; assume 5 per 5s until headers say otherwise
+DEFAULT_MESSAGE_LIMIT = 5
+DEFAULT_MESSAGE_PER = 5.0
+
+# Discord fails interactions not acknowledged within 3s; defer well before that
+DEFER_BUDGET = 2.0
+
+# Key in Interaction.extras of the lock serializing a deferral with the reply
+RESPONSE_LOCK = "response_lock"
+# Key in Interaction.extras of the task deferring a command that missed its budget
+DEFERRAL = "deferral"
+# Key in Interaction.extras: whether the "thinking" message of a deferral is
+# ephemeral; removed once a reply has taken its place
+DEFERRED_EPHEMERAL = "deferred_ephemeral"
+
+
+@dataclass(frozen=True)
+class Route:
+    """An API route plus the major parameter its rate limit is scoped to."""
+    method: str
+    path: str
+    major: Optional[int] = None
+    limit: Optional[int] = None  # Default requests per window, None for unlimited
+    per: float = 0.0
+    
+    @property
+    def key(self) -> Tuple[str, str, Optional[int]]:
+        return (self.method, self.path, self.major)
+    
+    @classmethod
+    def send_message(cls, channel_id: Optional[int]) -> "Route":
+        """Route for posting a message in a channel."""
+        return cls(
+            "POST", "/channels/{channel_id}/messages", channel_id,
+            DEFAULT_MESSAGE_LIMIT, DEFAULT_MESSAGE_PER,
+        )
+    
+    @classmethod
+    def edit_message(cls, channel_id: Optional[int]) -> "Route":
+        """Route for editing a message in a channel."""
+        return cls(
+            "PATCH", "/channels/{channel_id}/messages/{message_id}", channel_id,
+            DEFAULT_MESSAGE_LIMIT, DEFAULT_MESSAGE_PER,
+        )
+    
+    @classmethod
+    def interaction(cls, interaction: discord.Interaction) -> "Route":
+        """Route for responding to an interaction."""
+        return cls("POST", "/interactions/{interaction_id}/{token}/callback", interaction.id)
+    
+    @classmethod
+    def followup(cls, interaction: discord.Interaction) -> "Route":
+        """Route for a follow-up message to an acknowledged interaction."""
+        return cls("POST", "/webhooks/{application_id}/{token}", interaction.id)
+    
+    @classmethod
+    def delete_original(cls, interaction: discord.Interaction) -> "Route":
+        """Route for deleting the original response to an interaction."""
+        return cls("DELETE", "/webhooks/{application_id}/{token}/messages/@original", interaction.id)
+
+
+# Route of the request the current dispatch task is sending
+_current_route: "contextvars.ContextVar[Optional[Route]]" = contextvars.ContextVar("dispatch_route", default=None)
+
+
+class RateLimitBucket:
+    """Fixed-window request budget mirroring a Discord rate limit bucket."""
+    
+    __slots__ = ("limit", "per", "remaining", "reset_at")
+    
+    def __init__(self, limit: Optional[int], per: float):
+        self.limit = limit
+        self.per = per
+        self.remaining = limit
+        self.reset_at = 0.0
+    
+    def delay(self, now: float) -> float:
+        """Seconds until a request may be sent (0 if one may go now)."""
+        if self.limit is None:
+            return 0.0
+        if now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = now + self.per
+        return 0.0 if self.remaining > 0 else self.reset_at - now
+    
+    def take(self) -> None:
+        """Spend one request from the current window."""
+        if self.limit is not None:
+            self.remaining -= 1
+    
+    def update(self, headers: Mapping[str, str], now: float) -> None:
+        """
+        Sync the bucket with Discord's rate limit headers.
+        
+        Args:
+            headers: Response headers
+            now: Current monotonic time
+        """
+        limit = headers.get("X-RateLimit-Limit")
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset_after = headers.get("X-RateLimit-Reset-After")
+        if limit is None or remaining is None or reset_after is None:
+            return
+        self.limit = int(limit)
+        self.remaining = int(remaining)
+        # The first response of a window tells us how long windows last
+        if self.remaining == self.limit - 1 or not self.per:
+            self.per = float(reset_after)
+        self.reset_at = now + float(reset_after)
+    
+    def exhaust(self, retry_after: float, now: float) -> None:
+        """Block the bucket after a 429."""
+        if self.limit is None:
+            self.limit = 1
+        self.remaining = 0
+        self.reset_at = now + retry_after
+
+
+class _Job:
+    """A queued outbound request."""
+    
+    __slots__ = ("priority", "seq", "route", "call", "future", "enqueued_at")
+    
+    def __init__(
+        self,
+        priority: Priority,
+        seq: int,
+        route: Route,
+        call: Callable[[], Awaitable[Any]],
+        future: "asyncio.Future[Any]",
+        enqueued_at: float
+    ):
+        self.priority = priority
+        self.seq = seq
+        self.route = route
+        self.call = call
+        self.future = future
+        self.enqueued_at = enqueued_at
+
+
+class _WaitStats:
+    """Queue wait time summary for one priority."""
+    
+    __slots__ = ("count", "total", "max")
+    
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def record(self, wait: float) -> None:
+        self.count += 1
+        self.total += wait
+        if wait > self.max:
+            self.max = wait
+
+
+class OutboundDispatcher:
+    """Rate-limit-aware, prioritized queue for outbound Discord requests."""
+    
+    def __init__(
+        self,
+        global_limit: int = GLOBAL_LIMIT,
+        global_per: float = GLOBAL_PER,
+        clock: Callable[[], float] = time.monotonic,
+        metrics: Optional["Metrics"] = None,
+        defer_budget: float = DEFER_BUDGET
+    ):
+        self._clock = clock
+        self._metrics = metrics
+        self.defer_budget = defer_budget
+        self._global = RateLimitBucket(global_limit, global_per)
+        self._queues: Dict[Tuple, Deque[_Job]] = {}
+        self._route_buckets: Dict[Tuple, RateLimitBucket] = {}
+        self._shared_buckets: Dict[Tuple[str, Optional[int]], RateLimitBucket] = {}
+        # Heads of non-empty route queues: (priority, seq, route key)
+        self._ready: List[Tuple[int, int, Tuple]] = []
+        # Route queues waiting on their bucket: (ready at, priority, seq, route key)
+        self._delayed: List[Tuple[float, int, int, Tuple]] = []
+        self._counter = itertools.count()
+        self._depth: Dict[Priority, int] = {priority: 0 for priority in Priority}
+        self._waits: Dict[Priority, _WaitStats] = {priority: _WaitStats() for priority in Priority}
+        self._in_flight = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self) -> None:
+        """Start the dispatch task."""
+        if self._task is not None:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="outbound-dispatcher")
+    
+    async def stop(self) -> None:
+        """Stop the dispatch task; queued requests are cancelled."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._wakeup = None
+        for queue in self._queues.values():
+            for job in queue:
+                job.future.cancel()
+        self._queues.clear()
+        self._ready.clear()
+        self._delayed.clear()
+        self._depth = {priority: 0 for priority in Priority}
+    
+    async def submit(
+        self,
+        route: Route,
+        call: Callable[[], Awaitable[Any]],
+        priority: Priority = Priority.BACKGROUND
+    ) -> Any:
+        """
+        Queue a request and wait for its result.
+        
+        Args:
+            route: Route the request is rate limited under
+            call: Zero-argument coroutine function performing the request
+            priority: Dispatch priority
+        
+        Returns:
+            Whatever ``call`` returns
+        """
+        if self._task is None:
+            # Not running (e.g. in scripts and tests): send directly
+            return await call()
+        
+        job = _Job(
+            priority, next(self._counter), route, call,
+            asyncio.get_running_loop().create_future(), self._clock(),
+        )
+        queue = self._queues.get(route.key)
+        if queue is None:
+            queue = self._queues[route.key] = deque()
+        queue.append(job)
+        if len(queue) == 1:
+            heapq.heappush(self._ready, (job.priority, job.seq, route.key))
+            self._wake()
+        self._depth[priority] += 1
+        return await job.future
+    
+    async def respond(self, interaction: discord.Interaction, **kwargs) -> Any:
+        """
+        Send an interaction response in the priority lane.
+        
+        Once the interaction has been deferred, the reply is sent as a
+        follow-up instead. The first follow-up replaces the "thinking"
+        message and keeps the visibility chosen when deferring, so if the
+        reply's ``ephemeral`` differs, the "thinking" message is deleted
+        first and the reply posted as a new message.
+        
+        Returns:
+            The callback response, or the follow-up message if deferred
+        """
+        lock = interaction.extras.get(RESPONSE_LOCK)
+        if lock is None:
+            result = await self._reply(interaction, kwargs)
+        else:
+            async with lock:
+                result = await self._reply(interaction, kwargs)
+        if self._metrics is not None:
+            self._metrics.observe_response(interaction)
+        return result
+    
+    async def _reply(self, interaction: discord.Interaction, kwargs: Dict[str, Any]) -> Any:
+        if interaction.response.is_done():
+            deferred_ephemeral = interaction.extras.pop(DEFERRED_EPHEMERAL, None)
+            if deferred_ephemeral is not None and kwargs.get("ephemeral", False) != deferred_ephemeral:
+                # E.g. a private error after a public deferral, which would otherwise show to everyone
+                await self.submit(
+                    Route.delete_original(interaction),
+                    interaction.delete_original_response,
+                    Priority.INTERACTION,
+                )
+            return await self.submit(
+                Route.followup(interaction),
+                lambda: interaction.followup.send(**kwargs),
+                Priority.INTERACTION,
+            )
+        return await self.submit(
+            Route.interaction(interaction),
+            lambda: interaction.response.send_message(**kwargs),
+            Priority.INTERACTION,
+        )
+    
+    async def defer(self, interaction: discord.Interaction, ephemeral: bool = False) -> bool:
+        """
+        Acknowledge an interaction now and send its reply later.
+        
+        Args:
+            interaction: Interaction to acknowledge
+            ephemeral: Whether the reply will only be shown to the user
+        
+        Returns:
+            True if it was deferred, False if it had already been answered
+        """
+        lock = interaction.extras.get(RESPONSE_LOCK)
+        if lock is None:
+            lock = interaction.extras[RESPONSE_LOCK] = asyncio.Lock()
+        async with lock:
+            if interaction.response.is_done():
+                return False
+            await self.submit(
+                Route.interaction(interaction),
+                lambda: interaction.response.defer(ephemeral=ephemeral, thinking=True),
+                Priority.INTERACTION,
+            )
+            interaction.extras[DEFERRED_EPHEMERAL] = ephemeral
+        command = interaction.command.qualified_name if interaction.command else "unknown"
+        if self._metrics is not None:
+            self._metrics.observe_response(interaction)
+            self._metrics.count_deferred(command)
+        logger.info("Deferred /%s; it missed its response budget", command, extra={"command": command})
+        return True
+    
+    async def send(
+        self,
+        channel: discord.abc.Messageable,
+        priority: Priority = Priority.BACKGROUND,
+        **kwargs
+    ) -> Any:
+        """Send a message to a channel."""
+        return await self.submit(
+            Route.send_message(getattr(channel, "id", None)),
+            lambda: channel.send(**kwargs),
+            priority,
+        )
+    
+    async def edit(
+        self,
+        message: discord.Message,
+        priority: Priority = Priority.USER,
+        **kwargs
+    ) -> Any:
+        """Edit a message."""
+        return await self.submit(
+            Route.edit_message(getattr(message.channel, "id", None)),
+            lambda: message.edit(**kwargs),
+            priority,
+        )
+    
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """
+        Hook that feeds rate limit headers back into the buckets.
+        
+        discord.py returns messages rather than responses and retries 429s
+        itself, so the headers are read from every response at the HTTP
+        layer. Pass it as ``http_trace`` to the client, or in
+        ``trace_configs`` of the ``aiohttp.ClientSession`` the requests use.
+        
+        Returns:
+            aiohttp.TraceConfig: Trace config updating the route of the
+            request being dispatched
+        """
+        trace = aiohttp.TraceConfig()
+        trace.on_request_end.append(self._on_request_end)
+        return trace
+    
+    async def _on_request_end(self, session, context, params: aiohttp.TraceRequestEndParams) -> None:
+        # Requests made outside a dispatch task (e.g. gateway setup) have no route
+        route = _current_route.get()
+        if route is not None:
+            self.update_route(route, params.response.headers)
+    
+    def update_route(self, route: Route, headers: Mapping[str, str]) -> None:
+        """
+        Apply rate limit headers from a response on ``route``.
+        
+        Routes that Discord reports under the same bucket hash share one
+        bucket per major parameter from then on.
+        
+        Args:
+            route: Route the response came from
+            headers: Response headers
+        """
+        bucket_hash = headers.get("X-RateLimit-Bucket")
+        bucket = self._bucket(route)
+        if bucket_hash is not None:
+            shared = self._shared_buckets.setdefault((bucket_hash, route.major), bucket)
+            self._route_buckets[route.key] = shared
+            bucket = shared
+        bucket.update(headers, self._clock())
+    
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Snapshot of queue depth and wait times.
+        
+        Returns:
+            Dict with per-priority ``depth`` and ``wait`` (count, mean, max in seconds)
+        """
+        return {
+            "depth": {priority.name.lower(): depth for priority, depth in self._depth.items()},
+            "in_flight": self._in_flight,
+            "wait": {
+                priority.name.lower(): {
+                    "count": stats.count,
+                    "mean": stats.total / stats.count if stats.count else 0.0,
+                    "max": stats.max,
+                }
+                for priority, stats in self._waits.items()
+            },
+        }
+    
+    def _bucket(self, route: Route) -> RateLimitBucket:
+        bucket = self._route_buckets.get(route.key)
+        if bucket is None:
+            bucket = self._route_buckets[route.key] = RateLimitBucket(route.limit, route.per)
+        return bucket
+    
+    async def _run(self) -> None:
+        while True:
+            now = self._clock()
+            while self._delayed and self._delayed[0][0] <= now:
+                _, priority, seq, key = heapq.heappop(self._delayed)
+                heapq.heappush(self._ready, (priority, seq, key))
+            
+            while self._ready:
+                priority, seq, key = self._ready[0]
+                job = self._queues[key][0]
+                wait = self._bucket(job.route).delay(now)
+                if wait <= 0 and priority != Priority.INTERACTION:
+                    wait = self._global.delay(now)
+                if wait > 0:
+                    heapq.heappop(self._ready)
+                    heapq.heappush(self._delayed, (now + wait, priority, seq, key))
+                    continue
+                
+                heapq.heappop(self._ready)
+                self._dispatch(key, now)
+            
+            timeout = self._delayed[0][0] - now if self._delayed else None
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+    
+    def _dispatch(self, key: Tuple, now: float) -> None:
+        queue = self._queues[key]
+        job = queue.popleft()
+        if queue:
+            head = queue[0]
+            heapq.heappush(self._ready, (head.priority, head.seq, key))
+        else:
+            del self._queues[key]
+        
+        self._bucket(job.route).take()
+        if job.priority != Priority.INTERACTION:
+            self._global.take()
+        self._depth[job.priority] -= 1
+        self._waits[job.priority].record(now - job.enqueued_at)
+        self._in_flight += 1
+        asyncio.create_task(self._execute(job))
+    
+    async def _execute(self, job: _Job) -> None:
+        # Each job runs in its own task, so the trace hook sees this job's route
+        _current_route.set(job.route)
+        try:
+            result = await job.call()
+        except discord.HTTPException as e:
+            # discord.py gave up retrying; the trace hook has seen the headers
+            if e.status == 429:
+                self._retry(job, getattr(e.response, "headers", None))
+            elif not job.future.done():
+                job.future.set_exception(e)
+        except Exception as e:
+            if not job.future.done():
+                job.future.set_exception(e)
+        else:
+            if not job.future.done():
+                job.future.set_result(result)
+        finally:
+            self._in_flight -= 1
+    
+    def _retry(self, job: _Job, headers: Optional[Mapping[str, str]]) -> None:
+        """Put a rate-limited job back at the front of its route queue."""
+        if self._task is None:
+            # Stopped while the request was in flight; like queued requests, it is cancelled
+            job.future.cancel()
+            return
+        retry_after = float((headers or {}).get("Retry-After", 1.0))
+        self._bucket(job.route).exhaust(retry_after, self._clock())
+        logger.warning('Rate limited on %s %s; retrying in %.2fs', job.route.method, job.route.path, retry_after)
+        
+        queue = self._queues.get(job.route.key)
+        if queue is None:
+            queue = self._queues[job.route.key] = deque()
+            heapq.heappush(self._ready, (job.priority, job.seq, job.route.key))
+        queue.appendleft(job)
+        self._depth[job.priority] += 1
+        self._wake()
+    
+    def _wake(self) -> None:
+        """Let the dispatch task look at the queues again."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+
+def auto_defer(budget: Optional[float] = None, ephemeral: bool = False):
+    """
+    Defer a slash command whose handler has not answered within a budget.
+    
+    Decorates a cog's command callback (below the ``app_commands``
+    decorators). The handler keeps replying with ``dispatcher.respond``;
+    if it is still working when the budget runs out, the interaction is
+    deferred and the reply goes out as a follow-up. The cog must have a
+    ``dispatcher`` attribute.
+    
+    Args:
+        budget: Seconds the handler has to answer (defaults to the
+            dispatcher's ``defer_budget``)
+        ephemeral: Whether the "thinking" message is only shown to the
+            user; set it when the command's replies are private. A reply
+            of the other visibility is posted as a new message instead
+            (see ``OutboundDispatcher.respond``)
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, interaction: discord.Interaction, *args, **kwargs):
+            dispatcher: Optional[OutboundDispatcher] = self.dispatcher
+            if dispatcher is None:
+                return await func(self, interaction, *args, **kwargs)
+            
+            interaction.extras[RESPONSE_LOCK] = asyncio.Lock()
+            # A timer rather than a task, and no closure: the fast path only allocates the handle
+            timer = asyncio.get_running_loop().call_later(
+                dispatcher.defer_budget if budget is None else budget,
+                _start_deferral, dispatcher, interaction, ephemeral,
+            )
+            try:
+                return await func(self, interaction, *args, **kwargs)
+            finally:
+                timer.cancel()
+                deferral = interaction.extras.pop(DEFERRAL, None)
+                if deferral is not None:
+                    try:
+                        await deferral
+                    except Exception as e:
+                        logger.warning("Failed to defer interaction %s: %s", interaction.id, e)
+        return wrapper
+    return decorator
+
+
+def _start_deferral(dispatcher: OutboundDispatcher, interaction: discord.Interaction, ephemeral: bool) -> None:
+    """Timer callback of ``auto_defer``: start deferring the interaction."""
+    interaction.extras[DEFERRAL] = asyncio.create_task(dispatcher.defer(interaction, ephemeral))
@@ -0,0 +1,144 @@
+"""
+Duplicate session detection for the Game Coordinator Bot.
+
+In a busy server several members often ``/play`` the same game at about the
+same time, and every announcement pings @everyone again. The index keeps the
+upcoming sessions in memory, bucketed by (guild, game, mode, platform) and
+start time in buckets one window wide, so any session starting within a
+window of a new one is in its own bucket or one of the two next to it: three
+dict lookups, whatever the number of sessions.
+
+Sessions leave the index once their start time passes. Expiry is driven by a
+min-heap of start times, popped on every add and lookup, as in the scheduler.
+"""
+
+import heapq
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from game_coordinator_bot.storage.sessions import Session
+
+
+# Sessions starting within this many seconds of each other are duplicates
+DUPLICATE_WINDOW = 30 * 60
+
+BucketKey = Tuple[Optional[int], str, Optional[str], str, int]
+
+
+class DuplicateIndex:
+    """Upcoming sessions by guild, game, mode, platform and start time."""
+    
+    def __init__(self, window: int = DUPLICATE_WINDOW, clock: Callable[[], float] = time.time):
+        self.window = window
+        self._clock = clock
+        self._buckets: Dict[BucketKey, Dict[str, Session]] = {}
+        self._keys: Dict[str, BucketKey] = {}
+        # (start_time, session_id); entries of removed sessions are skipped when popped
+        self._expiry: List[Tuple[int, str]] = []
+    
+    def __len__(self) -> int:
+        """Number of indexed sessions that have not started."""
+        self.expire()
+        return len(self._keys)
+    
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._keys
+    
+    def _key(self, guild_id: Optional[int], game: str, mode: Optional[str], platform: str, start_time: int) -> BucketKey:
+        return guild_id, game, mode, platform, start_time // self.window
+    
+    def add(self, session: Session) -> bool:
+        """
+        Index a session until it starts, replacing one with the same ID.
+        
+        Args:
+            session: Session to index
+        
+        Returns:
+            True if it was indexed, False if it has already started
+        """
+        now = self._clock()
+        self.expire(now)
+        self.remove(session.id)
+        if session.start_time <= now:
+            return False
+        key = self._key(session.guild_id, session.game, session.mode, session.platform, session.start_time)
+        self._buckets.setdefault(key, {})[session.id] = session
+        self._keys[session.id] = key
+        heapq.heappush(self._expiry, (session.start_time, session.id))
+        return True
+    
+    def remove(self, session_id: str) -> bool:
+        """
+        Stop indexing a session (e.g., once it is cancelled).
+        
+        Returns:
+            True if the session was indexed
+        """
+        key = self._keys.pop(session_id, None)
+        if key is None:
+            return False
+        bucket = self._buckets[key]
+        del bucket[session_id]
+        if not bucket:
+            del self._buckets[key]
+        return True
+    
+    def expire(self, now: Optional[float] = None) -> int:
+        """
+        Drop the sessions that have started.
+        
+        Args:
+            now: Unix timestamp to compare against (defaults to now)
+        
+        Returns:
+            Number of sessions dropped
+        """
+        if now is None:
+            now = self._clock()
+        expiry = self._expiry
+        dropped = 0
+        while expiry and expiry[0][0] <= now:
+            start_time, session_id = heapq.heappop(expiry)
+            key = self._keys.get(session_id)
+            # Skip entries of sessions removed, or removed and added again
+            if key is not None and self._buckets[key][session_id].start_time == start_time:
+                self.remove(session_id)
+                dropped += 1
+        return dropped
+    
+    def find(
+        self,
+        guild_id: Optional[int],
+        game: str,
+        mode: Optional[str],
+        platform: str,
+        start_time: int,
+        now: Optional[float] = None
+    ) -> Optional[Session]:
+        """
+        Find the upcoming session closest to a start time, within the window.
+        
+        Args:
+            guild_id: Guild the session is in
+            game: Game ID
+            mode: Mode ID, if the game has modes
+            platform: Platform ID
+            start_time: Unix timestamp of the new session
+            now: Unix timestamp to compare against (defaults to now)
+        
+        Returns:
+            The matching session, or None if there is none
+        """
+        self.expire(now)
+        key = self._key(guild_id, game, mode, platform, start_time)
+        best: Optional[Session] = None
+        for offset in (-1, 0, 1):
+            sessions = self._buckets.get(key[:4] + (key[4] + offset,))
+            if not sessions:
+                continue
+            for session in sessions.values():
+                gap = abs(session.start_time - start_time)
+                if gap <= self.window and (best is None or gap < abs(best.start_time - start_time)):
+                    best = session
+        return best
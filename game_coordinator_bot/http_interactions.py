@@ -0,0 +1,507 @@
+"""
+HTTP interactions endpoint for the Game Coordinator Bot.
+
+Alternative entry point to the gateway bot: Discord POSTs every interaction
+to this server (the application's "Interactions Endpoint URL") and the first
+response is sent back as the HTTP reply. Requests are verified against the
+application's Ed25519 public key with PyNaCl.
+
+Slash commands run the same ``GameCommands``, ``SessionCommands`` and
+``AvailabilityCommands`` code as the gateway bot, through a stand-in for ``discord.Interaction``; RSVP clicks
+are applied straight to the session store. A worker keeps nothing between
+requests that another worker needs, so several can run behind a load
+balancer, or share one port (``SO_REUSEPORT``) on a single host.
+
+Once an endpoint URL is set Discord stops sending interactions over the
+gateway. Slash commands are still synced by the gateway bot
+(``python -m game_coordinator_bot.bot --force-sync``), and reminders are
+only sent by a gateway bot, for the sessions it loaded at startup.
+
+Run with: python -m game_coordinator_bot.http_interactions
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Set, Tuple
+import aiohttp
+import discord
+from aiohttp import web
+from discord import app_commands
+from discord.ext import commands
+from dotenv import load_dotenv
+from nacl.exceptions import BadSignatureError
+from nacl.signing import VerifyKey
+
+from game_coordinator_bot.cogs.availability_commands import AvailabilityCommands
+from game_coordinator_bot.cogs.game_commands import GameCommands
+from game_coordinator_bot.cogs.rsvp import RSVP_ACTIONS, apply_rsvps
+from game_coordinator_bot.cogs.session_commands import SessionCommands
+from game_coordinator_bot.dispatcher import OutboundDispatcher
+from game_coordinator_bot.metrics import Metrics, MetricsServer
+from game_coordinator_bot.scheduler import ReminderScheduler
+from game_coordinator_bot.storage.availability import AvailabilityRepository
+from game_coordinator_bot.storage.database import Database
+from game_coordinator_bot.storage.preferences import UserPreferences
+from game_coordinator_bot.storage.sessions import SessionRepository
+from game_coordinator_bot.utils.catalog_watcher import CatalogWatcher
+from game_coordinator_bot.utils.config import DEFAULT_CATALOG_PATH, load_catalog, set_catalog
+from game_coordinator_bot.utils.gateway_profile import use_endpoints
+from game_coordinator_bot.utils.log_pipeline import configure_logging
+from game_coordinator_bot.watchdog import LoopWatchdog
+
+logger = logging.getLogger('game_coordinator.http')
+
+
+# Interaction types
+PING = 1
+APPLICATION_COMMAND = 2
+MESSAGE_COMPONENT = 3
+AUTOCOMPLETE = 4
+
+# Interaction callback types
+PONG = 1
+CHANNEL_MESSAGE = 4
+DEFERRED_CHANNEL_MESSAGE = 5
+DEFERRED_UPDATE_MESSAGE = 6
+UPDATE_MESSAGE = 7
+AUTOCOMPLETE_RESULT = 8
+
+# Discord gives up on a reply after 3s; auto_defer normally answers by then
+RESPONSE_TIMEOUT = 3.0
+
+EPHEMERAL = discord.MessageFlags(ephemeral=True).value
+
+
+def message_data(
+    content: Optional[str] = None,
+    *,
+    embed: Optional[discord.Embed] = None,
+    embeds: Optional[List[discord.Embed]] = None,
+    view: Optional[discord.ui.View] = None,
+    ephemeral: bool = False,
+    allowed_mentions: Optional[discord.AllowedMentions] = None
+) -> Dict[str, Any]:
+    """
+    Build a message payload from ``send_message`` style arguments.
+    
+    Returns:
+        The JSON-ready message data
+    """
+    data: Dict[str, Any] = {}
+    if content is not None:
+        data["content"] = str(content)
+    if embed is not None:
+        embeds = [embed]
+    if embeds is not None:
+        data["embeds"] = [item.to_dict() for item in embeds]
+    if view is not None:
+        data["components"] = view.to_components()
+    if allowed_mentions is not None:
+        data["allowed_mentions"] = allowed_mentions.to_dict()
+    if ephemeral:
+        data["flags"] = EPHEMERAL
+    return data
+
+
+class _Options(SimpleNamespace):
+    """Option values by name; options the user has not filled in are None."""
+    
+    def __getattr__(self, name: str) -> Any:
+        return None
+
+
+class HttpInteractionResponse:
+    """
+    Stands in for ``discord.InteractionResponse``.
+    
+    The first response resolves ``reply``, which the server sends back as
+    the body of Discord's request.
+    """
+    
+    def __init__(self, interaction: "HttpInteraction"):
+        self._interaction = interaction
+        self.reply: asyncio.Future = asyncio.get_running_loop().create_future()
+    
+    def is_done(self) -> bool:
+        return self.reply.done()
+    
+    def _respond(self, reply: Dict[str, Any]) -> None:
+        if self.reply.done():
+            raise discord.InteractionResponded(self._interaction)
+        self.reply.set_result(reply)
+    
+    async def send_message(self, content: Optional[str] = None, **kwargs) -> SimpleNamespace:
+        """Reply with a message; its ID is not known until Discord posts it."""
+        self._respond({"type": CHANNEL_MESSAGE, "data": message_data(content, **kwargs)})
+        return SimpleNamespace(message_id=None)
+    
+    async def defer(self, *, ephemeral: bool = False, thinking: bool = False) -> None:
+        """Acknowledge now; the reply follows with ``followup.send``."""
+        if self._interaction.type == MESSAGE_COMPONENT and not thinking:
+            self._respond({"type": DEFERRED_UPDATE_MESSAGE})
+        else:
+            self._respond({"type": DEFERRED_CHANNEL_MESSAGE, "data": {"flags": EPHEMERAL} if ephemeral else {}})
+    
+    async def edit_message(self, **kwargs) -> None:
+        """Update the message a component belongs to."""
+        self._respond({"type": UPDATE_MESSAGE, "data": message_data(**kwargs)})
+    
+    async def autocomplete(self, choices: List[app_commands.Choice]) -> None:
+        """Answer an autocomplete request."""
+        self._respond({
+            "type": AUTOCOMPLETE_RESULT,
+            "data": {"choices": [{"name": choice.name, "value": choice.value} for choice in choices[:25]]},
+        })
+
+
+class HttpFollowup:
+    """Stands in for ``discord.Interaction.followup``: posts to the interaction webhook."""
+    
+    def __init__(self, session: Optional[aiohttp.ClientSession], application_id: int, token: str):
+        self._session = session
+        self._application_id = application_id
+        self._token = token
+    
+    async def send(self, content: Optional[str] = None, **kwargs) -> SimpleNamespace:
+        """
+        Send a follow-up message.
+        
+        Returns:
+            The created message (only its ``id`` is filled in)
+        
+        Raises:
+            discord.HTTPException: If Discord rejected the message
+        """
+        url = f"{discord.http.Route.BASE}/webhooks/{self._application_id}/{self._token}?wait=true"
+        async with self._session.post(url, json=message_data(content, **kwargs)) as response:
+            data = await response.json(content_type=None)
+            if response.status >= 400:
+                raise discord.HTTPException(response, data)
+        return SimpleNamespace(id=int(data["id"]))
+
+
+class HttpInteraction:
+    """The parts of ``discord.Interaction`` the cogs read, built from a webhook payload."""
+    
+    def __init__(self, payload: Dict[str, Any], session: Optional[aiohttp.ClientSession] = None):
+        self.id = int(payload["id"])
+        self.type = payload["type"]
+        self.application_id = int(payload["application_id"])
+        self.token = payload["token"]
+        self.data: Dict[str, Any] = payload.get("data") or {}
+        self.guild_id = _snowflake(payload.get("guild_id"))
+        self.channel_id = _snowflake(payload.get("channel_id") or (payload.get("channel") or {}).get("id"))
+        member = payload.get("member")
+        self.user = discord.User(state=None, data=member["user"] if member else payload["user"])
+        self.message: Optional[Dict[str, Any]] = payload.get("message")
+        self.command: Optional[app_commands.Command] = None
+        self.namespace = _Options()
+        self.extras: Dict[str, Any] = {}
+        self.response = HttpInteractionResponse(self)
+        self.followup = HttpFollowup(session, self.application_id, self.token)
+        self._session = session
+    
+    async def delete_original_response(self) -> None:
+        """
+        Delete the original response, e.g. a deferral's "thinking" message.
+        
+        Raises:
+            discord.HTTPException: If Discord rejected the request
+        """
+        url = f"{discord.http.Route.BASE}/webhooks/{self.application_id}/{self.token}/messages/@original"
+        async with self._session.delete(url) as response:
+            if response.status >= 400:
+                raise discord.HTTPException(response, await response.json(content_type=None))
+
+
+class InteractionsEndpoint:
+    """Verifies interactions POSTed by Discord and dispatches them to the cogs."""
+    
+    def __init__(
+        self,
+        public_key: str,
+        session_store: Optional[SessionRepository] = None,
+        user_preferences: Optional[UserPreferences] = None,
+        availability: Optional[AvailabilityRepository] = None,
+        metrics: Optional[Metrics] = None,
+        dispatcher: Optional[OutboundDispatcher] = None,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        reuse_port: bool = False
+    ):
+        self._verify_key = VerifyKey(bytes.fromhex(public_key))
+        self.host = host
+        self.port = port
+        self.reuse_port = reuse_port
+        # Read by the cogs in place of the bot's attributes
+        self.session_store = session_store
+        self.user_preferences = user_preferences
+        self.availability = availability
+        self.metrics = metrics
+        self.dispatcher = dispatcher if dispatcher is not None else OutboundDispatcher(metrics=metrics)
+        # Reminders are sent by the gateway bot; cancelling only updates the store
+        self.reminder_scheduler = None
+        
+        self.game_commands = GameCommands(self)
+        cogs: List[commands.Cog] = [self.game_commands]
+        if session_store is not None:
+            cogs.append(SessionCommands(self, session_store, ReminderScheduler(), self.dispatcher))
+        if availability is not None:
+            cogs.append(AvailabilityCommands(self, availability, self.dispatcher))
+        self._commands: Dict[str, app_commands.Command] = {
+            command.qualified_name: command
+            for cog in cogs
+            for command in cog.walk_app_commands()
+            if isinstance(command, app_commands.Command)
+        }
+        self._tasks: Set[asyncio.Task] = set()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._runner: Optional[web.AppRunner] = None
+    
+    async def start(self) -> None:
+        """Start listening; port 0 picks a free port."""
+        self._session = aiohttp.ClientSession(trace_configs=[self.dispatcher.trace_config()])
+        app = web.Application()
+        app.router.add_post("/interactions", self._handle_request)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port, reuse_port=self.reuse_port or None)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        logger.info("Serving interactions on http://%s:%s/interactions", self.host, self.port)
+    
+    async def stop(self) -> None:
+        """Stop listening, after the follow-ups still being sent."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        self.game_commands.cog_unload()
+    
+    def verify(self, signature: str, timestamp: str, body: bytes) -> bool:
+        """
+        Check a request's Ed25519 signature.
+        
+        Args:
+            signature: X-Signature-Ed25519 header (hex)
+            timestamp: X-Signature-Timestamp header
+            body: Raw request body
+        
+        Returns:
+            True if the application's key signed timestamp + body
+        """
+        try:
+            self._verify_key.verify(timestamp.encode() + body, bytes.fromhex(signature))
+        except (BadSignatureError, ValueError):
+            return False
+        return True
+    
+    async def _handle_request(self, request: web.Request) -> web.Response:
+        signature = request.headers.get("X-Signature-Ed25519")
+        timestamp = request.headers.get("X-Signature-Timestamp")
+        body = await request.read()
+        if not signature or not timestamp or not self.verify(signature, timestamp, body):
+            return web.Response(status=401, text="invalid request signature")
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return web.Response(status=400, text="invalid JSON")
+        
+        reply = await self.handle(payload)
+        return web.Response(body=json.dumps(reply).encode(), content_type="application/json")
+    
+    async def handle(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Dispatch a verified interaction.
+        
+        Args:
+            payload: Interaction payload
+        
+        Returns:
+            The interaction response to send back to Discord
+        """
+        if payload["type"] == PING:
+            return {"type": PONG}
+        
+        interaction = HttpInteraction(payload, self._session)
+        if interaction.type == APPLICATION_COMMAND:
+            if self.metrics is not None:
+                self.metrics.mark_received(interaction)
+            work = self._run_command(interaction)
+        elif interaction.type == AUTOCOMPLETE:
+            work = self._run_autocomplete(interaction)
+        elif interaction.type == MESSAGE_COMPONENT:
+            work = self._run_component(interaction)
+        else:
+            return _error_reply("❌ This interaction is not supported.")
+        
+        # The handler may go on (deferred, sending follow-ups) after the reply
+        task = asyncio.create_task(work)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        await asyncio.wait((task, interaction.response.reply), timeout=RESPONSE_TIMEOUT, return_when=asyncio.FIRST_COMPLETED)
+        if interaction.response.reply.done():
+            return interaction.response.reply.result()
+        if not task.done():
+            logger.warning("Interaction %s got no response within %.0fs", interaction.id, RESPONSE_TIMEOUT)
+        return _error_reply("❌ Something went wrong. Please try again.")
+    
+    async def _run_command(self, interaction: HttpInteraction) -> None:
+        name, options = _command_options(interaction.data)
+        command = self._commands.get(name)
+        if command is None:
+            await interaction.response.send_message("❌ This command is not available.", ephemeral=True)
+            return
+        interaction.command = command
+        
+        kwargs: Dict[str, Any] = {}
+        for option in options:
+            param = command._params.get(option["name"])
+            if param is None:
+                continue
+            value = option["value"]
+            if param.choices:
+                value = next((choice for choice in param.choices if choice.value == value), None)
+                if value is None:
+                    await interaction.response.send_message(f"❌ Invalid {param.display_name}.", ephemeral=True)
+                    return
+            kwargs[param.name] = value
+        
+        try:
+            await command.callback(command.binding, interaction, **kwargs)
+        except Exception:
+            logger.exception("Command /%s failed", name, extra={"command": name})
+            if self.metrics is not None:
+                self.metrics.count_error(name, "exception")
+    
+    async def _run_autocomplete(self, interaction: HttpInteraction) -> None:
+        name, options = _command_options(interaction.data)
+        command = self._commands.get(name)
+        focused = next((option for option in options if option.get("focused")), None)
+        param = command._params.get(focused["name"]) if command and focused else None
+        if param is None or param.autocomplete is None:
+            await interaction.response.autocomplete([])
+            return
+        interaction.command = command
+        interaction.namespace = _Options(**{option["name"]: option["value"] for option in options})
+        
+        if getattr(param.autocomplete, "pass_command_binding", False):
+            choices = await param.autocomplete(command.binding, interaction, str(focused["value"]))
+        else:
+            choices = await param.autocomplete(interaction, str(focused["value"]))
+        await interaction.response.autocomplete(choices)
+    
+    async def _run_component(self, interaction: HttpInteraction) -> None:
+        parts = interaction.data.get("custom_id", "").split(":")
+        if len(parts) != 3 or parts[0] != "rsvp" or parts[1] not in RSVP_ACTIONS or self.session_store is None:
+            await interaction.response.send_message("❌ This button is not available.", ephemeral=True)
+            return
+        _, action, session_id = parts
+        
+        # Read from the store every time; another worker may have the last click
+        status = RSVP_ACTIONS[action][2]
+        await self.session_store.set_rsvp(session_id, interaction.user.id, status)
+        rsvps = await self.session_store.get_rsvps(session_id)
+        
+        embeds = (interaction.message or {}).get("embeds") or []
+        base = discord.Embed.from_dict(embeds[0]) if embeds else discord.Embed()
+        await interaction.response.edit_message(embed=apply_rsvps(base, rsvps))
+
+
+def _command_options(data: Dict[str, Any]) -> Tuple[str, List[Dict[str, Any]]]:
+    """Qualified command name and leaf options, unwrapping subcommands."""
+    name = data.get("name", "")
+    options = data.get("options") or []
+    # Subcommand (1) and subcommand group (2) options nest the real ones
+    while options and options[0].get("type") in (1, 2):
+        name = f"{name} {options[0]['name']}"
+        options = options[0].get("options") or []
+    return name, options
+
+
+def _error_reply(content: str) -> Dict[str, Any]:
+    return {"type": CHANNEL_MESSAGE, "data": {"content": content, "flags": EPHEMERAL}}
+
+
+def _snowflake(value: Optional[str]) -> Optional[int]:
+    return int(value) if value is not None else None
+
+
+async def main(port: Optional[int] = None) -> None:
+    """Run an interactions endpoint worker."""
+    public_key = os.getenv('DISCORD_PUBLIC_KEY')
+    if not public_key:
+        logger.error('DISCORD_PUBLIC_KEY not found in environment variables')
+        return
+    use_endpoints(os.getenv('DISCORD_API_URL'))
+    
+    catalog_path = os.getenv('GAME_CATALOG_PATH') or DEFAULT_CATALOG_PATH
+    if catalog_path != DEFAULT_CATALOG_PATH:
+        set_catalog(load_catalog(catalog_path))
+        logger.info(f'Loaded game catalog from {catalog_path}')
+    catalog_watcher = CatalogWatcher(catalog_path)
+    
+    database = Database(os.getenv('DATABASE_PATH', 'data/game_coordinator.db'))
+    metrics = Metrics()
+    endpoint = InteractionsEndpoint(
+        public_key,
+        session_store=SessionRepository(database),
+        user_preferences=UserPreferences(database),
+        availability=AvailabilityRepository(database),
+        metrics=metrics,
+        dispatcher=OutboundDispatcher(metrics=metrics, defer_budget=float(os.getenv('INTERACTION_DEFER_BUDGET', '2.0'))),
+        host=os.getenv('INTERACTIONS_HOST', '127.0.0.1'),
+        port=port if port is not None else int(os.getenv('INTERACTIONS_PORT', '8080')),
+        # Workers started on the same port share it; the kernel spreads the connections
+        reuse_port=hasattr(socket, 'SO_REUSEPORT'),
+    )
+    metrics_port = os.getenv('METRICS_PORT')
+    metrics_server = MetricsServer(metrics, os.getenv('METRICS_HOST', '127.0.0.1'), int(metrics_port)) if metrics_port else None
+    loop_watchdog = LoopWatchdog()
+    metrics.add_gauge('event_loop_lag_seconds', 'Most recent event loop lag.', lambda: loop_watchdog.lag)
+    
+    endpoint.dispatcher.start()
+    await endpoint.session_store.open()
+    await endpoint.user_preferences.open()
+    await endpoint.availability.open()
+    try:
+        catalog_watcher.start()
+        if metrics_server is not None:
+            await metrics_server.start()
+        await endpoint.start()
+        loop_watchdog.start()
+        await asyncio.Event().wait()
+    finally:
+        await endpoint.stop()
+        await catalog_watcher.stop()
+        if metrics_server is not None:
+            await metrics_server.stop()
+        # See Database for the order
+        await endpoint.user_preferences.close()
+        await endpoint.session_store.close()
+        await endpoint.dispatcher.stop()
+        await loop_watchdog.stop()
+
+
+if __name__ == '__main__':
+    load_dotenv()
+    configure_logging(
+        level=logging.getLevelName(os.getenv('LOG_LEVEL', 'INFO').upper()),
+        log_format=os.getenv('LOG_FORMAT', 'json').lower(),
+    )
+    parser = argparse.ArgumentParser(description='Serve Discord interactions over HTTP')
+    parser.add_argument('--port', type=int, help='Port to listen on (default: INTERACTIONS_PORT or 8080)')
+    args = parser.parse_args()
+    try:
+        asyncio.run(main(args.port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,253 @@
+"""
+Metrics for the Game Coordinator Bot.
+
+Records per-command latency from interaction receipt to first response,
+rejected commands per reason, deferred commands and handled events, and
+serves them together with gateway latency and queue depths on a local
+``/metrics`` endpoint in the Prometheus text format. Recording is a dict
+lookup and a bisect over fixed buckets; gauges are only read when the
+endpoint is scraped.
+"""
+
+import logging
+import math
+import time
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Callable, Dict, List, Mapping, Optional, Tuple, Union
+import discord
+from discord import app_commands
+
+if TYPE_CHECKING:
+    from aiohttp import web
+
+logger = logging.getLogger('game_coordinator.metrics')
+
+
+# Upper bounds in seconds; Discord fails interactions not answered within 3s
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 3.0, 5.0)
+
+PREFIX = "game_coordinator_"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+GaugeValue = Union[float, Mapping[str, float]]
+
+
+class Histogram:
+    """Counts of observations per fixed bucket, plus their sum."""
+    
+    __slots__ = ("buckets", "counts", "sum", "count")
+    
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+    
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, count) pairs in Prometheus order, ending with +Inf."""
+        pairs, total = [], 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            pairs.append((_format_value(bound), total))
+        pairs.append(("+Inf", self.count))
+        return pairs
+
+
+class _Gauge:
+    __slots__ = ("name", "help", "label", "collect")
+    
+    def __init__(self, name: str, help: str, label: Optional[str], collect: Callable[[], GaugeValue]):
+        self.name = name
+        self.help = help
+        self.label = label
+        self.collect = collect
+
+
+class Metrics:
+    """Registry of the bot's metrics."""
+    
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self.latency: Dict[str, Histogram] = {}
+        self.errors: Dict[Tuple[str, str], int] = {}
+        self.deferred: Dict[str, int] = {}
+        self.events: Dict[str, int] = {}
+        self._gauges: List[_Gauge] = []
+    
+    def mark_received(self, interaction: discord.Interaction) -> None:
+        """Stamp an interaction with the time it was received."""
+        interaction.extras["received_at"] = self.clock()
+    
+    def observe_response(self, interaction: discord.Interaction) -> None:
+        """
+        Record the latency of an interaction's first response.
+        
+        Later responses, and interactions that were never stamped, are ignored.
+        
+        Args:
+            interaction: Interaction that has just been answered
+        """
+        received_at = interaction.extras.pop("received_at", None)
+        if received_at is None:
+            return
+        command = interaction.command.qualified_name if interaction.command else "unknown"
+        histogram = self.latency.get(command)
+        if histogram is None:
+            histogram = self.latency[command] = Histogram()
+        histogram.observe(self.clock() - received_at)
+    
+    def count_error(self, command: str, reason: str) -> None:
+        """
+        Count a command that failed or rejected its input.
+        
+        Args:
+            command: Command name
+            reason: Short, fixed reason (e.g. "missing_mode", "unparsable_time")
+        """
+        key = (command, reason)
+        self.errors[key] = self.errors.get(key, 0) + 1
+    
+    def count_deferred(self, command: str) -> None:
+        """Count a command that missed its response budget and was deferred."""
+        self.deferred[command] = self.deferred.get(command, 0) + 1
+    
+    def count_event(self, event: str) -> None:
+        """Count a handled event (e.g. "ready")."""
+        self.events[event] = self.events.get(event, 0) + 1
+    
+    def add_gauge(
+        self,
+        name: str,
+        help: str,
+        collect: Callable[[], GaugeValue],
+        label: Optional[str] = None
+    ) -> None:
+        """
+        Register a gauge read at scrape time.
+        
+        Args:
+            name: Metric name without the common prefix
+            help: Help text
+            collect: Returns the value, or a mapping of label value to value
+            label: Label name when collect returns a mapping
+        """
+        self._gauges.append(_Gauge(PREFIX + name, help, label, collect))
+    
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines = []
+        
+        name = PREFIX + "command_latency_seconds"
+        lines.append(f"# HELP {name} Time from interaction receipt to first response.")
+        lines.append(f"# TYPE {name} histogram")
+        for command, histogram in sorted(self.latency.items()):
+            labels = f'command="{_escape(command)}"'
+            for bound, count in histogram.cumulative():
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f"{name}_sum{{{labels}}} {_format_value(histogram.sum)}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        
+        name = PREFIX + "command_errors_total"
+        lines.append(f"# HELP {name} Commands that failed or rejected their input, by reason.")
+        lines.append(f"# TYPE {name} counter")
+        for (command, reason), count in sorted(self.errors.items()):
+            lines.append(f'{name}{{command="{_escape(command)}",reason="{_escape(reason)}"}} {count}')
+        
+        name = PREFIX + "command_deferred_total"
+        lines.append(f"# HELP {name} Commands deferred because they missed their response budget.")
+        lines.append(f"# TYPE {name} counter")
+        for command, count in sorted(self.deferred.items()):
+            lines.append(f'{name}{{command="{_escape(command)}"}} {count}')
+        
+        name = PREFIX + "events_total"
+        lines.append(f"# HELP {name} Handled events.")
+        lines.append(f"# TYPE {name} counter")
+        for event, count in sorted(self.events.items()):
+            lines.append(f'{name}{{event="{_escape(event)}"}} {count}')
+        
+        for gauge in self._gauges:
+            try:
+                value = gauge.collect()
+            except Exception as e:
+                logger.warning(f"Failed to collect {gauge.name}: {e}")
+                continue
+            lines.append(f"# HELP {gauge.name} {gauge.help}")
+            lines.append(f"# TYPE {gauge.name} gauge")
+            if isinstance(value, Mapping):
+                for label_value, item in value.items():
+                    lines.append(f'{gauge.name}{{{gauge.label}="{_escape(str(label_value))}"}} {_format_value(item)}')
+            else:
+                lines.append(f"{gauge.name} {_format_value(value)}")
+        
+        return "\n".join(lines) + "\n"
+
+
+class InstrumentedCommandTree(app_commands.CommandTree):
+    """Command tree that stamps interactions on receipt and counts failures."""
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        # The first step of the command task, before options are parsed
+        metrics = getattr(self.client, "metrics", None)
+        if metrics is not None:
+            metrics.mark_received(interaction)
+        return True
+    
+    async def on_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError) -> None:
+        metrics = getattr(self.client, "metrics", None)
+        if metrics is not None:
+            command = interaction.command.qualified_name if interaction.command else "unknown"
+            metrics.count_error(command, "exception")
+        await super().on_error(interaction, error)
+
+
+class MetricsServer:
+    """Serves ``/metrics`` over HTTP."""
+    
+    def __init__(self, metrics: Metrics, host: str = "127.0.0.1", port: int = 9108):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self._runner: Optional["web.AppRunner"] = None
+    
+    async def start(self) -> None:
+        """Start listening; port 0 picks a free port."""
+        # aiohttp.web is only imported when METRICS_PORT is set
+        from aiohttp import web
+        
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        logger.info(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+    
+    async def stop(self) -> None:
+        """Stop listening."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+    
+    async def _handle(self, request: "web.Request") -> "web.Response":
+        from aiohttp import web
+        
+        return web.Response(body=self.metrics.render().encode(), headers={"Content-Type": CONTENT_TYPE})
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
@@ -0,0 +1,311 @@
+"""
+Recurring sessions for the Game Coordinator Bot.
+
+A recurring session ("every Fri 9pm") is stored as a compact rule: a weekday
+bitmask, a local wall time, a timezone and an interval in weeks. Occurrences
+are generated lazily from the rule, one local day at a time, and each one is
+the rule's wall time converted through the zone's transition table, so a 9pm
+session stays at 9pm local time on both sides of a DST change.
+
+``OccurrenceIndex`` keeps the next occurrence of every rule in a min-heap:
+one heap across all rules plus one per group (a guild, or a guild and game).
+The next occurrence is at the top of a heap, and the next ``k`` occurrences
+of a group are read off its heap in O(k log k) without visiting the group's
+other rules. Entries whose occurrence has passed are advanced when they
+reach the top, and removed rules are dropped lazily, as in the scheduler.
+"""
+
+import heapq
+import itertools
+import math
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Hashable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from game_coordinator_bot.availability import WEEKDAY_NAMES, format_minute
+from game_coordinator_bot.utils.time_grammar import TimeGrammar, tokenize
+from game_coordinator_bot.utils.timezone_utils import get_timezone, get_transition_table
+
+
+ALL_DAYS = 0b1111111
+WEEKDAYS = 0b0011111
+WEEKENDS = 0b1100000
+
+_DAY_SECONDS = 86400
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+@dataclass(frozen=True)
+class RecurrenceRule:
+    """A session that repeats weekly at the same local wall time."""
+    weekdays: int  # Bitmask, bit 0 = Monday
+    minute: int  # Minutes after local midnight
+    timezone: str
+    interval: int = 1  # Weeks between occurrences
+    anchor: int = 0  # Unix timestamp; nothing occurs before it, and its week is the first
+    
+    def __post_init__(self):
+        if not 0 < self.weekdays <= ALL_DAYS:
+            raise ValueError(f"Invalid weekday mask {self.weekdays!r}")
+        if not 0 <= self.minute < 24 * 60:
+            raise ValueError(f"Invalid minute of the day {self.minute!r}")
+        if self.interval < 1:
+            raise ValueError(f"Invalid interval {self.interval!r}")
+        if get_timezone(self.timezone) is None:
+            raise ValueError(f"Unknown timezone {self.timezone!r}")
+    
+    def occurrences(self, start: Optional[float] = None) -> Iterator[int]:
+        """
+        Generate occurrences lazily, earliest first.
+        
+        Args:
+            start: Unix timestamp of the earliest occurrence wanted
+                (defaults to the anchor)
+        
+        Yields:
+            Unix timestamps of the occurrences at or after ``start``
+        """
+        start = self.anchor if start is None else max(math.ceil(start), self.anchor)
+        table = get_transition_table(self.timezone, start)
+        first_week = (datetime.fromtimestamp(self.anchor, table.zone).date().toordinal() - 1) // 7
+        # An occurrence later on the local day of ``start`` may still be ahead
+        ordinal = table.to_local(start).date().toordinal()
+        while True:
+            weekday = (ordinal - 1) % 7
+            if self.weekdays >> weekday & 1 and ((ordinal - 1) // 7 - first_week) % self.interval == 0:
+                local = (ordinal - _EPOCH_ORDINAL) * _DAY_SECONDS + self.minute * 60
+                if not table.covers(local):
+                    table = get_transition_table(self.timezone, local)
+                occurrence = table.to_utc(local)
+                if occurrence >= start:
+                    yield occurrence
+            ordinal += 1
+    
+    def next_occurrence(self, start: float) -> int:
+        """First occurrence at or after a Unix timestamp."""
+        return next(self.occurrences(start))
+    
+    def describe(self) -> str:
+        """Describe the rule, e.g. "every other Fri at 9pm"."""
+        days = {ALL_DAYS: "day", WEEKDAYS: "weekday", WEEKENDS: "weekend"}.get(self.weekdays)
+        if days is None:
+            days = ", ".join(name for day, name in enumerate(WEEKDAY_NAMES) if self.weekdays >> day & 1)
+        if self.interval == 1:
+            every = "every"
+        elif self.interval == 2:
+            every = "every other"
+        else:
+            every = f"every {self.interval} weeks on"
+        return f"{every} {days} at {format_minute(self.minute)}"
+
+
+def parse_recurrence(text: str, timezone: str, anchor: Optional[float] = None) -> Optional[RecurrenceRule]:
+    """
+    Parse a recurrence such as "every fri 9pm" or "every other mon, wed at 20:00".
+    
+    Read with the session time grammar: "every" ["other"] days ["at"] clock.
+    
+    Args:
+        text: Recurrence starting with "every"
+        timezone: IANA timezone the wall time is in
+        anchor: Unix timestamp the rule starts at (defaults to now)
+    
+    Returns:
+        RecurrenceRule, or None if the text is not a recurrence
+    
+    Raises:
+        ValueError: If the timezone is unknown
+    """
+    tokens = tokenize(text)
+    if not tokens:
+        return None
+    grammar = TimeGrammar(tokens)
+    if not grammar.word("every"):
+        return None
+    other = grammar.word("other")
+    weekdays = grammar.days()
+    grammar.word("at")
+    clock = grammar.clock() if weekdays is not None else None
+    if clock is None or not grammar.at_end():
+        return None
+    hour, minute, _ = clock
+    return RecurrenceRule(
+        weekdays=sum(1 << day for day in weekdays),
+        minute=hour * 60 + minute,
+        timezone=timezone,
+        interval=2 if other else 1,
+        anchor=int(time.time() if anchor is None else anchor),
+    )
+
+
+class Occurrence(NamedTuple):
+    """One occurrence of an indexed rule."""
+    start: int  # Unix timestamp
+    key: str
+    value: Any
+
+
+class OccurrenceIndex:
+    """Next occurrence of every rule, in one heap overall and one per group."""
+    
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        # key -> (rule, value, groups, generation); heap entries of older generations are dead
+        self._rules: Dict[str, Tuple[RecurrenceRule, Any, Tuple[Hashable, ...], int]] = {}
+        # Entries are (start, seq, key, generation) so ordering is compared in C
+        self._heaps: Dict[Optional[Hashable], List[Tuple[int, int, str, int]]] = {None: []}
+        self._counter = itertools.count()
+        self._dead = 0
+    
+    def __len__(self) -> int:
+        """Number of indexed rules."""
+        return len(self._rules)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._rules
+    
+    def get(self, key: str) -> Any:
+        """Value stored with a rule, or None if the key is not indexed."""
+        record = self._rules.get(key)
+        return record[1] if record is not None else None
+    
+    def add(self, key: str, rule: RecurrenceRule, value: Any = None, groups: Sequence[Hashable] = ()) -> int:
+        """
+        Index a rule, replacing any rule with the same key.
+        
+        Args:
+            key: Rule identifier (e.g., the session ID)
+            rule: Recurrence rule
+            value: Returned with the rule's occurrences (e.g., the session)
+            groups: Groups the rule is listed under besides the overall heap
+        
+        Returns:
+            The rule's next occurrence
+        """
+        self.remove(key)
+        generation = next(self._counter)
+        groups = tuple(groups)
+        self._rules[key] = (rule, value, groups, generation)
+        start = rule.next_occurrence(self._clock())
+        for group in (None, *groups):
+            heapq.heappush(self._heaps.setdefault(group, []), (start, next(self._counter), key, generation))
+        return start
+    
+    def remove(self, key: str) -> bool:
+        """
+        Stop indexing a rule.
+        
+        Returns:
+            True if the rule was indexed
+        """
+        record = self._rules.pop(key, None)
+        if record is None:
+            return False
+        self._dead += 1 + len(record[2])
+        self._maybe_compact()
+        return True
+    
+    def _maybe_compact(self) -> None:
+        # Rebuild once dead entries dominate so memory tracks live rules
+        total = sum(len(heap) for heap in self._heaps.values())
+        if self._dead > 1024 and self._dead * 2 > total:
+            for group, heap in list(self._heaps.items()):
+                live = [entry for entry in heap if self._live(entry)]
+                heapq.heapify(live)
+                if live or group is None:
+                    self._heaps[group] = live
+                else:
+                    del self._heaps[group]
+            self._dead = 0
+    
+    def _live(self, entry: Tuple[int, int, str, int]) -> bool:
+        record = self._rules.get(entry[2])
+        return record is not None and record[3] == entry[3]
+    
+    def _settle(self, heap: List[Tuple[int, int, str, int]], now: float) -> bool:
+        """Drop dead entries and advance passed ones until the top is current."""
+        while heap:
+            start, _, key, generation = heap[0]
+            record = self._rules.get(key)
+            if record is None or record[3] != generation:
+                heapq.heappop(heap)
+                self._dead -= 1
+            elif start < now:
+                heapq.heapreplace(heap, (record[0].next_occurrence(now), next(self._counter), key, generation))
+            else:
+                return True
+        return False
+    
+    def next(self, group: Optional[Hashable] = None, now: Optional[float] = None) -> Optional[Occurrence]:
+        """
+        The next occurrence of any rule, or of a group's rules.
+        
+        Args:
+            group: Group to look in (defaults to every rule)
+            now: Unix timestamp to compare against (defaults to now)
+        
+        Returns:
+            Occurrence, or None if nothing is indexed
+        """
+        heap = self._heaps.get(group)
+        if not heap or not self._settle(heap, self._clock() if now is None else now):
+            return None
+        start, _, key, _ = heap[0]
+        return Occurrence(start, key, self._rules[key][1])
+    
+    def upcoming(
+        self,
+        group: Optional[Hashable] = None,
+        limit: int = 10,
+        now: Optional[float] = None,
+        distinct: bool = False
+    ) -> List[Occurrence]:
+        """
+        The next occurrences of any rule, or of a group's rules.
+        
+        Only the heap entries that can hold one of the first ``limit``
+        occurrences are visited.
+        
+        Args:
+            group: Group to look in (defaults to every rule)
+            limit: Maximum number of occurrences
+            now: Unix timestamp to compare against (defaults to now)
+            distinct: List each rule once, at its next occurrence
+        
+        Returns:
+            Occurrences ordered by start
+        """
+        if now is None:
+            now = self._clock()
+        heap = self._heaps.get(group)
+        if not heap or not self._settle(heap, now):
+            return []
+        
+        # The frontier holds heap positions, keyed by a lower bound on their
+        # subtree, and the occurrence generators of the rules reached so far
+        tie = itertools.count()
+        frontier: List[Tuple[int, int, int, Optional[Tuple[str, Any, Iterator[int]]]]] = [
+            (heap[0][0], next(tie), 0, None)
+        ]
+        found: List[Occurrence] = []
+        while frontier and len(found) < limit:
+            start, _, position, series = heapq.heappop(frontier)
+            if series is not None:
+                key, value, occurrences = series
+                found.append(Occurrence(start, key, value))
+                if not distinct:
+                    heapq.heappush(frontier, (next(occurrences), next(tie), -1, series))
+                continue
+            
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child][0], next(tie), child, None))
+            entry = heap[position]
+            if not self._live(entry):
+                continue
+            rule, value = self._rules[entry[2]][:2]
+            # Entries below the top may still hold a passed occurrence
+            occurrences = rule.occurrences(max(start, now))
+            heapq.heappush(frontier, (next(occurrences), next(tie), -1, (entry[2], value, occurrences)))
+        return found
@@ -0,0 +1,237 @@
+"""
+Reminder scheduler for the Game Coordinator Bot.
+
+A single asyncio task drives a min-heap of reminders keyed on their UTC fire
+time, instead of one sleeping task per session. Inserting is O(log n);
+cancelling marks the entry dead in O(1) and dead entries are dropped when
+they reach the top of the heap (or in one pass once they make up most of it).
+Every reminder due within the same tick is handed to the callback as a batch.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger('game_coordinator.scheduler')
+
+
+# (seconds before start, kind) for each reminder sent about a session
+REMINDER_OFFSETS: Tuple[Tuple[int, str], ...] = (
+    (15 * 60, "soon"),
+    (0, "start"),
+)
+
+# Reminders due within this many seconds of each other fire together
+TICK = 0.05
+
+# Upper bound on a single sleep so wall-clock adjustments are picked up
+MAX_SLEEP = 60.0
+
+
+class Reminder:
+    """A pending reminder for a session."""
+    
+    __slots__ = ("fire_at", "seq", "session_id", "kind", "cancelled")
+    
+    def __init__(self, fire_at: float, seq: int, session_id: str, kind: str):
+        self.fire_at = fire_at
+        self.seq = seq
+        self.session_id = session_id
+        self.kind = kind
+        self.cancelled = False
+    
+    def __repr__(self) -> str:
+        return f"Reminder({self.session_id!r}, {self.kind!r}, fire_at={self.fire_at})"
+
+
+ReminderCallback = Callable[[List[Reminder]], Awaitable[None]]
+
+
+class ReminderScheduler:
+    """Heap-based scheduler that fires reminders from one background task."""
+    
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        # Entries are (fire_at, seq, reminder) so ordering is compared in C
+        self._heap: List[Tuple[float, int, Reminder]] = []
+        self._by_session: Dict[str, List[Reminder]] = {}
+        self._counter = itertools.count()
+        self._cancelled = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._callback: Optional[ReminderCallback] = None
+    
+    def __len__(self) -> int:
+        """Number of live (not cancelled) reminders."""
+        return len(self._heap) - self._cancelled
+    
+    def schedule(self, session_id: str, fire_at: float, kind: str) -> Reminder:
+        """
+        Schedule a single reminder.
+        
+        Args:
+            session_id: Session the reminder belongs to
+            fire_at: Unix timestamp at which to fire
+            kind: Reminder kind (e.g., "soon", "start")
+        
+        Returns:
+            The scheduled Reminder
+        """
+        seq = next(self._counter)
+        reminder = Reminder(fire_at, seq, session_id, kind)
+        entry = (fire_at, seq, reminder)
+        # Only wake the loop if this reminder is now the earliest one
+        earliest = not self._heap or entry < self._heap[0]
+        heapq.heappush(self._heap, entry)
+        self._by_session.setdefault(session_id, []).append(reminder)
+        if earliest and self._wakeup is not None:
+            self._wakeup.set()
+        return reminder
+    
+    def schedule_session(self, session_id: str, start_time: int) -> List[Reminder]:
+        """
+        Schedule the standard reminders for a session.
+        
+        Reminders whose time has already passed are skipped.
+        
+        Args:
+            session_id: Session identifier
+            start_time: Session start as a Unix timestamp
+        
+        Returns:
+            The reminders that were scheduled
+        """
+        now = self._clock()
+        return [
+            self.schedule(session_id, start_time - offset, kind)
+            for offset, kind in REMINDER_OFFSETS
+            if start_time - offset >= now
+        ]
+    
+    def cancel(self, reminder: Reminder) -> None:
+        """
+        Cancel a single reminder.
+        
+        Args:
+            reminder: Reminder returned by schedule()
+        """
+        if reminder.cancelled:
+            return
+        reminder.cancelled = True
+        self._cancelled += 1
+        reminders = self._by_session.get(reminder.session_id)
+        if reminders is not None:
+            if reminder in reminders:
+                reminders.remove(reminder)
+            if not reminders:
+                del self._by_session[reminder.session_id]
+        self._maybe_compact()
+    
+    def cancel_session(self, session_id: str) -> int:
+        """
+        Cancel every pending reminder for a session.
+        
+        Args:
+            session_id: Session identifier
+        
+        Returns:
+            Number of reminders cancelled
+        """
+        reminders = self._by_session.pop(session_id, [])
+        for reminder in reminders:
+            if not reminder.cancelled:
+                reminder.cancelled = True
+                self._cancelled += 1
+        self._maybe_compact()
+        return len(reminders)
+    
+    def _maybe_compact(self) -> None:
+        # Rebuild once dead entries dominate so memory tracks live reminders
+        if self._cancelled > 1024 and self._cancelled * 2 > len(self._heap):
+            self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+    
+    def pop_due(self, now: float) -> List[Reminder]:
+        """
+        Remove and return every live reminder due at ``now``.
+        
+        Args:
+            now: Current Unix timestamp
+        
+        Returns:
+            Due reminders, earliest first
+        """
+        due: List[Reminder] = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            reminder = heapq.heappop(heap)[2]
+            if reminder.cancelled:
+                self._cancelled -= 1
+                continue
+            due.append(reminder)
+            reminders = self._by_session.get(reminder.session_id)
+            if reminders is not None:
+                reminders.remove(reminder)
+                if not reminders:
+                    del self._by_session[reminder.session_id]
+        return due
+    
+    def next_fire_time(self) -> Optional[float]:
+        """Fire time of the earliest live reminder, or None if there is none."""
+        heap = self._heap
+        while heap and heap[0][2].cancelled:
+            heapq.heappop(heap)
+            self._cancelled -= 1
+        return heap[0][0] if heap else None
+    
+    def start(self, callback: ReminderCallback) -> None:
+        """
+        Start the background task.
+        
+        Args:
+            callback: Coroutine function called with each batch of due reminders
+        """
+        if self._task is not None:
+            return
+        self._callback = callback
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="reminder-scheduler")
+    
+    async def stop(self) -> None:
+        """Stop the background task. Pending reminders are kept."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._wakeup = None
+    
+    async def _run(self) -> None:
+        while True:
+            next_fire = self.next_fire_time()
+            if next_fire is None:
+                timeout = None
+            else:
+                timeout = min(max(next_fire - self._clock(), 0.0), MAX_SLEEP)
+            
+            if timeout is None or timeout > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+            
+            due = self.pop_due(self._clock() + TICK)
+            if not due:
+                continue
+            try:
+                await self._callback(due)
+            except Exception:
+                logger.exception(f'Failed to deliver {len(due)} reminders')
@@ -0,0 +1 @@
+"""Persistent storage for the Game Coordinator Bot."""
@@ -0,0 +1,124 @@
+"""
+Availability repository for the Game Coordinator Bot.
+
+Stores the weekly windows members register with ``/availability`` (e.g.
+Mon-Fri 7pm-11pm in their own timezone), optionally for one game only.
+``/when`` reads a guild's windows and scores them with
+``game_coordinator_bot.availability``.
+"""
+
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from game_coordinator_bot.storage.database import Database
+
+logger = logging.getLogger('game_coordinator.storage')
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS availability (
+    guild_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    weekday INTEGER NOT NULL,
+    start_minute INTEGER NOT NULL,
+    end_minute INTEGER NOT NULL,
+    timezone TEXT NOT NULL,
+    game TEXT,
+    created_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_availability_guild_user ON availability (guild_id, user_id);
+"""
+
+_COLUMNS = ("user_id", "weekday", "start_minute", "end_minute", "timezone", "game")
+_INSERT = (
+    "INSERT INTO availability (guild_id, user_id, weekday, start_minute, end_minute, timezone, game, created_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+@dataclass(frozen=True)
+class AvailabilityWindow:
+    """A weekly window in the member's local time."""
+    user_id: int
+    weekday: int  # 0 = Monday
+    start_minute: int  # Minutes after local midnight
+    end_minute: int  # At or before start_minute: the window runs past midnight
+    timezone: str
+    game: Optional[str] = None  # None: available for any game
+    
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "AvailabilityWindow":
+        """Build a window from a database row."""
+        return cls(**{column: row[column] for column in _COLUMNS})
+
+
+class AvailabilityRepository:
+    """Async repository of availability windows backed by SQLite."""
+    
+    def __init__(self, database: Database):
+        self.database = database
+    
+    async def open(self) -> None:
+        """Open the database and create the table."""
+        await self.database.open()
+        await self.database.executescript(SCHEMA)
+    
+    async def add(self, guild_id: int, windows: List[AvailabilityWindow]) -> None:
+        """
+        Store windows in one transaction.
+        
+        Args:
+            guild_id: Guild the windows apply to
+            windows: Windows to add
+        """
+        now = int(time.time())
+        rows = [
+            (guild_id, window.user_id, window.weekday, window.start_minute,
+             window.end_minute, window.timezone, window.game, now)
+            for window in windows
+        ]
+        await self.database.executemany(_INSERT, rows)
+    
+    async def clear(self, guild_id: int, user_id: int) -> int:
+        """
+        Remove all of a member's windows in a guild.
+        
+        Returns:
+            Number of windows removed
+        """
+        return await self.database.execute(
+            "DELETE FROM availability WHERE guild_id = ? AND user_id = ?",
+            (guild_id, user_id),
+        )
+    
+    async def for_user(self, guild_id: int, user_id: int) -> List[AvailabilityWindow]:
+        """A member's windows in a guild, by weekday and start."""
+        rows = await self.database.fetch(
+            f"SELECT {', '.join(_COLUMNS)} FROM availability WHERE guild_id = ? AND user_id = ? "
+            "ORDER BY weekday, start_minute",
+            (guild_id, user_id),
+        )
+        return [AvailabilityWindow.from_row(row) for row in rows]
+    
+    async def for_guild(self, guild_id: int, game: Optional[str] = None) -> List[AvailabilityWindow]:
+        """
+        Every member's windows in a guild.
+        
+        Args:
+            guild_id: Guild identifier
+            game: Only windows for this game or for any game (optional)
+        
+        Returns:
+            Windows grouped by member
+        """
+        query = f"SELECT {', '.join(_COLUMNS)} FROM availability WHERE guild_id = ?"
+        params: tuple = (guild_id,)
+        if game is not None:
+            query += " AND (game IS NULL OR game = ?)"
+            params += (game,)
+        rows = await self.database.fetch(query + " ORDER BY user_id", params)
+        return [AvailabilityWindow.from_row(row) for row in rows]
+
@@ -0,0 +1,138 @@
+"""
+SQLite access for the Game Coordinator Bot.
+
+SQLite calls block, so every statement runs on one dedicated worker thread
+that owns the connection. Coroutines submit work with ``Database.run`` and
+the event loop never waits on disk.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence, TypeVar
+
+logger = logging.getLogger('game_coordinator.storage')
+
+T = TypeVar('T')
+
+
+class Database:
+    """
+    A SQLite database in WAL mode served by a single worker thread.
+    
+    The bot shares one Database between its repositories. Each one's
+    ``open()`` opens it (only the first call connects), and
+    ``SessionRepository.close()`` closes it, so at shutdown the session
+    store is closed after the repositories that still have writes buffered.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._connection: Optional[sqlite3.Connection] = None
+    
+    async def open(self) -> None:
+        """Open the connection on the worker thread."""
+        if self._executor is not None:
+            return
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sqlite')
+        await self._submit(self._connect)
+        logger.info(f'Opened database {self.path}')
+    
+    def _connect(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        connection.row_factory = sqlite3.Row
+        if self.path != ':memory:':
+            connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection = connection
+    
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Run ``func(connection, *args)`` on the worker thread.
+        
+        Args:
+            func: Callable taking the sqlite3 connection as first argument
+            *args: Extra arguments passed to ``func``
+        
+        Returns:
+            Whatever ``func`` returns
+        """
+        if self._executor is None:
+            raise RuntimeError('Database is not open')
+        return await self._submit(lambda: func(self._connection, *args))
+    
+    async def executescript(self, script: str) -> None:
+        """Run a multi-statement SQL script, e.g. a schema."""
+        await self.run(lambda connection: connection.executescript(script))
+    
+    async def fetch(self, query: str, params: Sequence[Any] = ()) -> List[sqlite3.Row]:
+        """
+        Run a query and return all its rows.
+        
+        Args:
+            query: SQL query
+            params: Query parameters
+        
+        Returns:
+            List of rows
+        """
+        return await self.run(_fetch, query, params)
+    
+    async def execute(self, query: str, params: Sequence[Any] = ()) -> int:
+        """
+        Run a statement in its own transaction.
+        
+        Args:
+            query: SQL statement
+            params: Statement parameters
+        
+        Returns:
+            Number of rows changed
+        """
+        return await self.run(_execute, query, params)
+    
+    async def executemany(self, query: str, rows: Sequence[Sequence[Any]]) -> None:
+        """
+        Run a statement once per row, all in a single transaction.
+        
+        Args:
+            query: SQL statement
+            rows: Parameters for each run
+        """
+        await self.run(_executemany, query, rows)
+    
+    async def close(self) -> None:
+        """Close the connection and stop the worker thread."""
+        if self._executor is None:
+            return
+        await self._submit(self._disconnect)
+        self._executor.shutdown(wait=True)
+        self._executor = None
+    
+    def _disconnect(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+    
+    def _submit(self, func: Callable[[], T]) -> 'asyncio.Future[T]':
+        return asyncio.get_running_loop().run_in_executor(self._executor, func)
+
+
+def _fetch(connection: sqlite3.Connection, query: str, params: Sequence[Any]) -> List[sqlite3.Row]:
+    return connection.execute(query, params).fetchall()
+
+
+def _execute(connection: sqlite3.Connection, query: str, params: Sequence[Any]) -> int:
+    with connection:
+        return connection.execute(query, params).rowcount
+
+
+def _executemany(connection: sqlite3.Connection, query: str, rows: Sequence[Sequence[Any]]) -> None:
+    with connection:
+        connection.executemany(query, rows)
@@ -0,0 +1,212 @@
+"""
+User preferences for the Game Coordinator Bot.
+
+Remembers each user's last timezone, platform and game so ``/play`` can
+default them. Reads are served from a bounded in-memory LRU in front of the
+``user_preferences`` table; writes update memory immediately and reach disk
+in write-behind batches, so an interaction never waits on SQLite.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional
+
+from game_coordinator_bot.storage.database import Database
+
+logger = logging.getLogger('game_coordinator.storage')
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_preferences (
+    user_id INTEGER PRIMARY KEY,
+    timezone TEXT,
+    platform TEXT,
+    favorite_game TEXT,
+    updated_at INTEGER NOT NULL
+);
+"""
+
+# Only non-NULL fields overwrite what is stored
+_UPSERT = """
+INSERT INTO user_preferences (user_id, timezone, platform, favorite_game, updated_at)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (user_id) DO UPDATE SET
+    timezone = COALESCE(excluded.timezone, timezone),
+    platform = COALESCE(excluded.platform, platform),
+    favorite_game = COALESCE(excluded.favorite_game, favorite_game),
+    updated_at = excluded.updated_at
+"""
+
+# Users whose preferences are kept in memory
+CACHE_SIZE = 10000
+
+
+@dataclass(frozen=True)
+class Preferences:
+    """A user's remembered choices; None means never set."""
+    user_id: int
+    timezone: Optional[str] = None
+    platform: Optional[str] = None
+    favorite_game: Optional[str] = None  # The game the user last scheduled
+    
+    def merged(self, other: "Preferences") -> "Preferences":
+        """Overlay the fields set in ``other``."""
+        return replace(
+            self,
+            timezone=other.timezone or self.timezone,
+            platform=other.platform or self.platform,
+            favorite_game=other.favorite_game or self.favorite_game,
+        )
+
+
+class UserPreferences:
+    """LRU-cached, write-behind store of user preferences."""
+    
+    def __init__(
+        self,
+        database: Database,
+        cache_size: int = CACHE_SIZE,
+        flush_delay: float = 1.0,
+        batch_size: int = 500
+    ):
+        self.database = database
+        self.cache_size = cache_size
+        self.flush_delay = flush_delay
+        self.batch_size = batch_size
+        self._cache: "OrderedDict[int, Preferences]" = OrderedDict()
+        # Changes not yet on disk, holding only the fields that changed
+        self._dirty: Dict[int, Preferences] = {}
+        # Batches taken from _dirty whose write has not finished, oldest first
+        self._writing: List[Dict[int, Preferences]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+    
+    async def open(self) -> None:
+        """Open the database and create the table."""
+        await self.database.open()
+        await self.database.executescript(SCHEMA)
+    
+    async def close(self) -> None:
+        """Write pending changes."""
+        await self.flush()
+    
+    def __len__(self) -> int:
+        """Number of users cached in memory."""
+        return len(self._cache)
+    
+    async def get(self, user_id: int) -> Preferences:
+        """
+        Get a user's preferences.
+        
+        Args:
+            user_id: Discord user ID
+        
+        Returns:
+            Preferences, with unset fields None
+        """
+        cached = self._cache.get(user_id)
+        if cached is not None:
+            self._cache.move_to_end(user_id)
+            self.hits += 1
+            return cached
+        
+        self.misses += 1
+        rows = await self.database.fetch(
+            "SELECT timezone, platform, favorite_game FROM user_preferences WHERE user_id = ?",
+            (user_id,),
+        )
+        if rows:
+            row = rows[0]
+            preferences = Preferences(user_id, row["timezone"], row["platform"], row["favorite_game"])
+        else:
+            preferences = Preferences(user_id)
+        # Changes being written or made while the row was loading may be newer
+        # than the row, which can have been read before a flush wrote them
+        for changes in (*self._writing, self._dirty):
+            pending = changes.get(user_id)
+            if pending is not None:
+                preferences = preferences.merged(pending)
+        self._store(preferences)
+        return preferences
+    
+    def remember(
+        self,
+        user_id: int,
+        timezone: Optional[str] = None,
+        platform: Optional[str] = None,
+        favorite_game: Optional[str] = None
+    ) -> None:
+        """
+        Record a user's latest choices without waiting for disk.
+        
+        Args:
+            user_id: Discord user ID
+            timezone: IANA timezone name (optional)
+            platform: Platform ID (optional)
+            favorite_game: Game ID (optional)
+        """
+        change = Preferences(user_id, timezone, platform, favorite_game)
+        pending = self._dirty.get(user_id)
+        self._dirty[user_id] = pending.merged(change) if pending is not None else change
+        
+        cached = self._cache.get(user_id)
+        if cached is not None:
+            self._cache[user_id] = cached.merged(change)
+            self._cache.move_to_end(user_id)
+        
+        if len(self._dirty) >= self.batch_size:
+            self._schedule_flush(0)
+        elif self._flush_task is None:
+            self._schedule_flush(self.flush_delay)
+    
+    def _store(self, preferences: Preferences) -> None:
+        self._cache[preferences.user_id] = preferences
+        self._cache.move_to_end(preferences.user_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+    
+    def _schedule_flush(self, delay: float) -> None:
+        if self._flush_task is not None:
+            if delay > 0:
+                return
+            self._flush_task.cancel()
+        self._flush_task = asyncio.create_task(self._flush_later(delay))
+    
+    async def _flush_later(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._flush_task = None
+        try:
+            await self.flush()
+        except sqlite3.Error as e:
+            logger.error(f'Failed to write user preferences: {e}')
+    
+    async def flush(self) -> None:
+        """Write all pending changes in a single transaction."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        if not self._dirty:
+            return
+        batch, self._dirty = self._dirty, {}
+        self._writing.append(batch)
+        now = int(time.time())
+        rows = [
+            (p.user_id, p.timezone, p.platform, p.favorite_game, now)
+            for p in batch.values()
+        ]
+        try:
+            await self.database.executemany(_UPSERT, rows)
+        except sqlite3.Error:
+            # Keep the changes for the next flush, behind any newer ones
+            for user_id, change in batch.items():
+                newer = self._dirty.get(user_id)
+                self._dirty[user_id] = change.merged(newer) if newer is not None else change
+            raise
+        finally:
+            self._writing.remove(batch)
+
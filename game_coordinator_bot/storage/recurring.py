@@ -0,0 +1,153 @@
+"""
+Recurring session repository for the Game Coordinator Bot.
+
+Stores the rules of sessions created with ``/play`` and a time such as
+"every fri 9pm". Only the rule is stored; its occurrences are generated by
+``game_coordinator_bot.recurrence`` when they are needed.
+"""
+
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from typing import Hashable, List, Optional, Tuple
+
+from game_coordinator_bot.recurrence import RecurrenceRule
+from game_coordinator_bot.storage.database import Database
+from game_coordinator_bot.storage.sessions import CANCELLED, SCHEDULED, new_session_id
+
+logger = logging.getLogger('game_coordinator.storage')
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS recurring_sessions (
+    id TEXT PRIMARY KEY,
+    guild_id INTEGER,
+    channel_id INTEGER,
+    message_id INTEGER,
+    organizer_id INTEGER NOT NULL,
+    game TEXT NOT NULL,
+    mode TEXT,
+    platform TEXT NOT NULL,
+    timezone TEXT NOT NULL,
+    weekdays INTEGER NOT NULL,
+    minute INTEGER NOT NULL,
+    interval_weeks INTEGER NOT NULL,
+    anchor INTEGER NOT NULL,
+    created_at INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'scheduled'
+);
+CREATE INDEX IF NOT EXISTS idx_recurring_sessions_status ON recurring_sessions (status);
+"""
+
+_COLUMNS = (
+    "id", "guild_id", "channel_id", "message_id", "organizer_id", "game", "mode", "platform",
+    "timezone", "weekdays", "minute", "interval_weeks", "anchor", "created_at", "status",
+)
+_INSERT = f"INSERT INTO recurring_sessions ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+
+
+@dataclass
+class RecurringSession:
+    """A gaming session that repeats every week."""
+    guild_id: Optional[int]
+    channel_id: Optional[int]
+    organizer_id: int
+    game: str
+    platform: str
+    timezone: str
+    weekdays: int  # Bitmask, bit 0 = Monday
+    minute: int  # Minutes after local midnight
+    anchor: int  # Unix timestamp the rule starts at
+    interval_weeks: int = 1
+    mode: Optional[str] = None
+    message_id: Optional[int] = None
+    id: str = field(default_factory=new_session_id)
+    created_at: int = field(default_factory=lambda: int(time.time()))
+    status: str = SCHEDULED
+    
+    @property
+    def rule(self) -> RecurrenceRule:
+        """The session's recurrence rule."""
+        return RecurrenceRule(self.weekdays, self.minute, self.timezone, self.interval_weeks, self.anchor)
+    
+    def groups(self) -> Tuple[Hashable, ...]:
+        """``OccurrenceIndex`` groups: the guild, and the guild and game."""
+        return (self.guild_id, (self.guild_id, self.game))
+    
+    def as_row(self) -> tuple:
+        """Column values in table order."""
+        return tuple(getattr(self, column) for column in _COLUMNS)
+    
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "RecurringSession":
+        """Build a recurring session from a database row."""
+        return cls(**{column: row[column] for column in _COLUMNS})
+
+
+class RecurringSessionRepository:
+    """Async repository of recurring session rules backed by SQLite."""
+    
+    def __init__(self, database: Database):
+        self.database = database
+    
+    async def open(self) -> None:
+        """Open the database and create the table."""
+        await self.database.open()
+        await self.database.executescript(SCHEMA)
+    
+    async def add(self, session: RecurringSession) -> RecurringSession:
+        """
+        Store a recurring session.
+        
+        Args:
+            session: Recurring session to store
+        
+        Returns:
+            The same session
+        """
+        await self.database.execute(_INSERT, session.as_row())
+        return session
+    
+    async def get(self, session_id: str) -> Optional[RecurringSession]:
+        """
+        Get a recurring session by ID.
+        
+        Args:
+            session_id: Session identifier
+        
+        Returns:
+            RecurringSession if found, None otherwise
+        """
+        rows = await self.database.fetch(
+            "SELECT * FROM recurring_sessions WHERE id = ?", (session_id,)
+        )
+        return RecurringSession.from_row(rows[0]) if rows else None
+    
+    async def active(self) -> List[RecurringSession]:
+        """
+        All recurring sessions that have not been cancelled, across guilds.
+        
+        Used to rebuild the occurrence index and reminders after a restart.
+        """
+        rows = await self.database.fetch(
+            "SELECT * FROM recurring_sessions WHERE status = ?", (SCHEDULED,)
+        )
+        return [RecurringSession.from_row(row) for row in rows]
+    
+    async def cancel(self, session_id: str, guild_id: Optional[int]) -> bool:
+        """
+        Cancel a recurring session and all its future occurrences.
+        
+        Args:
+            session_id: Session identifier
+            guild_id: Guild the session must belong to
+        
+        Returns:
+            True if a recurring session was cancelled, False otherwise
+        """
+        return await self.database.execute(
+            "UPDATE recurring_sessions SET status = ? WHERE id = ? AND guild_id IS ? AND status = ?",
+            (CANCELLED, session_id, guild_id, SCHEDULED),
+        ) > 0
+
@@ -0,0 +1,317 @@
+"""
+Session repository for the Game Coordinator Bot.
+
+Stores gaming sessions created by ``/play`` so they can be listed, cancelled
+and recovered after a restart. New sessions are buffered briefly and written
+in one transaction per batch; queries flush the buffer first so they always
+see every session added before them.
+"""
+
+import asyncio
+import logging
+import secrets
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from game_coordinator_bot.storage.database import Database
+
+logger = logging.getLogger('game_coordinator.storage')
+
+
+SCHEDULED = "scheduled"
+CANCELLED = "cancelled"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    guild_id INTEGER,
+    channel_id INTEGER,
+    message_id INTEGER,
+    organizer_id INTEGER NOT NULL,
+    game TEXT NOT NULL,
+    mode TEXT,
+    platform TEXT NOT NULL,
+    timezone TEXT NOT NULL,
+    start_time INTEGER NOT NULL,
+    created_at INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'scheduled'
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_guild_start ON sessions (guild_id, start_time);
+CREATE INDEX IF NOT EXISTS idx_sessions_guild_game ON sessions (guild_id, game, start_time);
+CREATE TABLE IF NOT EXISTS rsvps (
+    session_id TEXT NOT NULL,
+    user_id INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    updated_at INTEGER NOT NULL,
+    PRIMARY KEY (session_id, user_id)
+);
+"""
+
+_COLUMNS = (
+    "id", "guild_id", "channel_id", "message_id", "organizer_id", "game", "mode",
+    "platform", "timezone", "start_time", "created_at", "status",
+)
+_INSERT = f"INSERT INTO sessions ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+
+
+def new_session_id() -> str:
+    """Generate an ID users can type into /sessions cancel (64 random bits)."""
+    return secrets.token_hex(8)
+
+
+@dataclass
+class Session:
+    """A scheduled gaming session."""
+    guild_id: Optional[int]
+    channel_id: Optional[int]
+    organizer_id: int
+    game: str
+    platform: str
+    timezone: str
+    start_time: int  # Unix timestamp
+    mode: Optional[str] = None
+    message_id: Optional[int] = None
+    id: str = field(default_factory=new_session_id)
+    created_at: int = field(default_factory=lambda: int(time.time()))
+    status: str = SCHEDULED
+    
+    def as_row(self) -> tuple:
+        """Column values in table order."""
+        return tuple(getattr(self, column) for column in _COLUMNS)
+    
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "Session":
+        """Build a session from a database row."""
+        return cls(**{column: row[column] for column in _COLUMNS})
+
+
+class SessionRepository:
+    """Async repository of gaming sessions backed by SQLite."""
+    
+    def __init__(
+        self,
+        database: Database,
+        batch_size: int = 100,
+        flush_delay: float = 0.05
+    ):
+        self.database = database
+        self.batch_size = batch_size
+        self.flush_delay = flush_delay
+        self._pending: List[Session] = []
+        self._flush_task: Optional[asyncio.Task] = None
+    
+    async def open(self) -> None:
+        """Open the database and create the schema."""
+        await self.database.open()
+        await self.database.executescript(SCHEMA)
+    
+    async def close(self) -> None:
+        """Write any buffered sessions and close the database."""
+        await self.flush()
+        await self.database.close()
+    
+    async def add(self, session: Session) -> Session:
+        """
+        Queue a session for writing.
+        
+        The session is written with the next batch, at most ``flush_delay``
+        seconds later or as soon as ``batch_size`` sessions are waiting.
+        
+        Args:
+            session: Session to store
+        
+        Returns:
+            The same session, with its ID assigned
+        """
+        self._pending.append(session)
+        if len(self._pending) >= self.batch_size:
+            await self.flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+        return session
+    
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_delay)
+        self._flush_task = None
+        try:
+            await self.flush()
+        except sqlite3.Error as e:
+            logger.error(f'Failed to write sessions: {e}')
+    
+    async def flush(self) -> None:
+        """Write all buffered sessions in a single transaction, keeping them if it fails."""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        try:
+            await self.database.executemany(_INSERT, [session.as_row() for session in batch])
+        except sqlite3.IntegrityError:
+            # Retrying the batch would fail forever; write the sessions one by one instead
+            await self._insert_each(batch)
+        except sqlite3.Error:
+            # Keep the sessions for the next flush, ahead of any added since
+            self._pending = batch + self._pending
+            raise
+    
+    async def _insert_each(self, batch: List[Session]) -> None:
+        """Write sessions one at a time, dropping any the schema rejects."""
+        for i, session in enumerate(batch):
+            try:
+                await self.database.execute(_INSERT, session.as_row())
+            except sqlite3.IntegrityError as e:
+                logger.error(f'Dropped session {session.id}, it could not be stored: {e}')
+            except sqlite3.Error:
+                self._pending = batch[i:] + self._pending
+                raise
+    
+    async def get(self, session_id: str) -> Optional[Session]:
+        """
+        Get a session by ID.
+        
+        Args:
+            session_id: Session identifier
+        
+        Returns:
+            Session if found, None otherwise
+        """
+        await self.flush()
+        rows = await self.database.fetch(
+            "SELECT * FROM sessions WHERE id = ?", (session_id,)
+        )
+        return Session.from_row(rows[0]) if rows else None
+    
+    async def upcoming(
+        self,
+        guild_id: Optional[int],
+        game: Optional[str] = None,
+        limit: int = 10,
+        now: Optional[int] = None
+    ) -> List[Session]:
+        """
+        List scheduled sessions in a guild that have not started yet.
+        
+        Args:
+            guild_id: Guild to list sessions for
+            game: Only include this game (optional)
+            limit: Maximum number of sessions
+            now: Unix timestamp to compare against (defaults to now)
+        
+        Returns:
+            Sessions ordered by start time
+        """
+        await self.flush()
+        if now is None:
+            now = int(time.time())
+        if game is None:
+            query = (
+                "SELECT * FROM sessions INDEXED BY idx_sessions_guild_start "
+                "WHERE guild_id IS ? AND start_time >= ? AND status = ? "
+                "ORDER BY start_time LIMIT ?"
+            )
+            params = (guild_id, now, SCHEDULED, limit)
+        else:
+            query = (
+                "SELECT * FROM sessions INDEXED BY idx_sessions_guild_game "
+                "WHERE guild_id IS ? AND game = ? AND start_time >= ? AND status = ? "
+                "ORDER BY start_time LIMIT ?"
+            )
+            params = (guild_id, game, now, SCHEDULED, limit)
+        rows = await self.database.fetch(query, params)
+        return [Session.from_row(row) for row in rows]
+    
+    async def pending(self, now: Optional[int] = None) -> List[Session]:
+        """
+        All scheduled sessions that have not started, across guilds.
+        
+        Used to rebuild in-memory state after a restart.
+        
+        Args:
+            now: Unix timestamp to compare against (defaults to now)
+        
+        Returns:
+            Sessions ordered by start time
+        """
+        await self.flush()
+        if now is None:
+            now = int(time.time())
+        rows = await self.database.fetch(
+            "SELECT * FROM sessions WHERE start_time >= ? AND status = ? ORDER BY start_time",
+            (now, SCHEDULED),
+        )
+        return [Session.from_row(row) for row in rows]
+    
+    async def cancel(self, session_id: str, guild_id: Optional[int]) -> bool:
+        """
+        Cancel a scheduled session.
+        
+        Args:
+            session_id: Session identifier
+            guild_id: Guild the session must belong to
+        
+        Returns:
+            True if a scheduled session was cancelled, False otherwise
+        """
+        await self.flush()
+        return await self.database.execute(
+            "UPDATE sessions SET status = ? WHERE id = ? AND guild_id IS ? AND status = ?",
+            (CANCELLED, session_id, guild_id, SCHEDULED),
+        ) > 0
+    
+    async def set_message_id(self, session_id: str, message_id: int) -> None:
+        """
+        Record the announcement message for a session.
+        
+        Args:
+            session_id: Session identifier
+            message_id: Discord message ID of the announcement
+        """
+        for session in self._pending:
+            if session.id == session_id:
+                session.message_id = message_id
+                return
+        await self.database.execute(
+            "UPDATE sessions SET message_id = ? WHERE id = ?",
+            (message_id, session_id),
+        )
+    
+    async def set_rsvp(self, session_id: str, user_id: int, status: Optional[str]) -> None:
+        """
+        Record a user's RSVP for a session.
+        
+        Args:
+            session_id: Session identifier
+            user_id: Discord user ID
+            status: RSVP status (e.g., "going", "maybe"), or None to remove it
+        """
+        if status is None:
+            await self.database.execute(
+                "DELETE FROM rsvps WHERE session_id = ? AND user_id = ?",
+                (session_id, user_id),
+            )
+            return
+        await self.database.execute(
+            "INSERT OR REPLACE INTO rsvps (session_id, user_id, status, updated_at) VALUES (?, ?, ?, ?)",
+            (session_id, user_id, status, int(time.time())),
+        )
+    
+    async def get_rsvps(self, session_id: str) -> Dict[int, str]:
+        """
+        Get all RSVPs for a session.
+        
+        Args:
+            session_id: Session identifier
+        
+        Returns:
+            Mapping of user ID to RSVP status, oldest response first
+        """
+        rows = await self.database.fetch(
+            "SELECT user_id, status FROM rsvps WHERE session_id = ? ORDER BY updated_at, rowid",
+            (session_id,),
+        )
+        return {row["user_id"]: row["status"] for row in rows}
+
@@ -0,0 +1,337 @@
+"""
+Autocomplete indexes for the Game Coordinator Bot.
+
+Slash command choices are capped at 25, which is too few for timezones
+(about 600 IANA zones) and for a growing game catalog. Options backed by
+autocomplete search a precomputed index instead:
+
+- a sorted array of every word-boundary suffix of every search key, so a
+  prefix lookup is one bisect plus a short scan ("york" and "new y" both
+  find America/New_York)
+- a trigram index for typos ("sydeny") when no prefix matches
+
+Every lookup scans a bounded number of rows, so a keystroke costs the same
+however large the index is.
+"""
+
+import re
+import zoneinfo
+from bisect import bisect_left
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from game_coordinator_bot.utils.config import GameCatalog, get_catalog
+from game_coordinator_bot.utils.timezone_utils import COMMON_TIMEZONES
+
+# Discord shows at most 25 autocomplete suggestions
+MAX_SUGGESTIONS = 25
+# Longer input is truncated before searching
+MAX_QUERY_LENGTH = 50
+# Upper bound on prefix rows examined per lookup
+MAX_PREFIX_SCAN = 200
+# Minimum trigram similarity (Dice coefficient) for a fuzzy match
+FUZZY_THRESHOLD = 0.3
+
+_NON_ALNUM = re.compile(r'[^a-z0-9+]+')
+
+# City, country and nickname aliases that are not part of any IANA name
+TIMEZONE_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "America/New_York": ("nyc", "new york city", "boston", "miami", "atlanta", "washington dc", "philadelphia", "east coast"),
+    "America/Chicago": ("dallas", "houston", "austin", "minneapolis", "new orleans"),
+    "America/Denver": ("salt lake city", "albuquerque"),
+    "America/Los_Angeles": ("la", "sf", "san francisco", "seattle", "las vegas", "san diego", "portland", "west coast"),
+    "America/Toronto": ("montreal", "ottawa"),
+    "America/Sao_Paulo": ("rio", "rio de janeiro", "brazil"),
+    "Europe/London": ("uk", "england", "britain", "manchester", "edinburgh"),
+    "Europe/Paris": ("france",),
+    "Europe/Berlin": ("germany", "munich", "frankfurt", "hamburg"),
+    "Europe/Madrid": ("spain", "barcelona"),
+    "Europe/Rome": ("italy", "milan"),
+    "Europe/Amsterdam": ("netherlands", "holland"),
+    "Europe/Stockholm": ("sweden",),
+    "Europe/Warsaw": ("poland",),
+    "Europe/Moscow": ("st petersburg",),
+    "Europe/Istanbul": ("turkey", "ankara"),
+    "Asia/Kolkata": ("india", "mumbai", "delhi", "new delhi", "bangalore", "bengaluru", "chennai", "hyderabad"),
+    "Asia/Shanghai": ("china", "beijing", "shenzhen", "guangzhou"),
+    "Asia/Tokyo": ("japan", "osaka", "kyoto"),
+    "Asia/Seoul": ("korea", "south korea", "busan"),
+    "Asia/Manila": ("philippines",),
+    "Asia/Dubai": ("uae", "abu dhabi"),
+    "Australia/Sydney": ("canberra",),
+    "Pacific/Auckland": ("new zealand", "wellington"),
+    "Africa/Johannesburg": ("south africa", "cape town"),
+}
+
+
+def normalize(text: str) -> str:
+    """Lowercase and collapse separators ("America/New_York" -> "america new york")."""
+    return _NON_ALNUM.sub(' ', text.lower()).strip()
+
+
+def _trigrams(text: str) -> set:
+    compact = f" {text.replace(' ', '')} "
+    return {compact[i:i + 3] for i in range(len(compact) - 2)}
+
+
+class Suggestion(NamedTuple):
+    """One autocomplete entry."""
+    name: str  # Shown to the user (at most 100 characters)
+    value: str  # Sent back as the option value
+    keys: Sequence[str]  # Names the entry is known by
+    aliases: Sequence[str] = ()  # Secondary search terms, ranked below keys
+    weight: int = 0  # Breaks ties in favour of popular entries
+
+
+class SuggestionIndex:
+    """Precomputed prefix and trigram index over a fixed set of suggestions."""
+    
+    def __init__(self, suggestions: Iterable[Suggestion]):
+        self._entries: List[Suggestion] = list(suggestions)
+        # A submitted value always resolves to its own entry ("EST" is the EST zone)
+        self._exact: Dict[str, int] = {
+            normalize(entry.value): entry_id for entry_id, entry in enumerate(self._entries)
+        }
+        # (-weight, tier) of the entry each exact term resolves to; values always win
+        exact_ranks: Dict[str, Tuple[float, int]] = {term: (float("-inf"), 0) for term in self._exact}
+        prefixes: List[Tuple[str, int, int]] = []
+        trigram_lists: Dict[str, List[int]] = {}
+        # Fuzzy matching compares against each search term separately
+        self._term_entries: List[int] = []
+        self._term_trigram_counts: List[int] = []
+        
+        for entry_id, entry in enumerate(self._entries):
+            terms = [(key, 0) for key in entry.keys] + [(alias, 1) for alias in entry.aliases]
+            for term, tier in terms:
+                normalized = normalize(term)
+                if not normalized:
+                    continue
+                # Shared terms resolve to the most popular entry, as search()
+                # ranks them ("pst" is US/Pacific, not America/Ensenada), then
+                # to a key over an alias
+                rank = (-entry.weight, tier)
+                if rank < exact_ranks.get(normalized, (float("inf"), 0)):
+                    exact_ranks[normalized] = rank
+                    self._exact[normalized] = entry_id
+                # Every word-boundary suffix; words inside a term rank lowest
+                words = normalized.split(' ')
+                for position in range(len(words)):
+                    prefixes.append((' '.join(words[position:]), tier if position == 0 else 2, entry_id))
+                
+                term_id = len(self._term_entries)
+                grams = _trigrams(normalized)
+                for gram in grams:
+                    trigram_lists.setdefault(gram, []).append(term_id)
+                self._term_entries.append(entry_id)
+                self._term_trigram_counts.append(len(grams))
+        
+        prefixes.sort()
+        self._prefixes = prefixes
+        self._trigrams: Dict[str, Tuple[int, ...]] = {
+            gram: tuple(ids) for gram, ids in trigram_lists.items()
+        }
+        # Shown for an empty query
+        self._defaults = sorted(
+            range(len(self._entries)),
+            key=lambda entry_id: (-self._entries[entry_id].weight, self._entries[entry_id].name)
+        )
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def lookup(self, text: str) -> Optional[Suggestion]:
+        """
+        Resolve text that exactly matches a value, name or key.
+        
+        Args:
+            text: User input, e.g. a submitted option value
+        
+        Returns:
+            The matching Suggestion, or None
+        """
+        entry_id = self._exact.get(normalize(text))
+        return self._entries[entry_id] if entry_id is not None else None
+    
+    def search(self, query: str, limit: int = MAX_SUGGESTIONS) -> List[Suggestion]:
+        """
+        Rank suggestions for partially typed input.
+        
+        Args:
+            query: What the user has typed so far
+            limit: Maximum number of suggestions
+        
+        Returns:
+            Best matches first: exact terms, then key prefixes, alias
+            prefixes, inner word prefixes, and finally fuzzy matches
+        """
+        q = normalize(query[:MAX_QUERY_LENGTH])
+        if not q:
+            return [self._entries[entry_id] for entry_id in self._defaults[:limit]]
+        
+        scores: Dict[int, float] = {}
+        prefixes = self._prefixes
+        i = bisect_left(prefixes, (q,))
+        end = min(len(prefixes), i + MAX_PREFIX_SCAN)
+        while i < end:
+            suffix, tier, entry_id = prefixes[i]
+            if not suffix.startswith(q):
+                break
+            # Exact term, then term prefix, then alias prefix, then inner word prefix
+            score = 4 if suffix == q and tier < 2 else 3 - tier
+            if score > scores.get(entry_id, 0):
+                scores[entry_id] = score
+            i += 1
+        
+        # Typo tolerance only when nothing matches as typed
+        if not scores and len(q) >= 3:
+            self._fuzzy(q, scores)
+        
+        entries = self._entries
+        ranked = sorted(
+            scores,
+            key=lambda entry_id: (-scores[entry_id], -entries[entry_id].weight, len(entries[entry_id].name), entries[entry_id].name)
+        )
+        return [entries[entry_id] for entry_id in ranked[:limit]]
+    
+    def _fuzzy(self, q: str, scores: Dict[int, float]) -> None:
+        """Add trigram matches, scored by Dice coefficient."""
+        grams = _trigrams(q)
+        shared: Dict[int, int] = {}
+        for gram in grams:
+            for term_id in self._trigrams.get(gram, ()):
+                shared[term_id] = shared.get(term_id, 0) + 1
+        for term_id, count in shared.items():
+            similarity = 2 * count / (len(grams) + self._term_trigram_counts[term_id])
+            entry_id = self._term_entries[term_id]
+            if similarity >= FUZZY_THRESHOLD and similarity > scores.get(entry_id, 0):
+                scores[entry_id] = similarity
+
+
+def _abbreviations(zone: zoneinfo.ZoneInfo, year: int) -> List[str]:
+    """Alphabetic abbreviations a zone uses in winter and summer (e.g. EST, EDT)."""
+    names = []
+    for month in (1, 7):
+        name = datetime(year, month, 1, tzinfo=zone).tzname()
+        if name and name.isalpha() and name not in names:
+            names.append(name)
+    return names
+
+
+@lru_cache(maxsize=1)
+def timezone_index() -> SuggestionIndex:
+    """
+    Index of every IANA timezone, built once on first use.
+    
+    Keys are the zone name and its city; aliases are common abbreviations
+    and TIMEZONE_ALIASES. The zones in COMMON_TIMEZONES rank first on ties.
+    """
+    year = datetime.now().year
+    suggestions = []
+    for name in sorted(zoneinfo.available_timezones()):
+        try:
+            zone = zoneinfo.ZoneInfo(name)
+        except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+            continue
+        keys = [name, name.rsplit('/', 1)[-1]]
+        if name in COMMON_TIMEZONES:
+            keys.append(COMMON_TIMEZONES[name])
+        aliases = list(TIMEZONE_ALIASES.get(name, ()))
+        aliases.extend(_abbreviations(zone, year))
+        
+        if name in COMMON_TIMEZONES:
+            weight = 3
+        elif name in TIMEZONE_ALIASES:
+            weight = 2
+        elif name.startswith(('Etc/', 'SystemV/')):
+            weight = 0
+        else:
+            weight = 1
+        display = COMMON_TIMEZONES.get(name) or name.replace('_', ' ')
+        suggestions.append(Suggestion(display[:100], name, keys, aliases, weight))
+    return SuggestionIndex(suggestions)
+
+
+def resolve_timezone(text: str) -> Optional[str]:
+    """
+    Resolve a submitted timezone option to an IANA name.
+    
+    Accepts the suggestion value, a zone name in any case, a city or an
+    alias. Partial text is rejected rather than guessed ("e" is not
+    US/Eastern); the autocomplete suggestions are there to complete it.
+    
+    Args:
+        text: Option value from the interaction
+    
+    Returns:
+        IANA timezone name, or None if nothing matches exactly
+    """
+    match = timezone_index().lookup(text)
+    return match.value if match else None
+
+
+def timezone_display_name(name: str) -> str:
+    """Friendly display name for an IANA timezone."""
+    return COMMON_TIMEZONES.get(name) or name.replace('_', ' ')
+
+
+class CatalogIndexes:
+    """Game, mode and platform indexes for one catalog, rebuilt when the catalog is swapped."""
+    
+    def __init__(self, catalog: GameCatalog):
+        self.catalog = catalog
+        self.games = SuggestionIndex(
+            Suggestion(game.display_name, game.id, (game.display_name, game.id))
+            for game in catalog.games.values()
+        )
+        # Weighted so an empty query lists platforms in catalog order
+        self.platforms = SuggestionIndex(
+            Suggestion(name, platform_id, (name, platform_id), weight=-position)
+            for position, (platform_id, name) in enumerate(catalog.platforms.items())
+        )
+        self._modes: Dict[Optional[str], SuggestionIndex] = {}
+    
+    def modes(self, game_id: Optional[str]) -> SuggestionIndex:
+        """
+        Mode index for a game, or for every game's modes if it is unknown.
+        
+        Args:
+            game_id: Selected game, if any
+        
+        Returns:
+            SuggestionIndex over mode names and IDs
+        """
+        if game_id not in self.catalog.games:
+            game_id = None
+        index = self._modes.get(game_id)
+        if index is None:
+            seen = {}
+            for (mode_game, mode_id), mode in self.catalog.modes.items():
+                if game_id in (None, mode_game):
+                    seen.setdefault(mode_id, Suggestion(mode.name, mode_id, (mode.name, mode_id)))
+            index = self._modes[game_id] = SuggestionIndex(seen.values())
+        return index
+
+
+_catalog_indexes: Optional[CatalogIndexes] = None
+
+
+def catalog_indexes() -> CatalogIndexes:
+    """Indexes for the current catalog, rebuilt lazily after a reload."""
+    global _catalog_indexes
+    catalog = get_catalog()
+    if _catalog_indexes is None or _catalog_indexes.catalog is not catalog:
+        _catalog_indexes = CatalogIndexes(catalog)
+    return _catalog_indexes
+
+
+def to_choices(suggestions: Iterable[Suggestion]) -> List:
+    """
+    Convert suggestions to autocomplete choices.
+    
+    Returns:
+        List of app_commands.Choice objects
+    """
+    from discord import app_commands
+    
+    return [app_commands.Choice(name=entry.name, value=entry.value) for entry in suggestions]
@@ -0,0 +1,86 @@
+"""
+Hot reload for the game catalog.
+
+Polls the catalog file's modification time and, when it changes, loads and
+validates the new file off the event loop, then swaps it in with
+set_catalog(). A file that fails to load is logged and ignored, so a typo
+never takes the current catalog down. Interactions already in flight keep
+the catalog reference they started with.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Optional, Tuple
+
+from game_coordinator_bot.utils.config import load_catalog, set_catalog
+
+logger = logging.getLogger('game_coordinator.catalog')
+
+# Seconds between checks of the catalog file
+POLL_INTERVAL = 2.0
+
+
+class CatalogWatcher:
+    """Background task that reloads the catalog when its file changes."""
+    
+    def __init__(self, path: str, interval: float = POLL_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.reloads = 0
+        self._signature = self._stat()
+        self._task: Optional[asyncio.Task] = None
+    
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def start(self) -> None:
+        """Start watching the file."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="catalog-watcher")
+    
+    async def stop(self) -> None:
+        """Stop watching the file."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+    
+    async def check(self) -> bool:
+        """
+        Reload the catalog if the file changed since the last check.
+        
+        Returns:
+            True if a new catalog was swapped in
+        """
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return False
+        self._signature = signature
+        
+        try:
+            catalog = await asyncio.to_thread(load_catalog, self.path)
+        except (OSError, ValueError) as e:
+            logger.error(f'Keeping current game catalog; failed to load {self.path}: {e}')
+            return False
+        
+        set_catalog(catalog)
+        self.reloads += 1
+        logger.info(f'Reloaded game catalog from {self.path}: {len(catalog.games)} games')
+        return True
+    
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception:
+                logger.exception('Catalog reload failed')
@@ -0,0 +1,99 @@
+"""
+Command tree sync tracking for the Game Coordinator Bot.
+
+Syncing the slash command tree is a slow, rate-limited HTTP call, and the
+bot used to do it on every READY, including gateway reconnects. A stable
+hash of the serialized tree is stored per scope (application + guild or
+global), so the bot only syncs when the command schema actually changed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, Optional
+import discord
+from discord import app_commands
+
+logger = logging.getLogger('game_coordinator.sync')
+
+
+def command_tree_hash(tree: app_commands.CommandTree, guild: Optional[discord.abc.Snowflake] = None) -> str:
+    """
+    Hash the commands that a sync for ``guild`` would upload.
+    
+    Args:
+        tree: The bot's command tree
+        guild: Guild scope, or None for global commands
+    
+    Returns:
+        Hex digest that changes whenever the command schema changes
+    """
+    payload = sorted(
+        (command.to_dict(tree) for command in tree.get_commands(guild=guild)),
+        key=lambda data: (data.get("type", 1), data["name"]),
+    )
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class CommandSyncState:
+    """Last synced command tree hash per scope, persisted as JSON."""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._hashes: Dict[str, str] = self._load()
+    
+    def _load(self) -> Dict[str, str]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f'Ignoring unreadable sync state {self.path}: {e}')
+            return {}
+        return data if isinstance(data, dict) else {}
+    
+    def get(self, scope: str) -> Optional[str]:
+        """Hash last synced for a scope, if any."""
+        return self._hashes.get(scope)
+    
+    def set(self, scope: str, digest: str) -> None:
+        """Record a successful sync and write the state file atomically."""
+        self._hashes[scope] = digest
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._hashes, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+async def sync_if_changed(
+    tree: app_commands.CommandTree,
+    state: CommandSyncState,
+    scope: str,
+    guild: Optional[discord.abc.Snowflake] = None,
+    force: bool = False
+) -> bool:
+    """
+    Sync the command tree only if its schema differs from the last sync.
+    
+    Args:
+        tree: The bot's command tree
+        state: Persisted sync hashes
+        scope: Key for this application and guild/global scope
+        guild: Guild to sync to, or None for global
+        force: Sync even if the hash is unchanged
+    
+    Returns:
+        True if a sync was performed
+    """
+    digest = command_tree_hash(tree, guild)
+    if not force and state.get(scope) == digest:
+        return False
+    await tree.sync(guild=guild)
+    state.set(scope, digest)
+    return True
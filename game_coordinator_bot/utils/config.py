@@ -1,23 +1,32 @@
 """
 Configuration management for the Game Coordinator Bot.
 
-This module provides configuration for games and their properties,
-making it easy to add new games and features in the future.
+Games, modes and platforms are loaded from a catalog file
+(game_coordinator_bot/data/games.json by default) into an immutable
+GameCatalog index. Adding a game is a data change: edit the catalog and the
+bot picks it up, including its autocomplete suggestions.
 """
 
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+import json
+import os
+from dataclasses import dataclass, field
 from enum import Enum
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+DEFAULT_CATALOG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "games.json"
+)
 
 
 class GameType(str, Enum):
-    """Enum for supported games."""
+    """IDs of the games in the bundled catalog."""
     CALL_OF_DUTY = "call_of_duty"
     OVERCOOKED = "overcooked"
 
 
 class Platform(str, Enum):
-    """Enum for gaming platforms."""
+    """IDs of the platforms in the bundled catalog."""
     PC = "pc"
     PLAYSTATION = "playstation"
     XBOX = "xbox"
@@ -25,7 +34,7 @@ class Platform(str, Enum):
     CROSSPLATFORM = "crossplatform"
 
 
-@dataclass
+@dataclass(frozen=True)
 class GameMode:
     """Represents a game mode."""
     id: str
@@ -33,47 +42,149 @@ class GameMode:
     description: Optional[str] = None
 
 
-@dataclass
+@dataclass(frozen=True)
 class GameConfig:
     """Configuration for a specific game."""
     id: str
     name: str
     display_name: str
-    modes: List[GameMode]
+    modes: Sequence[GameMode]
     supports_modes: bool
     color: int  # Discord color as integer
+    _modes_by_id: Mapping[str, GameMode] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        modes = tuple(self.modes)
+        object.__setattr__(self, "modes", modes)
+        object.__setattr__(self, "_modes_by_id", MappingProxyType({mode.id: mode for mode in modes}))
     
     def get_mode_by_id(self, mode_id: str) -> Optional[GameMode]:
         """Get a game mode by its ID."""
-        for mode in self.modes:
-            if mode.id == mode_id:
-                return mode
-        return None
-
-
-# Game configurations
-GAME_CONFIGS: Dict[str, GameConfig] = {
-    GameType.CALL_OF_DUTY: GameConfig(
-        id=GameType.CALL_OF_DUTY,
-        name="call_of_duty",
-        display_name="Call of Duty",
-        supports_modes=True,
-        modes=[
-            GameMode(id="zombies", name="Zombies", description="Survive the undead hordes"),
-            GameMode(id="multiplayer", name="Multiplayer", description="Classic PvP battles"),
-            GameMode(id="endgame", name="Endgame", description="High-stakes endgame mode"),
-        ],
-        color=0x8B0000,  # Dark red
-    ),
-    GameType.OVERCOOKED: GameConfig(
-        id=GameType.OVERCOOKED,
-        name="overcooked",
-        display_name="Overcooked",
-        supports_modes=False,
-        modes=[],
-        color=0xFF8C00,  # Orange
-    ),
-}
+        return self._modes_by_id.get(mode_id)
+
+
+def _parse_color(value: Any) -> int:
+    """Accept an integer or a "#RRGGBB"/"0xRRGGBB" string."""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        return int(value.lstrip("#"), 16)
+    raise ValueError(f"Invalid color {value!r}")
+
+
+class GameCatalog:
+    """
+    Immutable index of games, modes and platforms.
+    
+    Lookups are dict hits: games by ID, modes by (game ID, mode ID) and
+    platform display names by ID. A new catalog is built for every change
+    and swapped in with set_catalog(), so readers never see a partial update.
+    """
+    
+    __slots__ = ("games", "modes", "platforms")
+    
+    def __init__(self, games: Iterable[GameConfig], platforms: Mapping[str, str]):
+        self.games: Mapping[str, GameConfig] = MappingProxyType({game.id: game for game in games})
+        self.modes: Mapping[Tuple[str, str], GameMode] = MappingProxyType({
+            (game.id, mode.id): mode
+            for game in self.games.values()
+            for mode in game.modes
+        })
+        self.platforms: Mapping[str, str] = MappingProxyType(dict(platforms))
+    
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'GameCatalog':
+        """
+        Build and validate a catalog from its file representation.
+        
+        Args:
+            data: Dict with "games" and "platforms" lists
+        
+        Returns:
+            GameCatalog
+        
+        Raises:
+            ValueError: If the catalog is malformed
+        """
+        try:
+            games = []
+            for entry in data["games"]:
+                modes = [
+                    GameMode(id=mode["id"], name=mode["name"], description=mode.get("description"))
+                    for mode in entry.get("modes", [])
+                ]
+                if len({mode.id for mode in modes}) != len(modes):
+                    raise ValueError(f"Duplicate mode IDs in game {entry['id']!r}")
+                games.append(GameConfig(
+                    id=entry["id"],
+                    name=entry.get("name", entry["id"]),
+                    display_name=entry["display_name"],
+                    modes=modes,
+                    supports_modes=entry.get("supports_modes", bool(modes)),
+                    color=_parse_color(entry.get("color", 0x5865F2)),
+                ))
+            platforms = [(entry["id"], entry["name"]) for entry in data["platforms"]]
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Malformed game catalog: missing or invalid {e}") from e
+        
+        if not games:
+            raise ValueError("Game catalog has no games")
+        if len({game.id for game in games}) != len(games):
+            raise ValueError("Duplicate game IDs in catalog")
+        if len(dict(platforms)) != len(platforms):
+            raise ValueError("Duplicate platform IDs in catalog")
+        return cls(games, dict(platforms))
+    
+    def get_mode(self, game_id: str, mode_id: str) -> Optional[GameMode]:
+        """Get a mode by game and mode ID."""
+        return self.modes.get((game_id, mode_id))
+
+
+def load_catalog(path: str) -> GameCatalog:
+    """
+    Load a catalog from a JSON file, or TOML on Python 3.11+.
+    
+    Args:
+        path: Path to the catalog file
+    
+    Returns:
+        GameCatalog
+    
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file cannot be parsed or is malformed
+    """
+    if path.endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:
+            raise ValueError("TOML catalogs need Python 3.11+; use JSON instead")
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    else:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    return GameCatalog.from_dict(data)
+
+
+# The current catalog; replaced as a whole, never mutated
+_catalog: GameCatalog = load_catalog(DEFAULT_CATALOG_PATH)
+
+# Read-only live views of the current catalog, kept for existing callers
+_game_configs: Dict[str, GameConfig] = dict(_catalog.games)
+_platform_names: Dict[str, str] = dict(_catalog.platforms)
+GAME_CONFIGS: Mapping[str, GameConfig] = MappingProxyType(_game_configs)
+PLATFORM_NAMES: Mapping[str, str] = MappingProxyType(_platform_names)
+
+
+def get_catalog() -> GameCatalog:
+    """
+    Get the current catalog.
+    
+    Handlers should look it up once and use that reference throughout, so
+    a reload in the middle of an interaction cannot mix two catalogs.
+    """
+    return _catalog
 
 
 def get_game_config(game_id: str) -> Optional[GameConfig]:
@@ -86,22 +197,64 @@ def get_game_config(game_id: str) -> Optional[GameConfig]:
     Returns:
         GameConfig if found, None otherwise
     """
-    return GAME_CONFIGS.get(game_id)
+    return _catalog.games.get(game_id)
 
 
 def get_all_games() -> List[GameConfig]:
     """Get all available game configurations."""
-    return list(GAME_CONFIGS.values())
+    return list(_catalog.games.values())
+
+
+# Callbacks invoked after the catalog changes
+_config_listeners: List[Callable[[], None]] = []
+
+
+def add_config_listener(callback: Callable[[], None]) -> None:
+    """
+    Register a callback to run whenever the game configurations change.
+    
+    Args:
+        callback: Function called with no arguments after an update
+    """
+    _config_listeners.append(callback)
 
 
-# Platform display names
-PLATFORM_NAMES: Dict[str, str] = {
-    Platform.PC: "PC",
-    Platform.PLAYSTATION: "PlayStation",
-    Platform.XBOX: "Xbox",
-    Platform.SWITCH: "Nintendo Switch",
-    Platform.CROSSPLATFORM: "Cross-platform",
-}
+def remove_config_listener(callback: Callable[[], None]) -> None:
+    """
+    Unregister a callback added with add_config_listener.
+    
+    Args:
+        callback: Previously registered callback
+    """
+    if callback in _config_listeners:
+        _config_listeners.remove(callback)
+
+
+def set_catalog(catalog: GameCatalog) -> None:
+    """
+    Swap in a new catalog and notify listeners.
+    
+    Args:
+        catalog: Fully built replacement catalog
+    """
+    global _catalog
+    _catalog = catalog
+    _game_configs.clear()
+    _game_configs.update(catalog.games)
+    _platform_names.clear()
+    _platform_names.update(catalog.platforms)
+    for callback in list(_config_listeners):
+        callback()
+
+
+def update_game_configs(configs: Mapping[str, GameConfig]) -> None:
+    """
+    Replace the game configurations, keeping the current platforms.
+    
+    Args:
+        configs: New mapping of game ID to configuration
+    """
+    set_catalog(GameCatalog(configs.values(), _catalog.platforms))
 
 
 def get_platform_name(platform_id: str) -> str:
@@ -114,4 +267,4 @@ def get_platform_name(platform_id: str) -> str:
     Returns:
         Display name for the platform
     """
-    return PLATFORM_NAMES.get(platform_id, platform_id.title())
+    return _catalog.platforms.get(platform_id, platform_id.title())
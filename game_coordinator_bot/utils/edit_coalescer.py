@@ -0,0 +1,96 @@
+"""
+Message edit coalescing for the Game Coordinator Bot.
+
+Bursts of button clicks on one message would otherwise turn into one message
+edit per click and run into Discord's per-channel rate limits. The coalescer
+applies the first change in a quiet period as part of the interaction
+acknowledgement itself, then folds every further change during the window
+into a single trailing edit rendered from the latest state.
+"""
+
+import asyncio
+import logging
+from typing import Callable, Dict, Hashable, Optional
+import discord
+
+from game_coordinator_bot.dispatcher import OutboundDispatcher, Priority, Route
+
+logger = logging.getLogger('game_coordinator.edits')
+
+
+# Seconds during which changes to one message are merged into a single edit
+EDIT_WINDOW = 1.0
+
+
+class _PendingEdit:
+    """Latest state for a message whose edit window is open."""
+    
+    __slots__ = ("render", "message", "dirty")
+    
+    def __init__(self, render: Callable[[], discord.Embed], message: Optional[discord.Message]):
+        self.render = render
+        self.message = message
+        self.dirty = False
+
+
+class EditCoalescer:
+    """Throttles embed edits to at most one per message per window."""
+    
+    def __init__(self, dispatcher: OutboundDispatcher, window: float = EDIT_WINDOW):
+        self.dispatcher = dispatcher
+        self.window = window
+        self.edits = 0
+        self._pending: Dict[Hashable, _PendingEdit] = {}
+    
+    async def submit(
+        self,
+        key: Hashable,
+        interaction: discord.Interaction,
+        render: Callable[[], discord.Embed]
+    ) -> None:
+        """
+        Acknowledge a component interaction and schedule the embed update.
+        
+        Args:
+            key: Identifies the message being edited (e.g., session ID)
+            interaction: Component interaction to acknowledge
+            render: Builds the embed from the current state when called
+        """
+        pending = self._pending.get(key)
+        if pending is None:
+            # Quiet period: update the message as part of the acknowledgement
+            self._pending[key] = _PendingEdit(render, interaction.message)
+            asyncio.create_task(self._close_window(key))
+            embed = render()
+            await self.dispatcher.submit(
+                Route.interaction(interaction),
+                lambda: interaction.response.edit_message(embed=embed),
+                Priority.INTERACTION,
+            )
+            return
+        
+        pending.render = render
+        pending.message = interaction.message or pending.message
+        pending.dirty = True
+        await self.dispatcher.submit(
+            Route.interaction(interaction),
+            interaction.response.defer,
+            Priority.INTERACTION,
+        )
+    
+    async def _close_window(self, key: Hashable) -> None:
+        while True:
+            await asyncio.sleep(self.window)
+            pending = self._pending[key]
+            if not pending.dirty or pending.message is None:
+                del self._pending[key]
+                return
+            
+            # Keep the window open while editing so a continuing burst
+            # still results in at most one edit per window
+            pending.dirty = False
+            self.edits += 1
+            try:
+                await self.dispatcher.edit(pending.message, embed=pending.render())
+            except discord.HTTPException as e:
+                logger.warning('Failed to apply coalesced edit for %s: %s', key, e)
@@ -0,0 +1,116 @@
+"""
+Session embed templates for the Game Coordinator Bot.
+
+The static parts of a session announcement (title, color and game field)
+only depend on the game and mode, so they are built once per combination
+and each new session just fills in the organizer, platform and time.
+"""
+
+from typing import Dict, Mapping, Optional, Tuple
+import discord
+
+from game_coordinator_bot.utils.config import GameConfig, get_catalog
+
+
+SESSION_TITLE = "🎮 Gaming Session"
+DEFAULT_COLOR = discord.Color.blue()
+
+
+class EmbedTemplate:
+    """Prebuilt static content for one game/mode announcement."""
+    
+    __slots__ = ("color", "game_display", "_game_field")
+    
+    def __init__(self, color: discord.Color, game_display: str):
+        self.color = color
+        self.game_display = game_display
+        # The game field in Discord's embed format, copied into each render
+        self._game_field = {"name": "🎯 Game", "value": game_display, "inline": True}
+    
+    def render(
+        self,
+        user: discord.abc.User,
+        platform: str,
+        timestamp: Optional[int],
+        timezone_display: str
+    ) -> discord.Embed:
+        """
+        Create a session embed from this template.
+        
+        Args:
+            user: User who created the session
+            platform: Gaming platform display name
+            timestamp: Unix timestamp of the session, or None
+            timezone_display: Timezone display name
+        
+        Returns:
+            discord.Embed: Formatted embed
+        """
+        if timestamp:
+            # Discord timestamp formatting: <t:timestamp:F> shows full date/time in user's local timezone
+            time_display = f"<t:{timestamp}:F>\n<t:{timestamp}:R>"
+        else:
+            time_display = "Time not specified"
+        
+        # Fill the embed's attributes directly, as Embed.from_dict does, instead
+        # of going through __init__, add_field and set_footer for every session
+        embed = discord.Embed.__new__(discord.Embed)
+        embed.type = "rich"
+        embed.title = SESSION_TITLE
+        embed.url = None
+        embed.description = f"{user.mention} wants to play!"
+        embed._flags = 0
+        embed._colour = self.color
+        embed._fields = [
+            self._game_field.copy(),
+            {"name": "🖥️ Platform", "value": platform, "inline": True},
+            {"name": "⏰ Time", "value": time_display, "inline": False},
+        ]
+        embed._footer = {
+            "text": f"Organized by {user.name} • {timezone_display}",
+            "icon_url": str(user.display_avatar.url),
+        }
+        return embed
+
+
+class EmbedTemplateCache:
+    """Templates keyed by (game ID, mode ID), built from the game configs."""
+    
+    def __init__(self, configs: Optional[Mapping[str, GameConfig]] = None):
+        # None follows the current catalog across reloads
+        self._configs = configs
+        self._templates: Dict[Tuple[str, Optional[str]], EmbedTemplate] = {}
+        self.build()
+    
+    def build(self) -> None:
+        """Build a template for every game and each of its modes."""
+        templates: Dict[Tuple[str, Optional[str]], EmbedTemplate] = {}
+        configs = self._configs if self._configs is not None else get_catalog().games
+        for game_id, config in configs.items():
+            color = discord.Color(config.color)
+            templates[(game_id, None)] = EmbedTemplate(color, config.display_name)
+            for mode in config.modes:
+                templates[(game_id, mode.id)] = EmbedTemplate(
+                    color, f"{config.display_name} - {mode.name}"
+                )
+        self._templates = templates
+    
+    def invalidate(self) -> None:
+        """Rebuild templates after the game configurations change."""
+        self.build()
+    
+    def get(self, game_id: str, mode_id: Optional[str] = None) -> Optional[EmbedTemplate]:
+        """
+        Get the template for a game and mode.
+        
+        Args:
+            game_id: Game identifier
+            mode_id: Mode identifier, or None for games without modes
+        
+        Returns:
+            EmbedTemplate if the combination is configured, None otherwise
+        """
+        return self._templates.get((game_id, mode_id))
+    
+    def __len__(self) -> int:
+        return len(self._templates)
@@ -0,0 +1,71 @@
+"""
+Gateway profiles for the Game Coordinator Bot.
+
+The bot only handles slash commands, buttons and scheduled reminders, so
+most of what discord.py caches by default (messages, members, presences)
+is never read. The "lean" profile subscribes only to the guilds intent,
+which is still needed for the channel cache used by reminders, and turns
+the remaining caches off.
+
+The REST API and gateway URLs can also be overridden, so the bot can run
+against a local stand-in such as benchmarks/fake_discord.py.
+"""
+
+from typing import Any, Dict, Optional
+import discord
+import yarl
+from discord.gateway import DiscordWebSocket
+
+# Current behaviour: default intents plus message content
+STANDARD_PROFILE = "standard"
+# Interaction-only operation with minimal intents and caches
+LEAN_PROFILE = "lean"
+GATEWAY_PROFILES = (STANDARD_PROFILE, LEAN_PROFILE)
+
+
+def gateway_options(profile: str = STANDARD_PROFILE) -> Dict[str, Any]:
+    """
+    Get client keyword arguments for a gateway profile.
+    
+    Args:
+        profile: One of GATEWAY_PROFILES
+    
+    Returns:
+        Dict of intents and cache options to pass to the bot constructor
+    
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    if profile == STANDARD_PROFILE:
+        intents = discord.Intents.default()
+        intents.message_content = True
+        intents.guilds = True
+        return {"intents": intents}
+    
+    if profile == LEAN_PROFILE:
+        intents = discord.Intents.none()
+        intents.guilds = True
+        return {
+            "intents": intents,
+            "max_messages": None,
+            "member_cache_flags": discord.MemberCacheFlags.none(),
+            "chunk_guilds_at_startup": False,
+        }
+    
+    raise ValueError(
+        f"Unknown gateway profile {profile!r}; expected one of {', '.join(GATEWAY_PROFILES)}"
+    )
+
+
+def use_endpoints(api_url: Optional[str] = None, gateway_url: Optional[str] = None) -> None:
+    """
+    Point discord.py at another REST API and gateway.
+    
+    Args:
+        api_url: REST API base URL, e.g. "http://127.0.0.1:8090/api/v10"
+        gateway_url: Gateway websocket URL, e.g. "ws://127.0.0.1:8090/gateway"
+    """
+    if api_url:
+        discord.http.Route.BASE = api_url.rstrip("/")
+    if gateway_url:
+        DiscordWebSocket.DEFAULT_GATEWAY = yarl.URL(gateway_url)
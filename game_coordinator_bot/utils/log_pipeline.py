@@ -0,0 +1,118 @@
+"""
+Non-blocking logging for the Game Coordinator Bot.
+
+Every logger hands its records to a ``QueueHandler``; a ``QueueListener``
+thread formats them and writes them out. A burst of interactions therefore
+never waits on stderr or journald from inside the event loop.
+
+Records are not formatted on the calling thread: the message arguments
+travel with the record and ``%``-style formatting happens on the writer
+thread, so log calls should pass immutable values (``logger.info("... %s",
+name)``) rather than building f-strings. Extra fields passed with
+``extra={...}`` become keys of the JSON record.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional, TextIO
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+LOG_FORMATS = ("json", "text")
+
+# Attributes every LogRecord has; anything else came from ``extra``
+_RECORD_ATTRIBUTES = frozenset(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__
+) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as one JSON object per line."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        data: Dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                data[key] = value
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data["exception"] = record.exc_text
+        if record.stack_info:
+            data["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(data, default=str, ensure_ascii=False)
+
+
+class LazyQueueHandler(QueueHandler):
+    """
+    Queue handler that leaves formatting to the listener thread.
+    
+    The standard ``QueueHandler.prepare`` formats the message (and any
+    traceback) before enqueueing, which is the expensive part. The queue
+    here never leaves the process, so the record can be passed as is.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def configure_logging(
+    level: int = logging.INFO,
+    log_format: str = "json",
+    stream: Optional[TextIO] = None
+) -> QueueListener:
+    """
+    Route all logging through a queue to a background writer thread.
+    
+    Replaces the root logger's handlers. The listener is stopped (and the
+    queue drained) at interpreter exit.
+    
+    Args:
+        level: Root log level
+        log_format: "json" for structured records, "text" for the classic format
+        stream: Where records are written (defaults to stderr)
+    
+    Returns:
+        The started QueueListener
+    
+    Raises:
+        ValueError: If the log format is unknown
+    """
+    if log_format == "json":
+        formatter: logging.Formatter = JsonFormatter()
+    elif log_format == "text":
+        formatter = logging.Formatter(TEXT_FORMAT)
+    else:
+        raise ValueError(f"Unknown log format {log_format!r}; expected one of {', '.join(LOG_FORMATS)}")
+    
+    writer = logging.StreamHandler(stream if stream is not None else sys.stderr)
+    writer.setFormatter(formatter)
+    
+    records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    listener = QueueListener(records, writer, respect_handler_level=True)
+    
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(LazyQueueHandler(records))
+    root.setLevel(level)
+    
+    listener.start()
+    atexit.register(_stop, listener)
+    return listener
+
+
+def _stop(listener: QueueListener) -> None:
+    # QueueListener.stop fails if called twice
+    if listener._thread is not None:
+        listener.stop()
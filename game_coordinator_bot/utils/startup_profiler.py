@@ -0,0 +1,79 @@
+"""
+Startup timing for the Game Coordinator Bot.
+
+systemd restarts the bot on failure, so cold-start time is downtime. The
+profiler records how long each startup phase took (module imports,
+extension loading, login, and connecting until the first READY) and logs a
+one-line report once the bot is ready.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+logger = logging.getLogger('game_coordinator.startup')
+
+# Phases in the order the bot goes through them
+STARTUP_PHASES = ("import", "extensions", "login", "ready")
+
+
+class StartupProfiler:
+    """Wall-clock durations of named startup phases."""
+    
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self.origin = clock()
+        self._started: Dict[str, float] = {}
+        self.durations: Dict[str, float] = {}
+        self.reported = False
+    
+    def begin(self, phase: str) -> None:
+        """Start timing a phase."""
+        self._started[phase] = self._clock()
+    
+    def end(self, phase: str) -> Optional[float]:
+        """
+        Stop timing a phase.
+        
+        Args:
+            phase: Phase name passed to begin()
+        
+        Returns:
+            Duration in seconds, or None if the phase was never begun
+        """
+        started = self._started.pop(phase, None)
+        if started is None:
+            return None
+        self.durations[phase] = self._clock() - started
+        return self.durations[phase]
+    
+    @contextmanager
+    def phase(self, phase: str) -> Iterator[None]:
+        """Time the body of a with-block as a phase."""
+        self.begin(phase)
+        try:
+            yield
+        finally:
+            self.end(phase)
+    
+    def report(self) -> Dict[str, float]:
+        """
+        Phase durations in milliseconds, plus the total since the profiler was created.
+        
+        Returns:
+            Dict of phase name to milliseconds, known phases first
+        """
+        ordered = [name for name in STARTUP_PHASES if name in self.durations]
+        ordered += [name for name in self.durations if name not in STARTUP_PHASES]
+        result = {name: round(self.durations[name] * 1000, 1) for name in ordered}
+        result["total"] = round((self._clock() - self.origin) * 1000, 1)
+        return result
+    
+    def log_report(self) -> None:
+        """Log the report once; later calls (e.g. on reconnect) do nothing."""
+        if self.reported:
+            return
+        self.reported = True
+        timings = ", ".join(f"{name}={ms:.0f}ms" for name, ms in self.report().items())
+        logger.info(f'Startup timings: {timings}')
@@ -0,0 +1,312 @@
+"""
+Session time grammar for the Game Coordinator Bot.
+
+Times typed into ``/play`` ("8pm", "tomorrow 9", "fri 8:30pm", "in 2h",
+"noon") are split into number, word and punctuation tokens by the regex
+engine, with patterns that are single character classes and so never
+backtrack, then read by a recursive-descent grammar with one token of
+lookahead. Every rule either consumes the tokens it recognizes or gives up,
+so nothing is ever re-read and the cost is linear in the input however it is
+phrased.
+
+The grammar only says what was asked for (a ``TimeSpec``); turning that into
+a datetime in the member's timezone is left to ``timezone_utils``.
+
+    when     := "in" delay
+              | [day] ["at"] clock [["on"] day]
+    delay    := amount unit {["and"] amount unit}
+    amount   := NUMBER | "a" | "an"
+    day      := ["on"] ("today" | "tonight" | "tomorrow" | weekday)
+    clock    := NUMBER [":" NUMBER] [meridiem] | "noon" | "midnight"
+    meridiem := "am" | "pm" | "a" | "p"
+    days     := (group | weekday ["-" weekday]) {[","] (group | weekday ["-" weekday])}
+"""
+
+import re
+from functools import lru_cache
+from typing import Callable, List, NamedTuple, Optional, Tuple, TypeVar
+
+
+# A token is a run of digits, a run of letters or one punctuation mark
+_TOKEN = re.compile(r"\d+|[a-z]+|[:,\-]", re.ASCII)
+_INVALID = re.compile(r"[^0-9a-z:,\-\s]", re.ASCII)
+
+WEEKDAY_PREFIXES = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+DAY_GROUPS = {
+    "weekdays": tuple(range(5)),
+    "weekday": tuple(range(5)),
+    "weekends": (5, 6),
+    "weekend": (5, 6),
+    "daily": tuple(range(7)),
+    "day": tuple(range(7)),
+    "everyday": tuple(range(7)),
+}
+# Days from today
+RELATIVE_DAYS = {"today": 0, "tonight": 0, "tomorrow": 1, "tmrw": 1, "tmr": 1}
+NAMED_TIMES = {"noon": (12, 0), "midnight": (0, 0)}
+MERIDIEMS = {"am": 0, "a": 0, "pm": 12, "p": 12}
+ARTICLES = frozenset(("a", "an"))
+UNITS = {
+    "m": 60, "min": 60, "mins": 60, "minute": 60, "minutes": 60,
+    "h": 3600, "hr": 3600, "hrs": 3600, "hour": 3600, "hours": 3600,
+    "d": 86400, "day": 86400, "days": 86400,
+}
+# Longest number accepted in a delay ("in 9999 minutes")
+MAX_AMOUNT_DIGITS = 4
+
+# Upper bound on memoized parse results
+SPEC_CACHE_SIZE = 1024
+
+T = TypeVar("T")
+
+
+class TimeSpec(NamedTuple):
+    """A session time as typed, before it is placed in a timezone."""
+    hour: int = 0
+    minute: int = 0
+    day: Optional[int] = None  # Days from today ("today", "tomorrow")
+    weekday: Optional[int] = None  # 0 = Monday
+    delay: Optional[int] = None  # Seconds from now ("in 2h"); the other fields are unused
+
+
+def tokenize(text: str) -> Optional[List[str]]:
+    """
+    Split text into tokens.
+    
+    Args:
+        text: Input to split; letters are lowercased
+    
+    Returns:
+        List of tokens, or None if the text has a character no rule uses
+    """
+    text = text.lower()
+    if _INVALID.search(text):
+        return None
+    return _TOKEN.findall(text)
+
+
+def parse_weekday(name: str) -> Optional[int]:
+    """Weekday number (0 = Monday) of a name or abbreviation of three letters or more."""
+    if len(name) < 3:
+        return None
+    for day, prefix in enumerate(WEEKDAY_PREFIXES):
+        if name.startswith(prefix):
+            return day
+    return None
+
+
+class TimeGrammar:
+    """
+    Recursive-descent parser over a token list.
+    
+    Each rule method reads tokens from the current position and returns None
+    as soon as a token does not fit; callers then reject the whole input.
+    """
+    
+    __slots__ = ("tokens", "position")
+    
+    def __init__(self, tokens: List[str]):
+        self.tokens = tokens
+        self.position = 0
+    
+    def at_end(self) -> bool:
+        """Whether every token has been read."""
+        return self.position == len(self.tokens)
+    
+    def peek(self) -> Optional[str]:
+        """The next token without reading it, or None at the end."""
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+    
+    def word(self, text: str) -> bool:
+        """Read the next token if it is ``text``."""
+        if self.peek() == text:
+            self.position += 1
+            return True
+        return False
+    
+    def when(self) -> Optional[TimeSpec]:
+        """A session time: a delay, or a clock time with an optional day."""
+        token = self.peek()
+        if token == "in":
+            self.position += 1
+            delay = self.delay()
+            return TimeSpec(delay=delay) if delay is not None else None
+        
+        day = (None, None, False)
+        if token is not None and (token == "on" or token in RELATIVE_DAYS or parse_weekday(token) is not None):
+            day = self.day()
+            if day is None:
+                return None
+        self.word("at")
+        clock = self.clock()
+        if clock is None:
+            return None
+        if day[:2] == (None, None) and not self.at_end():
+            # "8pm tomorrow", "9 tonight"
+            day = self.day()
+            if day is None:
+                return None
+        
+        hour, minute, meridiem = clock
+        relative_day, weekday, evening = day
+        if evening and not meridiem and 1 <= hour < 12:
+            hour += 12
+        return TimeSpec(hour, minute, relative_day, weekday)
+    
+    def delay(self) -> Optional[int]:
+        """Seconds in a delay such as "2h", "1 hour 30 min" or "an hour"."""
+        seconds = 0
+        while True:
+            amount = self.peek()
+            if amount is None:
+                return None
+            self.position += 1
+            if amount.isdigit() and len(amount) <= MAX_AMOUNT_DIGITS:
+                count = int(amount)
+            elif amount in ARTICLES:
+                count = 1
+            else:
+                return None
+            unit = self.peek()
+            if unit not in UNITS:
+                return None
+            self.position += 1
+            seconds += count * UNITS[unit]
+            self.word("and")
+            if self.at_end():
+                return seconds or None
+    
+    def day(self) -> Optional[Tuple[Optional[int], Optional[int], bool]]:
+        """
+        A day such as "tomorrow" or "on fri".
+        
+        Returns:
+            (days from today, weekday, whether it is "tonight"), with one of
+            the first two set, or None
+        """
+        self.word("on")
+        name = self.peek()
+        if name is None:
+            return None
+        self.position += 1
+        if name in RELATIVE_DAYS:
+            return RELATIVE_DAYS[name], None, name == "tonight"
+        weekday = parse_weekday(name)
+        return (None, weekday, False) if weekday is not None else None
+    
+    def clock(self) -> Optional[Tuple[int, int, bool]]:
+        """
+        A wall-clock time such as "8pm", "8:30 pm", "20:00", "9" or "noon".
+        
+        A bare hour is on the 24-hour clock, like "20:00".
+        
+        Returns:
+            (hour, minute, whether it was am/pm or named), or None
+        """
+        # The most common rule, so it reads the token list directly
+        tokens, position = self.tokens, self.position
+        end = len(tokens)
+        if position == end:
+            return None
+        token = tokens[position]
+        if token in NAMED_TIMES:
+            self.position = position + 1
+            return (*NAMED_TIMES[token], True)
+        if not token.isdigit() or len(token) > 2:
+            return None
+        hour, minute = int(token), 0
+        position += 1
+        if position < end and tokens[position] == ":":
+            token = tokens[position + 1] if position + 1 < end else ""
+            if not token.isdigit() or len(token) != 2:
+                return None
+            minute = int(token)
+            if minute > 59:
+                return None
+            position += 2
+        meridiem = tokens[position] if position < end else None
+        if meridiem in MERIDIEMS:
+            if not 1 <= hour <= 12:
+                return None
+            self.position = position + 1
+            return hour % 12 + MERIDIEMS[meridiem], minute, True
+        self.position = position
+        return (hour, minute, False) if hour <= 23 else None
+    
+    def days(self) -> Optional[Tuple[int, ...]]:
+        """Weekdays such as "mon-fri", "sat, sun", "weekends" or "daily", sorted."""
+        days = set()
+        while True:
+            token = self.peek()
+            if token is None:
+                break
+            if token in DAY_GROUPS:
+                self.position += 1
+                days.update(DAY_GROUPS[token])
+            else:
+                first = parse_weekday(token)
+                if first is None:
+                    break
+                self.position += 1
+                last = first
+                if self.word("-"):
+                    name = self.peek()
+                    last = parse_weekday(name) if name is not None else None
+                    if last is None:
+                        return None
+                    self.position += 1
+                # "fri-mon" wraps over the weekend
+                days.update((first + offset) % 7 for offset in range((last - first) % 7 + 1))
+            self.word(",")
+        return tuple(sorted(days)) or None
+
+
+def _parse_all(text: str, rule: Callable[[TimeGrammar], Optional[T]]) -> Optional[T]:
+    """Apply a grammar rule to the whole text."""
+    tokens = tokenize(text)
+    if tokens is None:
+        return None
+    grammar = TimeGrammar(tokens)
+    result = rule(grammar)
+    return result if result is not None and grammar.at_end() else None
+
+
+@lru_cache(maxsize=SPEC_CACHE_SIZE)
+def parse_time_spec(text: str) -> Optional[TimeSpec]:
+    """
+    Parse a session time such as "tomorrow 9", "fri 8pm", "in 2h" or "noon".
+    
+    Args:
+        text: Normalized (lowercased, stripped) time string
+    
+    Returns:
+        TimeSpec, or None if the text is not a session time
+    """
+    return _parse_all(text, TimeGrammar.when)
+
+
+def parse_clock(text: str) -> Optional[Tuple[int, int]]:
+    """
+    Parse a wall-clock time such as "8pm", "20:00" or "noon".
+    
+    Args:
+        text: Time string
+    
+    Returns:
+        (hour, minute), or None if parsing fails
+    """
+    clock = _parse_all(text, TimeGrammar.clock)
+    return clock[:2] if clock is not None else None
+
+
+def parse_weekdays(text: str) -> Optional[Tuple[int, ...]]:
+    """
+    Parse days such as "mon-fri", "sat, sun", "weekdays" or "daily".
+    
+    Args:
+        text: Comma- or space-separated days, day ranges and groups
+    
+    Returns:
+        Sorted weekday numbers (0 = Monday), or None if a part is not a day
+    """
+    return _parse_all(text, TimeGrammar.days)
@@ -1,16 +1,19 @@
 """
 Timezone utilities for the Game Coordinator Bot.
 
-Provides timezone conversion and formatting for gaming sessions.
+Provides timezone conversion and formatting for gaming sessions. Session
+times are read by ``time_grammar`` and placed in the member's timezone here.
 """
 
-from datetime import datetime, timedelta
-from typing import Optional, List, TYPE_CHECKING
-import pytz
-import re
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, tzinfo
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+import time
+import zoneinfo
 
-if TYPE_CHECKING:
-    from discord import app_commands
+from game_coordinator_bot.utils.time_grammar import TimeSpec, parse_clock, parse_time_spec
 
 
 # Common timezones for gaming communities
@@ -28,93 +31,403 @@ COMMON_TIMEZONES = {
     "UTC": "UTC",
 }
 
+# Upper bound on memoized parse results
+PARSE_CACHE_SIZE = 1024
 
-def get_timezone_choices() -> List:
+# Years around the current one covered by a precomputed transition table
+TRANSITION_YEARS_BEFORE = 1
+TRANSITION_YEARS_AFTER = 5
+
+_EPOCH = datetime(1970, 1, 1)
+_SECONDS_PER_DAY = 86400
+# Offset changes are at least a week apart in every zone over the table window
+_SCAN_STEP = 7 * _SECONDS_PER_DAY
+
+
+@lru_cache(maxsize=None)
+def get_timezone(timezone_str: str) -> Optional[tzinfo]:
     """
-    Get timezone choices for slash command.
+    Resolve a timezone name once and reuse the tzinfo afterwards.
+    
+    Args:
+        timezone_str: Timezone name (e.g., "US/Eastern")
     
     Returns:
-        List of app_commands.Choice objects for timezones
+        tzinfo for the zone, or None if the name is unknown
+    """
+    try:
+        return zoneinfo.ZoneInfo(timezone_str)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+        return None
+
+
+def _local_seconds(naive: datetime) -> int:
+    """Wall-clock seconds since the epoch for a naive local datetime."""
+    return (naive - _EPOCH) // timedelta(seconds=1)
+
+
+class TransitionTable:
     """
-    from discord import app_commands
+    Precomputed UTC offset transitions for a single timezone.
+    
+    The table stores the UTC instants at which the zone's offset (or DST flag)
+    changes, so both UTC→local and local→UTC conversion are a bisect over a
+    flat list instead of a tzinfo lookup chain. Local→UTC follows pytz's
+    ``localize(is_dst=False)`` rules: ambiguous wall times resolve to standard
+    time and nonexistent ones are shifted by the offset in effect before the gap.
+    """
+    
+    __slots__ = ("name", "zone", "start", "end", "transitions", "offsets", "dst")
+    
+    def __init__(
+        self,
+        name: str,
+        zone: tzinfo,
+        start: int,
+        end: int,
+        transitions: List[int],
+        offsets: List[int],
+        dst: List[bool]
+    ):
+        self.name = name
+        self.zone = zone
+        self.start = start
+        self.end = end
+        # offsets[i] and dst[i] hold from transitions[i - 1] until transitions[i]
+        self.transitions = transitions
+        self.offsets = offsets
+        self.dst = dst
+    
+    @classmethod
+    def build(cls, name: str, start_year: int, end_year: int) -> Optional["TransitionTable"]:
+        """
+        Build a table covering ``start_year`` through ``end_year`` inclusive.
+        
+        Args:
+            name: Timezone name (e.g., "US/Eastern")
+            start_year: First year covered
+            end_year: Last year covered
+        
+        Returns:
+            TransitionTable, or None if the zone is unknown
+        """
+        zone = get_timezone(name)
+        if zone is None:
+            return None
+        
+        def period(ts: int) -> Tuple[int, bool]:
+            local = datetime.fromtimestamp(ts, zone)
+            return local.utcoffset() // timedelta(seconds=1), bool(local.dst())
+        
+        start = _local_seconds(datetime(start_year, 1, 1)) - _SECONDS_PER_DAY
+        end = _local_seconds(datetime(end_year + 1, 1, 1)) + _SECONDS_PER_DAY
+        
+        transitions: List[int] = []
+        first = period(start)
+        offsets, dst = [first[0]], [first[1]]
+        
+        # Walk a week at a time and pin each change down to the second
+        current, ts = first, start
+        while ts < end:
+            nxt = min(ts + _SCAN_STEP, end)
+            changed = period(nxt)
+            if changed != current:
+                lo, hi = ts, nxt
+                while hi - lo > 1:
+                    mid = (lo + hi) // 2
+                    if period(mid) == current:
+                        lo = mid
+                    else:
+                        hi = mid
+                transitions.append(hi)
+                offsets.append(changed[0])
+                dst.append(changed[1])
+                current = changed
+            ts = nxt
+        
+        return cls(name, zone, start, end, transitions, offsets, dst)
+    
+    def covers(self, utc_ts: float) -> bool:
+        """Whether ``utc_ts`` falls inside the precomputed window."""
+        return self.start <= utc_ts < self.end
     
-    return [
-        app_commands.Choice(name=display_name, value=tz_name)
-        for tz_name, display_name in COMMON_TIMEZONES.items()
-    ]
+    def utc_offset(self, utc_ts: float) -> int:
+        """UTC offset in seconds in effect at a UTC timestamp."""
+        return self.offsets[bisect_right(self.transitions, utc_ts)]
+    
+    def to_local(self, utc_ts: float) -> datetime:
+        """Naive local wall-clock datetime for a UTC timestamp."""
+        return _EPOCH + timedelta(seconds=utc_ts + self.utc_offset(utc_ts))
+    
+    def to_utc(self, local_ts: int) -> int:
+        """
+        Convert local wall-clock seconds to a UTC timestamp.
+        
+        Args:
+            local_ts: Seconds since the epoch of a naive local time
+        
+        Returns:
+            UTC timestamp in seconds
+        """
+        transitions, offsets = self.transitions, self.offsets
+        lo = bisect_right(transitions, local_ts - _SECONDS_PER_DAY)
+        hi = bisect_right(transitions, local_ts + _SECONDS_PER_DAY)
+        
+        candidates = []
+        for i in range(lo, hi + 1):
+            utc_ts = local_ts - offsets[i]
+            if (i == 0 or transitions[i - 1] <= utc_ts) and (
+                i == len(transitions) or utc_ts < transitions[i]
+            ):
+                candidates.append(i)
+        
+        if len(candidates) == 1:
+            return local_ts - offsets[candidates[0]]
+        
+        if not candidates:
+            # Wall time skipped by a forward jump: use the offset from before it
+            return self.to_utc(local_ts - 6 * 3600) + 6 * 3600
+        
+        # Ambiguous wall time: prefer standard time, then the latest instant
+        standard = [i for i in candidates if not self.dst[i]] or candidates
+        return local_ts - min(offsets[i] for i in standard)
+    
+    def localize(self, naive: datetime) -> datetime:
+        """
+        Attach this zone to a naive local datetime.
+        
+        Args:
+            naive: Local wall-clock time without tzinfo
+        
+        Returns:
+            Timezone-aware datetime for the same wall time
+        """
+        utc_ts = self.to_utc(_local_seconds(naive)) + naive.microsecond / 1e6
+        return datetime.fromtimestamp(utc_ts, self.zone)
 
 
-def parse_time_input(time_str: str, timezone_str: str) -> Optional[datetime]:
+_transition_tables: Dict[str, TransitionTable] = {}
+
+
+def get_transition_table(
+    timezone_str: str,
+    utc_ts: Optional[float] = None
+) -> Optional[TransitionTable]:
     """
-    Parse time input string with timezone.
+    Get the transition table for a zone, building it on first use.
     
     Args:
-        time_str: Time string (e.g., "8pm", "20:00", "8:30pm")
         timezone_str: Timezone name (e.g., "US/Eastern")
+        utc_ts: Instant the table must cover (defaults to now)
     
     Returns:
-        datetime object with timezone, or None if parsing fails
+        TransitionTable, or None if the zone is unknown
     """
-    try:
-        tz = pytz.timezone(timezone_str)
-        # Get current date in the specified timezone
-        now = datetime.now(tz)
+    if utc_ts is None:
+        utc_ts = time.time()
+    table = _transition_tables.get(timezone_str)
+    if table is not None and table.covers(utc_ts):
+        return table
+    
+    year = (_EPOCH + timedelta(seconds=utc_ts)).year
+    table = TransitionTable.build(
+        timezone_str,
+        year - TRANSITION_YEARS_BEFORE,
+        year + TRANSITION_YEARS_AFTER,
+    )
+    if table is not None:
+        _transition_tables[timezone_str] = table
+    return table
+
+
+def preload_transition_tables(all_zones: bool = False) -> int:
+    """
+    Build transition tables ahead of the first command.
+    
+    Args:
+        all_zones: Also load every IANA zone, not just COMMON_TIMEZONES
+    
+    Returns:
+        Number of tables loaded
+    """
+    names = set(COMMON_TIMEZONES)
+    if all_zones:
+        names.update(zoneinfo.available_timezones())
+    for name in sorted(names):
+        get_transition_table(name)
+    return len(_transition_tables)
+
+
+def parse_wall_time(time_str: str) -> Optional[Tuple[int, int]]:
+    """
+    Parse a wall-clock time without attaching a date or timezone.
+    
+    Args:
+        time_str: Time string (e.g., "8pm", "20:00", "8:30pm", "noon")
+    
+    Returns:
+        (hour, minute), or None if parsing fails
+    """
+    return parse_clock(time_str.lower().strip())
+
+
+class TimeParser:
+    """
+    Memoizing parser for session times.
+    
+    Results are cached per (normalized input, timezone, local date) in a
+    bounded LRU. An entry is only reused while it is still the answer the
+    parser would compute from scratch: until the parsed time passes (it then
+    rolls over to tomorrow) or until local midnight, whichever comes first.
+    Delays ("in 2h") depend on the second they are read, so they are never
+    cached.
+    """
+    
+    def __init__(self, maxsize: int = PARSE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._cache: OrderedDict = OrderedDict()
+    
+    def clear_cache(self) -> None:
+        """Drop all memoized results."""
+        self._cache.clear()
+    
+    def parse(self, time_str: str, timezone_str: str) -> Optional[datetime]:
+        """
+        Parse time input string with timezone.
+        
+        Args:
+            time_str: Time string (e.g., "8pm", "fri 8:30pm", "in 2h")
+            timezone_str: Timezone name (e.g., "US/Eastern")
+        
+        Returns:
+            datetime object with timezone, or None if parsing fails
+        """
+        now = time.time()
+        table = get_transition_table(timezone_str, now)
+        if table is None:
+            return None
+        return self._parse(time_str, timezone_str, table, now)
+    
+    def parse_many(
+        self,
+        requests: Iterable[Tuple[str, str]]
+    ) -> List[Optional[datetime]]:
+        """
+        Parse a batch of (time string, timezone name) pairs.
+        
+        The current time is read once for the whole batch, so every entry
+        is resolved against the same "now".
         
-        # Parse common time formats
+        Args:
+            requests: Iterable of (time_str, timezone_str) pairs
+        
+        Returns:
+            List of parsed datetimes (None where parsing failed), in input order
+        """
+        now = time.time()
+        tables: Dict[str, Optional[TransitionTable]] = {}
+        results: List[Optional[datetime]] = []
+        for time_str, timezone_str in requests:
+            if timezone_str not in tables:
+                tables[timezone_str] = get_transition_table(timezone_str, now)
+            table = tables[timezone_str]
+            if table is None:
+                results.append(None)
+                continue
+            results.append(self._parse(time_str, timezone_str, table, now))
+        return results
+    
+    def _parse(
+        self,
+        time_str: str,
+        timezone_str: str,
+        table: TransitionTable,
+        now: float
+    ) -> Optional[datetime]:
+        """Look up or compute the parse result for a zone at UTC time ``now``."""
         time_lower = time_str.lower().strip()
+        today = table.to_local(now).date()
+        key = (time_lower, timezone_str, today)
+        
+        cached = self._cache.get(key)
+        if cached is not None:
+            result, expires_at = cached
+            if now < expires_at:
+                self._cache.move_to_end(key)
+                return result
+            del self._cache[key]
         
-        # Try 12-hour format first (8pm, 8:30pm)
-        match_12h = re.match(r'^(\d{1,2})(?::(\d{2}))?\s*(am|pm)$', time_lower)
-        if match_12h:
-            hour = int(match_12h.group(1))
-            minute = int(match_12h.group(2)) if match_12h.group(2) else 0
-            ampm = match_12h.group(3)
-            
-            if ampm == 'pm' and hour < 12:
-                hour += 12
-            elif ampm == 'am' and hour == 12:
-                hour = 0
-            
-            # Create datetime for today at the specified time
-            parsed_time = tz.localize(datetime(
-                now.year, now.month, now.day, hour, minute
-            ))
-            
-            # If the time is in the past, assume it's for tomorrow
-            if parsed_time < now:
-                tomorrow = now + timedelta(days=1)
-                parsed_time = tz.localize(datetime(
-                    tomorrow.year, tomorrow.month, tomorrow.day, hour, minute
-                ))
-            
-            return parsed_time
-        
-        # Try 24-hour format (20:00, 14:30)
-        match_24h = re.match(r'^(\d{1,2}):(\d{2})$', time_str.strip())
-        if match_24h:
-            hour = int(match_24h.group(1))
-            minute = int(match_24h.group(2))
-            
-            if hour > 23 or minute > 59:
+        spec = parse_time_spec(time_lower)
+        if spec is not None and spec.delay is not None:
+            # Never cached: the answer moves with the clock
+            return datetime.fromtimestamp(int(now) + spec.delay, table.zone)
+        result = self._compute(spec, table, today, now) if spec is not None else None
+        
+        # A time later today turns into tomorrow once it has passed
+        tomorrow = datetime.combine(today, datetime.min.time()) + timedelta(days=1)
+        midnight = table.to_utc(_local_seconds(tomorrow))
+        expires_at = midnight
+        if result is not None:
+            expires_at = min(result.timestamp(), midnight)
+        
+        self._cache[key] = (result, expires_at)
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return result
+    
+    @staticmethod
+    def _compute(
+        spec: TimeSpec,
+        table: TransitionTable,
+        today: date,
+        now: float
+    ) -> Optional[datetime]:
+        """Place a parsed clock time and day in a zone, relative to UTC time ``now``."""
+        days = spec.day or 0
+        if spec.weekday is not None:
+            days = (spec.weekday - today.weekday()) % 7
+        local = datetime(today.year, today.month, today.day, spec.hour, spec.minute) + timedelta(days=days)
+        utc_ts = table.to_utc(_local_seconds(local))
+        
+        if utc_ts < now:
+            if spec.day is not None:
+                # "today 8am" after 8am
                 return None
-            
-            # Create datetime for today at the specified time
-            parsed_time = tz.localize(datetime(
-                now.year, now.month, now.day, hour, minute
-            ))
-            
-            # If the time is in the past, assume it's for tomorrow
-            if parsed_time < now:
-                tomorrow = now + timedelta(days=1)
-                parsed_time = tz.localize(datetime(
-                    tomorrow.year, tomorrow.month, tomorrow.day, hour, minute
-                ))
-            
-            return parsed_time
+            # If the time is in the past, assume it's for tomorrow (or next week)
+            local += timedelta(days=1 if spec.weekday is None else 7)
+            utc_ts = table.to_utc(_local_seconds(local))
         
-        return None
-    except Exception:
-        return None
+        return datetime.fromtimestamp(utc_ts, table.zone)
+
+
+_default_parser = TimeParser()
+
+
+def parse_time_input(time_str: str, timezone_str: str) -> Optional[datetime]:
+    """
+    Parse time input string with timezone.
+    
+    Args:
+        time_str: Time string (e.g., "8pm", "tomorrow 20:00", "in 2h")
+        timezone_str: Timezone name (e.g., "US/Eastern")
+    
+    Returns:
+        datetime object with timezone, or None if parsing fails
+    """
+    return _default_parser.parse(time_str, timezone_str)
+
+
+def parse_many(requests: Iterable[Tuple[str, str]]) -> List[Optional[datetime]]:
+    """
+    Parse many (time string, timezone name) pairs in one call.
+    
+    Args:
+        requests: Iterable of (time_str, timezone_str) pairs
+    
+    Returns:
+        List of parsed datetimes (None where parsing failed), in input order
+    """
+    return _default_parser.parse_many(requests)
 
 
 def get_unix_timestamp(dt: Optional[datetime]) -> Optional[int]:
@@ -0,0 +1,185 @@
+"""
+Event loop watchdog for the Game Coordinator Bot.
+
+A probe task on the event loop sleeps for a short interval and records how
+late it wakes up (the loop lag). A monitor thread watches the probe: when
+the loop has not run it for longer than the stall threshold, the thread
+logs the stack of whatever is blocking the loop, once per stall.
+
+Under systemd (``Type=notify`` with ``WatchdogSec=``) the monitor thread
+also sends ``WATCHDOG=1`` over the notify socket, but only while the probe
+keeps running. A busy loop that still turns over keeps the service alive;
+a wedged one stops the pings and systemd restarts the bot.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import sys
+import threading
+import time
+import traceback
+from typing import Callable, Optional
+
+logger = logging.getLogger('game_coordinator.watchdog')
+
+
+# How often the probe measures loop lag
+PROBE_INTERVAL = 0.1
+# Loop blocked this long counts as a stall; Discord's ack deadline is 3s
+STALL_THRESHOLD = 0.5
+
+
+class SystemdNotifier:
+    """Sends sd_notify messages to the socket systemd passes in NOTIFY_SOCKET."""
+    
+    def __init__(self, address: Optional[str] = None):
+        self.address = address
+        self._socket: Optional[socket.socket] = None
+        if address:
+            # Names starting with "@" are in the abstract namespace
+            if address.startswith("@"):
+                self.address = "\0" + address[1:]
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    
+    @classmethod
+    def from_env(cls) -> "SystemdNotifier":
+        """Notifier for the socket systemd set up, or a no-op one."""
+        return cls(os.getenv("NOTIFY_SOCKET"))
+    
+    @property
+    def enabled(self) -> bool:
+        return self._socket is not None
+    
+    def notify(self, state: str) -> bool:
+        """
+        Send a state string such as "READY=1" or "WATCHDOG=1".
+        
+        Returns:
+            True if it was sent
+        """
+        if self._socket is None:
+            return False
+        try:
+            self._socket.sendto(state.encode(), self.address)
+        except OSError as e:
+            logger.warning('Failed to notify systemd (%s): %s', state, e)
+            return False
+        return True
+    
+    def close(self) -> None:
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+
+def watchdog_interval() -> Optional[float]:
+    """
+    The service's WatchdogSec in seconds, if systemd enabled it for this process.
+    
+    Returns:
+        Seconds, or None when no watchdog is configured
+    """
+    usec = os.getenv("WATCHDOG_USEC")
+    pid = os.getenv("WATCHDOG_PID")
+    if not usec or (pid and int(pid) != os.getpid()):
+        return None
+    return int(usec) / 1_000_000
+
+
+class LoopWatchdog:
+    """Measures event loop lag, reports stalls and feeds the systemd watchdog."""
+    
+    def __init__(
+        self,
+        notifier: Optional[SystemdNotifier] = None,
+        probe_interval: float = PROBE_INTERVAL,
+        stall_threshold: float = STALL_THRESHOLD,
+        watchdog_sec: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.notifier = notifier if notifier is not None else SystemdNotifier.from_env()
+        self.probe_interval = probe_interval
+        self.stall_threshold = stall_threshold
+        self.watchdog_sec = watchdog_sec if watchdog_sec is not None else watchdog_interval()
+        self._clock = clock
+        self.lag = 0.0  # Most recent lag, seconds
+        self.max_lag = 0.0
+        self.stalls = 0
+        self.pings = 0
+        self.last_stall_stack: Optional[str] = None
+        self._last_beat = 0.0
+        self._loop_thread: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+    
+    def start(self) -> None:
+        """Start the probe task and the monitor thread; tell systemd the bot is up."""
+        if self._task is not None:
+            return
+        self._loop_thread = threading.get_ident()
+        self._last_beat = self._clock()
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._probe(), name="loop-watchdog")
+        self._thread = threading.Thread(target=self._monitor, name="loop-watchdog", daemon=True)
+        self._thread.start()
+        self.notifier.notify("READY=1")
+    
+    async def stop(self) -> None:
+        """Stop probing and pinging."""
+        if self._task is None:
+            return
+        self.notifier.notify("STOPPING=1")
+        self._stopping.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await asyncio.to_thread(self._thread.join)
+        self._thread = None
+    
+    async def _probe(self) -> None:
+        while True:
+            started = self._clock()
+            await asyncio.sleep(self.probe_interval)
+            now = self._clock()
+            self.lag = max(0.0, now - started - self.probe_interval)
+            if self.lag > self.max_lag:
+                self.max_lag = self.lag
+            self._last_beat = now
+    
+    def _monitor(self) -> None:
+        stalled_since: Optional[float] = None
+        last_ping = 0.0
+        ping_every = self.watchdog_sec / 2 if self.watchdog_sec else None
+        while not self._stopping.wait(self.probe_interval / 2):
+            now = self._clock()
+            since_beat = now - self._last_beat
+            
+            if since_beat > self.stall_threshold + self.probe_interval:
+                if stalled_since is None:
+                    stalled_since = self._last_beat
+                    self.stalls += 1
+                    self._report_stall(since_beat)
+            elif stalled_since is not None:
+                logger.warning('Event loop recovered after %.2fs', self._last_beat - stalled_since)
+                stalled_since = None
+            
+            # Only vouch for the loop while it keeps turning over
+            if ping_every and since_beat < ping_every and now - last_ping >= ping_every:
+                if self.notifier.notify("WATCHDOG=1"):
+                    self.pings += 1
+                last_ping = now
+    
+    def _report_stall(self, blocked_for: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else "(stack unavailable)\n"
+        self.last_stall_stack = stack
+        logger.warning(
+            'Event loop blocked for %.2fs; it is running:\n%s', blocked_for, stack,
+            extra={"blocked_for": round(blocked_for, 3)}
+        )
@@ -5,16 +5,54 @@ Test script for Game Coordinator Bot
 Validates the bot's core functionality without requiring a live Discord connection.
 """
 
+import asyncio
+import os
+import sqlite3
 import sys
+import tempfile
+import time
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from game_coordinator_bot.utils.config import (
     GameType, Platform, GameConfig, GameMode,
-    get_game_config, get_all_games, get_platform_name
+    get_game_config, get_all_games, get_platform_name,
+    GAME_CONFIGS, update_game_configs,
+    GameCatalog, get_catalog, set_catalog,
+    add_config_listener, remove_config_listener,
 )
+from game_coordinator_bot.utils.embed_templates import EmbedTemplateCache
+from game_coordinator_bot.availability import SLOTS_PER_WEEK, SlotMatrix, user_bitmap
+from game_coordinator_bot.cogs.rsvp import apply_rsvps, RSVP_GOING, RSVP_MAYBE
+from game_coordinator_bot.cluster import ClusterClient, ClusterHub, owns_guild, shard_ranges
+from game_coordinator_bot.dispatcher import OutboundDispatcher, Priority, Route, auto_defer
+from game_coordinator_bot.duplicates import DuplicateIndex
+from game_coordinator_bot.http_interactions import InteractionsEndpoint
+from game_coordinator_bot.metrics import Metrics, MetricsServer
+from game_coordinator_bot.recurrence import OccurrenceIndex, RecurrenceRule, parse_recurrence
+from game_coordinator_bot.scheduler import ReminderScheduler
+from game_coordinator_bot.watchdog import LoopWatchdog, SystemdNotifier
+from game_coordinator_bot.utils.edit_coalescer import EditCoalescer
+from game_coordinator_bot.utils.startup_profiler import StartupProfiler
+from game_coordinator_bot.utils.gateway_profile import gateway_options
+from game_coordinator_bot.utils.log_pipeline import LazyQueueHandler, configure_logging
+from game_coordinator_bot.utils.time_grammar import TimeSpec, parse_time_spec, parse_weekdays, tokenize
+from game_coordinator_bot.utils.catalog_watcher import CatalogWatcher
+from game_coordinator_bot.utils.autocomplete import (
+    MAX_SUGGESTIONS, catalog_indexes, resolve_timezone, timezone_index,
+)
+from game_coordinator_bot.utils.command_sync import CommandSyncState, command_tree_hash, sync_if_changed
+from game_coordinator_bot.storage.availability import AvailabilityRepository, AvailabilityWindow
+from game_coordinator_bot.storage.database import Database
+from game_coordinator_bot.storage.preferences import Preferences, UserPreferences
+from game_coordinator_bot.storage.recurring import RecurringSession, RecurringSessionRepository
+from game_coordinator_bot.storage.sessions import Session, SessionRepository, CANCELLED
 from game_coordinator_bot.utils.timezone_utils import (
     parse_time_input,
+    parse_many,
+    get_timezone,
+    get_transition_table,
     get_unix_timestamp,
+    TimeParser,
     COMMON_TIMEZONES,
 )
 
@@ -179,6 +217,1657 @@ def test_timezone_functionality():
     print(f"✓ None timestamp correctly returns None")
 
 
+def test_time_parser_cache():
+    """Test memoized and batch time parsing."""
+    print("\n=== Testing Time Parser Cache ===")
+    
+    # Batch parsing matches one-off parsing, in input order
+    batch = [("8pm", "US/Eastern"), ("20:00", "UTC"), ("nope", "UTC"), ("8pm", "Mars/Olympus")]
+    results = parse_many(batch)
+    assert results[0] == parse_time_input("8pm", "US/Eastern")
+    assert results[1] == parse_time_input("20:00", "UTC")
+    assert results[2] is None and results[3] is None
+    print(f"✓ parse_many returned {len(results)} results in order")
+    
+    # Normalized inputs share a cache entry
+    parser = TimeParser(maxsize=2)
+    tz = get_timezone("US/Eastern")
+    table = get_transition_table("US/Eastern", datetime(2024, 3, 1, tzinfo=tz).timestamp())
+    morning = datetime(2024, 3, 1, 9, 0, tzinfo=tz).timestamp()
+    first = parser._parse("8PM ", "US/Eastern", table, morning)
+    assert parser._parse(" 8pm", "US/Eastern", table, morning) is first
+    assert first.day == 1 and first.hour == 20
+    print(f"✓ Normalized inputs reuse the cached result")
+    
+    # Once the time has passed the entry rolls over to tomorrow
+    evening = datetime(2024, 3, 1, 21, 0, tzinfo=tz).timestamp()
+    rolled = parser._parse("8pm", "US/Eastern", table, evening)
+    assert rolled.day == 2 and rolled.hour == 20
+    print(f"✓ Cached time rolls over to tomorrow after it passes")
+    
+    # The LRU stays bounded
+    parser._parse("9pm", "US/Eastern", table, evening)
+    parser._parse("10pm", "US/Eastern", table, evening)
+    assert len(parser._cache) == 2
+    print(f"✓ Cache bounded to {parser.maxsize} entries")
+    
+    # Out-of-range values still fail cleanly
+    assert parse_time_input("25:00", "UTC") is None
+    assert parse_time_input("8:75pm", "UTC") is None
+    print(f"✓ Out-of-range times return None")
+
+
+def test_time_grammar():
+    """Test the session time grammar on a corpus and on random input."""
+    print("\n=== Testing Time Grammar ===")
+    import random
+    
+    # Tokens are digit runs, letter runs and punctuation; anything else is rejected
+    assert tokenize("Fri 8:30PM") == ["fri", "8", ":", "30", "pm"]
+    assert tokenize("8pm!") is None and tokenize("٨pm") is None
+    assert parse_time_spec("in 1h 30m") == TimeSpec(delay=5400)
+    assert parse_time_spec("tomorrow 9") == TimeSpec(9, 0, day=1)
+    assert parse_weekdays("mon-fri") == (0, 1, 2, 3, 4)
+    print(f"✓ Tokenizer and grammar produce time specs")
+    
+    # Corpus, read on Friday 2024-03-08 at 21:30 New York time (DST starts on the 10th)
+    tz = get_timezone("US/Eastern")
+    table = get_transition_table("US/Eastern", datetime(2024, 3, 1, tzinfo=tz).timestamp())
+    now = datetime(2024, 3, 8, 21, 30, tzinfo=tz).timestamp()
+    corpus = {
+        "8pm": (9, 20, 0),
+        "8:30pm": (9, 20, 30),
+        "8 PM": (9, 20, 0),
+        "20:00": (9, 20, 0),
+        "22:00": (8, 22, 0),
+        "12am": (9, 0, 0),
+        "12pm": (9, 12, 0),
+        "noon": (9, 12, 0),
+        "midnight": (9, 0, 0),
+        "at 11pm": (8, 23, 0),
+        "tomorrow 9": (9, 9, 0),
+        "tomorrow at 3pm": (9, 15, 0),
+        "8pm tomorrow": (9, 20, 0),
+        "tmrw noon": (9, 12, 0),
+        "fri 10pm": (8, 22, 0),
+        "fri 8pm": (15, 20, 0),
+        "friday 8pm": (15, 20, 0),
+        "on sat at 8:30 pm": (9, 20, 30),
+        "8pm on sunday": (10, 20, 0),
+        "tue 7p": (12, 19, 0),
+        "tonight 11": (8, 23, 0),
+        "11 tonight": (8, 23, 0),
+        "sun 2:30am": (10, 3, 30),  # In the DST gap: the offset from before it applies
+        "today 8am": None,
+        "tonight 9": None,
+        "13pm": None,
+        "0am": None,
+        "24:00": None,
+        "8:5pm": None,
+        "8:75pm": None,
+        "123": None,
+        "fri": None,
+        "tomorrow": None,
+        "8pm fri sat": None,
+        "someday 8pm": None,
+        "invalid time": None,
+        "": None,
+    }
+    parser = TimeParser()
+    for text, expected in corpus.items():
+        result = parser._parse(text, "US/Eastern", table, now)
+        if expected is None:
+            assert result is None, text
+        else:
+            assert (result.day, result.hour, result.minute) == expected, (text, result)
+            assert result.tzinfo is not None and result.timestamp() >= now, text
+    for text, seconds in {"in 2h": 7200, "in 90 minutes": 5400, "in an hour": 3600, "in 1 hour and 30 min": 5400, "in 2 days": 172800}.items():
+        assert parser._parse(text, "US/Eastern", table, now).timestamp() == now + seconds, text
+    for text in ("in", "in 2", "in 0m", "in 2 fortnights", "in 99999 days"):
+        assert parser._parse(text, "US/Eastern", table, now) is None, text
+    print(f"✓ Corpus of {len(corpus) + 10} inputs parsed as expected")
+    
+    # Delays are not cached: they move with the clock
+    assert parser._parse("in 1h", "US/Eastern", table, now + 60).timestamp() == now + 3660
+    assert not any(key[0] in ("in 1h", "in 2h") for key in parser._cache)
+    print(f"✓ Delays are read against the current time")
+    
+    # Random clock times agree with a direct computation
+    rng = random.Random(7)
+    day_names = {"": None, "mon ": 0, "tue ": 1, "wed ": 2, "thu ": 3, "fri ": 4, "sat ": 5, "sun ": 6, "tomorrow ": "tomorrow"}
+    for _ in range(500):
+        hour, minute = rng.randrange(24), rng.randrange(60)
+        if rng.random() < 0.5:
+            clock = f"{hour % 12 or 12}:{minute:02d}{rng.choice(['', ' '])}{'pm' if hour >= 12 else 'am'}"
+        else:
+            clock = f"{hour}:{minute:02d}"
+        day = rng.choice(list(day_names))
+        local = datetime(2024, 3, 8, hour, minute)
+        if day_names[day] == "tomorrow":
+            local += timedelta(days=1)
+        elif day_names[day] is not None:
+            local += timedelta(days=(day_names[day] - 4) % 7)
+        if table.to_utc(int((local - datetime(1970, 1, 1)).total_seconds())) < now:
+            local += timedelta(days=1 if day_names[day] is None else 7)
+        result = parser._parse(day + clock, "US/Eastern", table, now)
+        assert result.timestamp() == table.to_utc(int((local - datetime(1970, 1, 1)).total_seconds())), (day + clock, result)
+    print(f"✓ 500 random clock times match a direct computation")
+    
+    # Random token soup never raises and only yields future, aware datetimes
+    pieces = ["8", "12", "30", "123", ":", ",", "-", "pm", "am", "p", "in", "at", "on", "an", "h", "min", "days",
+              "fri", "sunday", "tomorrow", "tonight", "today", "noon", "midnight", "every", "other", "!", " "]
+    accepted = 0
+    for _ in range(3000):
+        text = " ".join(rng.choice(pieces) for _ in range(rng.randint(1, 5)))
+        result = parser._parse(text, "US/Eastern", table, now)
+        assert result is None or (result.tzinfo is not None and result.timestamp() >= int(now)), text
+        accepted += result is not None
+        parse_recurrence(text, "US/Eastern")
+    print(f"✓ 3000 random inputs parsed without errors ({accepted} accepted)")
+
+
+def test_transition_tables():
+    """Test DST-correct conversion through precomputed transition tables."""
+    print("\n=== Testing Transition Tables ===")
+    
+    tz = get_timezone("US/Eastern")
+    table = get_transition_table("US/Eastern", datetime(2024, 6, 1, tzinfo=tz).timestamp())
+    
+    # Plain summer and winter times
+    summer = table.localize(datetime(2024, 7, 4, 20, 0))
+    winter = table.localize(datetime(2024, 12, 1, 20, 0))
+    assert summer.utcoffset() == timedelta(hours=-4)
+    assert winter.utcoffset() == timedelta(hours=-5)
+    print(f"✓ Summer and winter offsets resolved")
+    
+    # Ambiguous fall-back hour resolves to standard time
+    ambiguous = table.localize(datetime(2024, 11, 3, 1, 30))
+    assert get_unix_timestamp(ambiguous) == int(datetime(2024, 11, 3, 6, 30, tzinfo=timezone.utc).timestamp())
+    print(f"✓ Ambiguous 1:30am resolves to standard time")
+    
+    # Skipped spring-forward hour uses the offset from before the gap
+    skipped = table.localize(datetime(2024, 3, 10, 2, 30))
+    assert get_unix_timestamp(skipped) == int(datetime(2024, 3, 10, 7, 30, tzinfo=timezone.utc).timestamp())
+    print(f"✓ Nonexistent 2:30am shifted past the gap")
+    
+    # Unknown zones have no table
+    assert get_transition_table("Mars/Olympus") is None
+    print(f"✓ Unknown timezone returns no table")
+
+
+def test_session_embed_templates():
+    """Test cached embed templates for session announcements."""
+    print("\n=== Testing Session Embed Templates ===")
+    from types import SimpleNamespace
+    import discord
+    
+    user = SimpleNamespace(
+        mention="<@1>",
+        name="player1",
+        display_avatar=SimpleNamespace(url="https://cdn.example/avatar.png"),
+    )
+    cache = EmbedTemplateCache()
+    assert len(cache) == 5, f"Expected 5 templates, found {len(cache)}"
+    print(f"✓ Built {len(cache)} templates from game configs")
+    
+    embed = cache.get("call_of_duty", "zombies").render(user, "PC", 1700000000, "UTC")
+    assert embed.color.value == 0x8B0000
+    assert embed.description == "<@1> wants to play!"
+    assert [f.value for f in embed.fields] == [
+        "Call of Duty - Zombies", "PC", "<t:1700000000:F>\n<t:1700000000:R>"
+    ]
+    assert embed.footer.text == "Organized by player1 • UTC"
+    built = discord.Embed(title="🎮 Gaming Session", description="<@1> wants to play!", color=0x8B0000)
+    built.add_field(name="🎯 Game", value="Call of Duty - Zombies", inline=True)
+    built.add_field(name="🖥️ Platform", value="PC", inline=True)
+    built.add_field(name="⏰ Time", value="<t:1700000000:F>\n<t:1700000000:R>", inline=False)
+    built.set_footer(text="Organized by player1 • UTC", icon_url="https://cdn.example/avatar.png")
+    assert embed.to_dict() == built.to_dict() and embed == built
+    print(f"✓ Rendered embed: {embed.fields[0].value}")
+    
+    # Editing a rendered embed leaves the template untouched
+    embed.set_field_at(0, name="🎯 Game", value="changed")
+    again = cache.get("call_of_duty", "zombies").render(user, "Xbox", None, "UTC")
+    assert again.fields[0].value == "Call of Duty - Zombies"
+    assert again.fields[2].value == "Time not specified"
+    print(f"✓ Rendered embeds are independent of the template")
+    
+    # Config changes rebuild the templates
+    original = dict(GAME_CONFIGS)
+    cod = get_game_config(GameType.CALL_OF_DUTY)
+    listener_cache = EmbedTemplateCache()
+    add_config_listener(listener_cache.invalidate)
+    try:
+        update_game_configs({GameType.CALL_OF_DUTY: cod})
+        assert listener_cache.get("overcooked") is None
+        assert listener_cache.get("call_of_duty", "endgame") is not None
+        print(f"✓ Templates invalidated on config change")
+    finally:
+        remove_config_listener(listener_cache.invalidate)
+        update_game_configs(original)
+
+
+def test_session_repository():
+    """Test the SQLite-backed session store."""
+    print("\n=== Testing Session Repository ===")
+    
+    async def run(path):
+        store = SessionRepository(Database(path), batch_size=3, flush_delay=0.01)
+        await store.open()
+        try:
+            def make(guild_id, game, start_time):
+                return Session(
+                    guild_id=guild_id, channel_id=10, organizer_id=42, game=game,
+                    platform="pc", timezone="UTC", start_time=start_time,
+                )
+            
+            # Buffered writes are visible to the next query
+            await store.add(make(1, "overcooked", 2000))
+            await store.add(make(1, "call_of_duty", 1500))
+            past = await store.add(make(1, "overcooked", 500))
+            await store.add(make(2, "overcooked", 1800))
+            upcoming = await store.upcoming(1, now=1000)
+            assert [s.start_time for s in upcoming] == [1500, 2000]
+            print(f"✓ Upcoming sessions ordered by start time")
+            
+            only_overcooked = await store.upcoming(1, game="overcooked", now=0)
+            assert [s.start_time for s in only_overcooked] == [500, 2000]
+            print(f"✓ Upcoming sessions filtered by game")
+            
+            # Cancelling hides the session and can only happen once
+            assert await store.cancel(past.id, 1)
+            assert not await store.cancel(past.id, 1)
+            assert (await store.get(past.id)).status == CANCELLED
+            print(f"✓ Session cancelled")
+            
+            # Timer-driven flush writes without an explicit query
+            late = await store.add(make(3, "overcooked", 3000))
+            await asyncio.sleep(0.05)
+            assert store._pending == []
+            await store.set_message_id(late.id, 99)
+            assert (await store.get(late.id)).message_id == 99
+            print(f"✓ Delayed batch flush")
+            
+            # A failed write keeps the batch for the next flush
+            async def locked(query, rows):
+                raise sqlite3.OperationalError("database is locked")
+            
+            retried = await store.add(make(3, "overcooked", 3500))
+            store.database.executemany = locked
+            try:
+                await store.flush()
+                assert False, "flush should have failed"
+            except sqlite3.OperationalError:
+                pass
+            finally:
+                del store.database.executemany
+            assert store._pending == [retried]
+            assert (await store.get(retried.id)).start_time == 3500
+            print(f"✓ Failed batch kept for the next flush")
+            
+            # A session whose ID is taken is dropped instead of blocking every query
+            clash = make(3, "overcooked", 3600)
+            clash.id = retried.id
+            kept = make(3, "overcooked", 3700)
+            await store.add(clash)
+            await store.add(kept)
+            assert (await store.get(retried.id)).start_time == 3500
+            assert (await store.get(kept.id)).start_time == 3700
+            assert store._pending == []
+            print(f"✓ Session with a duplicate ID dropped, rest of the batch written")
+        finally:
+            await store.close()
+        
+        # Sessions survive a restart
+        reopened = SessionRepository(Database(path))
+        await reopened.open()
+        try:
+            pending = await reopened.pending(now=1000)
+            assert [s.guild_id for s in pending] == [1, 2, 1, 3, 3, 3]
+            print(f"✓ Recovered {len(pending)} pending sessions after reopen")
+        finally:
+            await reopened.close()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(run(os.path.join(directory, "sessions.db")))
+
+
+def test_user_preferences():
+    """Test the LRU-cached, write-behind preference store."""
+    print("\n=== Testing User Preferences ===")
+    
+    async def run(path):
+        preferences = UserPreferences(Database(path), cache_size=2, flush_delay=0.01)
+        await preferences.open()
+        try:
+            assert await preferences.get(1) == Preferences(1)
+            preferences.remember(1, timezone="Europe/Berlin", platform="pc", favorite_game="overcooked")
+            assert (await preferences.get(1)).timezone == "Europe/Berlin"
+            print(f"✓ Remembered choices are visible immediately")
+            
+            await asyncio.sleep(0.05)
+            assert preferences._dirty == {}
+            print(f"✓ Delayed write-behind flush")
+            
+            # Partial updates keep the other fields
+            preferences.remember(1, platform="ps5")
+            for user_id in (2, 3):
+                preferences.remember(user_id, timezone="UTC")
+                await preferences.get(user_id)
+            assert len(preferences) == 2 and 1 not in preferences._cache
+            print(f"✓ Cache bounded to {preferences.cache_size} users")
+            
+            stored = await preferences.get(1)
+            assert (stored.timezone, stored.platform) == ("Europe/Berlin", "ps5")
+            print(f"✓ Partial update merged with stored preferences")
+            
+            # A load that reads the row before a flush writes the newer choice keeps the choice
+            await preferences.flush()
+            preferences._cache.clear()
+            preferences.remember(1, timezone="Asia/Tokyo")
+            loading = asyncio.create_task(preferences.get(1))
+            await asyncio.sleep(0)
+            await preferences.flush()
+            assert (await loading).timezone == "Asia/Tokyo"
+            assert preferences._cache[1].timezone == "Asia/Tokyo" and preferences._writing == []
+            print(f"✓ Changes being flushed are merged into rows loaded meanwhile")
+        finally:
+            await preferences.close()
+            await preferences.database.close()
+        
+        reopened = UserPreferences(Database(path))
+        await reopened.open()
+        try:
+            stored = await reopened.get(1)
+            assert stored == Preferences(1, "Asia/Tokyo", "ps5", "overcooked"), stored
+            assert (await reopened.get(3)).timezone == "UTC"
+            print(f"✓ Preferences survive a restart")
+        finally:
+            await reopened.database.close()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(run(os.path.join(directory, "preferences.db")))
+
+
+def test_reminder_scheduler():
+    """Test the heap-based reminder scheduler."""
+    print("\n=== Testing Reminder Scheduler ===")
+    
+    now = [1000.0]
+    scheduler = ReminderScheduler(clock=lambda: now[0])
+    
+    # Standard reminders: 15 minutes before and at start, past ones skipped
+    reminders = scheduler.schedule_session("a", 1000 + 3600)
+    assert [r.kind for r in reminders] == ["soon", "start"]
+    assert [r.kind for r in scheduler.schedule_session("b", 1000 + 60)] == ["start"]
+    assert len(scheduler) == 3
+    print(f"✓ Scheduled {len(scheduler)} reminders")
+    
+    # Cancelling a session removes all of its reminders
+    assert scheduler.cancel_session("a") == 2
+    assert len(scheduler) == 1
+    assert scheduler.next_fire_time() == 1060
+    print(f"✓ Session reminders cancelled")
+    
+    # Reminders due together come out as one batch, in order
+    scheduler.schedule("c", 1050, "start")
+    scheduler.schedule("d", 1055, "start")
+    scheduler.schedule("e", 5000, "start")
+    due = scheduler.pop_due(1060)
+    assert [r.session_id for r in due] == ["c", "d", "b"]
+    assert len(scheduler) == 1
+    print(f"✓ Fired a batch of {len(due)} due reminders")
+    
+    # The background task delivers reminders when they are due
+    async def run():
+        live = ReminderScheduler()
+        fired = []
+        
+        async def callback(batch):
+            fired.extend(r.session_id for r in batch)
+        
+        live.start(callback)
+        live.schedule("later", time.time() + 0.2, "start")
+        live.schedule("sooner", time.time() + 0.05, "start")
+        await asyncio.sleep(0.3)
+        await live.stop()
+        return fired
+    
+    assert asyncio.run(run()) == ["sooner", "later"]
+    print(f"✓ Background task fired reminders in order")
+
+
+def test_rsvp_edit_coalescing():
+    """Test that bursts of RSVP clicks collapse into one message edit."""
+    print("\n=== Testing RSVP Edit Coalescing ===")
+    import discord
+    from types import SimpleNamespace
+    
+    base = discord.Embed(title="🎮 Gaming Session")
+    base.add_field(name="🎯 Game", value="Overcooked")
+    
+    rendered = apply_rsvps(base, {1: RSVP_GOING, 2: RSVP_MAYBE, 3: RSVP_GOING})
+    assert [f.name for f in rendered.fields] == ["🎯 Game", "✅ Going (2)", "🤔 Maybe (1)"]
+    assert rendered.fields[1].value == "<@1>, <@3>"
+    rerendered = apply_rsvps(rendered, {2: RSVP_GOING})
+    assert [f.name for f in rerendered.fields] == ["🎯 Game", "✅ Going (1)"]
+    print(f"✓ Participant fields rendered and replaced")
+    
+    class FakeMessage:
+        def __init__(self):
+            self.channel = SimpleNamespace(id=10)
+            self.edits = []
+        
+        async def edit(self, embed):
+            self.edits.append(embed)
+    
+    def make_interaction(message, calls):
+        async def edit_message(embed):
+            calls.append(("ack-edit", embed))
+        
+        async def defer():
+            calls.append(("defer", None))
+        
+        return SimpleNamespace(
+            id=len(calls),
+            message=message,
+            response=SimpleNamespace(edit_message=edit_message, defer=defer),
+        )
+    
+    async def run():
+        coalescer = EditCoalescer(OutboundDispatcher(), window=0.05)
+        message = FakeMessage()
+        calls = []
+        rsvps = {}
+        
+        # Three clicks inside one window: ack-edit, then two deferred
+        for user_id in (1, 2, 3):
+            rsvps[user_id] = RSVP_GOING
+            await coalescer.submit("s1", make_interaction(message, calls), lambda: apply_rsvps(base, rsvps))
+        await asyncio.sleep(0.2)
+        return calls, message.edits, coalescer.edits
+    
+    calls, edits, count = asyncio.run(run())
+    assert [kind for kind, _ in calls] == ["ack-edit", "defer", "defer"]
+    assert calls[0][1].fields[1].name == "✅ Going (1)"
+    assert count == 1 and len(edits) == 1
+    assert edits[0].fields[1].value == "<@1>, <@2>, <@3>"
+    print(f"✓ 3 clicks produced 1 acknowledgement edit and {count} coalesced edit")
+    
+    from game_coordinator_bot.cogs.rsvp import Rsvp
+    
+    class FakeStore:
+        def __init__(self):
+            self.rows = {}
+            self.loads = 0
+        
+        async def get_rsvps(self, session_id):
+            self.loads += 1
+            return dict(self.rows.get(session_id, {}))
+        
+        async def set_rsvp(self, session_id, user_id, status):
+            self.rows.setdefault(session_id, {})[user_id] = status
+    
+    async def run_cache():
+        store = FakeStore()
+        cog = Rsvp(None, store, OutboundDispatcher(), cache_size=2)
+        cog.coalescer.window = 0.01
+        calls = []
+        for session_id, user_id in (("s1", 1), ("s2", 2), ("s3", 3), ("s1", 4)):
+            message = FakeMessage()
+            message.embeds = [base]
+            interaction = make_interaction(message, calls)
+            interaction.user = SimpleNamespace(id=user_id)
+            await cog.handle_rsvp(interaction, session_id, "join")
+        await asyncio.sleep(0.05)
+        return cog, store
+    
+    cog, store = asyncio.run(run_cache())
+    assert list(cog.rsvps) == ["s3", "s1"]
+    assert cog.rsvps["s1"] == {1: RSVP_GOING, 4: RSVP_GOING}
+    assert store.loads == 4
+    print(f"✓ RSVPs cached for {cog.cache_size} sessions, evicted ones read back from the store")
+
+
+def test_outbound_dispatcher():
+    """Test rate-limited, prioritized dispatch against a local fake endpoint."""
+    print("\n=== Testing Outbound Dispatcher ===")
+    import aiohttp
+    from aiohttp import web
+    
+    LIMIT, WINDOW = 2, 0.3
+    
+    async def run():
+        windows = {}
+        statuses = []
+        order = []
+        
+        # Fake Discord channel endpoint: 2 requests per 0.3s per channel
+        async def post_message(request):
+            channel_id = request.match_info["channel_id"]
+            now = time.monotonic()
+            start, used = windows.get(channel_id, (now, 0))
+            if now - start >= WINDOW:
+                start, used = now, 0
+            headers = {
+                "X-RateLimit-Bucket": "messages",
+                "X-RateLimit-Limit": str(LIMIT),
+                "X-RateLimit-Reset-After": f"{WINDOW - (now - start):.3f}",
+            }
+            if used >= LIMIT:
+                headers["X-RateLimit-Remaining"] = "0"
+                headers["Retry-After"] = headers["X-RateLimit-Reset-After"]
+                statuses.append(429)
+                return web.json_response({"message": "rate limited"}, status=429, headers=headers)
+            windows[channel_id] = (start, used + 1)
+            headers["X-RateLimit-Remaining"] = str(LIMIT - used - 1)
+            statuses.append(200)
+            order.append((await request.json())["content"])
+            return web.json_response({}, headers=headers)
+        
+        app = web.Application()
+        app.router.add_post("/channels/{channel_id}/messages", post_message)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        
+        dispatcher = OutboundDispatcher()
+        dispatcher.start()
+        try:
+            # Buckets learn the limits from the headers the trace hook sees
+            async with aiohttp.ClientSession(trace_configs=[dispatcher.trace_config()]) as http:
+                def post(channel_id, content):
+                    async def call():
+                        async with http.post(
+                            f"http://127.0.0.1:{port}/channels/{channel_id}/messages",
+                            json={"content": content},
+                        ) as response:
+                            await response.read()
+                            return response
+                    return call
+                
+                # The first response teaches the bucket the real limit
+                await dispatcher.submit(Route.send_message(1), post(1, "first"))
+                
+                jobs = [
+                    dispatcher.submit(Route.send_message(1), post(1, f"bg{i}"), Priority.BACKGROUND)
+                    for i in range(5)
+                ]
+                jobs.append(dispatcher.submit(Route.send_message(2), post(2, "other"), Priority.BACKGROUND))
+                jobs.append(dispatcher.submit(Route.send_message(3), post(3, "urgent"), Priority.INTERACTION))
+                tasks = [asyncio.ensure_future(job) for job in jobs]
+                await asyncio.sleep(0)
+                depth = dispatcher.metrics()["depth"]
+                results = await asyncio.gather(*tasks)
+        finally:
+            await dispatcher.stop()
+            await runner.cleanup()
+        return depth, statuses, order, results, dispatcher.metrics()
+    
+    depth, statuses, order, results, metrics = asyncio.run(run())
+    assert depth == {"interaction": 1, "user": 0, "background": 6}
+    print(f"✓ Queue depth reported: {depth}")
+    assert all(result.status == 200 for result in results)
+    assert 429 not in statuses, f"Dispatcher hit the rate limit: {statuses}"
+    print(f"✓ {len(results)} requests sent without a 429")
+    assert order[0] == "first" and order.index("urgent") < order.index("bg1")
+    assert [content for content in order if content.startswith("bg")] == [f"bg{i}" for i in range(5)]
+    assert metrics["wait"]["background"]["max"] >= WINDOW * 1.5
+    print(f"✓ Requests paced by bucket; max wait {metrics['wait']['background']['max']:.2f}s")
+    
+    import discord
+    from types import SimpleNamespace
+    
+    async def run_stopped():
+        dispatcher = OutboundDispatcher()
+        dispatcher.start()
+        release = asyncio.Event()
+        
+        async def limited():
+            await release.wait()
+            response = SimpleNamespace(status=429, reason="Too Many Requests", headers={"Retry-After": "1"})
+            raise discord.HTTPException(response, {"message": "rate limited"})
+        
+        async def direct():
+            return "sent"
+        
+        # In flight when the dispatcher stops, then rate limited
+        job = asyncio.ensure_future(dispatcher.submit(Route.send_message(1), limited))
+        await asyncio.sleep(0.01)
+        await dispatcher.stop()
+        release.set()
+        cancelled = False
+        try:
+            await job
+        except asyncio.CancelledError:
+            cancelled = True
+        return cancelled, await dispatcher.submit(Route.send_message(1), direct)
+    
+    cancelled, result = asyncio.run(run_stopped())
+    assert cancelled and result == "sent"
+    print(f"✓ Rate-limited request cancelled after stop; later requests sent directly")
+
+
+def test_auto_defer():
+    """Test that slow command handlers are deferred and answered with a follow-up."""
+    print("\n=== Testing Auto Defer ===")
+    import inspect
+    from types import SimpleNamespace
+    
+    
+    class FakeInteraction:
+        def __init__(self, command: str):
+            self.id = 1
+            self.extras = {}
+            self.command = SimpleNamespace(qualified_name=command)
+            self.calls = []
+            self._done = False
+            self.response = SimpleNamespace(
+                is_done=lambda: self._done,
+                send_message=self._send_message,
+                defer=self._defer,
+            )
+            self.followup = SimpleNamespace(send=self._followup)
+        
+        async def delete_original_response(self):
+            self.calls.append(("delete_original", {}))
+        
+        async def _send_message(self, **kwargs):
+            self.calls.append(("send_message", kwargs))
+            self._done = True
+            return SimpleNamespace(message_id=10)
+        
+        async def _defer(self, **kwargs):
+            self.calls.append(("defer", kwargs))
+            self._done = True
+        
+        async def _followup(self, **kwargs):
+            self.calls.append(("followup", kwargs))
+            return SimpleNamespace(id=11)
+    
+    metrics = Metrics()
+    
+    class Cog:
+        def __init__(self):
+            self.dispatcher = OutboundDispatcher(metrics=metrics, defer_budget=0.05)
+        
+        @auto_defer()
+        async def play(self, interaction, delay: float):
+            """Reply after a delay."""
+            await asyncio.sleep(delay)
+            return await self.dispatcher.respond(interaction, content="done")
+        
+        @auto_defer(budget=0.01, ephemeral=True)
+        async def upcoming(self, interaction):
+            await asyncio.sleep(0.05)
+            await self.dispatcher.respond(interaction, content="1 session", ephemeral=True)
+        
+        @auto_defer(budget=0.01)
+        async def cancel(self, interaction):
+            """A public command whose error replies are private."""
+            await asyncio.sleep(0.05)
+            await self.dispatcher.respond(interaction, content="❌ Not yours", ephemeral=True)
+            await self.dispatcher.respond(interaction, content="See /sessions upcoming", ephemeral=True)
+    
+    cog = Cog()
+    assert cog.play.__name__ == "play" and "interaction" in str(inspect.signature(cog.play))
+    
+    async def run():
+        fast = FakeInteraction("play")
+        metrics.mark_received(fast)
+        result = await cog.play(fast, 0)
+        assert [name for name, _ in fast.calls] == ["send_message"]
+        assert result.message_id == 10
+        await asyncio.sleep(0.1)
+        assert [name for name, _ in fast.calls] == ["send_message"], "Timer not cancelled"
+        
+        slow = FakeInteraction("play")
+        metrics.mark_received(slow)
+        result = await cog.play(slow, 0.15)
+        assert [name for name, _ in slow.calls] == ["defer", "followup"], slow.calls
+        assert slow.calls[0][1] == {"ephemeral": False, "thinking": True}
+        assert slow.calls[1][1] == {"content": "done"}
+        assert result.id == 11
+        
+        private = FakeInteraction("sessions upcoming")
+        await cog.upcoming(private)
+        assert private.calls[0] == ("defer", {"ephemeral": True, "thinking": True})
+        assert [name for name, _ in private.calls] == ["defer", "followup"]
+        
+        # A private reply after a public deferral must not replace the public "thinking" message
+        error = FakeInteraction("sessions cancel")
+        await cog.cancel(error)
+        assert [name for name, _ in error.calls] == ["defer", "delete_original", "followup", "followup"], error.calls
+        assert error.calls[0][1] == {"ephemeral": False, "thinking": True}
+        assert all(kwargs["ephemeral"] for name, kwargs in error.calls if name == "followup")
+        
+        # Answered before the deferral got the lock: nothing to defer
+        late = FakeInteraction("play")
+        await cog.dispatcher.respond(late, content="done")
+        assert not await cog.dispatcher.defer(late)
+        assert [name for name, _ in late.calls] == ["send_message"]
+    
+    asyncio.run(run())
+    print(f"✓ Fast handler answered directly, timer cancelled")
+    print(f"✓ Slow handler deferred, reply sent as a follow-up")
+    print(f"✓ Private reply after a public deferral sent as a new ephemeral message")
+    
+    assert metrics.deferred == {"play": 1, "sessions upcoming": 1, "sessions cancel": 1}
+    # The deferral is the first response; the follow-up is not counted again
+    assert metrics.latency["play"].count == 2
+    assert 'game_coordinator_command_deferred_total{command="play"} 1' in metrics.render()
+    print(f"✓ Deferrals counted per command")
+
+
+def test_http_interactions():
+    """Test the signed HTTP interactions endpoint."""
+    print("\n=== Testing HTTP Interactions ===")
+    import json
+    import aiohttp
+    from nacl.signing import SigningKey
+    from benchmarks.fake_discord import command_interaction
+    
+    signing_key = SigningKey.generate()
+    public_key = signing_key.verify_key.encode().hex()
+    
+    def signed(payload: dict, key: SigningKey = signing_key):
+        body = json.dumps(payload).encode()
+        timestamp = str(int(time.time()))
+        signature = key.sign(timestamp.encode() + body).signature.hex()
+        return body, {"X-Signature-Ed25519": signature, "X-Signature-Timestamp": timestamp, "Content-Type": "application/json"}
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        database = Database(os.path.join(tmp, "http.db"))
+        store = SessionRepository(database)
+        endpoint = InteractionsEndpoint(public_key, session_store=store, metrics=Metrics(), port=0)
+        
+        async def run():
+            await store.open()
+            await endpoint.start()
+            url = f"http://127.0.0.1:{endpoint.port}/interactions"
+            try:
+                async with aiohttp.ClientSession() as client:
+                    async def post(payload: dict, key: SigningKey = signing_key):
+                        body, headers = signed(payload, key)
+                        async with client.post(url, data=body, headers=headers) as response:
+                            return response.status, await response.json(content_type=None) if response.status == 200 else None
+                    
+                    assert await post({"type": 1}) == (200, {"type": 1})
+                    status, _ = await post({"type": 1}, SigningKey.generate())
+                    assert status == 401
+                    body, headers = signed({"type": 1})
+                    async with client.post(url, data=body + b" ", headers=headers) as response:
+                        assert response.status == 401
+                    print(f"✓ PING answered; bad signatures and tampered bodies rejected")
+                    
+                    play = command_interaction(10, 42, "play", {
+                        "game": "call_of_duty", "time": "8pm", "timezone": "America/New_York",
+                        "platform": "pc", "mode": "zombies",
+                    })
+                    status, reply = await post(play)
+                    assert status == 200 and reply["type"] == 4, reply
+                    assert reply["data"]["content"] == "@everyone"
+                    assert reply["data"]["embeds"][0]["fields"][0]["value"] == "Call of Duty - Zombies"
+                    custom_id = reply["data"]["components"][0]["components"][0]["custom_id"]
+                    session_id = custom_id.split(":")[2]
+                    session = await store.get(session_id)
+                    assert (session.organizer_id, session.guild_id, session.platform) == (42, 100, "pc")
+                    assert endpoint.metrics.latency["play"].count == 1
+                    print(f"✓ /play ran GameCommands and stored the session")
+                    
+                    status, reply = await post(command_interaction(11, 42, "play", {"game": "call_of_duty", "time": "8pm"}))
+                    assert reply["data"]["flags"] == 64 and "mode" in reply["data"]["content"], reply
+                    status, reply = await post(command_interaction(12, 42, "play", {"game": "chess", "time": "8pm", "platform": "pc"}))
+                    assert reply["data"]["flags"] == 64, reply
+                    print(f"✓ Invalid /play answered with ephemeral errors")
+                    
+                    autocomplete = command_interaction(13, 42, "play", {"game": "", "time": "8"})
+                    autocomplete["type"] = 4
+                    autocomplete["data"]["options"][0]["focused"] = True
+                    status, reply = await post(autocomplete)
+                    assert reply["type"] == 8 and len(reply["data"]["choices"]) > 0, reply
+                    print(f"✓ Autocomplete answered with {len(reply['data']['choices'])} choices")
+                    
+                    click = command_interaction(14, 43, "play", {})
+                    click["type"] = 3
+                    click["data"] = {"custom_id": custom_id, "component_type": 2}
+                    click["message"] = {"id": "500", "embeds": [{"title": "Call of Duty"}]}
+                    status, reply = await post(click)
+                    assert reply["type"] == 7, reply
+                    assert reply["data"]["embeds"][0]["fields"][-1]["value"] == "<@43>", reply
+                    assert await store.get_rsvps(session_id) == {43: "going"}
+                    print(f"✓ RSVP click applied to the store and the embed updated")
+                    
+                    status, reply = await post(command_interaction(15, 42, "sessions", {}) | {"data": {
+                        "id": "4", "name": "sessions", "type": 1, "options": [{"name": "upcoming", "type": 1, "options": []}],
+                    }})
+                    assert reply["type"] == 4 and reply["data"]["flags"] == 64, reply
+                    assert "Call of Duty" in json.dumps(reply["data"]["embeds"])
+                    print(f"✓ Subcommands dispatched to SessionCommands")
+            finally:
+                await endpoint.stop()
+                await store.close()
+        
+        asyncio.run(run())
+
+
+def test_cluster_mode():
+    """Test shard assignment and cross-worker IPC queries."""
+    print("\n=== Testing Cluster Mode ===")
+    from types import SimpleNamespace
+    
+    assert shard_ranges(10, 3) == [[0, 1, 2, 3], [4, 5, 6], [7, 8, 9]]
+    assert shard_ranges(2, 8) == [[0], [1]]
+    print(f"✓ Shards split into contiguous ranges")
+    
+    worker = SimpleNamespace(shard_ids=[1], shard_count=4)
+    assert owns_guild(worker, 1 << 22) and not owns_guild(worker, 2 << 22)
+    assert owns_guild(SimpleNamespace(), 2 << 22)
+    print(f"✓ Guild ownership follows Discord's shard formula")
+    
+    async def run():
+        hub = ClusterHub("secret")
+        address = await hub.start()
+        clients = []
+        try:
+            for cluster_id, guilds in enumerate((3, 5, 7)):
+                client = ClusterClient(cluster_id, address, "secret")
+                
+                async def guild_count(guilds=guilds):
+                    return guilds
+                
+                client.register("guild_count", guild_count)
+                await client.connect()
+                clients.append(client)
+            
+            intruder = ClusterClient(9, address, "wrong")
+            intruder.register("guild_count", guild_count)
+            await intruder.connect()
+            await asyncio.sleep(0.05)
+            return await clients[1].query("guild_count")
+        finally:
+            for client in clients:
+                await client.close()
+            await intruder.close()
+            await hub.stop()
+    
+    counts = asyncio.run(run())
+    assert counts == [3, 5, 7], counts
+    print(f"✓ Cross-worker guild count: {sum(counts)} from {len(counts)} workers")
+
+
+def test_metrics():
+    """Test latency histograms, error counters and the /metrics endpoint."""
+    print("\n=== Testing Metrics ===")
+    import aiohttp
+    from types import SimpleNamespace
+    
+    now = [0.0]
+    metrics = Metrics(clock=lambda: now[0])
+    for latency in (0.003, 0.02, 0.02, 4.0):
+        interaction = SimpleNamespace(extras={}, command=SimpleNamespace(qualified_name="play"))
+        metrics.mark_received(interaction)
+        now[0] += latency
+        metrics.observe_response(interaction)
+        # Only the first response counts
+        metrics.observe_response(interaction)
+    histogram = metrics.latency["play"]
+    assert histogram.count == 4 and abs(histogram.sum - 4.043) < 1e-9
+    buckets = dict(histogram.cumulative())
+    assert (buckets["0.005"], buckets["0.025"], buckets["3"], buckets["+Inf"]) == (1, 3, 3, 4), buckets
+    print(f"✓ Latency recorded once per interaction into cumulative buckets")
+    
+    import discord
+    from game_coordinator_bot.metrics import InstrumentedCommandTree
+    client = discord.Client(intents=discord.Intents.none())
+    client.metrics = metrics
+    tree = InstrumentedCommandTree(client)
+    interaction = SimpleNamespace(extras={})
+    assert asyncio.run(tree.interaction_check(interaction)) and interaction.extras["received_at"] == now[0]
+    print(f"✓ Command tree stamps interactions through interaction_check")
+    
+    metrics.count_error("play", "missing_mode")
+    metrics.count_error("play", "missing_mode")
+    metrics.count_event("ready")
+    metrics.add_gauge("queue_depth", "Queued requests.", lambda: {"interaction": 2}, label="priority")
+    metrics.add_gauge("gateway_latency_seconds", "Heartbeat latency.", lambda: float("nan"))
+    text = metrics.render()
+    assert 'game_coordinator_command_latency_seconds_bucket{command="play",le="+Inf"} 4' in text
+    assert 'game_coordinator_command_errors_total{command="play",reason="missing_mode"} 2' in text
+    assert 'game_coordinator_events_total{event="ready"} 1' in text
+    assert 'game_coordinator_queue_depth{priority="interaction"} 2' in text
+    assert "game_coordinator_gateway_latency_seconds NaN" in text
+    print(f"✓ Prometheus text rendering")
+    
+    async def scrape():
+        server = MetricsServer(metrics, port=0)
+        await server.start()
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"http://127.0.0.1:{server.port}/metrics") as response:
+                    return response.status, response.headers["Content-Type"], await response.text()
+        finally:
+            await server.stop()
+    
+    status, content_type, body = asyncio.run(scrape())
+    assert status == 200 and content_type.startswith("text/plain; version=0.0.4") and body == metrics.render()
+    print(f"✓ Served on /metrics")
+
+
+def test_log_pipeline():
+    """Test queued, lazily formatted JSON logging."""
+    print("\n=== Testing Log Pipeline ===")
+    import io
+    import json
+    import logging
+    
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    stream = io.StringIO()
+    try:
+        listener = configure_logging(logging.INFO, "json", stream)
+        handler = root.handlers[0]
+        assert isinstance(handler, LazyQueueHandler)
+        
+        # The record is queued with its arguments, unformatted
+        record = logging.LogRecord("game_coordinator.commands", logging.INFO, __file__, 1, "created by %s", ("player1",), None)
+        assert handler.prepare(record).args == ("player1",)
+        
+        logger = logging.getLogger("game_coordinator.commands")
+        logger.info("Gaming session created by %s", "player1", extra={"game": "overcooked", "guild_id": 100})
+        logger.debug("not written")
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("Failed")
+        listener.stop()
+    finally:
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        for handler in saved_handlers:
+            root.addHandler(handler)
+        root.setLevel(saved_level)
+    
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert len(lines) == 2, lines
+    assert lines[0]["message"] == "Gaming session created by player1"
+    assert (lines[0]["logger"], lines[0]["level"]) == ("game_coordinator.commands", "INFO")
+    assert (lines[0]["game"], lines[0]["guild_id"]) == ("overcooked", 100)
+    assert "ValueError: boom" in lines[1]["exception"]
+    print(f"✓ Records written as JSON by the listener thread, with extra fields")
+    
+    try:
+        configure_logging(log_format="xml")
+        assert False, "Expected ValueError"
+    except ValueError:
+        pass
+    print(f"✓ Unknown log format rejected")
+
+
+def test_loop_watchdog():
+    """Test event loop stall reports and systemd watchdog pings."""
+    print("\n=== Testing Loop Watchdog ===")
+    import socket
+    
+    def block_the_loop(seconds: float) -> None:
+        time.sleep(seconds)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        address = os.path.join(tmp, "notify")
+        receiver = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        receiver.bind(address)
+        receiver.setblocking(False)
+        notifier = SystemdNotifier(address)
+        
+        def received():
+            messages = []
+            while True:
+                try:
+                    messages.append(receiver.recv(64).decode())
+                except BlockingIOError:
+                    return messages
+        
+        async def run():
+            watchdog = LoopWatchdog(notifier, probe_interval=0.02, stall_threshold=0.1, watchdog_sec=0.1)
+            watchdog.start()
+            await asyncio.sleep(0.3)
+            healthy = received()
+            assert healthy[0] == "READY=1", healthy
+            assert "WATCHDOG=1" in healthy, healthy
+            assert watchdog.stalls == 0
+            
+            block_the_loop(0.4)
+            wedged = received()
+            await asyncio.sleep(0.2)
+            assert watchdog.stalls == 1
+            assert "block_the_loop" in watchdog.last_stall_stack, watchdog.last_stall_stack
+            assert watchdog.max_lag >= 0.3
+            # At most the ping that was due as the loop stopped
+            assert wedged.count("WATCHDOG=1") <= 1, wedged
+            
+            pings = watchdog.pings
+            await asyncio.sleep(0.2)
+            assert watchdog.pings > pings
+            await watchdog.stop()
+            assert received()[-1] == "STOPPING=1"
+        
+        try:
+            asyncio.run(run())
+        finally:
+            notifier.close()
+            receiver.close()
+    print(f"✓ READY and WATCHDOG sent over the notify socket while the loop is healthy")
+    print(f"✓ Blocked loop reported once with the blocking function's stack")
+    
+    assert not SystemdNotifier(None).enabled
+    assert not SystemdNotifier(None).notify("READY=1")
+    assert SystemdNotifier("@abstract").address == "\0abstract"
+    print(f"✓ No-op without NOTIFY_SOCKET; abstract socket names supported")
+
+
+def test_command_sync():
+    """Test that command tree syncs are skipped when the schema is unchanged."""
+    print("\n=== Testing Command Sync ===")
+    import discord
+    from discord import app_commands
+    
+    tree = app_commands.CommandTree(discord.Client(intents=discord.Intents.none()))
+    
+    @tree.command(name="play", description="Schedule a session")
+    async def play(interaction: discord.Interaction, game: str):
+        pass
+    
+    first = command_tree_hash(tree)
+    assert first == command_tree_hash(tree)
+    print(f"✓ Tree hash is stable: {first[:12]}")
+    
+    syncs = []
+    
+    async def fake_sync(*, guild=None):
+        syncs.append(guild)
+        return []
+    
+    tree.sync = fake_sync
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data", "command_sync.json")
+        assert asyncio.run(sync_if_changed(tree, CommandSyncState(path), "1:global"))
+        
+        # A restart reloads the state and skips the unchanged tree
+        state = CommandSyncState(path)
+        assert state.get("1:global") == first
+        assert not asyncio.run(sync_if_changed(tree, state, "1:global"))
+        assert asyncio.run(sync_if_changed(tree, state, "1:global", force=True))
+        assert asyncio.run(sync_if_changed(tree, state, "1:42", guild=None))
+        assert len(syncs) == 3
+        print(f"✓ Unchanged tree skipped; --force-sync and new scopes still sync")
+        
+        @tree.command(name="ping", description="Check latency")
+        async def ping(interaction: discord.Interaction):
+            pass
+        
+        assert command_tree_hash(tree) != first
+        assert asyncio.run(sync_if_changed(tree, state, "1:global"))
+        assert len(syncs) == 4
+        print(f"✓ Schema change triggers a sync")
+
+
+def test_startup_profiler():
+    """Test startup phase timing."""
+    print("\n=== Testing Startup Profiler ===")
+    now = [0.0]
+    profiler = StartupProfiler(clock=lambda: now[0])
+    
+    profiler.begin("import")
+    now[0] = 0.3
+    profiler.end("import")
+    with profiler.phase("extensions"):
+        now[0] = 0.35
+    profiler.begin("ready")
+    now[0] = 1.35
+    profiler.end("ready")
+    assert profiler.end("login") is None
+    
+    report = profiler.report()
+    assert list(report) == ["import", "extensions", "ready", "total"], report
+    assert report["import"] == 300.0 and report["extensions"] == 50.0
+    assert report["ready"] == 1000.0 and report["total"] == 1350.0
+    print(f"✓ Phase report: {report}")
+    
+    profiler.log_report()
+    assert profiler.reported
+    print(f"✓ Report is logged once per process")
+
+
+def test_gateway_profiles():
+    """Test the standard and lean gateway profiles."""
+    print("\n=== Testing Gateway Profiles ===")
+    import discord
+    
+    standard = gateway_options("standard")
+    assert standard["intents"].message_content and standard["intents"].guilds
+    print(f"✓ Standard profile keeps default intents plus message content")
+    
+    lean = gateway_options("lean")
+    assert lean["intents"].value == discord.Intents(guilds=True).value
+    assert lean["max_messages"] is None
+    assert lean["member_cache_flags"].value == discord.MemberCacheFlags.none().value
+    assert lean["chunk_guilds_at_startup"] is False
+    print(f"✓ Lean profile subscribes to guilds only and disables message/member caches")
+    
+    try:
+        gateway_options("tiny")
+        assert False, "Unknown profile should raise"
+    except ValueError:
+        print(f"✓ Unknown profile rejected")
+
+
+def test_game_catalog():
+    """Test the catalog index, platform suggestions and hot reload."""
+    print("\n=== Testing Game Catalog ===")
+    import json
+    from types import SimpleNamespace
+    from game_coordinator_bot.cogs.game_commands import GameCommands
+    
+    original = get_catalog()
+    assert original.get_mode("call_of_duty", "endgame").name == "Endgame"
+    assert original.get_mode("overcooked", "zombies") is None
+    assert original.platforms["switch"] == "Nintendo Switch"
+    assert list(original.platforms)[:2] == ["pc", "playstation"]
+    print(f"✓ Catalog indexes {len(original.games)} games, {len(original.modes)} modes, {len(original.platforms)} platforms")
+    
+    try:
+        GameCatalog.from_dict({"games": [{"id": "a", "display_name": "A"}] * 2, "platforms": []})
+        assert False, "Duplicate game IDs should be rejected"
+    except ValueError as e:
+        print(f"✓ Invalid catalog rejected: {e}")
+    
+    data = {
+        "games": [
+            {"id": "chess", "display_name": "Chess", "color": "#FFFFFF", "modes": [{"id": "blitz", "name": "Blitz"}]},
+        ],
+        "platforms": [{"id": "pc", "name": "PC"}, {"id": "board", "name": "Board"}],
+    }
+    cog = GameCommands(SimpleNamespace(dispatcher=None))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "games.json")
+        with open(path, "w") as f:
+            json.dump(data, f)
+        watcher = CatalogWatcher(path)
+        try:
+            assert not asyncio.run(watcher.check())
+            
+            # Rewrite the file with a different size so the change is seen
+            data["games"][0]["display_name"] = "Chess960"
+            with open(path, "w") as f:
+                json.dump(data, f)
+            in_flight = get_catalog()
+            assert asyncio.run(watcher.check())
+            assert get_game_config("chess").display_name == "Chess960"
+            assert get_game_config("chess").color == 0xFFFFFF
+            assert in_flight is original and in_flight.games["call_of_duty"]
+            assert [entry.value for entry in catalog_indexes().platforms.search("")] == ["pc", "board"]
+            assert cog.embed_templates.get("chess", "blitz") is not None
+            print(f"✓ Reload swapped the catalog, platform suggestions and templates")
+            
+            with open(path, "w") as f:
+                f.write("{not json")
+            assert not asyncio.run(watcher.check())
+            assert get_game_config("chess") is not None
+            print(f"✓ Broken catalog file ignored")
+        finally:
+            set_catalog(original)
+            cog.cog_unload()
+    
+    assert len(catalog_indexes().platforms) == len(original.platforms)
+
+
+def test_autocomplete():
+    """Test timezone, game and mode autocomplete."""
+    print("\n=== Testing Autocomplete ===")
+    index = timezone_index()
+    assert len(index) > 500, len(index)
+    
+    def top(query):
+        return [entry.value for entry in index.search(query)]
+    
+    assert top("york")[0] == "America/New_York"
+    assert top("new y")[0] == "America/New_York"
+    assert top("mumbai")[0] == "Asia/Kolkata"
+    assert top("sf")[0] == "America/Los_Angeles"
+    assert top("pst")[0] == "US/Pacific"
+    assert top("sydeny")[0] == "Australia/Sydney"
+    assert top("qqqqq") == []
+    print(f"✓ Prefix, alias, abbreviation and fuzzy matches over {len(index)} zones")
+    
+    defaults = top("")
+    assert len(defaults) <= MAX_SUGGESTIONS and set(COMMON_TIMEZONES) <= set(defaults)
+    assert all(len(index.search(q)) <= MAX_SUGGESTIONS for q in ("a", "america", "e" * 200))
+    print(f"✓ Empty input suggests the common zones; results capped at {MAX_SUGGESTIONS}")
+    
+    assert resolve_timezone("America/Los_Angeles") == "America/Los_Angeles"
+    assert resolve_timezone("europe/berlin") == "Europe/Berlin"
+    assert resolve_timezone("UK (GMT/BST)") == "Europe/London"
+    assert resolve_timezone("zzzz") is None
+    print(f"✓ Submitted values resolve to IANA names")
+    
+    # Shared abbreviations resolve to the zone search ranks first
+    for text, zone in (("PST", "US/Pacific"), ("BST", "Europe/London"), ("AEST", "Australia/Sydney"), ("edt", "US/Eastern")):
+        assert resolve_timezone(text) == zone == top(text)[0], (text, resolve_timezone(text))
+    assert resolve_timezone("EST") == "EST"
+    assert resolve_timezone("e") is None and resolve_timezone("sydeny") is None
+    print(f"✓ Abbreviations resolve to the most common zone; partial text is rejected")
+    
+    indexes = catalog_indexes()
+    assert [entry.value for entry in indexes.games.search("call")] == ["call_of_duty"]
+    assert indexes.games.lookup("Overcooked").value == "overcooked"
+    assert {entry.value for entry in indexes.modes("call_of_duty").search("")} == {"zombies", "multiplayer", "endgame"}
+    assert indexes.modes("overcooked").search("") == []
+    assert indexes.modes(None).lookup("Zombies").value == "zombies"
+    print(f"✓ Game and mode suggestions follow the catalog and the chosen game")
+    
+    assert [entry.value for entry in indexes.platforms.search("")][:2] == ["pc", "playstation"]
+    assert indexes.platforms.search("swi")[0].value == "switch"
+    assert indexes.platforms.lookup("Nintendo Switch").value == "switch"
+    assert indexes.platforms.lookup("gameboy") is None
+    print(f"✓ Platform suggestions in catalog order, resolved by ID or name")
+    
+    start = time.perf_counter()
+    for query in ("a", "am", "ame", "america", "europe/lo", "tok", "est", "sydeny"):
+        index.search(query)
+    elapsed = (time.perf_counter() - start) / 8
+    assert elapsed < 0.05, elapsed
+    print(f"✓ Average lookup {elapsed * 1e6:.0f}µs")
+
+
+def test_availability():
+    """Test availability bitmaps, slot suggestions and /when."""
+    print("\n=== Testing Availability ===")
+    import calendar
+    from zoneinfo import ZoneInfo
+    from benchmarks.fake_discord import command_interaction
+    
+    assert parse_weekdays("mon-fri") == (0, 1, 2, 3, 4)
+    assert parse_weekdays("Sat, sunday") == (5, 6)
+    assert parse_weekdays("fri-mon") == (0, 4, 5, 6)
+    assert parse_weekdays("weekends tue") == (1, 5, 6)
+    assert parse_weekdays("daily") == tuple(range(7))
+    assert parse_weekdays("mo") is None and parse_weekdays("mon, someday") is None and parse_weekdays("") is None
+    print(f"✓ Days, ranges and groups parsed")
+    
+    # New York moves to EDT on Sunday 8 March 2026
+    start = calendar.timegm((2026, 3, 2, 0, 0, 0))
+    bitmap = user_bitmap([(0, 19 * 60, 20 * 60)], "America/New_York", start, 2)
+    assert [slot for slot in range(2 * SLOTS_PER_WEEK) if bitmap >> slot & 1] == [96, 97, 98, 99, 764, 765, 766, 767]
+    print(f"✓ Monday 7pm New York is 00:00 UTC Tuesday in EST and 23:00 UTC Monday in EDT")
+    
+    windows = [(0, 18 * 60, 22 * 60), (4, 22 * 60, 2 * 60), (6, 23 * 60 + 30, 23 * 60 + 30), (2, 0, 45)]
+    for zone in ("America/New_York", "Europe/London", "Australia/Lord_Howe", "Asia/Kolkata", "Pacific/Chatham", "UTC"):
+        bitmap = user_bitmap(windows, zone, start, 5)
+        tz = ZoneInfo(zone)
+        for slot in range(5 * SLOTS_PER_WEEK):
+            local = datetime.fromtimestamp(start + slot * 900, tz)
+            minute = local.hour * 60 + local.minute
+            free = False
+            for weekday, first, last in windows:
+                last = last if last > first else last + 24 * 60
+                # Also catch windows that started the day before and run past midnight
+                for day, offset in ((weekday, 0), ((weekday + 1) % 7, 24 * 60)):
+                    free |= local.weekday() == day and first <= minute + offset < last
+            assert bool(bitmap >> slot & 1) == free, (zone, slot)
+    print(f"✓ Bitmaps match a slot-by-slot conversion across DST changes")
+    
+    july = calendar.timegm((2026, 7, 6, 0, 0, 0))
+    matrix = SlotMatrix(july)
+    matrix.add(1, [(0, 19 * 60, 23 * 60)], "America/New_York")
+    matrix.add(2, [(0, 20 * 60, 22 * 60)], "Europe/London")
+    matrix.add(3, [(1, 0, 3 * 60)], "UTC")
+    matrix.add(3, [(0, 19 * 60, 21 * 60)], "UTC")
+    assert len(matrix) == 3
+    suggestions = matrix.best_slots(60, top=4)
+    assert [(s.start - july, s.user_ids) for s in suggestions] == [
+        (19 * 3600, (2, 3)), (20 * 3600, (2, 3)), (24 * 3600, (1, 3)), (25 * 3600, (1, 3))
+    ]
+    suggestions = matrix.best_slots(120, top=3)
+    assert [(s.start - july, s.end - july) for s in suggestions] == [(19 * 3600, 21 * 3600), (24 * 3600, 26 * 3600)]
+    assert matrix.best_slots(60, min_users=3) == []
+    late = matrix.best_slots(120, top=1, not_before=july + 20 * 3600)[0]
+    assert (late.start - july, late.user_ids) == (24 * 3600, (1, 3))
+    print(f"✓ Best slots ranked by free members, without overlaps")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        database = Database(os.path.join(tmp, "availability.db"))
+        repository = AvailabilityRepository(database)
+        endpoint = InteractionsEndpoint("00" * 32, availability=repository)
+        
+        def subcommand(interaction_id, user_id, name, options):
+            payload = command_interaction(interaction_id, user_id, "availability", {})
+            payload["data"]["options"] = [{
+                "name": name, "type": 1,
+                "options": [{"name": key, "type": 3, "value": value} for key, value in options.items()],
+            }]
+            return payload
+        
+        async def run():
+            await repository.open()
+            try:
+                await repository.add(100, [AvailabilityWindow(7, 5, 600, 720, "UTC", "chess")])
+                assert len(await repository.for_guild(100)) == 1
+                assert await repository.for_guild(100, game="call_of_duty") == []
+                print(f"✓ Windows for another game are left out")
+                
+                reply = await endpoint.handle(subcommand(1, 42, "add", {
+                    "days": "daily", "start": "7pm", "end": "11pm", "timezone": "America/New_York",
+                }))
+                assert "Mon, Tue, Wed, Thu, Fri, Sat, Sun, 7pm-11pm" in reply["data"]["content"], reply
+                await endpoint.handle(subcommand(2, 43, "add", {"days": "mon-sun", "start": "0:05", "end": "2:50", "timezone": "UTC"}))
+                windows = await repository.for_user(100, 43)
+                assert len(windows) == 7 and (windows[0].start_minute, windows[0].end_minute) == (0, 180)
+                reply = await endpoint.handle(subcommand(3, 43, "add", {"days": "someday", "start": "1am", "end": "2am"}))
+                assert reply["data"]["flags"] == 64 and "days" in reply["data"]["content"], reply
+                reply = await endpoint.handle(subcommand(4, 44, "add", {"days": "mon", "start": "1am", "end": "2am"}))
+                assert "timezone" in reply["data"]["content"], reply
+                print(f"✓ /availability add stores windows rounded to 15 minutes")
+                
+                when = command_interaction(5, 42, "when", {"game": "call_of_duty"})
+                when["data"]["options"].append({"name": "duration", "type": 4, "value": 120})
+                reply = await endpoint.handle(when)
+                description = reply["data"]["embeds"][0]["description"]
+                assert description.count("**2 of 2** free") == 3 and "<@42> <@43>" in description, description
+                print(f"✓ /when suggests the times both members are free")
+                
+                reply = await endpoint.handle(subcommand(6, 43, "clear", {}))
+                assert "Removed 7 windows" in reply["data"]["content"]
+                assert await repository.for_user(100, 43) == []
+                print(f"✓ /availability clear removes a member's windows")
+            finally:
+                await endpoint.stop()
+                await database.close()
+        
+        asyncio.run(run())
+
+
+def test_recurring_sessions():
+    """Test recurrence rules, the occurrence index and recurring /play sessions."""
+    print("\n=== Testing Recurring Sessions ===")
+    import calendar
+    import inspect
+    import itertools
+    import random
+    from types import SimpleNamespace
+    from zoneinfo import ZoneInfo
+    from benchmarks.fake_discord import command_interaction
+    from game_coordinator_bot.cogs.game_commands import GameCommands
+    from game_coordinator_bot.cogs.reminders import Reminders
+    from game_coordinator_bot.cogs.session_commands import SessionCommands
+    from game_coordinator_bot.http_interactions import HttpInteraction
+    from game_coordinator_bot.scheduler import Reminder
+    
+    october = calendar.timegm((2026, 10, 1, 0, 0, 0))
+    rule = parse_recurrence("every Fri 9pm", "US/Pacific", anchor=october)
+    assert (rule.weekdays, rule.minute, rule.interval) == (1 << 4, 21 * 60, 1)
+    assert rule.describe() == "every Fri at 9pm"
+    assert parse_recurrence("every other mon, wed at 20:00", "UTC").describe() == "every other Mon, Wed at 8pm"
+    assert parse_recurrence("every weekday 7:30 pm", "UTC").describe() == "every weekday at 7:30pm"
+    assert parse_recurrence("8pm", "UTC") is None and parse_recurrence("every someday 8pm", "UTC") is None
+    print(f"✓ Recurrences parsed and described")
+    
+    occurrences = rule.occurrences()
+    assert inspect.isgenerator(occurrences)
+    local = [datetime.fromtimestamp(ts, ZoneInfo("US/Pacific")) for ts in itertools.islice(occurrences, 8)]
+    assert all((dt.weekday(), dt.hour, dt.minute) == (4, 21, 0) for dt in local)
+    assert local[0].date().isoformat() == "2026-10-02" and local[-1].date().isoformat() == "2026-11-20"
+    assert {dt.utcoffset() for dt in local} == {timedelta(hours=-7), timedelta(hours=-8)}
+    # 2:30am does not exist on 8 March in New York; it is taken as 2:30 EST
+    gap = RecurrenceRule(1 << 6, 150, "America/New_York", anchor=calendar.timegm((2026, 3, 2, 0, 0, 0)))
+    assert gap.next_occurrence(gap.anchor) == calendar.timegm((2026, 3, 8, 7, 30, 0))
+    every_other = parse_recurrence("every other wed 8pm", "Europe/London", anchor=calendar.timegm((2026, 3, 18, 0, 0, 0)))
+    assert [ts - every_other.anchor for ts in itertools.islice(every_other.occurrences(), 2)] == [20 * 3600, 14 * 86400 + 19 * 3600]
+    print(f"✓ Occurrences generated lazily at the same wall time across DST changes")
+    
+    rng = random.Random(7)
+    now = october
+    index = OccurrenceIndex(clock=lambda: now)
+    rules = {}
+    zones = ["US/Pacific", "Europe/London", "Australia/Sydney", "Asia/Kolkata", "UTC"]
+    for i in range(200):
+        rules[str(i)] = (RecurrenceRule(rng.randint(1, 127), rng.randrange(96) * 15, rng.choice(zones), rng.choice((1, 2, 3)), now - rng.randrange(10 ** 7)), i % 3)
+        index.add(str(i), rules[str(i)][0], i, groups=(i % 3,))
+    for key in map(str, range(0, 200, 9)):
+        assert index.remove(key)
+        del rules[key]
+    assert len(index) == len(rules) and not index.remove("0")
+    for _ in range(3):
+        now += rng.randrange(10 ** 6)
+        for group in (None, 0, 1, 2):
+            expected = sorted(
+                start for rule, rule_group in rules.values() if group in (None, rule_group)
+                for start in itertools.islice(rule.occurrences(now), 20)
+            )[:20]
+            assert [occurrence.start for occurrence in index.upcoming(group, limit=20)] == expected
+            assert index.next(group).start == expected[0]
+            distinct = index.upcoming(group, limit=20, distinct=True)
+            assert len({occurrence.key for occurrence in distinct}) == len(distinct)
+            assert [occurrence.start for occurrence in distinct] == sorted(
+                rule.next_occurrence(now) for rule, rule_group in rules.values() if group in (None, rule_group)
+            )[:20]
+    print(f"✓ Index returns the next occurrences of {len(index)} rules, per group and overall")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        database = Database(os.path.join(tmp, "recurring.db"))
+        store = SessionRepository(database)
+        recurring = RecurringSessionRepository(database)
+        scheduler = ReminderScheduler()
+        sent = []
+        
+        async def send(channel, **kwargs):
+            sent.append(kwargs["content"])
+        
+        bot = SimpleNamespace(
+            dispatcher=OutboundDispatcher(),
+            session_store=store,
+            recurring_sessions=recurring,
+            recurring_index=OccurrenceIndex(),
+            reminder_scheduler=scheduler,
+            get_channel=lambda channel_id: SimpleNamespace(id=channel_id),
+        )
+        
+        async def run():
+            await store.open()
+            await recurring.open()
+            game_commands = GameCommands(bot)
+            session_commands = SessionCommands(bot, store, scheduler, bot.dispatcher)
+            try:
+                interaction = HttpInteraction(command_interaction(1, 42, "play", {}))
+                interaction.command = game_commands.play_command
+                await game_commands.play_command.callback(
+                    game_commands, interaction, game="call_of_duty", time="every fri 9pm",
+                    timezone="US/Pacific", platform="pc", mode="zombies"
+                )
+                embed = (await interaction.response.reply)["data"]["embeds"][0]
+                assert {"name": "🔁 Repeats", "value": "every Fri at 9pm", "inline": False} in embed["fields"]
+                (series,) = await recurring.active()
+                first = bot.recurring_index.next().start
+                assert datetime.fromtimestamp(first, ZoneInfo("US/Pacific")).strftime("%a %H:%M") == "Fri 21:00"
+                assert {reminder.kind for reminder in scheduler._by_session[series.id]} <= {"soon", "start"}
+                print(f"✓ /play 'every fri 9pm' stores the rule and schedules its first occurrence")
+                
+                interaction = HttpInteraction(command_interaction(2, 43, "sessions", {}))
+                await session_commands.upcoming_command.callback(session_commands, interaction, None)
+                description = (await interaction.response.reply)["data"]["embeds"][0]["description"]
+                assert description.count(series.id) == 1 and "🔁 every Fri at 9pm" in description
+                print(f"✓ /sessions upcoming lists a recurring session once, at its next occurrence")
+                
+                reminders = Reminders(bot, store, scheduler, SimpleNamespace(send=send), recurring, bot.recurring_index)
+                await reminders.send_reminders([Reminder(first, 0, series.id, "start")])
+                assert sent == ["🎮 <@42>'s **Call of Duty** session is starting now!"]
+                following = [reminder.fire_at for reminder in scheduler._by_session[series.id]]
+                assert max(following) == bot.recurring_index.get(series.id).rule.next_occurrence(first + 1) > first
+                print(f"✓ The next occurrence is scheduled once one starts")
+                
+                interaction = HttpInteraction(command_interaction(3, 42, "sessions", {}))
+                await session_commands.cancel_command.callback(session_commands, interaction, series.id)
+                assert "cancelled" in (await interaction.response.reply)["data"]["content"]
+                assert await recurring.active() == [] and len(bot.recurring_index) == 0
+                assert series.id not in scheduler._by_session
+                print(f"✓ /sessions cancel stops a recurring session")
+                
+                # Only the session store opened: the recurring table does not exist
+                bare_store = SessionRepository(Database(os.path.join(tmp, "bare.db")))
+                await bare_store.open()
+                bare_scheduler = ReminderScheduler()
+                reminders = Reminders(
+                    bot, bare_store, bare_scheduler, bot.dispatcher,
+                    RecurringSessionRepository(bare_store.database), OccurrenceIndex()
+                )
+                try:
+                    await reminders.cog_load()
+                    assert bare_scheduler._task is not None
+                finally:
+                    await reminders.cog_unload()
+                    await bare_store.close()
+                print(f"✓ Reminders load without the recurring table")
+            finally:
+                game_commands.cog_unload()
+                await store.close()
+        
+        asyncio.run(run())
+
+
+def test_duplicate_sessions():
+    """Test near-duplicate /play detection through the bucketed session index."""
+    print("\n=== Testing Duplicate Sessions ===")
+    from types import SimpleNamespace
+    import discord
+    from benchmarks.fake_discord import command_interaction
+    from game_coordinator_bot.cogs.game_commands import DuplicateOfferView, GameCommands
+    from game_coordinator_bot.cogs.session_commands import SessionCommands
+    from game_coordinator_bot.http_interactions import HttpInteraction
+    
+    now = 1_800_000_000
+    index = DuplicateIndex(window=1800, clock=lambda: now)
+    
+    def session(start_time, **overrides):
+        fields = dict(guild_id=1, channel_id=2, organizer_id=3, game="valorant", platform="pc", timezone="UTC", start_time=start_time)
+        fields.update(overrides)
+        return Session(**fields)
+    # Just before a bucket boundary, so matches come from the neighbouring bucket
+    first = session(now + 3600 - now % 1800 + 1799)
+    assert index.add(first) and not index.add(session(now - 60))
+    assert index.find(1, "valorant", None, "pc", first.start_time + 1) is first
+    assert index.find(1, "valorant", None, "pc", first.start_time - 1800) is first
+    assert index.find(1, "valorant", None, "pc", first.start_time + 1801) is None
+    assert index.find(1, "valorant", None, "xbox", first.start_time) is None
+    assert index.find(1, "valorant", "ranked", "pc", first.start_time) is None
+    assert index.find(9, "valorant", None, "pc", first.start_time) is None
+    closer = session(first.start_time + 600)
+    index.add(closer)
+    assert index.find(1, "valorant", None, "pc", first.start_time + 500) is closer
+    print(f"✓ Sessions within the window match; other games, modes, platforms and guilds do not")
+    
+    now = first.start_time
+    assert index.find(1, "valorant", None, "pc", first.start_time) is closer and first.id not in index
+    assert len(index) == 1 and index.remove(closer.id) and len(index) == 0 and not index.remove(closer.id)
+    print(f"✓ Sessions expire once they start, and can be removed")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        database = Database(os.path.join(tmp, "duplicates.db"))
+        store = SessionRepository(database)
+        scheduler = ReminderScheduler()
+        bot = SimpleNamespace(
+            dispatcher=OutboundDispatcher(),
+            session_store=store,
+            reminder_scheduler=scheduler,
+            duplicate_index=DuplicateIndex(),
+        )
+        views = []
+        respond = bot.dispatcher.respond
+        
+        async def recording_respond(interaction, **kwargs):
+            views.append(kwargs.get("view"))
+            return await respond(interaction, **kwargs)
+        
+        bot.dispatcher.respond = recording_respond
+        
+        async def run():
+            await store.open()
+            await store.add(session(int(time.time()) + 7200, guild_id=100, game="call_of_duty", mode="zombies"))
+            game_commands = GameCommands(bot)
+            await game_commands.cog_load()
+            
+            async def play(interaction_id, user_id, time, platform="pc"):
+                interaction = HttpInteraction(command_interaction(interaction_id, user_id, "play", {}))
+                interaction.command = game_commands.play_command
+                await game_commands.play_command.callback(
+                    game_commands, interaction, game="call_of_duty", time=time, timezone="UTC",
+                    platform=platform, mode="zombies"
+                )
+                return (await interaction.response.reply)["data"]
+            
+            try:
+                assert len(bot.duplicate_index) == 1
+                reply = await play(1, 42, "in 2h 10m")
+                assert "already posted **Call of Duty**" in reply["content"] and reply["flags"] & 64
+                assert isinstance(views[-1], DuplicateOfferView) and len(await store.pending()) == 1
+                print(f"✓ Stored sessions are indexed at startup and /play offers the matching one")
+                
+                assert (await play(2, 43, "in 4h"))["content"] == "@everyone"
+                assert (await play(3, 44, "in 2h", platform="xbox"))["content"] == "@everyone"
+                assert "already posted" in (await play(4, 45, "in 4h 20m"))["content"]
+                click = HttpInteraction(command_interaction(5, 45, "play", {}))
+                await views[-1].post_anyway.callback(click)
+                assert (await click.response.reply)["data"]["content"] == "@everyone"
+                assert len(await store.pending()) == 4 and len(bot.duplicate_index) == 4
+                print(f"✓ Different times and platforms are announced, and 'Post anyway' announces after all")
+                
+                (latest,) = [pending for pending in await store.pending() if pending.organizer_id == 45]
+                session_commands = SessionCommands(bot, store, scheduler, bot.dispatcher)
+                interaction = HttpInteraction(command_interaction(6, 45, "sessions", {}))
+                await session_commands.cancel_command.callback(session_commands, interaction, latest.id)
+                assert latest.id not in bot.duplicate_index and len(bot.duplicate_index) == 3
+                print(f"✓ Cancelled sessions leave the index")
+                
+                # Two /play calls racing: the first announcement is held until the second replies
+                release = asyncio.Event()
+                held = []
+                
+                async def slow_respond(interaction, **kwargs):
+                    if not held:
+                        held.append(interaction)
+                        await release.wait()
+                    else:
+                        release.set()
+                    return await recording_respond(interaction, **kwargs)
+                
+                bot.dispatcher.respond = slow_respond
+                replies = await asyncio.gather(play(7, 46, "in 6h"), play(8, 47, "in 6h 5m"))
+                assert [reply["content"] == "@everyone" for reply in replies] == [True, False]
+                print(f"✓ A /play racing an announcement in flight is offered it as a duplicate")
+                
+                # A failed announcement releases its place in the index
+                async def failing_respond(interaction, **kwargs):
+                    raise discord.HTTPException(SimpleNamespace(status=500, reason="error"), "error")
+                
+                bot.dispatcher.respond = failing_respond
+                indexed = len(bot.duplicate_index)
+                try:
+                    await play(9, 48, "in 8h")
+                    assert False, "the announcement should have failed"
+                except discord.HTTPException:
+                    pass
+                assert len(bot.duplicate_index) == indexed
+                bot.dispatcher.respond = recording_respond
+                assert (await play(10, 48, "in 8h"))["content"] == "@everyone"
+                print(f"✓ A failed announcement is removed from the index")
+            finally:
+                game_commands.cog_unload()
+                await store.close()
+        
+        asyncio.run(run())
+
+
 def main():
     """Run all tests."""
     print("=" * 60)
@@ -191,12 +1880,35 @@ def main():
         test_command_validation_logic()
         test_embed_data_structure()
         test_timezone_functionality()
+        test_time_parser_cache()
+        test_time_grammar()
+        test_transition_tables()
+        test_session_embed_templates()
+        test_session_repository()
+        test_user_preferences()
+        test_reminder_scheduler()
+        test_rsvp_edit_coalescing()
+        test_outbound_dispatcher()
+        test_auto_defer()
+        test_http_interactions()
+        test_cluster_mode()
+        test_metrics()
+        test_log_pipeline()
+        test_loop_watchdog()
+        test_command_sync()
+        test_startup_profiler()
+        test_gateway_profiles()
+        test_game_catalog()
+        test_autocomplete()
+        test_availability()
+        test_recurring_sessions()
+        test_duplicate_sessions()
         
         print("\n" + "=" * 60)
         print("✅ All tests passed!")
         print("=" * 60)
         return 0
-        
+    
     except AssertionError as e:
         print(f"\n❌ Test failed: {e}")
         return 1